@@ -8,7 +8,25 @@
 
 CORE_MODULES: list[str] = [
     "servicenow_api.api_client",
+    "servicenow_api.async_client",
+    "servicenow_api.bulk",
+    "servicenow_api.choices",
+    "servicenow_api.codec",
+    "servicenow_api.columnar",
+    "servicenow_api.flows",
+    "servicenow_api.lookup",
+    "servicenow_api.microbatch",
+    "servicenow_api.mirror",
+    "servicenow_api.ndjson",
+    "servicenow_api.pagination",
+    "servicenow_api.partitioning",
+    "servicenow_api.references",
+    "servicenow_api.results",
+    "servicenow_api.retry",
     "servicenow_api.servicenow_models",
+    "servicenow_api.streaming",
+    "servicenow_api.sync",
+    "servicenow_api.transport",
 ]
 
 OPTIONAL_MODULES = {
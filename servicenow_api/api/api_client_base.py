@@ -1,14 +1,16 @@
 #!/usr/bin/python
 
 import base64
+import functools
 import gzip
+import io
 import json
 import sys
+import threading
 from base64 import b64encode
 from collections import defaultdict
 from datetime import datetime
 from typing import Any
-from urllib.parse import urlencode
 
 import requests
 from agent_utilities.base_utilities import get_logger
@@ -18,9 +20,20 @@
     resolve_configured_tls_profile,
 )
 
+from servicenow_api.client_pool import identity_digest
+from servicenow_api.codec import JsonCodec
+from servicenow_api.microbatch import MicroBatchConfig, MicroBatcher
+from servicenow_api.results import (
+    default_result_mode,
+    parse_records,
+    validate_result_mode,
+)
+from servicenow_api.retry import RateLimiter, RetryPolicy
 from servicenow_api.servicenow_models import (
     FlowGraph,
 )
+from servicenow_api.token_manager import OAuthTokenManager
+from servicenow_api.transport import ServiceNowSession, TransportConfig
 
 logger = get_logger(__name__)
 
@@ -185,53 +198,68 @@ def get_reachable_subgraph(graph: FlowGraph, root_id: str) -> FlowGraph:
     )
 
 
-def find_connected_components(graph: FlowGraph) -> list[FlowGraph]:
+def find_connected_components(
+    graph: FlowGraph, drop_singletons: bool = False
+) -> list[FlowGraph]:
     """
     Splits a single large global FlowGraph into a list of smaller FlowGraphs,
     where each sub-graph represents a completely disconnected component of flows/subflows.
+
+    Components are found with a union-find over the edges. Every node and edge is then
+    assigned to its component in one pass, so the cost is linear in the size of the
+    graph. Components are returned in the order of their first node in ``graph.nodes``,
+    and each keeps the original order of its nodes and edges.
+
+    :param drop_singletons: Leave out components made of one node and no edges.
     """
     if not graph.nodes:
         return []
 
-    adj: defaultdict[str, list[str]] = defaultdict(list)
+    parent: dict[str, str] = {}
+    size: dict[str, int] = {}
+
+    def find(node_id: str) -> str:
+        parent.setdefault(node_id, node_id)
+        while parent[node_id] != node_id:
+            parent[node_id] = parent[parent[node_id]]
+            node_id = parent[node_id]
+        return node_id
+
     for edge in graph.edges:
-        adj[edge.from_id].append(edge.to_id)
-        adj[edge.to_id].append(edge.from_id)
+        a, b = find(edge.from_id), find(edge.to_id)
+        if a != b:
+            if size.get(a, 1) < size.get(b, 1):
+                a, b = b, a
+            parent[b] = a
+            size[a] = size.get(a, 1) + size.get(b, 1)
 
-    all_node_ids = {node.id for node in graph.nodes}
     node_by_id = {node.id: node for node in graph.nodes}
+    members: dict[str, tuple[list, list]] = {}
+    for node_id, node in node_by_id.items():
+        members.setdefault(find(node_id), ([], []))[0].append(node)
+    for edge in graph.edges:
+        component = members.get(find(edge.from_id))
+        if component is not None:
+            component[1].append(edge)
+
+    return [
+        FlowGraph(
+            nodes=sub_nodes,
+            edges=sub_edges,
+            summary=f"Component size: {len(sub_nodes)}",
+        )
+        for sub_nodes, sub_edges in members.values()
+        if not (drop_singletons and len(sub_nodes) == 1 and not sub_edges)
+    ]
 
-    visited: set[str] = set()
-    components: list[FlowGraph] = []
-
-    for start_node in all_node_ids:
-        if start_node not in visited:
-            component_nodes: set[str] = set()
-            stack = [start_node]
-            while stack:
-                curr = stack.pop()
-                if curr not in component_nodes:
-                    component_nodes.add(curr)
-                    visited.add(curr)
-                    for neighbor in adj[curr]:
-                        if neighbor not in component_nodes:
-                            stack.append(neighbor)
-
-            sub_nodes = [node_by_id[nid] for nid in component_nodes]
-            sub_edges = [
-                edge
-                for edge in graph.edges
-                if edge.from_id in component_nodes and edge.to_id in component_nodes
-            ]
-            components.append(
-                FlowGraph(
-                    nodes=sub_nodes,
-                    edges=sub_edges,
-                    summary=f"Component size: {len(sub_nodes)}",
-                )
-            )
 
-    return components
+#: Opening and closing brackets of each Mermaid node shape, by node type.
+_MERMAID_SHAPES = {
+    "trigger": ("((", "))"),
+    "decision": ("{{", "}}"),
+    "loop": ("[/", "/]"),
+    "subflow_call": ("[[", "]]"),
+}
 
 
 def graph_to_mermaid_multi(
@@ -239,55 +267,52 @@ def graph_to_mermaid_multi(
     root_sys_ids: list[str],
     all_metadata: dict[str, dict[str, Any]] = None,
 ) -> str:
-    lines = ["flowchart TD"]
+    """
+    Render a flow graph as a Mermaid flowchart with one subgraph per root flow.
 
+    Nodes are grouped under their ``root_<sys_id[:8]>_`` prefix in a single pass and
+    the lines are streamed into one buffer, so the cost grows linearly with the number
+    of nodes and edges instead of with nodes × roots.
+    """
+    prefixes = {f"root_{rid[:8]}_" for rid in root_sys_ids}
+    lengths = sorted({len(p) for p in prefixes})
+    by_prefix: dict[str, list[str]] = {p: [] for p in prefixes}
+    loose: list[str] = []
+    for node in graph.nodes:
+        opening, closing = _MERMAID_SHAPES.get(node.type, ("[", "]"))
+        line = f"{node.id}{opening}{sanitize_mermaid_label(node.label)}{closing}"
+        matched = False
+        for length in lengths:
+            if len(node.id) < length:
+                break
+            group = by_prefix.get(node.id[:length])
+            if group is not None:
+                group.append(line)
+                matched = True
+        if not matched:
+            loose.append(line)
+
+    out = io.StringIO()
+    out.write("flowchart TD")
     for root_id in root_sys_ids:
-        root_prefix = f"root_{root_id[:8]}_"
-
-        has_nodes = any(
-            node.id.startswith(root_prefix)
-            or node.id == f"root_{root_id[:8]}_trigger_{root_id[:8]}"
-            for node in graph.nodes
-        )
-        if not has_nodes:
+        group = by_prefix[f"root_{root_id[:8]}_"]
+        if not group:
             continue
-
         meta = (all_metadata or {}).get(root_id, {})
         flow_name = meta.get("name", root_id)
-        lines.append(f'    subgraph "{flow_name} ({root_id})"')
-        for node in graph.nodes:
-            if (
-                node.id.startswith(root_prefix)
-                or node.id == f"root_{root_id[:8]}_trigger_{root_id[:8]}"
-            ):
-                label = sanitize_mermaid_label(node.label)
-                shape_map = {
-                    "trigger": f"(({label}))",
-                    "decision": f"{{{{{label}}}}}",
-                    "loop": f"[/{label}/]",
-                    "subflow_call": f"[[{label}]]",
-                }
-                shape = shape_map.get(node.type, f"[{label}]")
-                lines.append(f"        {node.id}{shape}")
-        lines.append("    end")
+        out.write(f'\n    subgraph "{flow_name} ({root_id})"')
+        for line in group:
+            out.write(f"\n        {line}")
+        out.write("\n    end")
 
-    for node in graph.nodes:
-        if not any(node.id.startswith(f"root_{rid[:8]}_") for rid in root_sys_ids):
-            label = sanitize_mermaid_label(node.label)
-            shape_map = {
-                "trigger": f"(({label}))",
-                "decision": f"{{{{{label}}}}}",
-                "loop": f"[/{label}/]",
-                "subflow_call": f"[[{label}]]",
-            }
-            shape = shape_map.get(node.type, f"[{label}]")
-            lines.append(f"    {node.id}{shape}")
+    for line in loose:
+        out.write(f"\n    {line}")
 
     for edge in graph.edges:
         label = f" |{edge.label}|" if edge.label else ""
-        lines.append(f"    {edge.from_id} -->{label} {edge.to_id}")
+        out.write(f"\n    {edge.from_id} -->{label} {edge.to_id}")
 
-    return "\n".join(lines)
+    return out.getvalue()
 
 
 def build_polished_markdown(
@@ -364,13 +389,34 @@ def __init__(
         token: str | None = None,
         grant_type: str | None = "password",
         tls_profile: ResolvedTLSProfile | None = None,
+        background_token_refresh: bool = True,
+        transport: TransportConfig | None = None,
+        retry_policy: RetryPolicy | None = None,
+        rate_limiter: RateLimiter | None = None,
+        result_mode: str | None = None,
+        json_codec: JsonCodec | str | None = None,
+        micro_batch: MicroBatchConfig | float | None = None,
     ):
         if url is None:
             raise MissingParameterError
 
-        self._session = requests.Session()
+        # Pool sizing, timeouts, socket options, rate limiting and retries apply to
+        # every mixin's `self._session.<verb>(...)` call through the wrapper, and so
+        # does the JSON codec behind `json=` bodies and `response.json()`. The TLS
+        # profile is applied last so its adapters/verification settings win.
+        self._session = ServiceNowSession(
+            requests.Session(),
+            transport,
+            retry_policy=retry_policy,
+            rate_limiter=rate_limiter,
+            codec=JsonCodec(json_codec) if isinstance(json_codec, str) else json_codec,
+        )
+        self.transport = self._session.config
+        self.json_codec = self._session.codec
+        # How list endpoints return rows unless a call passes its own result_mode.
+        self.result_mode = validate_result_mode(result_mode) or default_result_mode()
         self.tls_profile = tls_profile or resolve_configured_tls_profile("servicenow")
-        self.tls_profile.configure_requests_session(self._session)
+        self.tls_profile.configure_requests_session(self._session.session)
         self.base_url = url
         self.auth_url = f"{self.base_url}/oauth_token.do"
         self.url = ""
@@ -379,6 +425,17 @@ def __init__(
         self.auth_data = None
         self.encoded_auth_data = None
         self.token = None
+        self.token_manager: OAuthTokenManager | None = None
+        # Guards the lazily built per-client helpers (mirror, sync store, flow
+        # cache, reference resolver): pooled clients are shared across threads.
+        self._helpers_lock = threading.RLock()
+        # Who this client acts as: the auth-identity digest of its pool key (see
+        # auth._resolve_client). Caches of ACL-filtered data are scoped by it.
+        self.identity = (
+            identity_digest(token)
+            if token
+            else identity_digest(username, password, client_id, client_secret)
+        )
         if token:
             self.token = token
             self.headers = {
@@ -394,27 +451,25 @@ def __init__(
                 "username": username,
                 "password": password,
             }
-            encoded_data_str = urlencode(self.auth_data)
-            response = None
+            self.token_manager = OAuthTokenManager(
+                session=self._session,
+                token_url=self.auth_url,
+                auth_data=self.auth_data,
+                auth_headers=self.auth_headers,
+                on_token=self._set_bearer_token,
+            )
             try:
-                response = self._session.post(
-                    url=self.auth_url,
-                    data=encoded_data_str,
-                    headers=self.auth_headers,
-                    timeout=30,
-                )
-                response = response.json()
-                self.token = response["access_token"]
+                self.token_manager.fetch()
             except Exception as e:
                 print(
-                    f"Error Authenticating with OAuth: \n\n{type(e).__name__}\n\nResponse: {response}",
+                    f"Error Authenticating with OAuth: \n\n{type(e).__name__}",
                     file=sys.stderr,
                 )
                 raise e
-            self.headers = {
-                "Authorization": f"Bearer {self.token}",
-                "Content-Type": "application/json",
-            }
+            # Retry a 401 once with a refreshed token, for every mixin's requests.
+            self._session.hooks["response"].append(self.token_manager.response_hook)
+            if background_token_refresh:
+                self.token_manager.start()
         elif username and password:
             user_pass = f"{username}:{password}".encode()
             user_pass_encoded = b64encode(user_pass).decode()
@@ -427,6 +482,17 @@ def __init__(
 
         self.url = f"{self.base_url}/api"
 
+        # Opt-in: concurrent GETs on this client share /now/v1/batch round trips.
+        self.micro_batch = MicroBatchConfig.resolve(micro_batch)
+        if self.micro_batch.enabled:
+            self._session.batcher = MicroBatcher(
+                self.micro_batch,
+                self.base_url,
+                send_batch=self.batch_request,
+                send_direct=functools.partial(self._session._send, "get"),
+                retry_statuses=self._session.retry_policy.retry_statuses,
+            )
+
         # NOTE: no eager connectivity probe here. This used to issue a GET
         # `{url}/api/subscribers` at construction time to fail fast on bad
         # auth/URL — but a client is built per-call via `Depends(get_client)`
@@ -440,3 +506,37 @@ def __init__(
         # the actual transport/auth failure is what the caller sees, instead
         # of a generic dependency-resolution error. Same fix already applied
         # in archivebox-api's `BaseApiClient.__init__`.
+
+    def _set_bearer_token(self, token: str) -> None:
+        """Install a newly issued OAuth access token on this client.
+
+        ``self.headers`` is updated in place so requests built from it afterwards
+        (on any thread) carry the new token.
+        """
+        self.token = token
+        if self.headers is None:
+            self.headers = {
+                "Authorization": f"Bearer {token}",
+                "Content-Type": "application/json",
+            }
+        else:
+            self.headers["Authorization"] = f"Bearer {token}"
+
+    def _parse_records(
+        self, model: Any, rows: list[dict[str, Any]], result_mode: str | None = None
+    ) -> list[Any]:
+        """Build a list endpoint's result in the call's or the client's result mode."""
+        return parse_records(model, rows, result_mode or self.result_mode)
+
+    @property
+    def token_expires_at(self) -> float | None:
+        """Wall-clock expiry of the OAuth access token, if known."""
+        if self.token_manager is None:
+            return None
+        return self.token_manager.expires_at
+
+    def close(self) -> None:
+        """Stop token refresh and release pooled connections held by this client."""
+        if self.token_manager is not None:
+            self.token_manager.stop()
+        self._session.close()
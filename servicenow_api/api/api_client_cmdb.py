@@ -2,6 +2,7 @@
 
 import base64
 import gzip
+import io
 import json
 import sys
 from collections import defaultdict
@@ -14,6 +15,7 @@
 )
 from pydantic import ValidationError
 
+from servicenow_api.flows import FlowCrawler
 from servicenow_api.servicenow_models import (
     CMDB,
     CILifecycleActionRequest,
@@ -190,53 +192,68 @@ def get_reachable_subgraph(graph: FlowGraph, root_id: str) -> FlowGraph:
     )
 
 
-def find_connected_components(graph: FlowGraph) -> list[FlowGraph]:
+def find_connected_components(
+    graph: FlowGraph, drop_singletons: bool = False
+) -> list[FlowGraph]:
     """
     Splits a single large global FlowGraph into a list of smaller FlowGraphs,
     where each sub-graph represents a completely disconnected component of flows/subflows.
+
+    Components are found with a union-find over the edges. Every node and edge is then
+    assigned to its component in one pass, so the cost is linear in the size of the
+    graph. Components are returned in the order of their first node in ``graph.nodes``,
+    and each keeps the original order of its nodes and edges.
+
+    :param drop_singletons: Leave out components made of one node and no edges.
     """
     if not graph.nodes:
         return []
 
-    adj: defaultdict[str, list[str]] = defaultdict(list)
+    parent: dict[str, str] = {}
+    size: dict[str, int] = {}
+
+    def find(node_id: str) -> str:
+        parent.setdefault(node_id, node_id)
+        while parent[node_id] != node_id:
+            parent[node_id] = parent[parent[node_id]]
+            node_id = parent[node_id]
+        return node_id
+
     for edge in graph.edges:
-        adj[edge.from_id].append(edge.to_id)
-        adj[edge.to_id].append(edge.from_id)
+        a, b = find(edge.from_id), find(edge.to_id)
+        if a != b:
+            if size.get(a, 1) < size.get(b, 1):
+                a, b = b, a
+            parent[b] = a
+            size[a] = size.get(a, 1) + size.get(b, 1)
 
-    all_node_ids = {node.id for node in graph.nodes}
     node_by_id = {node.id: node for node in graph.nodes}
+    members: dict[str, tuple[list, list]] = {}
+    for node_id, node in node_by_id.items():
+        members.setdefault(find(node_id), ([], []))[0].append(node)
+    for edge in graph.edges:
+        component = members.get(find(edge.from_id))
+        if component is not None:
+            component[1].append(edge)
+
+    return [
+        FlowGraph(
+            nodes=sub_nodes,
+            edges=sub_edges,
+            summary=f"Component size: {len(sub_nodes)}",
+        )
+        for sub_nodes, sub_edges in members.values()
+        if not (drop_singletons and len(sub_nodes) == 1 and not sub_edges)
+    ]
 
-    visited: set[str] = set()
-    components: list[FlowGraph] = []
-
-    for start_node in all_node_ids:
-        if start_node not in visited:
-            component_nodes: set[str] = set()
-            stack = [start_node]
-            while stack:
-                curr = stack.pop()
-                if curr not in component_nodes:
-                    component_nodes.add(curr)
-                    visited.add(curr)
-                    for neighbor in adj[curr]:
-                        if neighbor not in component_nodes:
-                            stack.append(neighbor)
-
-            sub_nodes = [node_by_id[nid] for nid in component_nodes]
-            sub_edges = [
-                edge
-                for edge in graph.edges
-                if edge.from_id in component_nodes and edge.to_id in component_nodes
-            ]
-            components.append(
-                FlowGraph(
-                    nodes=sub_nodes,
-                    edges=sub_edges,
-                    summary=f"Component size: {len(sub_nodes)}",
-                )
-            )
 
-    return components
+#: Opening and closing brackets of each Mermaid node shape, by node type.
+_MERMAID_SHAPES = {
+    "trigger": ("((", "))"),
+    "decision": ("{{", "}}"),
+    "loop": ("[/", "/]"),
+    "subflow_call": ("[[", "]]"),
+}
 
 
 def graph_to_mermaid_multi(
@@ -244,55 +261,52 @@ def graph_to_mermaid_multi(
     root_sys_ids: list[str],
     all_metadata: dict[str, dict[str, Any]] = None,
 ) -> str:
-    lines = ["flowchart TD"]
+    """
+    Render a flow graph as a Mermaid flowchart with one subgraph per root flow.
 
+    Nodes are grouped under their ``root_<sys_id[:8]>_`` prefix in a single pass and
+    the lines are streamed into one buffer, so the cost grows linearly with the number
+    of nodes and edges instead of with nodes × roots.
+    """
+    prefixes = {f"root_{rid[:8]}_" for rid in root_sys_ids}
+    lengths = sorted({len(p) for p in prefixes})
+    by_prefix: dict[str, list[str]] = {p: [] for p in prefixes}
+    loose: list[str] = []
+    for node in graph.nodes:
+        opening, closing = _MERMAID_SHAPES.get(node.type, ("[", "]"))
+        line = f"{node.id}{opening}{sanitize_mermaid_label(node.label)}{closing}"
+        matched = False
+        for length in lengths:
+            if len(node.id) < length:
+                break
+            group = by_prefix.get(node.id[:length])
+            if group is not None:
+                group.append(line)
+                matched = True
+        if not matched:
+            loose.append(line)
+
+    out = io.StringIO()
+    out.write("flowchart TD")
     for root_id in root_sys_ids:
-        root_prefix = f"root_{root_id[:8]}_"
-
-        has_nodes = any(
-            node.id.startswith(root_prefix)
-            or node.id == f"root_{root_id[:8]}_trigger_{root_id[:8]}"
-            for node in graph.nodes
-        )
-        if not has_nodes:
+        group = by_prefix[f"root_{root_id[:8]}_"]
+        if not group:
             continue
-
         meta = (all_metadata or {}).get(root_id, {})
         flow_name = meta.get("name", root_id)
-        lines.append(f'    subgraph "{flow_name} ({root_id})"')
-        for node in graph.nodes:
-            if (
-                node.id.startswith(root_prefix)
-                or node.id == f"root_{root_id[:8]}_trigger_{root_id[:8]}"
-            ):
-                label = sanitize_mermaid_label(node.label)
-                shape_map = {
-                    "trigger": f"(({label}))",
-                    "decision": f"{{{{{label}}}}}",
-                    "loop": f"[/{label}/]",
-                    "subflow_call": f"[[{label}]]",
-                }
-                shape = shape_map.get(node.type, f"[{label}]")
-                lines.append(f"        {node.id}{shape}")
-        lines.append("    end")
+        out.write(f'\n    subgraph "{flow_name} ({root_id})"')
+        for line in group:
+            out.write(f"\n        {line}")
+        out.write("\n    end")
 
-    for node in graph.nodes:
-        if not any(node.id.startswith(f"root_{rid[:8]}_") for rid in root_sys_ids):
-            label = sanitize_mermaid_label(node.label)
-            shape_map = {
-                "trigger": f"(({label}))",
-                "decision": f"{{{{{label}}}}}",
-                "loop": f"[/{label}/]",
-                "subflow_call": f"[[{label}]]",
-            }
-            shape = shape_map.get(node.type, f"[{label}]")
-            lines.append(f"    {node.id}{shape}")
+    for line in loose:
+        out.write(f"\n    {line}")
 
     for edge in graph.edges:
         label = f" |{edge.label}|" if edge.label else ""
-        lines.append(f"    {edge.from_id} -->{label} {edge.to_id}")
+        out.write(f"\n    {edge.from_id} -->{label} {edge.to_id}")
 
-    return "\n".join(lines)
+    return out.getvalue()
 
 
 def build_polished_markdown(
@@ -1039,7 +1053,40 @@ def collect_graph_for_roots(
         root_sys_ids: list[str],
         max_depth: int = 5,
         initial_metadata: dict[str, dict[str, Any]] = None,
+        workers: int = 4,
+        crawler: FlowCrawler | None = None,
     ) -> tuple[FlowGraph, dict[str, dict[str, Any]]]:
+        """
+        Build the graph of the given root flows and the subflows they call.
+
+        Flow metadata and actions are loaded breadth-first, one depth level at a time,
+        with batched ``sys_idIN``/``flowIN`` queries (see :mod:`servicenow_api.flows`);
+        the graph is then assembled depth-first from the loaded data. Metadata, actions
+        and decoded action values are memoized for the crawl; pass a ``crawler`` to
+        read its hit/miss stats afterwards.
+
+        :param root_sys_ids: sys_ids of the root flows.
+        :type root_sys_ids: list[str]
+        :param max_depth: Maximum subflow depth followed.
+        :type max_depth: int
+        :param initial_metadata: Metadata already read for the roots, by sys_id.
+        :type initial_metadata: dict
+        :param workers: Query chunks read concurrently per level.
+        :type workers: int
+        :param crawler: Crawler to load with; a new one (using ``workers``) by default.
+        :type crawler: FlowCrawler
+
+        :return: The flow graph and the metadata of every flow in it.
+        :rtype: tuple[FlowGraph, dict]
+        """
+        if crawler is None:
+            crawler = FlowCrawler(
+                self, decode_values, find_subflow_sys_id, workers=workers
+            )
+        crawler.crawl(
+            root_sys_ids, max_depth=max_depth, known_metadata=initial_metadata
+        )
+
         all_nodes: list[FlowNode] = []
         all_edges: list[FlowEdge] = []
         visited: dict[str, str] = {}
@@ -1064,7 +1111,7 @@ def recurse(
             if flow_sys_id in all_metadata:
                 meta = all_metadata[flow_sys_id]
             else:
-                meta = self.get_flow_metadata(flow_sys_id)
+                meta = crawler.metadata(flow_sys_id)
                 if meta:
                     all_metadata[flow_sys_id] = meta
 
@@ -1074,27 +1121,7 @@ def recurse(
 
             flow_name = meta.get("name", "Unnamed")
 
-            actions = []
-            for tbl in ["sys_hub_action_instance_v2", "sys_hub_action_instance"]:
-                resp = self.get_table(
-                    table=tbl,
-                    sysparm_query=f"flow={flow_sys_id}^ORDERBYorder",
-                    sysparm_fields="sys_id,name,order,values,action,action_type,comment,display_text",
-                    sysparm_limit=500,
-                    sysparm_display_value="true",
-                )
-                if resp.response.ok:
-                    results = resp.response.json().get("result", [])
-                    if results:
-                        actions = results if isinstance(results, list) else [results]
-                        logger.debug(
-                            f"Found {len(actions)} actions for flow {flow_sys_id} in table {tbl}"
-                        )
-                        break
-                else:
-                    logger.warning(
-                        f"Failed fetching actions from table {tbl} for flow {flow_sys_id}: {resp.response.status_code} - {resp.response.text}"
-                    )
+            actions = crawler.actions(flow_sys_id)
 
             nodes: list[FlowNode] = []
             edges: list[FlowEdge] = []
@@ -1121,7 +1148,7 @@ def recurse(
 
             for action in actions:
                 act_id = f"{prefix}{action.get('sys_id', '')}"
-                decoded = decode_values(action.get("values"))
+                decoded = crawler.decoded(action.get("values"))
                 node_type = determine_node_type(action, decoded)
 
                 step_name = action.get("name", "")
@@ -1167,7 +1194,7 @@ def recurse(
 
                 sub_id = find_subflow_sys_id(decoded)
                 if sub_id:
-                    sub_meta = self.get_flow_metadata(sub_id)
+                    sub_meta = crawler.metadata(sub_id)
                     if sub_meta:
                         sub_name = sub_meta.get("name", "Unnamed Subflow")
                         label = f"{label} -> CALL SUBFLOW: {sub_name}"
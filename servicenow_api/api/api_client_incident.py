@@ -2,6 +2,7 @@
 
 import base64
 import gzip
+import io
 import json
 import sys
 from collections import defaultdict
@@ -14,6 +15,7 @@
 )
 from pydantic import ValidationError
 
+from servicenow_api.pagination import keyset_params, total_count
 from servicenow_api.servicenow_models import (
     FlowGraph,
     Incident,
@@ -184,53 +186,68 @@ def get_reachable_subgraph(graph: FlowGraph, root_id: str) -> FlowGraph:
     )
 
 
-def find_connected_components(graph: FlowGraph) -> list[FlowGraph]:
+def find_connected_components(
+    graph: FlowGraph, drop_singletons: bool = False
+) -> list[FlowGraph]:
     """
     Splits a single large global FlowGraph into a list of smaller FlowGraphs,
     where each sub-graph represents a completely disconnected component of flows/subflows.
+
+    Components are found with a union-find over the edges. Every node and edge is then
+    assigned to its component in one pass, so the cost is linear in the size of the
+    graph. Components are returned in the order of their first node in ``graph.nodes``,
+    and each keeps the original order of its nodes and edges.
+
+    :param drop_singletons: Leave out components made of one node and no edges.
     """
     if not graph.nodes:
         return []
 
-    adj: defaultdict[str, list[str]] = defaultdict(list)
+    parent: dict[str, str] = {}
+    size: dict[str, int] = {}
+
+    def find(node_id: str) -> str:
+        parent.setdefault(node_id, node_id)
+        while parent[node_id] != node_id:
+            parent[node_id] = parent[parent[node_id]]
+            node_id = parent[node_id]
+        return node_id
+
     for edge in graph.edges:
-        adj[edge.from_id].append(edge.to_id)
-        adj[edge.to_id].append(edge.from_id)
+        a, b = find(edge.from_id), find(edge.to_id)
+        if a != b:
+            if size.get(a, 1) < size.get(b, 1):
+                a, b = b, a
+            parent[b] = a
+            size[a] = size.get(a, 1) + size.get(b, 1)
 
-    all_node_ids = {node.id for node in graph.nodes}
     node_by_id = {node.id: node for node in graph.nodes}
+    members: dict[str, tuple[list, list]] = {}
+    for node_id, node in node_by_id.items():
+        members.setdefault(find(node_id), ([], []))[0].append(node)
+    for edge in graph.edges:
+        component = members.get(find(edge.from_id))
+        if component is not None:
+            component[1].append(edge)
+
+    return [
+        FlowGraph(
+            nodes=sub_nodes,
+            edges=sub_edges,
+            summary=f"Component size: {len(sub_nodes)}",
+        )
+        for sub_nodes, sub_edges in members.values()
+        if not (drop_singletons and len(sub_nodes) == 1 and not sub_edges)
+    ]
 
-    visited: set[str] = set()
-    components: list[FlowGraph] = []
-
-    for start_node in all_node_ids:
-        if start_node not in visited:
-            component_nodes: set[str] = set()
-            stack = [start_node]
-            while stack:
-                curr = stack.pop()
-                if curr not in component_nodes:
-                    component_nodes.add(curr)
-                    visited.add(curr)
-                    for neighbor in adj[curr]:
-                        if neighbor not in component_nodes:
-                            stack.append(neighbor)
-
-            sub_nodes = [node_by_id[nid] for nid in component_nodes]
-            sub_edges = [
-                edge
-                for edge in graph.edges
-                if edge.from_id in component_nodes and edge.to_id in component_nodes
-            ]
-            components.append(
-                FlowGraph(
-                    nodes=sub_nodes,
-                    edges=sub_edges,
-                    summary=f"Component size: {len(sub_nodes)}",
-                )
-            )
 
-    return components
+#: Opening and closing brackets of each Mermaid node shape, by node type.
+_MERMAID_SHAPES = {
+    "trigger": ("((", "))"),
+    "decision": ("{{", "}}"),
+    "loop": ("[/", "/]"),
+    "subflow_call": ("[[", "]]"),
+}
 
 
 def graph_to_mermaid_multi(
@@ -238,55 +255,52 @@ def graph_to_mermaid_multi(
     root_sys_ids: list[str],
     all_metadata: dict[str, dict[str, Any]] = None,
 ) -> str:
-    lines = ["flowchart TD"]
+    """
+    Render a flow graph as a Mermaid flowchart with one subgraph per root flow.
 
+    Nodes are grouped under their ``root_<sys_id[:8]>_`` prefix in a single pass and
+    the lines are streamed into one buffer, so the cost grows linearly with the number
+    of nodes and edges instead of with nodes × roots.
+    """
+    prefixes = {f"root_{rid[:8]}_" for rid in root_sys_ids}
+    lengths = sorted({len(p) for p in prefixes})
+    by_prefix: dict[str, list[str]] = {p: [] for p in prefixes}
+    loose: list[str] = []
+    for node in graph.nodes:
+        opening, closing = _MERMAID_SHAPES.get(node.type, ("[", "]"))
+        line = f"{node.id}{opening}{sanitize_mermaid_label(node.label)}{closing}"
+        matched = False
+        for length in lengths:
+            if len(node.id) < length:
+                break
+            group = by_prefix.get(node.id[:length])
+            if group is not None:
+                group.append(line)
+                matched = True
+        if not matched:
+            loose.append(line)
+
+    out = io.StringIO()
+    out.write("flowchart TD")
     for root_id in root_sys_ids:
-        root_prefix = f"root_{root_id[:8]}_"
-
-        has_nodes = any(
-            node.id.startswith(root_prefix)
-            or node.id == f"root_{root_id[:8]}_trigger_{root_id[:8]}"
-            for node in graph.nodes
-        )
-        if not has_nodes:
+        group = by_prefix[f"root_{root_id[:8]}_"]
+        if not group:
             continue
-
         meta = (all_metadata or {}).get(root_id, {})
         flow_name = meta.get("name", root_id)
-        lines.append(f'    subgraph "{flow_name} ({root_id})"')
-        for node in graph.nodes:
-            if (
-                node.id.startswith(root_prefix)
-                or node.id == f"root_{root_id[:8]}_trigger_{root_id[:8]}"
-            ):
-                label = sanitize_mermaid_label(node.label)
-                shape_map = {
-                    "trigger": f"(({label}))",
-                    "decision": f"{{{{{label}}}}}",
-                    "loop": f"[/{label}/]",
-                    "subflow_call": f"[[{label}]]",
-                }
-                shape = shape_map.get(node.type, f"[{label}]")
-                lines.append(f"        {node.id}{shape}")
-        lines.append("    end")
+        out.write(f'\n    subgraph "{flow_name} ({root_id})"')
+        for line in group:
+            out.write(f"\n        {line}")
+        out.write("\n    end")
 
-    for node in graph.nodes:
-        if not any(node.id.startswith(f"root_{rid[:8]}_") for rid in root_sys_ids):
-            label = sanitize_mermaid_label(node.label)
-            shape_map = {
-                "trigger": f"(({label}))",
-                "decision": f"{{{{{label}}}}}",
-                "loop": f"[/{label}/]",
-                "subflow_call": f"[[{label}]]",
-            }
-            shape = shape_map.get(node.type, f"[{label}]")
-            lines.append(f"    {node.id}{shape}")
+    for line in loose:
+        out.write(f"\n    {line}")
 
     for edge in graph.edges:
         label = f" |{edge.label}|" if edge.label else ""
-        lines.append(f"    {edge.from_id} -->{label} {edge.to_id}")
+        out.write(f"\n    {edge.from_id} -->{label} {edge.to_id}")
 
-    return "\n".join(lines)
+    return out.getvalue()
 
 
 def build_polished_markdown(
@@ -361,6 +375,34 @@ def build_polished_markdown(
 DEFAULT_INCIDENT_LIMIT = 50
 
 
+def incident_page_metadata(
+    params: dict[str, Any], limit_was_explicit: bool, returned: int, response: Any
+) -> tuple[bool, int | None]:
+    """
+    Work out ``(truncated, next_offset)`` for a page of ``get_incidents`` results.
+
+    Uses the ``X-Total-Count`` header when the instance sends it, otherwise treats a
+    full page under the default cap as truncated.
+    """
+    applied_limit = int(params["sysparm_limit"])
+    total_header = (getattr(response, "headers", None) or {}).get("X-Total-Count")
+    total_available = (
+        int(total_header)
+        if total_header is not None and str(total_header).isdigit()
+        else None
+    )
+    if total_available is not None:
+        truncated = total_available > returned
+    else:
+        truncated = not limit_was_explicit and returned >= applied_limit
+
+    next_offset = None
+    if truncated:
+        current_offset = int(params.get("sysparm_offset") or 0)
+        next_offset = current_offset + returned
+    return truncated, next_offset
+
+
 class ServiceNowApiIncident(ServiceNowApiBase):
     def get_incidents(self, **kwargs) -> Response:
         """
@@ -391,10 +433,23 @@ def get_incidents(self, **kwargs) -> Response:
         :type sysparm_suppress_pagination_header: bool
         :param sysparm_view: Display style ('desktop', 'mobile', or 'both').
         :type sysparm_view: str
+        :param pagination: 'offset' (default), 'keyset' (order by sys_id) or 'keyset_updated'
+            (order by sys_updated_on, sys_id).
+        :type pagination: str
+        :param cursor: ``next_cursor`` of the previous keyset page.
+        :type cursor: str
+        :param result_mode: ``"models"``, ``"dicts"`` (raw JSON rows, no validation) or
+            ``"lazy"`` (rows validated on access); defaults to the client's ``result_mode``.
+        :type result_mode: str
+        :param resolve_references: Fill in the ``display_value`` of reference fields from
+            the client's reference cache, fetching unknown ids in batches (see
+            :meth:`resolve_references`).
+        :type resolve_references: bool
 
         :return: Response containing list of parsed Pydantic models with information about the
             retrieved records, plus ``truncated``/``applied_limit``/``next_offset`` metadata
-            disclosing whether a default cap was applied and how to page past it.
+            disclosing whether a default cap was applied and how to page past it
+            (``next_cursor`` instead of ``next_offset`` in keyset mode).
         :rtype: Response
 
         :raises MissingParameterError: If table is not provided.
@@ -407,6 +462,7 @@ def get_incidents(self, **kwargs) -> Response:
             if not limit_was_explicit:
                 params["sysparm_limit"] = DEFAULT_INCIDENT_LIMIT
             applied_limit = int(params["sysparm_limit"])
+            params, keyset = keyset_params(params, incident.pagination, incident.cursor)
 
             response = self._session.get(
                 url=f"{self.url}/now/table/incident",
@@ -416,25 +472,21 @@ def get_incidents(self, **kwargs) -> Response:
             response.raise_for_status()
             json_response = response.json()
             result_data = json_response.get("result", json_response)
-            parsed_data = [Incident.model_validate(item) for item in result_data]
-
-            total_header = (getattr(response, "headers", None) or {}).get(
-                "X-Total-Count"
+            if incident.resolve_references:
+                self.resolve_references(result_data)
+            parsed_data = self._parse_records(
+                Incident, result_data, incident.result_mode
             )
-            total_available = (
-                int(total_header)
-                if total_header is not None and str(total_header).isdigit()
-                else None
-            )
-            if total_available is not None:
-                truncated = total_available > len(parsed_data)
-            else:
-                truncated = not limit_was_explicit and len(parsed_data) >= applied_limit
 
-            next_offset = None
-            if truncated:
-                current_offset = int(params.get("sysparm_offset") or 0)
-                next_offset = current_offset + len(parsed_data)
+            truncated, next_offset = incident_page_metadata(
+                params, limit_was_explicit, len(parsed_data), response
+            )
+            next_cursor = None
+            if keyset is not None:
+                next_cursor = keyset.next_cursor(
+                    result_data, total_count(response), applied_limit
+                )
+                next_offset = None
 
             return Response(
                 response=response,
@@ -442,6 +494,7 @@ def get_incidents(self, **kwargs) -> Response:
                 truncated=truncated,
                 applied_limit=applied_limit,
                 next_offset=next_offset,
+                next_cursor=next_cursor,
             )
         except ValidationError as ve:
             print(
@@ -44,6 +44,9 @@ def get_problems(self, **kwargs) -> Response:
         :type sysparm_suppress_pagination_header: bool
         :param sysparm_view: Display style ('desktop', 'mobile', or 'both').
         :type sysparm_view: str
+        :param result_mode: ``"models"``, ``"dicts"`` (raw JSON rows, no validation) or
+            ``"lazy"`` (rows validated on access); defaults to the client's ``result_mode``.
+        :type result_mode: str
 
         :return: Response containing list of parsed Pydantic models with information about the retrieved records.
         :rtype: Response
@@ -60,7 +63,7 @@ def get_problems(self, **kwargs) -> Response:
             response.raise_for_status()
             json_response = response.json()
             result_data = json_response.get("result", json_response)
-            parsed_data = [Problem.model_validate(item) for item in result_data]
+            parsed_data = self._parse_records(Problem, result_data, problem.result_mode)
             return Response(response=response, result=parsed_data)
         except ValidationError as ve:
             print(
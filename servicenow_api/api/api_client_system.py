@@ -2,13 +2,16 @@
 
 import base64
 import gzip
+import io
 import json
+import sqlite3
 import sys
 from collections import defaultdict
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Any
-from urllib.parse import urlencode
 
 from agent_utilities.base_utilities import get_logger
 from agent_utilities.core.exceptions import (
@@ -17,9 +20,47 @@
 )
 from pydantic import ValidationError
 
+from servicenow_api.bulk import (
+    DEFAULT_BULK_ATTEMPTS,
+    BulkOperation,
+    BulkWriter,
+    BulkWriteResult,
+)
+from servicenow_api.choices import ChoiceCache, shared_choice_cache
+from servicenow_api.columnar import (
+    DEFAULT_ROW_GROUP_SIZE,
+    ArrowBatchWriter,
+    ColumnarExportResult,
+)
+from servicenow_api.flows import (
+    FLOW_FIELDS,
+    FlowCache,
+    FlowCrawler,
+    flow_cache_enabled,
+    flow_metadata,
+)
+from servicenow_api.lookup import (
+    MAX_URL_LENGTH,
+    RecordsResult,
+    chunk_in_query,
+    record_key,
+    unique_ids,
+)
+from servicenow_api.mirror import MirrorMiss, TableMirror, configured_tables
+from servicenow_api.ndjson import NdjsonExportResult, export_ndjson
+from servicenow_api.pagination import (
+    DEFAULT_PAGE_SIZE,
+    PaginationProgress,
+    TableIterator,
+    TablePage,
+    keyset_params,
+    pagination_strategy,
+    total_count,
+)
+from servicenow_api.partitioning import PartitionedExport, and_condition
+from servicenow_api.references import ReferenceResolver
 from servicenow_api.servicenow_models import (
     AggregateModel,
-    Authentication,
     EmailModel,
     FlowGraph,
     FlowReportResult,
@@ -27,6 +68,9 @@
     Table,
     TableModel,
 )
+from servicenow_api.streaming import stream_records
+from servicenow_api.sync import SyncResult, SyncStore, TableSync
+from servicenow_api.token_manager import OAuthTokenManager
 
 logger = get_logger(__name__)
 
@@ -191,53 +235,68 @@ def get_reachable_subgraph(graph: FlowGraph, root_id: str) -> FlowGraph:
     )
 
 
-def find_connected_components(graph: FlowGraph) -> list[FlowGraph]:
+def find_connected_components(
+    graph: FlowGraph, drop_singletons: bool = False
+) -> list[FlowGraph]:
     """
     Splits a single large global FlowGraph into a list of smaller FlowGraphs,
     where each sub-graph represents a completely disconnected component of flows/subflows.
+
+    Components are found with a union-find over the edges. Every node and edge is then
+    assigned to its component in one pass, so the cost is linear in the size of the
+    graph. Components are returned in the order of their first node in ``graph.nodes``,
+    and each keeps the original order of its nodes and edges.
+
+    :param drop_singletons: Leave out components made of one node and no edges.
     """
     if not graph.nodes:
         return []
 
-    adj: defaultdict[str, list[str]] = defaultdict(list)
+    parent: dict[str, str] = {}
+    size: dict[str, int] = {}
+
+    def find(node_id: str) -> str:
+        parent.setdefault(node_id, node_id)
+        while parent[node_id] != node_id:
+            parent[node_id] = parent[parent[node_id]]
+            node_id = parent[node_id]
+        return node_id
+
     for edge in graph.edges:
-        adj[edge.from_id].append(edge.to_id)
-        adj[edge.to_id].append(edge.from_id)
+        a, b = find(edge.from_id), find(edge.to_id)
+        if a != b:
+            if size.get(a, 1) < size.get(b, 1):
+                a, b = b, a
+            parent[b] = a
+            size[a] = size.get(a, 1) + size.get(b, 1)
 
-    all_node_ids = {node.id for node in graph.nodes}
     node_by_id = {node.id: node for node in graph.nodes}
+    members: dict[str, tuple[list, list]] = {}
+    for node_id, node in node_by_id.items():
+        members.setdefault(find(node_id), ([], []))[0].append(node)
+    for edge in graph.edges:
+        component = members.get(find(edge.from_id))
+        if component is not None:
+            component[1].append(edge)
+
+    return [
+        FlowGraph(
+            nodes=sub_nodes,
+            edges=sub_edges,
+            summary=f"Component size: {len(sub_nodes)}",
+        )
+        for sub_nodes, sub_edges in members.values()
+        if not (drop_singletons and len(sub_nodes) == 1 and not sub_edges)
+    ]
 
-    visited: set[str] = set()
-    components: list[FlowGraph] = []
-
-    for start_node in all_node_ids:
-        if start_node not in visited:
-            component_nodes: set[str] = set()
-            stack = [start_node]
-            while stack:
-                curr = stack.pop()
-                if curr not in component_nodes:
-                    component_nodes.add(curr)
-                    visited.add(curr)
-                    for neighbor in adj[curr]:
-                        if neighbor not in component_nodes:
-                            stack.append(neighbor)
-
-            sub_nodes = [node_by_id[nid] for nid in component_nodes]
-            sub_edges = [
-                edge
-                for edge in graph.edges
-                if edge.from_id in component_nodes and edge.to_id in component_nodes
-            ]
-            components.append(
-                FlowGraph(
-                    nodes=sub_nodes,
-                    edges=sub_edges,
-                    summary=f"Component size: {len(sub_nodes)}",
-                )
-            )
 
-    return components
+#: Opening and closing brackets of each Mermaid node shape, by node type.
+_MERMAID_SHAPES = {
+    "trigger": ("((", "))"),
+    "decision": ("{{", "}}"),
+    "loop": ("[/", "/]"),
+    "subflow_call": ("[[", "]]"),
+}
 
 
 def graph_to_mermaid_multi(
@@ -245,55 +304,52 @@ def graph_to_mermaid_multi(
     root_sys_ids: list[str],
     all_metadata: dict[str, dict[str, Any]] = None,
 ) -> str:
-    lines = ["flowchart TD"]
+    """
+    Render a flow graph as a Mermaid flowchart with one subgraph per root flow.
 
+    Nodes are grouped under their ``root_<sys_id[:8]>_`` prefix in a single pass and
+    the lines are streamed into one buffer, so the cost grows linearly with the number
+    of nodes and edges instead of with nodes × roots.
+    """
+    prefixes = {f"root_{rid[:8]}_" for rid in root_sys_ids}
+    lengths = sorted({len(p) for p in prefixes})
+    by_prefix: dict[str, list[str]] = {p: [] for p in prefixes}
+    loose: list[str] = []
+    for node in graph.nodes:
+        opening, closing = _MERMAID_SHAPES.get(node.type, ("[", "]"))
+        line = f"{node.id}{opening}{sanitize_mermaid_label(node.label)}{closing}"
+        matched = False
+        for length in lengths:
+            if len(node.id) < length:
+                break
+            group = by_prefix.get(node.id[:length])
+            if group is not None:
+                group.append(line)
+                matched = True
+        if not matched:
+            loose.append(line)
+
+    out = io.StringIO()
+    out.write("flowchart TD")
     for root_id in root_sys_ids:
-        root_prefix = f"root_{root_id[:8]}_"
-
-        has_nodes = any(
-            node.id.startswith(root_prefix)
-            or node.id == f"root_{root_id[:8]}_trigger_{root_id[:8]}"
-            for node in graph.nodes
-        )
-        if not has_nodes:
+        group = by_prefix[f"root_{root_id[:8]}_"]
+        if not group:
             continue
-
         meta = (all_metadata or {}).get(root_id, {})
         flow_name = meta.get("name", root_id)
-        lines.append(f'    subgraph "{flow_name} ({root_id})"')
-        for node in graph.nodes:
-            if (
-                node.id.startswith(root_prefix)
-                or node.id == f"root_{root_id[:8]}_trigger_{root_id[:8]}"
-            ):
-                label = sanitize_mermaid_label(node.label)
-                shape_map = {
-                    "trigger": f"(({label}))",
-                    "decision": f"{{{{{label}}}}}",
-                    "loop": f"[/{label}/]",
-                    "subflow_call": f"[[{label}]]",
-                }
-                shape = shape_map.get(node.type, f"[{label}]")
-                lines.append(f"        {node.id}{shape}")
-        lines.append("    end")
+        out.write(f'\n    subgraph "{flow_name} ({root_id})"')
+        for line in group:
+            out.write(f"\n        {line}")
+        out.write("\n    end")
 
-    for node in graph.nodes:
-        if not any(node.id.startswith(f"root_{rid[:8]}_") for rid in root_sys_ids):
-            label = sanitize_mermaid_label(node.label)
-            shape_map = {
-                "trigger": f"(({label}))",
-                "decision": f"{{{{{label}}}}}",
-                "loop": f"[/{label}/]",
-                "subflow_call": f"[[{label}]]",
-            }
-            shape = shape_map.get(node.type, f"[{label}]")
-            lines.append(f"    {node.id}{shape}")
+    for line in loose:
+        out.write(f"\n    {line}")
 
     for edge in graph.edges:
         label = f" |{edge.label}|" if edge.label else ""
-        lines.append(f"    {edge.from_id} -->{label} {edge.to_id}")
+        out.write(f"\n    {edge.from_id} -->{label} {edge.to_id}")
 
-    return "\n".join(lines)
+    return out.getvalue()
 
 
 def build_polished_markdown(
@@ -369,6 +425,11 @@ def refresh_auth_token(self) -> Response:
         :return:
         Response with new refreshed token.
 
+        Uses the ``refresh_token`` issued with the current access token (falling back
+        to the original grant when none was issued), and installs the new token on
+        this client. Tokens are normally renewed automatically ahead of expiry by
+        the client's :class:`~servicenow_api.token_manager.OAuthTokenManager`.
+
         :raises MissingParameterError: If the client was authenticated without OAuth
             client credentials (e.g. basic auth or a bearer token), so there is no
             client_id/client_secret to refresh with.
@@ -379,25 +440,19 @@ def refresh_auth_token(self) -> Response:
                 "(SERVICENOW_CLIENT_ID/SERVICENOW_CLIENT_SECRET) — not available "
                 "when authenticated via basic auth or a bearer token."
             )
-        refresh_data = {
-            "grant_type": "refresh_token",
-            "client_id": self.auth_data["client_id"],
-            "client_secret": self.auth_data["client_secret"],
-            "refresh_token": self.token,
-        }
-        encoded_data_str = urlencode(refresh_data)
+        if self.token_manager is None:
+            self.token_manager = OAuthTokenManager(
+                session=self._session,
+                token_url=self.auth_url,
+                auth_data=self.auth_data,
+                auth_headers=self.auth_headers,
+                on_token=self._set_bearer_token,
+            )
         try:
-            response = self._session.post(
-                url=self.auth_url,
-                data=encoded_data_str,
-                headers=self.auth_headers,
-                timeout=30,
+            parsed_data = self.token_manager.force_refresh()
+            return Response(
+                response=self.token_manager.last_response, result=parsed_data
             )
-            response.raise_for_status()
-            json_response = response.json()
-            self.token = json_response["access_token"]
-            parsed_data = Authentication.model_validate(json_response)
-            return Response(response=response, result=parsed_data)
         except ValidationError:
             print("Invalid response data", file=sys.stderr)
             raise
@@ -474,8 +529,21 @@ def get_table(self, **kwargs) -> Response:
         :type sysparm_suppress_pagination_header: bool
         :param sysparm_view: Display style ('desktop', 'mobile', or 'both').
         :type sysparm_view: str
-
-        :return: Response containing list of parsed Pydantic models with information about the retrieved records.
+        :param pagination: 'offset' (default), 'keyset' (order by sys_id) or 'keyset_updated'
+            (order by sys_updated_on, sys_id). Keyset pages cost the same at any depth.
+        :type pagination: str
+        :param cursor: ``next_cursor`` of the previous keyset page.
+        :type cursor: str
+        :param result_mode: ``"models"``, ``"dicts"`` (raw JSON rows, no validation) or
+            ``"lazy"`` (rows validated on access); defaults to the client's ``result_mode``.
+        :type result_mode: str
+        :param resolve_references: Fill in the ``display_value`` of reference fields from
+            the client's reference cache, fetching unknown ids in batches (see
+            :meth:`resolve_references`).
+        :type resolve_references: bool
+
+        :return: Response containing list of parsed Pydantic models with information about the
+            retrieved records; in keyset mode ``next_cursor`` is set while more records remain.
         :rtype: Response
 
         :raises MissingParameterError: If table is not provided.
@@ -485,16 +553,597 @@ def get_table(self, **kwargs) -> Response:
             table_model = TableModel(**kwargs)
             if table_model.table is None:
                 raise MissingParameterError
+            params, keyset = keyset_params(
+                table_model.api_parameters, table_model.pagination, table_model.cursor
+            )
             response = self._session.get(
                 url=f"{self.url}/now/table/{table_model.table}",
-                params=table_model.api_parameters,
+                params=params,
                 headers=self.headers,
             )
             response.raise_for_status()
             json_response = response.json()
             result_data = json_response.get("result", json_response)
-            parsed_data = [Table.model_validate(item) for item in result_data]
-            return Response(response=response, result=parsed_data)
+            next_cursor = (
+                keyset.next_cursor(
+                    result_data, total_count(response), params.get("sysparm_limit")
+                )
+                if keyset is not None
+                else None
+            )
+            if table_model.resolve_references:
+                self.resolve_references(result_data)
+            parsed_data = self._parse_records(
+                Table, result_data, table_model.result_mode
+            )
+            return Response(
+                response=response, result=parsed_data, next_cursor=next_cursor
+            )
+        except ValidationError as ve:
+            print(
+                f"Invalid parameters or response data: {ve.errors()}", file=sys.stderr
+            )
+            raise
+        except Exception as e:
+            print(f"Operation failed: {type(e).__name__}", file=sys.stderr)
+            raise
+
+    def _fetch_table_page(
+        self, table: str, params: dict[str, Any], stream: bool = False
+    ) -> TablePage:
+        """GET one page of raw records from a table, with its ``X-Total-Count``.
+
+        With ``stream`` the records are decoded while the body downloads.
+        """
+        response = self._session.get(
+            url=f"{self.url}/now/table/{table}",
+            params=params,
+            headers=self.headers,
+            stream=stream,
+        )
+        response.raise_for_status()
+        if stream:
+            return TablePage(
+                records=stream_records(response), total=total_count(response)
+            )
+        json_response = response.json()
+        records = json_response.get("result", json_response)
+        return TablePage(records=records, total=total_count(response))
+
+    def iter_table(
+        self,
+        table: str,
+        query: str | None = None,
+        fields: str | list[str] | None = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+        on_progress: Callable[[PaginationProgress], None] | None = None,
+        pagination: str = "offset",
+        cursor: str | None = None,
+        stream: bool = False,
+        **kwargs,
+    ) -> TableIterator:
+        """
+        Iterate over every record of a table matching a query, page by page.
+
+        Records are yielded lazily as :class:`Table` models; only the page being
+        consumed and the prefetched next page are held in memory.
+
+        :param table: The name of the table.
+        :type table: str
+        :param query: Encoded query string for filtering records.
+        :type query: str
+        :param fields: Field names to return (comma-separated string or list).
+        :type fields: str | list[str]
+        :param page_size: Records requested per page.
+        :type page_size: int
+        :param prefetch: Fetch the next page in the background while the current one is consumed.
+        :type prefetch: bool
+        :param on_progress: Called with a :class:`PaginationProgress` after every page.
+        :type on_progress: Callable
+        :param pagination: 'offset', 'keyset' (order by sys_id) or 'keyset_updated'
+            (order by sys_updated_on, sys_id). Keyset paging keeps the cost per page flat
+            and does not skip or repeat rows when the table changes during the walk.
+        :type pagination: str
+        :param cursor: Resume a keyset walk after this cursor (``TableIterator.cursor``).
+        :type cursor: str
+        :param stream: Decode each page while it downloads and yield records as they
+            arrive, holding about one record instead of a page; disables prefetch.
+        :type stream: bool
+        :param kwargs: Other :meth:`get_table` parameters; ``sysparm_offset`` sets the
+            starting offset and ``sysparm_limit`` caps the total records yielded.
+
+        :return: Iterator of Table records exposing ``total``, ``fetched``, ``progress``
+            and, in keyset mode, ``cursor``.
+        :rtype: TableIterator
+
+        :raises MissingParameterError: If table is not provided.
+        :raises ParameterError: If input parameters are invalid.
+        """
+        try:
+            if isinstance(fields, (list, tuple)):
+                fields = ",".join(fields)
+            table_model = TableModel(
+                table=table, sysparm_query=query, sysparm_fields=fields, **kwargs
+            )
+            if table_model.table is None:
+                raise MissingParameterError
+            params = dict(table_model.api_parameters)
+            max_records = params.pop("sysparm_limit", None)
+            start = int(params.pop("sysparm_offset", 0) or 0)
+            return TableIterator(
+                lambda page_params: self._fetch_table_page(
+                    table_model.table, page_params, stream=stream
+                ),
+                params,
+                page_size=page_size,
+                parse=Table.model_validate,
+                prefetch=prefetch,
+                on_progress=on_progress,
+                max_records=int(max_records) if max_records is not None else None,
+                strategy=pagination_strategy(pagination, cursor, start),
+                table=table_model.table,
+            )
+        except ValidationError as ve:
+            print(
+                f"Invalid parameters or response data: {ve.errors()}", file=sys.stderr
+            )
+            raise
+        except Exception as e:
+            print(f"Operation failed: {type(e).__name__}", file=sys.stderr)
+            raise
+
+    def export_table(
+        self,
+        table: str,
+        query: str | None = None,
+        fields: str | list[str] | None = None,
+        workers: int = 4,
+        partitioning: str = "sys_id",
+        partitions: int | None = None,
+        ordered: bool = False,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        state_path: str | None = None,
+        on_progress: Callable[[PaginationProgress], None] | None = None,
+        **kwargs,
+    ) -> PartitionedExport:
+        """
+        Read a whole table with several workers, each owning a disjoint partition.
+
+        Workers share this client's connection pool and rate limiter; ``workers`` is
+        capped at the transport's ``pool_maxsize``.
+
+        :param table: The name of the table.
+        :type table: str
+        :param query: Encoded query string for filtering records.
+        :type query: str
+        :param fields: Field names to return (comma-separated string or list).
+        :type fields: str | list[str]
+        :param workers: Partitions read concurrently.
+        :type workers: int
+        :param partitioning: 'sys_id' (hex prefix ranges, keyset paged) or 'offset'
+            (windows sized from X-Total-Count).
+        :type partitioning: str
+        :param partitions: Number of partitions; defaults to ``workers``.
+        :type partitions: int
+        :param ordered: Yield partition by partition (sys_id order for 'sys_id')
+            instead of as pages arrive.
+        :type ordered: bool
+        :param page_size: Records requested per page.
+        :type page_size: int
+        :param state_path: JSON checkpoint file; an existing one resumes unfinished partitions.
+        :type state_path: str
+        :param on_progress: Called with a :class:`PaginationProgress` after every page.
+        :type on_progress: Callable
+        :param kwargs: Other :meth:`get_table` parameters (e.g. ``sysparm_display_value``).
+
+        :return: Iterator of Table records; ``state`` holds per-partition progress.
+        :rtype: PartitionedExport
+
+        :raises MissingParameterError: If table is not provided.
+        :raises ParameterError: If input parameters are invalid.
+        :raises PartitionExportError: After the stream ends, if any partition failed.
+        """
+        try:
+            if isinstance(fields, (list, tuple)):
+                fields = ",".join(fields)
+            table_model = TableModel(
+                table=table, sysparm_query=query, sysparm_fields=fields, **kwargs
+            )
+            if table_model.table is None:
+                raise MissingParameterError
+            pool_size = self.transport.pool_maxsize
+            if workers > pool_size:
+                logger.info(
+                    "Capping export workers at the connection pool size (%s)",
+                    pool_size,
+                )
+                workers = pool_size
+            return PartitionedExport(
+                lambda page_params: self._fetch_table_page(
+                    table_model.table, page_params
+                ),
+                table_model.table,
+                dict(table_model.api_parameters),
+                workers=workers,
+                partitioning=partitioning,
+                partitions=partitions,
+                ordered=ordered,
+                page_size=page_size,
+                parse=Table.model_validate,
+                state_path=state_path,
+                on_progress=on_progress,
+            )
+        except ValidationError as ve:
+            print(
+                f"Invalid parameters or response data: {ve.errors()}", file=sys.stderr
+            )
+            raise
+        except Exception as e:
+            print(f"Operation failed: {type(e).__name__}", file=sys.stderr)
+            raise
+
+    def export_table_columnar(
+        self,
+        table: str,
+        path: str,
+        query: str | None = None,
+        fields: str | list[str] | None = None,
+        format: str = "parquet",
+        schema: Any = None,
+        dictionary_fields: list[str] | None = None,
+        row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+        compression: str | None = "zstd",
+        page_size: int = DEFAULT_PAGE_SIZE,
+        on_progress: Callable[[PaginationProgress], None] | None = None,
+        stream: bool = False,
+        **kwargs,
+    ) -> ColumnarExportResult:
+        """
+        Stream a table straight into a Parquet or Feather file.
+
+        Pages are walked with keyset pagination and appended column-wise to Arrow
+        record batches without building a :class:`Table` model per row; see
+        :mod:`servicenow_api.columnar`. Requires the ``arrow`` extra (pyarrow).
+
+        :param table: The name of the table.
+        :type table: str
+        :param path: Output file.
+        :type path: str
+        :param query: Encoded query string for filtering records.
+        :type query: str
+        :param fields: Field names to export, in column order (comma-separated string or list).
+        :type fields: str | list[str]
+        :param format: 'parquet' or 'feather'.
+        :type format: str
+        :param schema: Column types, as a pyarrow schema or ``{field: type}`` with pyarrow
+            types or names ('string', 'dictionary', 'int64', 'float64', 'bool', 'timestamp',
+            'date'); other columns are inferred from the first page.
+        :type schema: pyarrow.Schema | dict
+        :param dictionary_fields: Columns to dictionary-encode; by default choice/reference
+            columns such as state, priority and assignment_group plus low-cardinality ones.
+        :type dictionary_fields: list[str]
+        :param row_group_size: Rows per Parquet row group / Feather record batch.
+        :type row_group_size: int
+        :param compression: Codec ('zstd', 'snappy', 'lz4'...) or None.
+        :type compression: str
+        :param page_size: Records requested per page.
+        :type page_size: int
+        :param on_progress: Called with a :class:`PaginationProgress` after every page.
+        :type on_progress: Callable
+        :param stream: Decode pages while they download instead of buffering each body.
+        :type stream: bool
+        :param kwargs: Other :meth:`get_table` parameters; ``sysparm_limit`` caps the
+            rows exported and ``sysparm_display_value`` may be 'true' or 'false'.
+
+        :return: Rows, row groups, file size and the dictionary-encoded columns.
+        :rtype: ColumnarExportResult
+
+        :raises MissingParameterError: If table is not provided.
+        :raises ParameterError: If input parameters are invalid.
+        :raises ImportError: If pyarrow is not installed.
+        """
+        try:
+            if isinstance(fields, str):
+                fields = [f.strip() for f in fields.split(",") if f.strip()]
+            table_model = TableModel(
+                table=table,
+                sysparm_query=query,
+                sysparm_fields=",".join(fields) if fields else None,
+                sysparm_exclude_reference_link=True,
+                **kwargs,
+            )
+            if table_model.table is None:
+                raise MissingParameterError
+            if table_model.sysparm_display_value == "all":
+                raise ParameterError(
+                    "Columnar export needs one value per cell; use "
+                    "sysparm_display_value 'true' or 'false'"
+                )
+            params = dict(table_model.api_parameters)
+            max_records = params.pop("sysparm_limit", None)
+            rows = TableIterator(
+                lambda page_params: self._fetch_table_page(
+                    table_model.table, page_params, stream=stream
+                ),
+                params,
+                page_size=page_size,
+                on_progress=on_progress,
+                max_records=int(max_records) if max_records is not None else None,
+                strategy=pagination_strategy("keyset", None, 0),
+                table=table_model.table,
+            )
+            with ArrowBatchWriter(
+                path,
+                format=format,
+                schema=schema,
+                fields=fields,
+                dictionary_fields=dictionary_fields,
+                row_group_size=row_group_size,
+                compression=compression,
+            ) as writer:
+                page: list[dict[str, Any]] = []
+                for record in rows:
+                    page.append(record)
+                    if len(page) >= page_size:
+                        writer.write(page)
+                        page = []
+                writer.write(page)
+            return writer.result
+        except ValidationError as ve:
+            print(
+                f"Invalid parameters or response data: {ve.errors()}", file=sys.stderr
+            )
+            raise
+        except Exception as e:
+            print(f"Operation failed: {type(e).__name__}", file=sys.stderr)
+            raise
+
+    def export_table_ndjson(
+        self,
+        table: str,
+        path: str,
+        query: str | None = None,
+        fields: str | list[str] | None = None,
+        compression: str | None = None,
+        pagination: str = "keyset",
+        page_size: int = DEFAULT_PAGE_SIZE,
+        resume: bool = True,
+        on_progress: Callable[[PaginationProgress], None] | None = None,
+        stream: bool = False,
+        **kwargs,
+    ) -> NdjsonExportResult:
+        """
+        Stream a table to newline-delimited JSON, resuming an interrupted export.
+
+        Records are written as pages arrive, one gzip member / zstd frame per page,
+        and at most one page is held in memory. With ``resume`` a checkpoint
+        (``<path>.checkpoint.json``) stores the last cursor or offset and the file size
+        after each page; see :func:`servicenow_api.ndjson.export_ndjson`.
+
+        :param table: The name of the table.
+        :type table: str
+        :param path: Output file.
+        :type path: str
+        :param query: Encoded query string for filtering records.
+        :type query: str
+        :param fields: Field names to return (comma-separated string or list).
+        :type fields: str | list[str]
+        :param compression: None, 'gzip' or 'zstd' (needs the ``zstd`` extra).
+        :type compression: str
+        :param pagination: 'keyset' (default), 'keyset_updated' or 'offset'.
+        :type pagination: str
+        :param page_size: Records requested per page.
+        :type page_size: int
+        :param resume: Checkpoint after every page and continue from an existing checkpoint.
+        :type resume: bool
+        :param on_progress: Called with a :class:`PaginationProgress` after every page.
+        :type on_progress: Callable
+        :param stream: Decode pages while they download, so not even one page is
+            buffered; records go to the file as they arrive.
+        :type stream: bool
+        :param kwargs: Other :meth:`get_table` parameters; ``sysparm_limit`` caps the
+            records exported and ``sysparm_offset`` sets the start of an offset walk.
+
+        :return: Records and bytes written, and whether the run resumed.
+        :rtype: NdjsonExportResult
+
+        :raises MissingParameterError: If table is not provided.
+        :raises ParameterError: If input parameters are invalid or the checkpoint
+            belongs to another export.
+        """
+        try:
+            if isinstance(fields, (list, tuple)):
+                fields = ",".join(fields)
+            table_model = TableModel(
+                table=table, sysparm_query=query, sysparm_fields=fields, **kwargs
+            )
+            if table_model.table is None:
+                raise MissingParameterError
+            params = dict(table_model.api_parameters)
+            max_records = params.pop("sysparm_limit", None)
+            return export_ndjson(
+                lambda page_params: self._fetch_table_page(
+                    table_model.table, page_params, stream=stream
+                ),
+                table_model.table,
+                params,
+                path,
+                compression=compression,
+                pagination=pagination,
+                page_size=page_size,
+                checkpoint_path=f"{path}.checkpoint.json" if resume else None,
+                max_records=int(max_records) if max_records is not None else None,
+                on_progress=on_progress,
+            )
+        except ValidationError as ve:
+            print(
+                f"Invalid parameters or response data: {ve.errors()}", file=sys.stderr
+            )
+            raise
+        except Exception as e:
+            print(f"Operation failed: {type(e).__name__}", file=sys.stderr)
+            raise
+
+    def sync_table(
+        self,
+        table: str,
+        query: str | None = None,
+        fields: str | list[str] | None = None,
+        on_records: Callable[[list[dict[str, Any]]], None] | None = None,
+        on_deletes: Callable[[list[str]], None] | None = None,
+        reconcile: bool | None = None,
+        full: bool = False,
+        store: SyncStore | None = None,
+        overlap_seconds: float | None = None,
+        reconcile_seconds: float | None = None,
+    ) -> SyncResult:
+        """
+        Incrementally sync a table: deliver only records changed since the last run.
+
+        The ``sys_updated_on`` watermark per (instance, table, query) is kept in a
+        SQLite :class:`SyncStore`; deletes are detected by a periodic ``sys_id``
+        reconciliation pass. See :class:`servicenow_api.sync.TableSync`.
+
+        :param table: The name of the table.
+        :type table: str
+        :param query: Encoded query selecting the synced records.
+        :type query: str
+        :param fields: Field names to read (``sys_id``/``sys_updated_on`` are added).
+        :type fields: str | list[str]
+        :param on_records: Receives each batch of new or updated raw records.
+        :type on_records: Callable
+        :param on_deletes: Receives sys_ids found deleted by reconciliation.
+        :type on_deletes: Callable
+        :param reconcile: Force or skip the delete reconciliation pass.
+        :type reconcile: bool
+        :param full: Ignore the watermark and re-read everything.
+        :type full: bool
+        :param store: Checkpoint store; one shared store at ``SERVICENOW_SYNC_DB`` by default.
+        :type store: SyncStore
+        :param overlap_seconds: Re-read window before the watermark.
+        :type overlap_seconds: float
+        :param reconcile_seconds: Minimum interval between reconciliation passes.
+        :type reconcile_seconds: float
+
+        :return: Counts of changed/unchanged records, deleted sys_ids and the new watermark.
+        :rtype: SyncResult
+
+        :raises ParameterError: If input parameters are invalid.
+        """
+        try:
+            if store is None:
+                with self._helpers_lock:
+                    if getattr(self, "_sync_store", None) is None:
+                        self._sync_store = SyncStore()
+                    store = self._sync_store
+            return TableSync(
+                self,
+                store=store,
+                overlap_seconds=overlap_seconds,
+                reconcile_seconds=reconcile_seconds,
+            ).sync(
+                table,
+                query=query,
+                fields=fields,
+                on_records=on_records,
+                on_deletes=on_deletes,
+                reconcile=reconcile,
+                full=full,
+            )
+        except Exception as e:
+            print(f"Operation failed: {type(e).__name__}", file=sys.stderr)
+            raise
+
+    def _get_mirror(self) -> TableMirror:
+        with self._helpers_lock:
+            if getattr(self, "_mirror", None) is None:
+                self._mirror = TableMirror(self)
+            return self._mirror
+
+    def mirror_table(
+        self,
+        table: str,
+        fields: str | list[str] | None = None,
+        full: bool = False,
+    ) -> SyncResult:
+        """
+        Materialise a table into the local mirror, or refresh it incrementally.
+
+        The mirror (``SERVICENOW_MIRROR_DB``) stores each record with raw and display
+        values and is kept fresh with :class:`~servicenow_api.sync.TableSync`; see
+        :class:`servicenow_api.mirror.TableMirror`.
+
+        :param table: The name of the table.
+        :type table: str
+        :param fields: Fields to mirror (comma-separated string or list); all when omitted.
+            Changing the field list re-materialises the table.
+        :type fields: str | list[str]
+        :param full: Re-read the whole table instead of only the changes.
+        :type full: bool
+
+        :return: Counts of changed records and deleted sys_ids.
+        :rtype: SyncResult
+
+        :raises ParameterError: If input parameters are invalid.
+        """
+        try:
+            if isinstance(fields, str):
+                fields = [f.strip() for f in fields.split(",") if f.strip()]
+            mirror = self._get_mirror()
+            mirror.add(table, fields)
+            return mirror.refresh(table, full=full)
+        except Exception as e:
+            print(f"Operation failed: {type(e).__name__}", file=sys.stderr)
+            raise
+
+    def query_mirror(self, **kwargs) -> Response:
+        """
+        Answer a :meth:`get_table` call from the local mirror, falling back to the instance.
+
+        Takes the same parameters as :meth:`get_table`. Tables listed in
+        ``SERVICENOW_MIRROR_TABLES`` are mirrored on first use; a mirrored table older
+        than ``SERVICENOW_MIRROR_MAX_AGE`` is refreshed first. Requests the mirror cannot
+        answer exactly (unsupported query operators, dot-walked or unmirrored fields,
+        keyset paging, views, ``name_value_pairs``) are sent to the instance.
+
+        :return: Response like :meth:`get_table`; ``from_mirror`` tells where it came from.
+        :rtype: Response
+
+        :raises MissingParameterError: If table is not provided.
+        :raises ParameterError: If input parameters are invalid.
+        """
+        try:
+            table_model = TableModel(**kwargs)
+            if table_model.table is None:
+                raise MissingParameterError
+            try:
+                if (
+                    table_model.pagination not in (None, "offset")
+                    or table_model.name_value_pairs
+                    or table_model.sysparm_view
+                    or table_model.sysparm_query_category
+                    or table_model.sysparm_query_no_domain
+                ):
+                    raise MirrorMiss("Request options the mirror does not support")
+                mirror = self._get_mirror()
+                if table_model.table not in mirror.tables():
+                    if table_model.table not in configured_tables():
+                        raise MirrorMiss(f"Table {table_model.table!r} is not mirrored")
+                    mirror.add(table_model.table)
+                records = mirror.query(
+                    table_model.table,
+                    query=table_model.sysparm_query,
+                    fields=table_model.sysparm_fields,
+                    limit=table_model.sysparm_limit,
+                    offset=table_model.sysparm_offset or 0,
+                    display_value=table_model.sysparm_display_value or "false",
+                )
+            except MirrorMiss as miss:
+                logger.debug("Mirror miss, querying the instance: %s", miss)
+                return self.get_table(**kwargs)
+            parsed_data = self._parse_records(Table, records, table_model.result_mode)
+            return Response(result=parsed_data, from_mirror=True)
         except ValidationError as ve:
             print(
                 f"Invalid parameters or response data: {ve.errors()}", file=sys.stderr
@@ -540,6 +1189,183 @@ def get_table_record(self, **kwargs) -> Response:
             print(f"Operation failed: {type(e).__name__}", file=sys.stderr)
             raise
 
+    def get_records(
+        self,
+        table: str,
+        sys_ids: list[str],
+        fields: str | list[str] | None = None,
+        workers: int = 4,
+        max_url_length: int = MAX_URL_LENGTH,
+        **kwargs,
+    ) -> RecordsResult:
+        """
+        Fetch many records of one table by sys_id in as few requests as possible.
+
+        The ids are sent as ``sys_idIN`` encoded queries, split so that every request
+        URL stays under ``max_url_length``, and the chunks are read concurrently
+        (``workers`` capped at the transport's ``pool_maxsize``). See
+        :mod:`servicenow_api.lookup`.
+
+        :param table: The name of the table.
+        :type table: str
+        :param sys_ids: Records to fetch; duplicates and empty values are ignored.
+        :type sys_ids: list[str]
+        :param fields: Field names to return (comma-separated string or list);
+            ``sys_id`` is always included.
+        :type fields: str | list[str]
+        :param workers: Chunks read concurrently.
+        :type workers: int
+        :param max_url_length: Longest request URL to send.
+        :type max_url_length: int
+        :param kwargs: Other :meth:`get_table` parameters (e.g. ``sysparm_display_value``,
+            or ``sysparm_query`` to AND an extra filter into every chunk).
+
+        :return: Found records keyed by sys_id (``Table`` models, or raw dicts with
+            ``result_mode="dicts"``) and the sys_ids that were not returned.
+        :rtype: RecordsResult
+
+        :raises MissingParameterError: If table is not provided.
+        :raises ParameterError: If input parameters are invalid.
+        """
+        try:
+            if isinstance(fields, (list, tuple)):
+                fields = ",".join(fields)
+            if fields and "sys_id" not in fields.split(","):
+                fields = f"sys_id,{fields}"
+            table_model = TableModel(table=table, sysparm_fields=fields, **kwargs)
+            if table_model.table is None:
+                raise MissingParameterError
+            ids = unique_ids(sys_ids)
+            url = f"{self.url}/now/table/{table_model.table}"
+            params = dict(table_model.api_parameters)
+            query = params.pop("sysparm_query", None)
+            params.pop("sysparm_offset", None)
+            params.pop("sysparm_limit", None)
+            chunks = chunk_in_query(
+                ids, url, params, query=query, max_url_length=max_url_length
+            )
+
+            def fetch(chunk: list[str]) -> list[dict[str, Any]]:
+                response = self._session.get(
+                    url=url,
+                    params={
+                        **params,
+                        "sysparm_query": and_condition(
+                            query, f"sys_idIN{','.join(chunk)}"
+                        ),
+                        "sysparm_limit": len(chunk),
+                    },
+                    headers=self.headers,
+                )
+                response.raise_for_status()
+                json_response = response.json()
+                return json_response.get("result", json_response)
+
+            workers = max(min(workers, self.transport.pool_maxsize, len(chunks)), 1)
+            if len(chunks) <= 1:
+                pages = [fetch(chunk) for chunk in chunks]
+            else:
+                with ThreadPoolExecutor(
+                    max_workers=workers, thread_name_prefix="get-records"
+                ) as pool:
+                    pages = list(pool.map(fetch, chunks))
+
+            found = {
+                key: row
+                for page in pages
+                for row in page
+                if (key := record_key(row)) is not None
+            }
+            rows = [found[i] for i in ids if i in found]
+            parsed = self._parse_records(Table, rows, table_model.result_mode)
+            return RecordsResult(
+                table=table_model.table,
+                records={
+                    record_key(row): record
+                    for row, record in zip(rows, parsed, strict=True)
+                },
+                missing=[i for i in ids if i not in found],
+                requests=len(chunks),
+            )
+        except ValidationError as ve:
+            print(
+                f"Invalid parameters or response data: {ve.errors()}", file=sys.stderr
+            )
+            raise
+        except Exception as e:
+            print(f"Operation failed: {type(e).__name__}", file=sys.stderr)
+            raise
+
+    def _get_flow_cache(self) -> FlowCache | None:
+        """The on-disk flow cache, or ``None`` when its database cannot be opened."""
+        with self._helpers_lock:
+            if getattr(self, "_flow_cache", None) is None:
+                try:
+                    self._flow_cache = FlowCache()
+                except (OSError, sqlite3.Error) as e:
+                    logger.warning(
+                        "Flow cache unavailable, crawling without it: error_type=%s",
+                        type(e).__name__,
+                    )
+                    return None
+            return self._flow_cache
+
+    def _get_reference_resolver(self) -> ReferenceResolver:
+        with self._helpers_lock:
+            if getattr(self, "_reference_resolver", None) is None:
+                self._reference_resolver = ReferenceResolver(self)
+            return self._reference_resolver
+
+    def resolve_references(
+        self, records: list[Any], fields: str | list[str] | None = None
+    ) -> list[Any]:
+        """
+        Fill in the display values of reference fields without asking the instance
+        for ``sysparm_display_value`` on every row.
+
+        Reference fields read with ``sysparm_display_value=false`` carry a ``link`` and
+        a ``value`` (sys_id). Their display values are looked up in a per-table LRU
+        cache with a TTL; the ids it does not hold are fetched with one batched
+        :meth:`get_records` call per referenced table. See
+        :mod:`servicenow_api.references`.
+
+        :param records: Raw row dicts or parsed models; updated in place.
+        :type records: list
+        :param fields: Only resolve these fields (comma-separated string or list).
+        :type fields: str | list[str]
+
+        :return: ``records``, with ``display_value`` set on resolved reference fields.
+        :rtype: list
+        """
+        try:
+            if isinstance(fields, str):
+                fields = [f.strip() for f in fields.split(",") if f.strip()]
+            return self._get_reference_resolver().annotate(records, fields)
+        except Exception as e:
+            print(f"Operation failed: {type(e).__name__}", file=sys.stderr)
+            raise
+
+    def get_choice_cache(self, language: str | None = None) -> ChoiceCache:
+        """
+        Choice lists (``sys_choice``) of this instance, for rendering the labels of
+        state, priority, impact and other choice fields from their raw values.
+
+        The cache is shared by every client of the instance. It is loaded on first use
+        and, once older than ``SERVICENOW_CHOICE_REFRESH`` seconds, refreshed in the
+        background by the next client that asks for it. See :mod:`servicenow_api.choices`.
+
+        :param language: Label language; defaults to ``SERVICENOW_CHOICE_LANGUAGE``.
+        :type language: str
+
+        :return: The loaded choice cache.
+        :rtype: ChoiceCache
+        """
+        try:
+            return shared_choice_cache(self, language).ensure_loaded(self)
+        except Exception as e:
+            print(f"Operation failed: {type(e).__name__}", file=sys.stderr)
+            raise
+
     def patch_table_record(self, **kwargs) -> Response:
         """
         Partially update a record in the specified table.
@@ -666,6 +1492,76 @@ def add_table_record(self, **kwargs) -> Response:
             print(f"Operation failed: {type(e).__name__}", file=sys.stderr)
             raise
 
+    def bulk_write(
+        self,
+        table: str,
+        operations: list[BulkOperation | dict[str, Any]],
+        workers: int = 8,
+        batch_size: int | None = None,
+        fields: str | list[str] | None = None,
+        max_attempts: int = DEFAULT_BULK_ATTEMPTS,
+    ) -> BulkWriteResult:
+        """
+        Create, update, patch or delete many records of one table concurrently.
+
+        Requests in flight start at ``workers`` (capped at the transport's
+        ``pool_maxsize``), are halved when the instance answers 429 and grow back
+        while it keeps up; see :mod:`servicenow_api.bulk`. A failed record is reported
+        in its :class:`~servicenow_api.bulk.BulkItemResult` and does not stop the others.
+
+        :param table: The name of the table.
+        :type table: str
+        :param operations: ``BulkOperation`` objects or dicts with ``op``
+            ('create', 'update', 'patch', 'delete'), ``sys_id`` and ``data``.
+        :type operations: list
+        :param workers: Maximum requests in flight.
+        :type workers: int
+        :param batch_size: Pack this many operations into each ``/now/v1/batch``
+            request instead of sending one request per record.
+        :type batch_size: int
+        :param fields: Fields to return for each written record (``sysparm_fields``).
+        :type fields: str | list[str]
+        :param max_attempts: Attempts per record before a 429 is reported as a failure.
+        :type max_attempts: int
+
+        :return: One result per operation, in input order, plus totals.
+        :rtype: BulkWriteResult
+
+        :raises MissingParameterError: If table is not provided.
+        :raises ParameterError: If an operation or the concurrency settings are invalid.
+        """
+        try:
+            if not table:
+                raise MissingParameterError
+            if isinstance(fields, (list, tuple)):
+                fields = ",".join(fields)
+            pool_size = self.transport.pool_maxsize
+            if workers > pool_size:
+                logger.info(
+                    "Capping bulk write workers at the connection pool size (%s)",
+                    pool_size,
+                )
+                workers = pool_size
+            writer = BulkWriter(
+                self._session,
+                self.url,
+                self.headers,
+                table,
+                workers=workers,
+                batch_size=batch_size,
+                batch_request=self.batch_request,
+                params={"sysparm_fields": fields},
+                max_attempts=max_attempts,
+                codec=self.json_codec,
+            )
+            return writer.run(operations)
+        except ValidationError as ve:
+            print(f"Invalid parameters: {ve.errors()}", file=sys.stderr)
+            raise
+        except Exception as e:
+            print(f"Operation failed: {type(e).__name__}", file=sys.stderr)
+            raise
+
     def send_email(self, **kwargs) -> Response:
         try:
             email = EmailModel(**kwargs)
@@ -746,7 +1642,7 @@ def get_flow_metadata(self, flow_sys_id: str) -> dict[str, Any]:
             resp = self.get_table(
                 table="sys_hub_flow",
                 sysparm_query=f"sys_id={flow_sys_id}",
-                sysparm_fields="sys_id,name,active,flow_type,description,sys_scope,application,sys_domain,sys_updated_on,sys_created_on",
+                sysparm_fields=FLOW_FIELDS,
                 sysparm_display_value="true",
                 sysparm_limit="1",
             )
@@ -763,25 +1659,7 @@ def get_flow_metadata(self, flow_sys_id: str) -> dict[str, Any]:
                 return {}
 
             flow = results[0] if isinstance(results, list) else results
-
-            def get_val(item, key, default=""):
-                v = item.get(key)
-                if isinstance(v, dict):
-                    return v.get("display_value", v.get("value", default))
-                return v if v is not None else default
-
-            return {
-                "sys_id": flow.get("sys_id"),
-                "name": get_val(flow, "name", "Unnamed Flow"),
-                "domain": get_val(flow, "sys_domain"),
-                "scope": get_val(flow, "sys_scope"),
-                "application": get_val(flow, "application", "Global"),
-                "active": str(flow.get("active", False)).lower() == "true",
-                "flow_type": flow.get("flow_type", "flow"),
-                "description": flow.get("description", ""),
-                "updated_on": flow.get("sys_updated_on"),
-                "created_on": flow.get("sys_created_on"),
-            }
+            return flow_metadata(flow)
         except Exception as e:
             logger.error("Operation failed: error_type=%s", type(e).__name__)
             return {}
@@ -795,6 +1673,8 @@ def workflow_to_mermaid(
         mermaid_name: str = "servicenow_workflow",
         segment_by_root: bool = True,
         destination_file: str | None = None,
+        use_cache: bool | None = None,
+        drop_singletons: bool = False,
     ) -> FlowReportResult:
         """
         Generates a Mermaid diagram representing the relationships between ServiceNow flows and subflows.
@@ -806,6 +1686,10 @@ def workflow_to_mermaid(
         :param mermaid_name: Base name for the generated file (used if destination_file is not provided).
         :param segment_by_root: If True, generates a separate diagram for each root flow.
         :param destination_file: Explicit full path to save the markdown report.
+        :param use_cache: Reuse flows unchanged since the last run (by ``sys_updated_on``)
+            from the on-disk flow cache. Defaults to ``SERVICENOW_FLOW_CACHE``.
+        :param drop_singletons: With ``segment_by_root=False``, leave out components
+            made of a single node, such as flows without actions.
         """
         from servicenow_api import api_client as _api_client
 
@@ -934,9 +1818,21 @@ def get_val(item, key, default=""):
                 )
 
             logger.info(f"Collecting graph for {len(root_sys_ids)} root sys_ids")
+            if use_cache is None:
+                use_cache = flow_cache_enabled()
+            crawler = FlowCrawler(
+                self,
+                _api_client.decode_values,
+                _api_client.find_subflow_sys_id,
+                cache=self._get_flow_cache() if use_cache else None,
+            )
             graph, all_metadata = self.collect_graph_for_roots(
-                root_sys_ids, max_depth=max_depth, initial_metadata=initial_metadata
+                root_sys_ids,
+                max_depth=max_depth,
+                initial_metadata=initial_metadata,
+                crawler=crawler,
             )
+            logger.info(f"Flow crawl {crawler.summary()}")
 
             mermaid_blocks = []
             if segment_by_root:
@@ -951,7 +1847,9 @@ def get_val(item, key, default=""):
                         mermaid_blocks.append(comp_mermaid)
             else:
                 logger.info("Splitting global graph into disjoint components")
-                components = _api_client.find_connected_components(graph)
+                components = _api_client.find_connected_components(
+                    graph, drop_singletons=drop_singletons
+                )
                 logger.info(
                     f"Found {len(components)} standalone graph component groups"
                 )
@@ -990,6 +1888,7 @@ def get_val(item, key, default=""):
                 summary = f"✅ Report saved ({len(all_metadata)} flows documented)"
             else:
                 summary = f"✅ Markdown generated ({len(all_metadata)} flows) — copy the content below"
+            summary += f" [{crawler.summary()}]"
 
             return FlowReportResult(
                 markdown_content=markdown_content,
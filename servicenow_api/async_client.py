@@ -0,0 +1,1051 @@
+#!/usr/bin/python
+"""Native asyncio client for the ServiceNow REST API.
+
+:class:`~servicenow_api.api_client.Api` is synchronous ``requests`` code, so the MCP
+layer has to wrap every call in ``run_blocking`` and each in-flight request pins a
+worker thread blocked on I/O. :class:`AsyncApi` issues the same calls on one shared
+``httpx.AsyncClient`` (HTTP/2 when the ``h2`` package is installed, bounded
+connection pool), so thousands of concurrent requests cost coroutines rather than
+threads.
+
+The hot endpoints — Table API, incidents, problems, change requests, CMDB,
+knowledge and CI/CD progress — are implemented natively and return the same
+:class:`~servicenow_api.servicenow_models.Response` objects (with the same parsed
+models) as their ``Api`` counterparts. Every other ``Api`` method is still
+available on ``AsyncApi`` as an awaitable that runs the synchronous implementation
+in a worker thread, so callers can treat the two clients interchangeably.
+
+:func:`call_client` is the MCP-side helper: it awaits a coroutine method directly
+and falls back to ``run_blocking`` for synchronous ones.
+"""
+
+import asyncio
+import functools
+import inspect
+import sys
+import threading
+import time
+from base64 import b64encode
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlencode
+
+from agent_utilities.base_utilities import get_logger
+from agent_utilities.core.exceptions import MissingParameterError
+from agent_utilities.core.transport_security import (
+    ResolvedTLSProfile,
+    resolve_configured_tls_profile,
+)
+from pydantic import ValidationError
+
+from servicenow_api.api.api_client_incident import (
+    DEFAULT_INCIDENT_LIMIT,
+    incident_page_metadata,
+)
+from servicenow_api.codec import JsonCodec
+from servicenow_api.microbatch import AsyncMicroBatcher, MicroBatchConfig
+from servicenow_api.pagination import (
+    DEFAULT_PAGE_SIZE,
+    AsyncTableIterator,
+    PaginationProgress,
+    TablePage,
+    keyset_params,
+    pagination_strategy,
+    total_count,
+)
+from servicenow_api.results import (
+    default_result_mode,
+    parse_records,
+    validate_result_mode,
+)
+from servicenow_api.retry import RateLimiter, RetryBudget, RetryPolicy
+from servicenow_api.servicenow_models import (
+    CICD,
+    CMDB,
+    Article,
+    Authentication,
+    BatchResponse,
+    ChangeManagementModel,
+    ChangeRequest,
+    CICDModel,
+    CMDBInstanceModel,
+    CMDBModel,
+    Incident,
+    IncidentModel,
+    KnowledgeManagementModel,
+    Problem,
+    ProblemModel,
+    Response,
+    Table,
+    TableModel,
+)
+from servicenow_api.transport import TransportConfig
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = get_logger(__name__)
+
+#: Renew the OAuth token this many seconds before it expires.
+_TOKEN_REFRESH_MARGIN_SECONDS = 60.0
+
+
+def _httpx():
+    try:
+        import httpx
+    except ImportError as e:
+        raise ImportError("AsyncApi needs httpx; install servicenow-api[http2]") from e
+    return httpx
+
+
+def http2_available() -> bool:
+    """Whether the optional ``h2`` package needed for HTTP/2 is installed."""
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+async def call_client(method, **kwargs) -> Any:
+    """Invoke a client method from async code.
+
+    Coroutine methods (``AsyncApi``) are awaited on the event loop; synchronous ones
+    (``Api``) are dispatched through ``run_blocking`` so they do not stall it.
+    """
+    if inspect.iscoroutinefunction(method):
+        return await method(**kwargs)
+    from agent_utilities.mcp.concurrency import run_blocking
+
+    return await run_blocking(method, **kwargs)
+
+
+class AsyncApi:
+    """Asynchronous ServiceNow client with the same method surface as ``Api``.
+
+    :param url: Instance base URL, e.g. ``https://dev12345.service-now.com``.
+    :param username: Username for Basic auth or the OAuth password grant.
+    :param password: Password for Basic auth or the OAuth password grant.
+    :param client_id: OAuth client id (enables the OAuth password grant).
+    :param client_secret: OAuth client secret.
+    :param token: Pre-issued bearer token (e.g. from OIDC delegation).
+    :param grant_type: OAuth grant type.
+    :param tls_profile: Outbound TLS profile; resolved from config when omitted.
+    :param http2: Negotiate HTTP/2. Defaults to on when ``h2`` is installed.
+    :param transport: Pool limits and timeouts; read from settings when omitted.
+    :param retry_policy: Retry settings; read from settings when omitted.
+    :param rate_limiter: Client-side rate limiter; read from settings when omitted.
+    :param result_mode: How list endpoints return rows: ``"models"``, ``"dicts"`` or
+        ``"lazy"``; read from ``SERVICENOW_RESULT_MODE`` when omitted.
+    :param json_codec: JSON codec (or its name) for request and response bodies;
+        read from ``SERVICENOW_JSON_CODEC`` when omitted.
+    :param micro_batch: Collect concurrent record reads for this many seconds (or a
+        :class:`~servicenow_api.microbatch.MicroBatchConfig`) and send them as one
+        batch request; read from ``SERVICENOW_MICRO_BATCH_*`` when omitted.
+    :param client: Pre-built ``httpx.AsyncClient`` to use instead of creating one.
+    """
+
+    def __init__(
+        self,
+        url: str | None = None,
+        username: str | None = None,
+        password: str | None = None,
+        client_id: str | None = None,
+        client_secret: str | None = None,
+        token: str | None = None,
+        grant_type: str | None = "password",
+        tls_profile: ResolvedTLSProfile | None = None,
+        http2: bool | None = None,
+        transport: TransportConfig | None = None,
+        retry_policy: RetryPolicy | None = None,
+        rate_limiter: RateLimiter | None = None,
+        result_mode: str | None = None,
+        json_codec: JsonCodec | str | None = None,
+        micro_batch: MicroBatchConfig | float | None = None,
+        client: "httpx.AsyncClient | None" = None,
+    ):
+        if url is None:
+            raise MissingParameterError
+        httpx = _httpx()
+
+        self._sync_api = None
+        self.base_url = url
+        self.auth_url = f"{self.base_url}/oauth_token.do"
+        self.url = f"{self.base_url}/api"
+        self.tls_profile = tls_profile or resolve_configured_tls_profile("servicenow")
+        self._credentials = {
+            "username": username,
+            "password": password,
+            "client_id": client_id,
+            "client_secret": client_secret,
+            "grant_type": grant_type,
+        }
+        self.token = None
+        self.token_expires_at: float | None = None
+        self._refresh_token: str | None = None
+        self.auth_data = None
+        self.headers: dict[str, str] | None = None
+        if token:
+            self._set_bearer_token(token)
+        elif username and password and client_id and client_secret:
+            self.auth_data = {
+                "grant_type": grant_type,
+                "client_id": client_id,
+                "client_secret": client_secret,
+                "username": username,
+                "password": password,
+            }
+        elif username and password:
+            user_pass_encoded = b64encode(f"{username}:{password}".encode()).decode()
+            self.headers = {
+                "Authorization": f"Basic {user_pass_encoded}",
+                "Content-Type": "application/json",
+            }
+        else:
+            raise MissingParameterError
+
+        self.transport = transport or TransportConfig.from_settings()
+        self.retry_policy = retry_policy or RetryPolicy.from_settings()
+        self.rate_limiter = rate_limiter or RateLimiter.from_settings()
+        self.result_mode = validate_result_mode(result_mode) or default_result_mode()
+        if isinstance(json_codec, str):
+            json_codec = JsonCodec(json_codec)
+        self.json_codec = json_codec or JsonCodec.from_settings()
+        self.retry_budget = RetryBudget()
+        self.micro_batch = MicroBatchConfig.resolve(micro_batch)
+        self._batcher = (
+            AsyncMicroBatcher(
+                self.micro_batch,
+                self.url,
+                send_batch=self._post_batch,
+                send_direct=functools.partial(self._request, "GET"),
+                retry_statuses=self.retry_policy.retry_statuses,
+            )
+            if self.micro_batch.enabled
+            else None
+        )
+        # Builds the client again when a pooled AsyncApi moves to a new event loop
+        # (see _bind_loop); a caller-supplied client is kept as it is.
+        self._client_factory = (
+            functools.partial(
+                httpx.AsyncClient,
+                http2=http2_available() if http2 is None else http2,
+                limits=self.transport.httpx_limits(),
+                timeout=self.transport.httpx_timeout(),
+                **self.tls_profile.httpx_kwargs(),
+            )
+            if client is None
+            else None
+        )
+        self._client = client if client is not None else self._client_factory()
+        self._token_lock = asyncio.Lock()
+        #: Event loop the client's connections were opened on (set by the first request
+        #: and moved by _rebind).
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    # -- lifecycle ---------------------------------------------------------------
+
+    async def __aenter__(self) -> "AsyncApi":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the shared ``httpx.AsyncClient`` and any synchronous fallback client."""
+        await self._client.aclose()
+        if self._sync_api is not None:
+            self._sync_api.close()
+            self._sync_api = None
+
+    def close(self) -> None:
+        """Synchronous close, used when the client is dropped from a ``ClientPool``.
+
+        The ``httpx.AsyncClient`` is closed on the event loop its connections were
+        opened on: as a task when that loop runs in this thread, through
+        ``run_coroutine_threadsafe`` when it runs in another one, and directly when it
+        is not running. Prefer ``await aclose()`` where a loop is at hand.
+        """
+        try:
+            current = asyncio.get_running_loop()
+        except RuntimeError:
+            current = None
+        loop = self._loop or current
+        if loop is not None and loop.is_closed():
+            logger.warning("Cannot close async client: its event loop is closed")
+            if self._sync_api is not None:
+                self._sync_api.close()
+                self._sync_api = None
+            return
+        if loop is not None and loop is current:
+            loop.create_task(self.aclose())
+        elif loop is not None and loop.is_running():
+            asyncio.run_coroutine_threadsafe(self.aclose(), loop)
+        elif current is not None:
+            # Its loop is idle but this thread is inside another running loop.
+            threading.Thread(
+                target=loop.run_until_complete, args=(self.aclose(),), daemon=True
+            ).start()
+        else:
+            try:
+                if loop is not None:
+                    loop.run_until_complete(self.aclose())
+                else:
+                    # Never used, so no connection is bound to a loop yet.
+                    asyncio.run(self.aclose())
+            except Exception as e:
+                logger.warning(
+                    "Closing async client failed: error_type=%s", type(e).__name__
+                )
+
+    # -- authentication ----------------------------------------------------------
+
+    def _set_bearer_token(self, token: str) -> None:
+        self.token = token
+        if self.headers is None:
+            self.headers = {
+                "Authorization": f"Bearer {token}",
+                "Content-Type": "application/json",
+            }
+        else:
+            self.headers["Authorization"] = f"Bearer {token}"
+        if self._sync_api is not None:
+            self._sync_api._set_bearer_token(token)
+
+    def _token_is_fresh(self) -> bool:
+        if self.token is None:
+            return False
+        if self.token_expires_at is None:
+            return True
+        return time.time() < self.token_expires_at - _TOKEN_REFRESH_MARGIN_SECONDS
+
+    def _bind_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        if self._loop is None:
+            self._loop = loop
+        elif self._loop is not loop:
+            self._rebind(loop)
+
+    def _rebind(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Move to ``loop``: a new client and token lock for the connections there.
+
+        A pooled client outlives the loop it first ran on (every ``asyncio.run()``
+        starts a new one), and httpx connections and ``asyncio.Lock`` waiters belong
+        to the loop that created them. The old client is closed on its own loop
+        while that loop still runs; a closed loop has already dropped its sockets.
+        """
+        stale, stale_loop = self._client, self._loop
+        if self._client_factory is not None:
+            self._client = self._client_factory()
+        self._token_lock = asyncio.Lock()
+        self._loop = loop
+        if stale is not self._client and stale_loop.is_running():
+            asyncio.run_coroutine_threadsafe(stale.aclose(), stale_loop)
+
+    async def _request_token(self, form: dict[str, Any]) -> Authentication:
+        self._bind_loop()
+        response = await self._client.post(
+            self.auth_url,
+            content=urlencode(form),
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+        )
+        response.raise_for_status()
+        json_response = response.json()
+        access_token = json_response["access_token"]
+        parsed = Authentication.model_validate(json_response)
+        if parsed.refresh_token:
+            self._refresh_token = parsed.refresh_token
+        self.token_expires_at = (
+            time.time() + parsed.expires_in if parsed.expires_in else None
+        )
+        self._set_bearer_token(access_token)
+        return parsed
+
+    async def _renew_token(self) -> None:
+        if self._refresh_token:
+            form = {
+                "grant_type": "refresh_token",
+                "client_id": self.auth_data.get("client_id"),
+                "client_secret": self.auth_data.get("client_secret"),
+                "refresh_token": self._refresh_token,
+            }
+            import httpx
+
+            try:
+                await self._request_token(form)
+                return
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code not in (400, 401):
+                    raise
+                self._refresh_token = None
+        await self._request_token(self.auth_data)
+
+    async def _ensure_token(self, stale: str | None = None) -> None:
+        """Obtain or renew the OAuth token; single-flight across concurrent callers."""
+        if self.auth_data is None:
+            return
+        if stale is None and self._token_is_fresh():
+            return
+        async with self._token_lock:
+            if stale is not None and self.token != stale:
+                return
+            if stale is None and self._token_is_fresh():
+                return
+            try:
+                await self._renew_token()
+            except Exception as e:
+                print(
+                    f"Error Authenticating with OAuth: \n\n{type(e).__name__}",
+                    file=sys.stderr,
+                )
+                raise
+
+    # -- transport ---------------------------------------------------------------
+
+    async def _request(
+        self,
+        method: str,
+        path: str,
+        params: dict[str, Any] | None = None,
+        json: Any = None,
+    ) -> "httpx.Response":
+        import httpx
+
+        policy = self.retry_policy
+        headers = policy.with_idempotency_key(method, None)
+        retryable = policy.is_retryable_method(method, headers)
+        self.retry_budget.record_request()
+        attempt = 1
+        while True:
+            wait = self.rate_limiter.reserve()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            try:
+                response = await self._send_authenticated(
+                    method, path, params, json, headers
+                )
+            except httpx.TransportError as e:
+                safe = retryable or isinstance(e, httpx.ConnectError)
+                delay = self._next_delay(
+                    attempt, safe and policy.retry_on_connection_errors, None
+                )
+                if delay is None:
+                    raise
+            else:
+                self.rate_limiter.observe(response.status_code, response.headers)
+                delay = None
+                if response.status_code in policy.retry_statuses:
+                    delay = self._next_delay(attempt, retryable, response.headers)
+                if delay is None:
+                    response.raise_for_status()
+                    return response
+                logger.warning(
+                    "Retrying after HTTP %s: method=%s attempt=%s delay=%.2fs",
+                    response.status_code,
+                    method,
+                    attempt,
+                    delay,
+                )
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    def _next_delay(self, attempt: int, retryable: bool, headers: Any) -> float | None:
+        if not retryable or attempt >= self.retry_policy.max_attempts:
+            return None
+        delay = self.retry_policy.retry_delay(attempt, headers)
+        if delay is None or not self.retry_budget.try_acquire():
+            return None
+        return delay
+
+    async def _send_authenticated(
+        self,
+        method: str,
+        path: str,
+        params: dict[str, Any] | None,
+        json: Any,
+        extra_headers: dict[str, Any] | None,
+    ) -> "httpx.Response":
+        self._bind_loop()
+        await self._ensure_token()
+        sent_token = self.token
+        content = None if json is None else self.json_codec.dumps(json)
+        response = await self._client.request(
+            method,
+            f"{self.url}{path}",
+            params=params,
+            content=content,
+            headers={**self.headers, **(extra_headers or {})},
+        )
+        if response.status_code == 401 and self.auth_data is not None:
+            await self._ensure_token(stale=sent_token)
+            if self.token != sent_token:
+                response = await self._client.request(
+                    method,
+                    f"{self.url}{path}",
+                    params=params,
+                    content=content,
+                    headers={**self.headers, **(extra_headers or {})},
+                )
+        return response
+
+    def _result(self, response: "httpx.Response") -> Any:
+        json_response = self.json_codec.loads(response.content)
+        return json_response.get("result", json_response)
+
+    async def _call(
+        self,
+        method: str,
+        path: str,
+        parser=None,
+        params: dict[str, Any] | None = None,
+        json: Any = None,
+        many: bool = False,
+        result_mode: str | None = None,
+    ) -> Response:
+        if method == "GET" and self._batcher is not None:
+            response = await self._batcher.get(path, params)
+            response.raise_for_status()
+        else:
+            response = await self._request(method, path, params=params, json=json)
+        result_data = self._result(response)
+        if parser is not None:
+            if many:
+                result_data = parse_records(
+                    parser, result_data, result_mode or self.result_mode
+                )
+            else:
+                result_data = parser.model_validate(result_data)
+        return Response(response=response, result=result_data)
+
+    async def _post_batch(self, body: dict[str, Any]) -> BatchResponse:
+        response = await self._request("POST", "/now/v1/batch", json=body)
+        return BatchResponse.model_validate(self.json_codec.loads(response.content))
+
+    async def _delete(self, path: str, parser=None) -> Response:
+        response = await self._request("DELETE", path)
+        if response.content:
+            result_data = self._result(response)
+            if parser is not None:
+                result_data = parser.model_validate(result_data)
+            return Response(response=response, result=result_data)
+        return Response(response=response, result={"status": "deleted"})
+
+    # -- synchronous fallback ----------------------------------------------------
+
+    def _get_sync_api(self):
+        if self._sync_api is None:
+            from servicenow_api.api_client import Api
+
+            if self.token is not None:
+                self._sync_api = Api(
+                    url=self.base_url,
+                    token=self.token,
+                    tls_profile=self.tls_profile,
+                    transport=self.transport,
+                    retry_policy=self.retry_policy,
+                    rate_limiter=self.rate_limiter,
+                    result_mode=self.result_mode,
+                    json_codec=self.json_codec,
+                    micro_batch=self.micro_batch,
+                )
+            else:
+                self._sync_api = Api(
+                    url=self.base_url,
+                    username=self._credentials["username"],
+                    password=self._credentials["password"],
+                    tls_profile=self.tls_profile,
+                    transport=self.transport,
+                    retry_policy=self.retry_policy,
+                    rate_limiter=self.rate_limiter,
+                    result_mode=self.result_mode,
+                    json_codec=self.json_codec,
+                    micro_batch=self.micro_batch,
+                )
+        return self._sync_api
+
+    def __getattr__(self, name: str):
+        from servicenow_api.api_client import Api
+
+        if name.startswith("_") or not callable(getattr(Api, name, None)):
+            raise AttributeError(
+                f"{type(self).__name__!r} object has no attribute {name!r}"
+            )
+
+        @functools.wraps(getattr(Api, name))
+        async def _threaded(**kwargs):
+            await self._ensure_token()
+            method = getattr(self._get_sync_api(), name)
+            return await asyncio.to_thread(method, **kwargs)
+
+        return _threaded
+
+    # -- Table API ---------------------------------------------------------------
+
+    async def get_table(self, **kwargs) -> Response:
+        """Async :meth:`Api.get_table`."""
+        try:
+            table_model = TableModel(**kwargs)
+            if table_model.table is None:
+                raise MissingParameterError
+            params, keyset = keyset_params(
+                table_model.api_parameters, table_model.pagination, table_model.cursor
+            )
+            response = await self._request(
+                "GET", f"/now/table/{table_model.table}", params=params
+            )
+            result_data = self._result(response)
+            if table_model.resolve_references:
+                await self.resolve_references(records=result_data)
+            next_cursor = (
+                keyset.next_cursor(
+                    result_data, total_count(response), params.get("sysparm_limit")
+                )
+                if keyset is not None
+                else None
+            )
+            return Response(
+                response=response,
+                result=parse_records(
+                    Table, result_data, table_model.result_mode or self.result_mode
+                ),
+                next_cursor=next_cursor,
+            )
+        except ValidationError as ve:
+            print(
+                f"Invalid parameters or response data: {ve.errors()}", file=sys.stderr
+            )
+            raise
+        except Exception as e:
+            print(f"Operation failed: {type(e).__name__}", file=sys.stderr)
+            raise
+
+    async def _fetch_table_page(self, table: str, params: dict[str, Any]) -> TablePage:
+        response = await self._request("GET", f"/now/table/{table}", params=params)
+        return TablePage(records=self._result(response), total=total_count(response))
+
+    def iter_table(
+        self,
+        table: str,
+        query: str | None = None,
+        fields: str | list[str] | None = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        prefetch: bool = True,
+        on_progress: Callable[[PaginationProgress], None] | None = None,
+        pagination: str = "offset",
+        cursor: str | None = None,
+        **kwargs,
+    ) -> AsyncTableIterator:
+        """Async :meth:`Api.iter_table`; use with ``async for``."""
+        if isinstance(fields, (list, tuple)):
+            fields = ",".join(fields)
+        table_model = TableModel(
+            table=table, sysparm_query=query, sysparm_fields=fields, **kwargs
+        )
+        if table_model.table is None:
+            raise MissingParameterError
+        params = dict(table_model.api_parameters)
+        max_records = params.pop("sysparm_limit", None)
+        start = int(params.pop("sysparm_offset", 0) or 0)
+        return AsyncTableIterator(
+            lambda page_params: self._fetch_table_page(table_model.table, page_params),
+            params,
+            page_size=page_size,
+            parse=Table.model_validate,
+            prefetch=prefetch,
+            on_progress=on_progress,
+            max_records=int(max_records) if max_records is not None else None,
+            strategy=pagination_strategy(pagination, cursor, start),
+            table=table_model.table,
+        )
+
+    async def get_table_record(self, **kwargs) -> Response:
+        """Async :meth:`Api.get_table_record`."""
+        try:
+            table_model = TableModel(**kwargs)
+            if table_model.table is None or table_model.table_record_sys_id is None:
+                raise MissingParameterError
+            return await self._call(
+                "GET",
+                f"/now/table/{table_model.table}/{table_model.table_record_sys_id}",
+                Table,
+            )
+        except ValidationError as ve:
+            print(
+                f"Invalid parameters or response data: {ve.errors()}", file=sys.stderr
+            )
+            raise
+        except Exception as e:
+            print(f"Operation failed: {type(e).__name__}", file=sys.stderr)
+            raise
+
+    async def add_table_record(self, **kwargs) -> Response:
+        """Async :meth:`Api.add_table_record`."""
+        try:
+            table_model = TableModel(**kwargs)
+            if table_model.table is None or table_model.data is None:
+                raise MissingParameterError
+            return await self._call(
+                "POST",
+                f"/now/table/{table_model.table}",
+                Table,
+                json=table_model.data,
+            )
+        except ValidationError as ve:
+            print(
+                f"Invalid parameters or response data: {ve.errors()}", file=sys.stderr
+            )
+            raise
+        except Exception as e:
+            print(f"Operation failed: {type(e).__name__}", file=sys.stderr)
+            raise
+
+    async def _write_table_record(self, method: str, **kwargs) -> Response:
+        try:
+            table_model = TableModel(**kwargs)
+            if (
+                table_model.table is None
+                or table_model.table_record_sys_id is None
+                or table_model.data is None
+            ):
+                raise MissingParameterError
+            return await self._call(
+                method,
+                f"/now/table/{table_model.table}/{table_model.table_record_sys_id}",
+                Table,
+                json=table_model.data,
+            )
+        except ValidationError as ve:
+            print(
+                f"Invalid parameters or response data: {ve.errors()}", file=sys.stderr
+            )
+            raise
+        except Exception as e:
+            print(f"Operation failed: {type(e).__name__}", file=sys.stderr)
+            raise
+
+    async def patch_table_record(self, **kwargs) -> Response:
+        """Async :meth:`Api.patch_table_record`."""
+        return await self._write_table_record("PATCH", **kwargs)
+
+    async def update_table_record(self, **kwargs) -> Response:
+        """Async :meth:`Api.update_table_record`."""
+        return await self._write_table_record("PUT", **kwargs)
+
+    async def delete_table_record(self, **kwargs) -> Response:
+        """Async :meth:`Api.delete_table_record`."""
+        try:
+            table_model = TableModel(**kwargs)
+            if table_model.table is None or table_model.table_record_sys_id is None:
+                raise MissingParameterError
+            return await self._delete(
+                f"/now/table/{table_model.table}/{table_model.table_record_sys_id}",
+                Table,
+            )
+        except ValidationError as ve:
+            print(
+                f"Invalid parameters or response data: {ve.errors()}", file=sys.stderr
+            )
+            raise
+        except Exception as e:
+            print(f"Operation failed: {type(e).__name__}", file=sys.stderr)
+            raise
+
+    # -- Incidents ---------------------------------------------------------------
+
+    async def get_incidents(self, **kwargs) -> Response:
+        """Async :meth:`Api.get_incidents`, including the default-limit disclosure."""
+        try:
+            incident = IncidentModel(**kwargs)
+            params = dict(incident.api_parameters)
+            limit_was_explicit = "sysparm_limit" in params
+            if not limit_was_explicit:
+                params["sysparm_limit"] = DEFAULT_INCIDENT_LIMIT
+            applied_limit = int(params["sysparm_limit"])
+            params, keyset = keyset_params(params, incident.pagination, incident.cursor)
+
+            response = await self._request("GET", "/now/table/incident", params=params)
+            result_data = self._result(response)
+            if incident.resolve_references:
+                await self.resolve_references(records=result_data)
+            parsed_data = parse_records(
+                Incident, result_data, incident.result_mode or self.result_mode
+            )
+            truncated, next_offset = incident_page_metadata(
+                params, limit_was_explicit, len(parsed_data), response
+            )
+            next_cursor = None
+            if keyset is not None:
+                next_cursor = keyset.next_cursor(
+                    result_data, total_count(response), applied_limit
+                )
+                next_offset = None
+            return Response(
+                response=response,
+                result=parsed_data,
+                truncated=truncated,
+                applied_limit=applied_limit,
+                next_offset=next_offset,
+                next_cursor=next_cursor,
+            )
+        except ValidationError as ve:
+            print(
+                f"Invalid parameters or response data: {ve.errors()}", file=sys.stderr
+            )
+            raise
+        except Exception as e:
+            print(f"Operation failed: {type(e).__name__}", file=sys.stderr)
+            raise
+
+    async def get_incident(self, **kwargs) -> Response:
+        """Async :meth:`Api.get_incident`."""
+        try:
+            incident = IncidentModel(**kwargs)
+            if incident.incident_id is None:
+                raise MissingParameterError
+            return await self._call(
+                "GET",
+                f"/now/table/incident/{incident.incident_id}",
+                Incident,
+                params=incident.api_parameters,
+            )
+        except ValidationError as ve:
+            print(
+                f"Invalid parameters or response data: {ve.errors()}", file=sys.stderr
+            )
+            raise
+        except Exception as e:
+            print(f"Operation failed: {type(e).__name__}", file=sys.stderr)
+            raise
+
+    async def create_incident(self, **kwargs) -> Response:
+        """Async :meth:`Api.create_incident`."""
+        try:
+            incident = IncidentModel(**kwargs)
+            if incident.data is None:
+                raise MissingParameterError
+            return await self._call(
+                "POST", "/now/table/incident", Incident, json=incident.data
+            )
+        except ValidationError as ve:
+            print(
+                f"Invalid parameters or response data: {ve.errors()}", file=sys.stderr
+            )
+            raise
+        except Exception as e:
+            print(f"Operation failed: {type(e).__name__}", file=sys.stderr)
+            raise
+
+    async def update_incident(self, **kwargs) -> Response:
+        """Async :meth:`Api.update_incident`."""
+        try:
+            incident = IncidentModel(**kwargs)
+            if incident.incident_id is None or incident.data is None:
+                raise MissingParameterError
+            return await self._call(
+                "PATCH",
+                f"/now/table/incident/{incident.incident_id}",
+                Incident,
+                json=incident.data,
+            )
+        except ValidationError as ve:
+            print(
+                f"Invalid parameters or response data: {ve.errors()}", file=sys.stderr
+            )
+            raise
+        except Exception as e:
+            print(f"Operation failed: {type(e).__name__}", file=sys.stderr)
+            raise
+
+    async def delete_incident(self, **kwargs) -> Response:
+        """Async :meth:`Api.delete_incident`."""
+        try:
+            incident = IncidentModel(**kwargs)
+            if incident.incident_id is None:
+                raise MissingParameterError
+            return await self._delete(f"/now/table/incident/{incident.incident_id}")
+        except ValidationError as ve:
+            print(
+                f"Invalid parameters or response data: {ve.errors()}", file=sys.stderr
+            )
+            raise
+        except Exception as e:
+            print(f"Operation failed: {type(e).__name__}", file=sys.stderr)
+            raise
+
+    # -- Problems ----------------------------------------------------------------
+
+    async def get_problems(self, **kwargs) -> Response:
+        """Async :meth:`Api.get_problems`."""
+        try:
+            problem = ProblemModel(**kwargs)
+            return await self._call(
+                "GET",
+                "/now/table/problem",
+                Problem,
+                params=problem.api_parameters,
+                many=True,
+                result_mode=problem.result_mode,
+            )
+        except ValidationError as ve:
+            print(
+                f"Invalid parameters or response data: {ve.errors()}", file=sys.stderr
+            )
+            raise
+        except Exception as e:
+            print(f"Operation failed: {type(e).__name__}", file=sys.stderr)
+            raise
+
+    # -- Change management -------------------------------------------------------
+
+    async def get_change_request(self, **kwargs) -> Response:
+        """Async :meth:`Api.get_change_request`."""
+        try:
+            change_request = ChangeManagementModel(**kwargs)
+            if change_request.change_request_sys_id is None:
+                raise MissingParameterError
+            if change_request.change_type in ["emergency", "normal", "standard"]:
+                path = f"/sn_chg_rest/change/{change_request.change_type}/{change_request.change_request_sys_id}"
+            else:
+                path = f"/sn_chg_rest/change/{change_request.change_request_sys_id}"
+            return await self._call("GET", path, ChangeRequest)
+        except ValidationError as ve:
+            print(
+                f"Invalid parameters or response data: {ve.errors()}", file=sys.stderr
+            )
+            raise
+        except Exception as e:
+            print(f"API call failed: {type(e).__name__}", file=sys.stderr)
+            raise
+
+    # -- CMDB --------------------------------------------------------------------
+
+    async def get_cmdb(self, **kwargs) -> Response:
+        """Async :meth:`Api.get_cmdb`."""
+        try:
+            cmdb = CMDBModel(**kwargs)
+            return await self._call("GET", f"/now/cmdb/meta/{cmdb.cmdb_id}", CMDB)
+        except ValidationError as ve:
+            print(
+                f"Invalid parameters or response data: {ve.errors()}", file=sys.stderr
+            )
+            raise
+        except Exception as e:
+            print(f"Operation failed: {type(e).__name__}", file=sys.stderr)
+            raise
+
+    async def get_cmdb_instances(self, **kwargs) -> Response:
+        """Async :meth:`Api.get_cmdb_instances`."""
+        try:
+            cmdb = CMDBInstanceModel(**kwargs)
+            if cmdb.className is None:
+                raise MissingParameterError
+            return await self._call(
+                "GET",
+                f"/now/cmdb/instance/{cmdb.className}",
+                params=cmdb.api_parameters,
+            )
+        except ValidationError as ve:
+            print(
+                f"Invalid parameters or response data: {ve.errors()}", file=sys.stderr
+            )
+            raise
+        except Exception as e:
+            print(f"Operation failed: {type(e).__name__}", file=sys.stderr)
+            raise
+
+    async def get_cmdb_instance(self, **kwargs) -> Response:
+        """Async :meth:`Api.get_cmdb_instance`."""
+        try:
+            cmdb = CMDBInstanceModel(**kwargs)
+            if cmdb.className is None or cmdb.sys_id is None:
+                raise MissingParameterError
+            return await self._call(
+                "GET", f"/now/cmdb/instance/{cmdb.className}/{cmdb.sys_id}"
+            )
+        except ValidationError as ve:
+            print(
+                f"Invalid parameters or response data: {ve.errors()}", file=sys.stderr
+            )
+            raise
+        except Exception as e:
+            print(f"Operation failed: {type(e).__name__}", file=sys.stderr)
+            raise
+
+    # -- Knowledge ---------------------------------------------------------------
+
+    async def get_knowledge_articles(self, **kwargs) -> Response:
+        """Async :meth:`Api.get_knowledge_articles`."""
+        try:
+            knowledge_base = KnowledgeManagementModel(**kwargs)
+            return await self._call(
+                "GET",
+                "/sn_km_api/knowledge/articles",
+                Article,
+                params=knowledge_base.api_parameters,
+                many=True,
+                result_mode=knowledge_base.result_mode,
+            )
+        except ValidationError as ve:
+            print(
+                f"Invalid parameters or response data: {ve.errors()}", file=sys.stderr
+            )
+            raise
+        except Exception as e:
+            print(f"Operation failed: {type(e).__name__}", file=sys.stderr)
+            raise
+
+    async def get_knowledge_article(self, **kwargs) -> Response:
+        """Async :meth:`Api.get_knowledge_article`."""
+        try:
+            knowledge_base = KnowledgeManagementModel(**kwargs)
+            if knowledge_base.article_sys_id is None:
+                raise MissingParameterError
+            return await self._call(
+                "GET",
+                f"/sn_km_api/knowledge/articles/{knowledge_base.article_sys_id}",
+                Article,
+                params=knowledge_base.api_parameters,
+            )
+        except ValidationError as ve:
+            print(
+                f"Invalid parameters or response data: {ve.errors()}", file=sys.stderr
+            )
+            raise
+        except Exception as e:
+            print(f"Operation failed: {type(e).__name__}", file=sys.stderr)
+            raise
+
+    # -- CI/CD -------------------------------------------------------------------
+
+    async def _get_cicd(self, path: str) -> Response:
+        try:
+            return await self._call("GET", path, CICD)
+        except ValidationError as ve:
+            print(
+                f"Invalid parameters or response data: {ve.errors()}", file=sys.stderr
+            )
+            raise
+        except Exception as e:
+            print(f"Operation failed: {type(e).__name__}", file=sys.stderr)
+            raise
+
+    async def batch_install_result(self, **kwargs) -> Response:
+        """Async :meth:`Api.batch_install_result`."""
+        cicd = CICDModel(**kwargs)
+        if cicd.result_id is None:
+            raise MissingParameterError
+        return await self._get_cicd(f"/sn_cicd/app/batch/results/{cicd.result_id}")
+
+    async def instance_scan_progress(self, **kwargs) -> Response:
+        """Async :meth:`Api.instance_scan_progress`."""
+        cicd = CICDModel(**kwargs)
+        if cicd.progress_id is None:
+            raise MissingParameterError
+        return await self._get_cicd(f"/sn_cicd/instance_scan/result/{cicd.progress_id}")
+
+    async def progress(self, **kwargs) -> Response:
+        """Async :meth:`Api.progress`."""
+        cicd = CICDModel(**kwargs)
+        if cicd.progress_id is None:
+            raise MissingParameterError
+        return await self._get_cicd(f"/sn_cicd/progress/{cicd.progress_id}")
@@ -22,10 +22,34 @@
 
 local = local()
 from servicenow_api.api_client import Api
+from servicenow_api.async_client import AsyncApi
+from servicenow_api.client_pool import (
+    client_pool_enabled,
+    get_client_pool,
+    identity_digest,
+)
 
 logger = get_logger(__name__)
 
 
+def _pooled(key: tuple, factory):
+    """Return a warm client for ``key`` from the shared pool, or build one."""
+    if not client_pool_enabled():
+        return factory()
+    return get_client_pool().get(key, factory)
+
+
+def _tls_key(tls_profile: ResolvedTLSProfile | None) -> tuple:
+    """Pool-key component identifying the outbound TLS profile."""
+    if tls_profile is not None:
+        return ("explicit", id(tls_profile))
+    return (
+        "configured",
+        setting("SERVICENOW_TLS_PROFILE", "") or None,
+        setting("SERVICENOW_TLS_PROFILE_REF", "") or None,
+    )
+
+
 def get_client(
     username=None,
     password=None,
@@ -40,7 +64,44 @@ def get_client(
     import. Auto-detects auth method:
     1. OIDC Delegation → exchanges MCP token via shared helper
     2. Basic auth → username/password (config fallback)
+
+    Clients are reused from the process-wide :class:`~servicenow_api.client_pool.ClientPool`,
+    keyed by (instance, auth identity, TLS profile), so repeat calls share a warm
+    session and access token. Set ``SERVICENOW_CLIENT_POOL=false`` to build a fresh
+    client per call.
     """
+    return _resolve_client(
+        Api, "sync", username, password, client_id, client_secret, tls_profile
+    )
+
+
+def get_async_client(
+    username=None,
+    password=None,
+    client_id=None,
+    client_secret=None,
+    tls_profile: ResolvedTLSProfile | None = None,
+) -> AsyncApi:
+    """Async counterpart of :func:`get_client`.
+
+    Resolves credentials the same way and returns a pooled
+    :class:`~servicenow_api.async_client.AsyncApi` whose shared ``httpx.AsyncClient``
+    is reused across tool calls.
+    """
+    return _resolve_client(
+        AsyncApi, "async", username, password, client_id, client_secret, tls_profile
+    )
+
+
+def _resolve_client(
+    client_cls,
+    kind: str,
+    username,
+    password,
+    client_id,
+    client_secret,
+    tls_profile: ResolvedTLSProfile | None,
+):
     from agent_utilities.mcp.delegated_auth import (
         get_delegated_token,
         get_user_identity,
@@ -55,6 +116,7 @@ def get_client(
         if client_secret is not None
         else setting("SERVICENOW_CLIENT_SECRET")
     )
+    tls_key = _tls_key(tls_profile)
     profile = tls_profile or resolve_configured_tls_profile(
         "servicenow",
         profile_name=setting("SERVICENOW_TLS_PROFILE", "") or None,
@@ -74,7 +136,12 @@ def get_client(
             )
             get_user_identity()
             logger.info("Using OIDC delegated token for ServiceNow API")
-            return Api(url=instance, token=delegated_token, tls_profile=profile)
+            return _pooled(
+                (kind, instance, "token", identity_digest(delegated_token), tls_key),
+                lambda: client_cls(
+                    url=instance, token=delegated_token, tls_profile=profile
+                ),
+            )
         except Exception:
             logger.error("OIDC delegation failed", extra={"error": "Operation failed"})
             raise
@@ -83,13 +150,17 @@ def get_client(
     try:
         if username or password:
             logger.info("Using username/password credentials for ServiceNow API")
-            return Api(
-                url=instance,
-                username=username,
-                password=password,
-                client_id=client_id,
-                client_secret=client_secret,
-                tls_profile=profile,
+            identity = identity_digest(username, password, client_id, client_secret)
+            return _pooled(
+                (kind, instance, "password", identity, tls_key),
+                lambda: client_cls(
+                    url=instance,
+                    username=username,
+                    password=password,
+                    client_id=client_id,
+                    client_secret=client_secret,
+                    tls_profile=profile,
+                ),
             )
     except (AuthError, UnauthorizedError) as e:
         logger.error("Operation failed: error_type=%s", type(e).__name__)
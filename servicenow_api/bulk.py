@@ -0,0 +1,462 @@
+#!/usr/bin/python
+"""Bulk create / update / patch / delete of Table API records.
+
+Writing thousands of records one ``add_table_record`` call at a time is bounded by
+round-trip latency, and a naive thread pool either underuses the instance or trips
+its REST rate limit and gets 429s. :class:`BulkWriter` runs a list of
+:class:`BulkOperation` objects concurrently through the client's pooled
+:class:`~servicenow_api.transport.ServiceNowSession`:
+
+* The number of requests in flight is an AIMD limit (:class:`AdaptiveConcurrency`),
+  the same scheme TCP uses. It starts at ``workers`` and grows by one after a full
+  window of successful requests. Each 429 halves it, once per window. Throttled
+  operations are re-queued, and the shared
+  :class:`~servicenow_api.retry.RateLimiter` holds them back for the
+  ``Retry-After`` period.
+* With ``batch_size`` set, operations are packed ``batch_size`` at a time into
+  ``/api/now/v1/batch`` envelopes with the existing ``batch_request`` call. This
+  saves a round trip per record. Requests the instance leaves unserviced are
+  re-queued.
+* Every operation ends with a :class:`BulkItemResult`. An error in one record is
+  recorded there and does not stop the others.
+"""
+
+import base64
+import threading
+import time
+import uuid
+from collections import deque
+from collections.abc import Callable, Iterable
+from typing import Any
+from urllib.parse import urlencode
+
+import requests
+from agent_utilities.base_utilities import get_logger
+from agent_utilities.core.exceptions import ParameterError
+from pydantic import BaseModel, ConfigDict, Field, field_validator, model_validator
+
+from servicenow_api.codec import JsonCodec
+
+logger = get_logger(__name__)
+
+#: Operations accepted in :attr:`BulkOperation.op`, with their HTTP method.
+BULK_OPERATIONS = {
+    "create": "POST",
+    "update": "PUT",
+    "patch": "PATCH",
+    "delete": "DELETE",
+}
+#: Attempts per operation before a 429 (or unserviced batch entry) is final.
+DEFAULT_BULK_ATTEMPTS = 5
+_THROTTLED = 429
+
+
+class BulkOperation(BaseModel):
+    """One record write in a :meth:`bulk_write` job."""
+
+    model_config = ConfigDict(extra="forbid")
+
+    op: str = Field(description="'create', 'update', 'patch' or 'delete'.")
+    sys_id: str | None = Field(
+        default=None, description="Target record; required except for 'create'."
+    )
+    data: dict[str, Any] | None = Field(
+        default=None, description="Field values; required except for 'delete'."
+    )
+
+    @field_validator("op")
+    def validate_op(cls, v):
+        """
+        Validates the operation name.
+
+        Args:
+        - v: The operation name.
+
+        Returns:
+        - The lower-cased operation name.
+
+        Raises:
+        - ParameterError: If the operation is not one of BULK_OPERATIONS.
+        """
+        op = v.lower()
+        if op not in BULK_OPERATIONS:
+            raise ParameterError(
+                f"Unknown bulk operation {v!r}; expected one of {list(BULK_OPERATIONS)}"
+            )
+        return op
+
+    @model_validator(mode="after")
+    def check_target(self):
+        if self.op != "create" and not self.sys_id:
+            raise ParameterError(f"Bulk '{self.op}' requires a sys_id")
+        if self.op != "delete" and self.data is None:
+            raise ParameterError(f"Bulk '{self.op}' requires data")
+        return self
+
+    @property
+    def method(self) -> str:
+        return BULK_OPERATIONS[self.op]
+
+    def path(self, table: str) -> str:
+        """Table API path relative to ``/api``."""
+        if self.op == "create":
+            return f"/now/table/{table}"
+        return f"/now/table/{table}/{self.sys_id}"
+
+
+class BulkItemResult(BaseModel):
+    """Outcome of one :class:`BulkOperation`."""
+
+    index: int = Field(description="Position of the operation in the input.")
+    op: str
+    sys_id: str | None = Field(
+        default=None, description="Record written (the new sys_id for 'create')."
+    )
+    ok: bool = False
+    status_code: int | None = None
+    result: dict[str, Any] | None = Field(
+        default=None, description="The record returned by the instance."
+    )
+    error: str | None = None
+    attempts: int = 0
+
+
+class BulkWriteResult(BaseModel):
+    """Per-record results and totals of a :meth:`bulk_write` job."""
+
+    table: str
+    results: list[BulkItemResult] = Field(default_factory=list)
+    succeeded: int = 0
+    failed: int = 0
+    throttled: int = Field(default=0, description="429 responses received.")
+    concurrency: int = Field(default=0, description="Concurrency limit at the end.")
+    min_concurrency: int = Field(
+        default=0, description="Lowest concurrency limit reached."
+    )
+    elapsed: float = Field(default=0.0, description="Wall time in seconds.")
+
+    @property
+    def ok(self) -> bool:
+        return self.failed == 0
+
+    @property
+    def failures(self) -> list[BulkItemResult]:
+        return [r for r in self.results if not r.ok]
+
+
+class AdaptiveConcurrency:
+    """AIMD limit on requests in flight, shared by the workers of one job.
+
+    ``acquire`` blocks while ``limit`` requests are in flight and returns the
+    current window. The limit grows by one after ``limit`` successes in a row.
+    :meth:`throttle` halves it, but only for a request sent in the current window,
+    so one burst of 429s counts as a single congestion signal.
+
+    :param limit: Starting and maximum concurrency.
+    :param minimum: Lowest concurrency the limit can drop to.
+    """
+
+    def __init__(self, limit: int, minimum: int = 1):
+        self.maximum = max(limit, 1)
+        self.minimum = max(min(minimum, self.maximum), 1)
+        self.limit = self.maximum
+        self.lowest = self.maximum
+        self.throttled = 0
+        self._in_flight = 0
+        self._window = 0
+        self._successes = 0
+        self._cond = threading.Condition()
+
+    def acquire(self) -> int:
+        with self._cond:
+            while self._in_flight >= self.limit:
+                self._cond.wait()
+            self._in_flight += 1
+            return self._window
+
+    def release(self, throttled: bool = False) -> None:
+        """End a request; only unthrottled ones count towards growing the limit."""
+        with self._cond:
+            self._in_flight -= 1
+            if not throttled:
+                self._successes += 1
+                if self._successes >= self.limit and self.limit < self.maximum:
+                    self.limit += 1
+                    self._successes = 0
+            self._cond.notify_all()
+
+    def throttle(self, window: int) -> None:
+        """Record a 429 for a request sent in ``window``."""
+        with self._cond:
+            self._decrease(window)
+
+    def _decrease(self, window: int) -> None:
+        self.throttled += 1
+        if window != self._window:
+            return
+        self.limit = max(self.limit // 2, self.minimum)
+        self.lowest = min(self.lowest, self.limit)
+        self._window += 1
+        self._successes = 0
+        logger.info("Bulk write throttled; concurrency limit now %s", self.limit)
+
+
+def _error_message(status: int | None, body: Any, fallback: str = "") -> str:
+    error = body.get("error") if isinstance(body, dict) else None
+    if isinstance(error, dict):
+        parts = [error.get("message"), error.get("detail")]
+        message = ": ".join(str(p) for p in parts if p)
+        if message:
+            return message
+    return fallback or f"HTTP {status}"
+
+
+class BulkWriter:
+    """Runs :class:`BulkOperation` objects against one table; see the module docstring.
+
+    :param session: The client's session (``Api._session``).
+    :param url: The client's API root (``Api.url``, ending in ``/api``).
+    :param headers: Headers sent with every single-record request.
+    :param table: Target table.
+    :param workers: Starting and maximum number of requests in flight.
+    :param batch_size: Operations per ``/now/v1/batch`` envelope; ``None`` sends
+        one request per operation.
+    :param batch_request: The client's ``batch_request`` method (batch mode only).
+    :param params: Query parameters for each write (e.g. ``sysparm_fields``).
+    :param max_attempts: Attempts per operation before a 429 is reported as a failure.
+    :param codec: JSON codec used for batch envelope bodies.
+    """
+
+    def __init__(
+        self,
+        session: Any,
+        url: str,
+        headers: dict[str, str],
+        table: str,
+        workers: int = 8,
+        batch_size: int | None = None,
+        batch_request: Callable[..., Any] | None = None,
+        params: dict[str, Any] | None = None,
+        max_attempts: int = DEFAULT_BULK_ATTEMPTS,
+        codec: JsonCodec | None = None,
+    ):
+        if workers < 1:
+            raise ParameterError("workers must be at least 1")
+        if batch_size is not None and batch_size < 1:
+            raise ParameterError("batch_size must be at least 1")
+        if batch_size and batch_request is None:
+            raise ParameterError("batch_size requires a batch_request callable")
+        self.session = session
+        self.url = url
+        self.headers = headers
+        self.table = table
+        self.workers = workers
+        self.batch_size = batch_size
+        self.batch_request = batch_request
+        self.params = {k: v for k, v in (params or {}).items() if v is not None}
+        self.max_attempts = max(max_attempts, 1)
+        self.codec = codec or JsonCodec()
+        self.limiter = AdaptiveConcurrency(workers)
+
+    def run(
+        self, operations: Iterable[BulkOperation | dict[str, Any]]
+    ) -> BulkWriteResult:
+        """Execute ``operations`` and return one result per operation, in input order."""
+        ops = [
+            op if isinstance(op, BulkOperation) else BulkOperation.model_validate(op)
+            for op in operations
+        ]
+        started = time.monotonic()
+        self._ops = ops
+        self._results: list[BulkItemResult | None] = [None] * len(ops)
+        self._attempts = [0] * len(ops)
+        size = self.batch_size or 1
+        indexes = list(range(len(ops)))
+        self._queue = deque(indexes[i : i + size] for i in range(0, len(ops), size))
+        self._lock = threading.Lock()
+
+        threads = [
+            threading.Thread(target=self._work, name=f"bulk-write-{i}", daemon=True)
+            for i in range(min(self.workers, len(self._queue)))
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        results = [
+            r or BulkItemResult(index=i, op=ops[i].op, error="Not sent")
+            for i, r in enumerate(self._results)
+        ]
+        succeeded = sum(r.ok for r in results)
+        return BulkWriteResult(
+            table=self.table,
+            results=results,
+            succeeded=succeeded,
+            failed=len(results) - succeeded,
+            throttled=self.limiter.throttled,
+            concurrency=self.limiter.limit,
+            min_concurrency=self.limiter.lowest,
+            elapsed=time.monotonic() - started,
+        )
+
+    def _work(self) -> None:
+        # A worker leaves once the queue is empty; a unit re-queued after a 429 is
+        # picked up again by the worker that re-queued it.
+        while True:
+            with self._lock:
+                if not self._queue:
+                    return
+                unit = self._queue.popleft()
+            window = self.limiter.acquire()
+            retry: list[int] = []
+            try:
+                if self.batch_size:
+                    retry = self._send_batch(unit, window)
+                else:
+                    retry = self._send_one(unit[0], window)
+            except Exception as e:
+                for index in unit:
+                    self._fail(index, None, f"{type(e).__name__}: {e}")
+            finally:
+                self.limiter.release(throttled=bool(retry))
+            if retry:
+                with self._lock:
+                    self._queue.append(retry)
+
+    def _record(self, index: int, status: int | None, body: Any) -> None:
+        op = self._ops[index]
+        record = body.get("result", body) if isinstance(body, dict) else None
+        record = record if isinstance(record, dict) else None
+        sys_id = (record or {}).get("sys_id")
+        self._results[index] = BulkItemResult(
+            index=index,
+            op=op.op,
+            sys_id=sys_id if isinstance(sys_id, str) else op.sys_id,
+            ok=True,
+            status_code=status,
+            result=record,
+            attempts=self._attempts[index],
+        )
+
+    def _fail(self, index: int, status: int | None, error: str) -> None:
+        self._results[index] = BulkItemResult(
+            index=index,
+            op=self._ops[index].op,
+            sys_id=self._ops[index].sys_id,
+            status_code=status,
+            error=error,
+            attempts=self._attempts[index],
+        )
+
+    def _requeue(self, index: int, status: int | None, error: str) -> bool:
+        """Whether ``index`` may be tried again; records the failure when not."""
+        if self._attempts[index] < self.max_attempts:
+            return True
+        self._fail(index, status, error)
+        return False
+
+    def _send_one(self, index: int, window: int) -> list[int]:
+        op = self._ops[index]
+        self._attempts[index] += 1
+        observed: list[Any] = []
+
+        def observe(response, *args, **kwargs):
+            # Also sees the 429s the session retries on its own.
+            if getattr(response, "status_code", None) == _THROTTLED:
+                observed.append(response)
+                self.limiter.throttle(window)
+
+        kwargs: dict[str, Any] = {
+            "url": f"{self.url}{op.path(self.table)}",
+            "headers": self.headers,
+            "hooks": {"response": [observe]},
+        }
+        if self.params:
+            kwargs["params"] = self.params
+        if op.data is not None:
+            kwargs["json"] = op.data
+        response = getattr(self.session, op.method.lower())(**kwargs)
+        status = response.status_code
+        try:
+            body = response.json() if response.content else {}
+        except ValueError:
+            body = None
+        if status == _THROTTLED:
+            if not any(r is response for r in observed):
+                self.limiter.throttle(window)
+            if self._requeue(index, status, _error_message(status, body)):
+                return [index]
+        elif 200 <= status < 300:
+            self._record(index, status, body)
+        else:
+            self._fail(index, status, _error_message(status, body, response.reason))
+        return []
+
+    def _batch_item(self, index: int) -> dict[str, Any]:
+        op = self._ops[index]
+        url = f"/api{op.path(self.table)}"
+        if self.params:
+            url += "?" + urlencode(self.params)
+        item: dict[str, Any] = {
+            "id": str(index),
+            "method": op.method,
+            "url": url,
+            "headers": [
+                {"name": "Content-Type", "value": "application/json"},
+                {"name": "Accept", "value": "application/json"},
+            ],
+            "exclude_response_headers": True,
+        }
+        if op.data is not None:
+            item["body"] = base64.b64encode(self.codec.dumps(op.data)).decode("ascii")
+        return item
+
+    def _send_batch(self, unit: list[int], window: int) -> list[int]:
+        for index in unit:
+            self._attempts[index] += 1
+        try:
+            response = self.batch_request(
+                batch_request_id=uuid.uuid4().hex,
+                rest_requests=[self._batch_item(i) for i in unit],
+            )
+        except requests.HTTPError as e:
+            status = getattr(e.response, "status_code", None)
+            if status != _THROTTLED:
+                raise
+            self.limiter.throttle(window)
+            return [i for i in unit if self._requeue(i, status, "HTTP 429")]
+
+        batch = response.result
+        retry = []
+        serviced = set()
+        for item in batch.serviced_requests:
+            if not item.id.isdigit() or int(item.id) not in unit:
+                continue
+            index = int(item.id)
+            serviced.add(index)
+            body = None
+            if item.body:
+                try:
+                    body = self.codec.loads(base64.b64decode(item.body))
+                except ValueError:
+                    body = None
+            if item.status_code == _THROTTLED:
+                self.limiter.throttle(window)
+                if self._requeue(index, item.status_code, "HTTP 429"):
+                    retry.append(index)
+            elif 200 <= item.status_code < 300:
+                self._record(index, item.status_code, body)
+            else:
+                message = _error_message(
+                    item.status_code, body, item.error_message or item.status_text or ""
+                )
+                self._fail(index, item.status_code, message)
+        unserviced = [i for i in unit if i not in serviced]
+        if unserviced:
+            # The instance ran out of time for the envelope: it is overloaded.
+            self.limiter.throttle(window)
+        for index in unserviced:
+            if self._requeue(index, None, "Unserviced by the batch API"):
+                retry.append(index)
+        return retry
@@ -0,0 +1,271 @@
+#!/usr/bin/python
+"""Choice-list (``sys_choice``) cache for rendering labels from raw values.
+
+``state``, ``priority``, ``impact``, ``urgency``, ``category`` and similar fields
+are choice fields. The Table API returns their stored value (``"2"``), and only
+returns the label (``"In Progress"``) when ``sysparm_display_value`` is requested.
+That option makes the instance do more work and sends more bytes per row.
+
+A :class:`ChoiceCache` reads the ``sys_choice`` rows of a few tables once and
+renders the labels locally. Choices are keyed by ``(table, element, language)``.
+A lookup on a table without its own list for a field falls back to the parent
+table, for example ``incident.impact`` → ``task.impact``, as the platform does.
+Once loaded, a cache older than ``SERVICENOW_CHOICE_REFRESH`` seconds is reloaded
+on a background thread. Lookups keep being answered from the previous lists
+while that runs.
+
+:func:`shared_choice_cache` keeps one cache per instance and language, so every
+client of the same instance shares one preload. The shared cache holds no client of
+its own: loads and refreshes run with the client that asked for it.
+:func:`choice_display` renders a field value the same way whether it arrived as a
+``{value, display_value}`` pair or as a raw value.
+"""
+
+import threading
+import time
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from agent_utilities.base_utilities import get_logger
+from agent_utilities.core.config import setting
+from agent_utilities.core.exceptions import MissingParameterError
+
+logger = get_logger(__name__)
+
+#: Tables whose choice lists are loaded (``SERVICENOW_CHOICE_TABLES``).
+DEFAULT_CHOICE_TABLES = ("task", "incident", "problem", "change_request", "cmdb_ci")
+#: Language of the loaded labels (``SERVICENOW_CHOICE_LANGUAGE``).
+DEFAULT_CHOICE_LANGUAGE = "en"
+#: Seconds before loaded choices are refreshed in the background
+#: (``SERVICENOW_CHOICE_REFRESH``); ``0`` never refreshes.
+DEFAULT_REFRESH_SECONDS = 3600.0
+#: Parent table consulted for fields a table has no choice list of its own for.
+PARENT_TABLES = {
+    "incident": "task",
+    "problem": "task",
+    "change_request": "task",
+    "sc_request": "task",
+    "sc_req_item": "task",
+    "sc_task": "task",
+    "change_task": "task",
+    "problem_task": "task",
+    "incident_task": "task",
+}
+_CHOICE_FIELDS = "sys_id,name,element,value,label,language"
+_PAGE_SIZE = 1000
+
+_shared: dict[tuple[str, str], "ChoiceCache"] = {}
+_shared_lock = threading.Lock()
+
+
+def configured_choice_tables() -> list[str]:
+    """Tables whose choices are loaded, from ``SERVICENOW_CHOICE_TABLES`` (comma-separated)."""
+    configured = setting("SERVICENOW_CHOICE_TABLES", ",".join(DEFAULT_CHOICE_TABLES))
+    return [t.strip() for t in str(configured).split(",") if t.strip()]
+
+
+def _field(row: Any, name: str) -> Any:
+    value = row.get(name) if isinstance(row, dict) else getattr(row, name, None)
+    if isinstance(value, dict):
+        value = value.get("value")
+    return value
+
+
+class ChoiceCache:
+    """``sys_choice`` labels by ``(table, element, language)``, loaded once.
+
+    :param api: :class:`~servicenow_api.api_client.Api` used to read ``sys_choice``
+        unless :meth:`load` or :meth:`ensure_loaded` is given one; ``None`` for a
+        cache shared between clients.
+    :param tables: Tables to load; defaults to :func:`configured_choice_tables`.
+    :param language: Label language; defaults to ``SERVICENOW_CHOICE_LANGUAGE``.
+    :param refresh_interval: Seconds before a background refresh; ``0`` disables it.
+    :param clock: Monotonic time source.
+    """
+
+    def __init__(
+        self,
+        api=None,
+        tables: Iterable[str] | None = None,
+        language: str | None = None,
+        refresh_interval: float | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.api = api
+        self.tables = list(tables) if tables is not None else configured_choice_tables()
+        self.language = language or setting(
+            "SERVICENOW_CHOICE_LANGUAGE", DEFAULT_CHOICE_LANGUAGE
+        )
+        self.refresh_interval = float(
+            refresh_interval
+            if refresh_interval is not None
+            else setting("SERVICENOW_CHOICE_REFRESH", DEFAULT_REFRESH_SECONDS)
+        )
+        self.loads = 0
+        self._clock = clock
+        self._choices: dict[tuple[str, str, str], dict[str, str]] = {}
+        self._loaded_at: float | None = None
+        self._refreshing: threading.Thread | None = None
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    def load(self, api=None) -> int:
+        """Read the choice lists now, replacing the cached ones.
+
+        :param api: Client to read with; defaults to the cache's own.
+        :return: Number of choices loaded.
+        :raises MissingParameterError: If there is no client to read with.
+        """
+        api = api or self.api
+        if api is None:
+            raise MissingParameterError
+        query = f"nameIN{','.join(self.tables)}^language={self.language}^inactive=false"
+        choices: dict[tuple[str, str, str], dict[str, str]] = {}
+        count = 0
+        cursor = None
+        while True:
+            page = api.get_table(
+                table="sys_choice",
+                sysparm_query=query,
+                sysparm_fields=_CHOICE_FIELDS,
+                sysparm_limit=_PAGE_SIZE,
+                pagination="keyset",
+                cursor=cursor,
+                result_mode="dicts",
+            )
+            for row in page.result:
+                table, element = _field(row, "name"), _field(row, "element")
+                value, label = _field(row, "value"), _field(row, "label")
+                if not table or not element or value is None:
+                    continue
+                key = (table, element, _field(row, "language") or self.language)
+                choices.setdefault(key, {}).setdefault(str(value), label)
+                count += 1
+            cursor = page.next_cursor
+            if cursor is None:
+                break
+        with self._lock:
+            self._choices = choices
+            self._loaded_at = self._clock()
+            self.loads += 1
+        logger.debug("Loaded choices: tables=%s count=%d", self.tables, count)
+        return count
+
+    def ensure_loaded(self, api=None) -> "ChoiceCache":
+        """Load on first use; afterwards start a background refresh once stale.
+
+        :param api: Client to read with; defaults to the cache's own. Without
+            either, the lists already loaded are used as they are.
+        """
+        api = api or self.api
+        if api is None:
+            return self
+        if self._loaded_at is None:
+            with self._load_lock:
+                if self._loaded_at is None:
+                    self.load(api)
+            return self
+        stale = (
+            self.refresh_interval > 0
+            and self._clock() - self._loaded_at >= self.refresh_interval
+        )
+        if stale:
+            with self._lock:
+                if self._refreshing is None or not self._refreshing.is_alive():
+                    self._refreshing = threading.Thread(
+                        target=self._refresh,
+                        args=(api,),
+                        name="choice-refresh",
+                        daemon=True,
+                    )
+                    self._refreshing.start()
+        return self
+
+    def _refresh(self, api) -> None:
+        try:
+            self.load(api)
+        except Exception as e:
+            logger.warning(
+                "Choice refresh failed, keeping previous lists: error_type=%s",
+                type(e).__name__,
+            )
+            with self._lock:
+                self._loaded_at = self._clock()
+
+    def choices(
+        self, table: str, element: str, language: str | None = None
+    ) -> dict[str, str]:
+        """Labels by raw value of ``table.element``, following :data:`PARENT_TABLES`."""
+        self.ensure_loaded()
+        language = language or self.language
+        current: str | None = table
+        while current is not None:
+            found = self._choices.get((current, element, language))
+            if found is not None:
+                return found
+            current = PARENT_TABLES.get(current)
+        return {}
+
+    def label(
+        self, table: str, element: str, value: Any, language: str | None = None
+    ) -> str | None:
+        """Label of ``value`` in ``table.element``; ``None`` if it is not a known choice."""
+        if value is None or value == "":
+            return None
+        return self.choices(table, element, language).get(str(value))
+
+
+def shared_choice_cache(api, language: str | None = None) -> ChoiceCache:
+    """The :class:`ChoiceCache` of ``api``'s instance, created on first use.
+
+    The cache is shared by every client of the instance and does not keep ``api``;
+    pass the calling client to :meth:`ChoiceCache.ensure_loaded`.
+    """
+    language = language or setting(
+        "SERVICENOW_CHOICE_LANGUAGE", DEFAULT_CHOICE_LANGUAGE
+    )
+    key = (api.url, language)
+    with _shared_lock:
+        cache = _shared.get(key)
+        if cache is None:
+            cache = _shared[key] = ChoiceCache(language=language)
+    return cache
+
+
+def choice_display(
+    value: Any,
+    choices: ChoiceCache | None = None,
+    table: str | None = None,
+    element: str | None = None,
+) -> Any:
+    """Human-readable form of a field value.
+
+    A ``{value, display_value}`` pair gives its display value. A raw value is looked
+    up in ``choices`` under ``table.element``. Anything else is returned unchanged.
+    """
+    if isinstance(value, dict):
+        raw = value.get("value")
+        return (
+            value.get("display_value")
+            or _label(choices, table, element, raw)
+            or raw
+            or value.get("name")
+        )
+    if hasattr(value, "display_value") and hasattr(value, "value"):
+        if value.display_value:
+            return value.display_value
+        value = value.value
+    label = _label(choices, table, element, value)
+    return value if label is None else label
+
+
+def _label(
+    choices: ChoiceCache | None, table: str | None, element: str | None, value: Any
+) -> str | None:
+    if choices is None or not table or not element:
+        return None
+    return choices.label(table, element, value)
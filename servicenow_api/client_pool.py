@@ -0,0 +1,218 @@
+#!/usr/bin/python
+"""Process-wide pool of warm :class:`~servicenow_api.api_client.Api` clients.
+
+Every MCP tool resolves its client through ``Depends(get_client)`` (see
+``servicenow_api/auth.py``). Without a pool each call builds a brand-new ``Api`` —
+a fresh ``requests.Session`` (cold TCP/TLS handshake) and, on the OAuth path, a
+synchronous ``POST /oauth_token.do`` — so every tool call pays for a connection
+and a token it throws away a moment later.
+
+:class:`ClientPool` keeps constructed clients keyed by *(instance, auth identity,
+TLS profile)* and hands the same warm client back to later callers with the same
+key. Entries are evicted least-recently-used beyond ``max_size``, dropped after
+``idle_ttl`` seconds without use, and rebuilt when the client reports that its
+access token has (or is about to) expire. Secrets never appear in a key: the
+identity component is a SHA-256 digest of the credentials.
+
+The pool is safe to share across threads. Construction of a missing entry is
+single-flight per key, so N concurrent callers for a cold key trigger exactly one
+``Api(...)`` (and one OAuth round trip) rather than N.
+
+Dropping an entry never closes a client another caller may still be using. The pool
+only forgets it; its connections are released when the last caller drops it and it
+is garbage collected.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable
+from typing import Any
+
+from agent_utilities.core.config import setting
+
+#: Maximum number of warm clients kept before least-recently-used eviction.
+DEFAULT_POOL_SIZE = 32
+#: Seconds a client may sit unused before it is dropped from the pool.
+DEFAULT_IDLE_TTL_SECONDS = 900.0
+#: A client whose token expires within this many seconds is treated as stale.
+DEFAULT_TOKEN_EXPIRY_SKEW_SECONDS = 60.0
+
+
+def identity_digest(*parts: Any) -> str:
+    """Return an opaque, stable digest of the credential ``parts``.
+
+    Used as the auth-identity component of a pool key so that passwords, client
+    secrets and bearer tokens are never held in (or logged as part of) a key.
+    """
+    hasher = hashlib.sha256()
+    for part in parts:
+        hasher.update(b"\x00" if part is None else str(part).encode("utf-8"))
+        hasher.update(b"\x1f")
+    return hasher.hexdigest()
+
+
+class _PoolEntry:
+    __slots__ = ("client", "created_at", "last_used")
+
+    def __init__(self, client: Any, now: float):
+        self.client = client
+        self.created_at = now
+        self.last_used = now
+
+
+class ClientPool:
+    """Thread-safe LRU + idle-TTL cache of API clients.
+
+    :param max_size: Maximum number of clients retained; the least recently used
+        client is evicted when a new one would exceed it.
+    :param idle_ttl: Seconds after last use at which a client is discarded.
+    :param token_expiry_skew: Seconds before ``client.token_expires_at`` at which
+        a cached client is considered expired and rebuilt.
+    :param clock: Monotonic time source (injectable for tests).
+    """
+
+    def __init__(
+        self,
+        max_size: int = DEFAULT_POOL_SIZE,
+        idle_ttl: float = DEFAULT_IDLE_TTL_SECONDS,
+        token_expiry_skew: float = DEFAULT_TOKEN_EXPIRY_SKEW_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_size < 1:
+            raise ValueError("max_size must be at least 1")
+        self.max_size = max_size
+        self.idle_ttl = idle_ttl
+        self.token_expiry_skew = token_expiry_skew
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, _PoolEntry] = OrderedDict()
+        self._key_locks: dict[Hashable, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def _is_stale(self, entry: _PoolEntry, now: float) -> bool:
+        if self.idle_ttl and now - entry.last_used > self.idle_ttl:
+            return True
+        expires_at = getattr(entry.client, "token_expires_at", None)
+        if isinstance(expires_at, (int, float)):
+            # token_expires_at is wall-clock (it comes from the OAuth expires_in).
+            return time.time() >= expires_at - self.token_expiry_skew
+        return False
+
+    def _lookup(self, key: Hashable) -> Any | None:
+        """Return a live cached client for ``key`` (caller holds ``_lock``)."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        now = self._clock()
+        if self._is_stale(entry, now):
+            del self._entries[key]
+            self.expirations += 1
+            return None
+        entry.last_used = now
+        self._entries.move_to_end(key)
+        return entry.client
+
+    def get(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        """Return the pooled client for ``key``, building it with ``factory`` on a miss.
+
+        Exceptions raised by ``factory`` propagate unchanged and nothing is cached.
+        The caller keeps no claim on the client, so the pool never closes it once it
+        has been handed out; it is released when it is garbage collected.
+        """
+        with self._lock:
+            client = self._lookup(key)
+            if client is not None:
+                self.hits += 1
+                return client
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+
+        with key_lock:
+            # Another thread may have built the client while we waited.
+            with self._lock:
+                client = self._lookup(key)
+                if client is not None:
+                    self.hits += 1
+                    return client
+                self.misses += 1
+
+            client = factory()
+
+            with self._lock:
+                self._entries[key] = _PoolEntry(client, self._clock())
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_size:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+                self._key_locks.pop(key, None)
+            return client
+
+    def invalidate(self, key: Hashable) -> bool:
+        """Drop ``key`` from the pool. Returns True if an entry was removed."""
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def clear(self) -> None:
+        """Drop every pooled client and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._key_locks.clear()
+            self.hits = self.misses = self.evictions = self.expirations = 0
+
+    def stats(self) -> dict[str, int]:
+        """Return hit/miss/eviction counters and the current pool size."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+_default_pool: ClientPool | None = None
+_default_pool_lock = threading.Lock()
+
+
+def get_client_pool() -> ClientPool:
+    """Return the process-wide pool used by :func:`servicenow_api.auth.get_client`.
+
+    Sized from ``SERVICENOW_CLIENT_POOL_SIZE`` / ``SERVICENOW_CLIENT_POOL_IDLE_TTL``
+    on first use.
+    """
+    global _default_pool
+    if _default_pool is None:
+        with _default_pool_lock:
+            if _default_pool is None:
+                _default_pool = ClientPool(
+                    max_size=int(
+                        setting("SERVICENOW_CLIENT_POOL_SIZE", DEFAULT_POOL_SIZE)
+                    ),
+                    idle_ttl=float(
+                        setting(
+                            "SERVICENOW_CLIENT_POOL_IDLE_TTL",
+                            DEFAULT_IDLE_TTL_SECONDS,
+                        )
+                    ),
+                )
+    return _default_pool
+
+
+def client_pool_enabled() -> bool:
+    """Whether ``get_client`` should reuse pooled clients (``SERVICENOW_CLIENT_POOL``)."""
+    return str(setting("SERVICENOW_CLIENT_POOL", "true")).strip().lower() not in (
+        "0",
+        "false",
+        "no",
+        "off",
+    )
@@ -0,0 +1,128 @@
+#!/usr/bin/python
+"""Pluggable JSON codec for request and response bodies.
+
+``requests`` decodes ``response.json()`` by first building a ``str`` out of the
+whole body and then running the stdlib parser over it. A 5-20 MB page of
+``sysparm_display_value=all`` records therefore costs one extra copy of the body
+plus the slowest decoder available. :class:`JsonCodec` picks the fastest backend
+that is installed and decodes straight from ``response.content`` bytes:
+
+* ``"orjson"`` -- ``pip install servicenow-api[json]``;
+* ``"msgspec"`` -- ``msgspec.json``;
+* ``"json"`` -- the standard library, always available.
+
+``"auto"`` (the default, ``SERVICENOW_JSON_CODEC``) uses the first installed one in
+that order. :class:`~servicenow_api.transport.ServiceNowSession` applies the
+client's codec to every request it sends: ``json=`` bodies are encoded with it and
+``response.json()`` on the returned response decodes with it, so none of the
+``api_client_*`` mixins change. Bodies a fast backend rejects (non-UTF-8, a BOM,
+types it cannot serialize) fall back to the standard library, so the codec never
+fails where ``requests`` would have succeeded.
+"""
+
+import json
+from collections.abc import Callable
+from typing import Any
+
+import requests
+from agent_utilities.core.config import setting
+from agent_utilities.core.exceptions import ParameterError
+
+#: Accepted ``SERVICENOW_JSON_CODEC`` values, ``"auto"`` first.
+JSON_CODECS = ("auto", "orjson", "msgspec", "json")
+
+
+def _stdlib_dumps(obj: Any) -> bytes:
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _backend(name: str) -> tuple[Callable[[Any], Any], Callable[[Any], bytes]]:
+    """``(loads, dumps)`` for ``name``; raises ImportError if it is not installed."""
+    if name == "orjson":
+        import orjson
+
+        return orjson.loads, orjson.dumps
+    if name == "msgspec":
+        import msgspec
+
+        decoder = msgspec.json.Decoder()
+        encoder = msgspec.json.Encoder()
+        return decoder.decode, encoder.encode
+    return json.loads, _stdlib_dumps
+
+
+class JsonCodec:
+    """Encode request bodies and decode response bodies with one JSON backend.
+
+    :param name: ``"auto"``, ``"orjson"``, ``"msgspec"`` or ``"json"``.
+    :raises ParameterError: If ``name`` is not a known codec.
+    :raises ImportError: If the named backend is not installed.
+    """
+
+    def __init__(self, name: str = "auto"):
+        name = (name or "auto").lower()
+        if name not in JSON_CODECS:
+            raise ParameterError(
+                f"Unknown JSON codec {name!r}; expected one of {list(JSON_CODECS)}"
+            )
+        if name == "auto":
+            for candidate in JSON_CODECS[1:]:
+                try:
+                    self._loads, self._dumps = _backend(candidate)
+                except ImportError:
+                    continue
+                name = candidate
+                break
+        else:
+            try:
+                self._loads, self._dumps = _backend(name)
+            except ImportError as e:
+                raise ImportError(
+                    f"JSON codec {name!r} is not installed; install it or use 'auto'"
+                ) from e
+        #: Backend actually in use.
+        self.name = name
+
+    @classmethod
+    def from_settings(cls) -> "JsonCodec":
+        """Codec named by ``SERVICENOW_JSON_CODEC`` (``"auto"`` when unset)."""
+        return cls(str(setting("SERVICENOW_JSON_CODEC", "auto") or "auto"))
+
+    def __repr__(self) -> str:
+        return f"JsonCodec({self.name!r})"
+
+    def loads(self, data: bytes | str) -> Any:
+        """Decode a JSON document.
+
+        :raises ValueError: If ``data`` is not valid JSON (``json.JSONDecodeError``
+            for syntax errors).
+        """
+        try:
+            return self._loads(data)
+        except Exception:
+            if self.name == "json":
+                raise
+        # Fast backends only read UTF-8: let the standard library handle a BOM or
+        # UTF-16/32 body, and report genuine syntax errors the usual way.
+        return json.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        """Encode ``obj`` as compact UTF-8 JSON."""
+        try:
+            return self._dumps(obj)
+        except TypeError:
+            if self.name == "json":
+                raise
+            return _stdlib_dumps(obj)
+
+    def decode_response(self, response: requests.Response, **kwargs) -> Any:
+        """Drop-in for ``requests.Response.json`` that decodes ``response.content``.
+
+        :raises requests.JSONDecodeError: If the body is not valid JSON.
+        """
+        try:
+            return self.loads(response.content)
+        except ValueError as e:
+            if isinstance(e, json.JSONDecodeError):
+                raise requests.JSONDecodeError(e.msg, e.doc, e.pos) from e
+            raise requests.JSONDecodeError(str(e), "", 0) from e
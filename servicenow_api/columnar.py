@@ -0,0 +1,388 @@
+#!/usr/bin/python
+"""Columnar (Arrow) export of Table API records to Parquet or Feather.
+
+Analytics extracts used to go through ``get_table``. That builds a pydantic
+:class:`~servicenow_api.servicenow_models.Table` per row, and the rows were then
+converted to columns one by one. :class:`RecordBatchBuilder` skips the models. Raw
+page records are appended column-wise into Python lists and emitted as
+``pyarrow.RecordBatch`` objects of ``batch_size`` rows:
+
+* the schema is supplied (``{"field": "int64" | pyarrow type}``) or inferred from
+  the first page. ServiceNow returns every value as a string, so inferred columns
+  are ``string`` unless they are dictionary-encoded;
+* low-cardinality columns (``state``, ``priority``, ``assignment_group``... see
+  :data:`DEFAULT_DICTIONARY_FIELDS`, plus any string column whose first page is at
+  most :data:`DICTIONARY_RATIO` distinct) become ``dictionary<int32, string>``.
+  Each column keeps one growing dictionary, so codes are stable across batches
+  and Feather files can be written with dictionary deltas;
+* reference fields (``{"value": ..., "link": ...}``) are flattened to their value
+  and empty strings become nulls.
+
+:class:`ArrowBatchWriter` spills those batches to Parquet (one row group per
+batch) or Feather/Arrow IPC files. ``pyarrow`` is an optional dependency
+(``pip install servicenow-api[arrow]``).
+"""
+
+from collections.abc import Iterable
+from pathlib import Path
+from typing import Any
+
+from agent_utilities.base_utilities import get_logger
+from agent_utilities.core.exceptions import ParameterError
+from pydantic import BaseModel, Field
+
+logger = get_logger(__name__)
+
+#: Output formats understood by :class:`ArrowBatchWriter`.
+COLUMNAR_FORMATS = ("parquet", "feather")
+#: Rows per record batch, i.e. per Parquet row group.
+DEFAULT_ROW_GROUP_SIZE = 65536
+#: Columns dictionary-encoded whatever their first-page cardinality.
+DEFAULT_DICTIONARY_FIELDS = frozenset(
+    {
+        "active",
+        "approval",
+        "assigned_to",
+        "assignment_group",
+        "category",
+        "caller_id",
+        "close_code",
+        "company",
+        "contact_type",
+        "impact",
+        "incident_state",
+        "location",
+        "opened_by",
+        "phase",
+        "priority",
+        "risk",
+        "state",
+        "subcategory",
+        "sys_class_name",
+        "sys_created_by",
+        "sys_domain",
+        "sys_updated_by",
+        "type",
+        "urgency",
+    }
+)
+#: Other string columns are dictionary-encoded when distinct/rows on the first page
+#: is at or below this ratio.
+DICTIONARY_RATIO = 0.5
+#: Minimum first-page rows before the cardinality ratio is trusted.
+_RATIO_MIN_ROWS = 20
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+    except ImportError as e:
+        raise ImportError(
+            "Columnar export needs pyarrow; install servicenow-api[arrow]"
+        ) from e
+    return pyarrow
+
+
+def _type_names(pa) -> dict[str, Any]:
+    return {
+        "string": pa.string(),
+        "dictionary": pa.dictionary(pa.int32(), pa.string()),
+        "int64": pa.int64(),
+        "float64": pa.float64(),
+        "bool": pa.bool_(),
+        "timestamp": pa.timestamp("s"),
+        "date": pa.date32(),
+    }
+
+
+def resolve_type(spec: Any):
+    """Map a type name (``"int64"``, ``"dictionary"``...) or pyarrow type to a type."""
+    pa = _pyarrow()
+    if isinstance(spec, pa.DataType):
+        return spec
+    names = _type_names(pa)
+    if spec not in names:
+        raise ParameterError(
+            f"Unknown column type {spec!r}; expected a pyarrow type or one of "
+            f"{sorted(names)}"
+        )
+    return names[spec]
+
+
+def cell_value(cell: Any) -> Any:
+    """Flatten a Table API cell: references to their value, ``""`` to ``None``."""
+    if isinstance(cell, dict):
+        cell = cell.get("value", cell.get("display_value"))
+    if cell == "":
+        return None
+    return cell
+
+
+class ColumnarExportResult(BaseModel):
+    """Summary of a finished :class:`ArrowBatchWriter`."""
+
+    path: str
+    format: str
+    rows: int = 0
+    row_groups: int = 0
+    bytes: int = Field(default=0, description="Size of the written file.")
+    columns: list[str] = Field(default_factory=list)
+    dictionary_columns: list[str] = Field(default_factory=list)
+
+
+class _Dictionary:
+    """Growing string dictionary shared by every batch of one column."""
+
+    def __init__(self):
+        self.values: list[str] = []
+        self.index: dict[str, int] = {}
+
+    def encode(self, values: list[Any]) -> list[int | None]:
+        codes: list[int | None] = []
+        for value in values:
+            if value is None:
+                codes.append(None)
+                continue
+            value = str(value)
+            code = self.index.get(value)
+            if code is None:
+                code = self.index[value] = len(self.values)
+                self.values.append(value)
+            codes.append(code)
+        return codes
+
+
+class RecordBatchBuilder:
+    """Accumulate raw records column-wise and cut them into Arrow record batches.
+
+    :param schema: ``pyarrow.Schema`` or ``{field: type}`` overrides; other columns
+        are inferred from the first records added.
+    :param fields: Column order; the first records' keys when omitted.
+    :param dictionary_fields: Columns to dictionary-encode; defaults to
+        :data:`DEFAULT_DICTIONARY_FIELDS` plus low-cardinality string columns.
+    :param batch_size: Rows per emitted batch.
+    """
+
+    def __init__(
+        self,
+        schema: Any = None,
+        fields: list[str] | None = None,
+        dictionary_fields: Iterable[str] | None = None,
+        batch_size: int = DEFAULT_ROW_GROUP_SIZE,
+    ):
+        if batch_size < 1:
+            raise ParameterError("batch_size must be at least 1")
+        self.pa = _pyarrow()
+        self._overrides = schema
+        self._fields = list(fields) if fields else None
+        self._dictionary_fields = (
+            set(dictionary_fields) if dictionary_fields is not None else None
+        )
+        self.batch_size = batch_size
+        self.schema = (
+            schema if isinstance(schema, self.pa.Schema) and not fields else None
+        )
+        self._columns: dict[str, list[Any]] = {}
+        self._dictionaries: dict[str, _Dictionary] = {}
+        self._buffered = 0
+
+    def _infer(self, records: list[dict[str, Any]]):
+        pa = self.pa
+        overrides: dict[str, Any] = {}
+        if isinstance(self._overrides, pa.Schema):
+            overrides = {f.name: f.type for f in self._overrides}
+        elif self._overrides:
+            overrides = {k: resolve_type(v) for k, v in self._overrides.items()}
+        names = self._fields or list(
+            dict.fromkeys([*(k for r in records for k in r), *overrides])
+        )
+        dictionary_type = pa.dictionary(pa.int32(), pa.string())
+        fields = []
+        for name in names:
+            if name in overrides:
+                fields.append(pa.field(name, overrides[name]))
+                continue
+            if self._dictionary_fields is not None:
+                encode = name in self._dictionary_fields
+            else:
+                values = [cell_value(r.get(name)) for r in records]
+                encode = name in DEFAULT_DICTIONARY_FIELDS or (
+                    len(values) >= _RATIO_MIN_ROWS
+                    and len(set(values)) <= DICTIONARY_RATIO * len(values)
+                )
+            fields.append(pa.field(name, dictionary_type if encode else pa.string()))
+        return pa.schema(fields)
+
+    def add(self, records: list[dict[str, Any]]) -> list[Any]:
+        """Append records; return the batches completed by them."""
+        if not records:
+            return []
+        if self.schema is None:
+            self.schema = self._infer(records)
+            logger.debug("Inferred Arrow schema: %s", self.schema)
+        for name in self.schema.names:
+            self._columns.setdefault(name, []).extend(
+                cell_value(r.get(name)) for r in records
+            )
+        self._buffered += len(records)
+        batches = []
+        while self._buffered >= self.batch_size:
+            batches.append(self._cut(self.batch_size))
+        return batches
+
+    def flush(self):
+        """Emit the remaining buffered rows as a (short) batch, or ``None``."""
+        if not self._buffered:
+            return None
+        return self._cut(self._buffered)
+
+    def _cut(self, rows: int):
+        pa = self.pa
+        arrays = []
+        for field in self.schema:
+            values = self._columns[field.name][:rows]
+            del self._columns[field.name][:rows]
+            arrays.append(self._array(field, values))
+        self._buffered -= rows
+        return pa.record_batch(arrays, schema=self.schema)
+
+    def _array(self, field, values: list[Any]):
+        pa = self.pa
+        if pa.types.is_dictionary(field.type):
+            dictionary = self._dictionaries.setdefault(field.name, _Dictionary())
+            codes = pa.array(dictionary.encode(values), type=field.type.index_type)
+            return pa.DictionaryArray.from_arrays(
+                codes, pa.array(dictionary.values, type=field.type.value_type)
+            )
+        if pa.types.is_string(field.type):
+            return pa.array(
+                [v if v is None or isinstance(v, str) else str(v) for v in values],
+                type=pa.string(),
+            )
+        try:
+            return pa.array(
+                [None if v is None else str(v) for v in values], type=pa.string()
+            ).cast(field.type)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as e:
+            raise ParameterError(
+                f"Column {field.name!r} cannot be converted to {field.type}: {e}"
+            ) from e
+
+
+class ArrowBatchWriter:
+    """Stream raw Table API records into a Parquet or Feather file.
+
+    The file is written as ``<path>.partial`` and renamed on :meth:`close`, so an
+    interrupted export never leaves a truncated file at ``path``.
+
+    :param path: Output file.
+    :param format: ``"parquet"`` or ``"feather"`` (Arrow IPC file).
+    :param schema: Column type overrides; see :class:`RecordBatchBuilder`.
+    :param fields: Column order.
+    :param dictionary_fields: Columns to dictionary-encode.
+    :param row_group_size: Rows per Parquet row group / Feather record batch.
+    :param compression: Codec, e.g. ``"zstd"``, ``"snappy"`` (Parquet), ``"lz4"`` or
+        ``None``.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        format: str = "parquet",
+        schema: Any = None,
+        fields: list[str] | None = None,
+        dictionary_fields: Iterable[str] | None = None,
+        row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+        compression: str | None = "zstd",
+    ):
+        if format not in COLUMNAR_FORMATS:
+            raise ParameterError(
+                f"Unknown columnar format {format!r}; expected one of "
+                f"{list(COLUMNAR_FORMATS)}"
+            )
+        self.path = Path(path)
+        self.format = format
+        self.compression = compression
+        self.builder = RecordBatchBuilder(
+            schema=schema,
+            fields=fields,
+            dictionary_fields=dictionary_fields,
+            batch_size=row_group_size,
+        )
+        self.result = ColumnarExportResult(path=str(self.path), format=format)
+        self._partial = self.path.with_name(self.path.name + ".partial")
+        self._sink = None
+        self._closed = False
+
+    def __enter__(self) -> "ArrowBatchWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if exc_info[0] is None:
+            self.close()
+        else:
+            self.abort()
+
+    def _open(self, schema) -> None:
+        pa = self.builder.pa
+        if self.format == "parquet":
+            import pyarrow.parquet as pq
+
+            self._sink = pq.ParquetWriter(
+                str(self._partial), schema, compression=self.compression or "none"
+            )
+        else:
+            self._sink = pa.ipc.new_file(
+                str(self._partial),
+                schema,
+                options=pa.ipc.IpcWriteOptions(
+                    compression=self.compression, emit_dictionary_deltas=True
+                ),
+            )
+
+    def _write_batch(self, batch) -> None:
+        if self._sink is None:
+            self._open(batch.schema)
+        if self.format == "parquet":
+            self._sink.write_batch(batch, row_group_size=batch.num_rows)
+        else:
+            self._sink.write_batch(batch)
+        self.result.rows += batch.num_rows
+        self.result.row_groups += 1
+
+    def write(self, records: list[dict[str, Any]]) -> None:
+        """Buffer a page of raw records, writing every full row group."""
+        for batch in self.builder.add(records):
+            self._write_batch(batch)
+
+    def close(self) -> ColumnarExportResult:
+        """Write the last partial row group and finish the file."""
+        if self._closed:
+            return self.result
+        self._closed = True
+        if self.builder.schema is None:
+            # Nothing was written: still produce a valid (empty) file.
+            self.builder.schema = self.builder._infer([])
+        batch = self.builder.flush()
+        if batch is not None:
+            self._write_batch(batch)
+        if self._sink is None:
+            self._open(self.builder.schema)
+        self._sink.close()
+        schema = self.builder.schema
+        self.result.columns = list(schema.names)
+        self.result.dictionary_columns = [
+            f.name for f in schema if self.builder.pa.types.is_dictionary(f.type)
+        ]
+        self._partial.replace(self.path)
+        self.result.bytes = self.path.stat().st_size
+        return self.result
+
+    def abort(self) -> None:
+        """Discard the partly written file; the target path is left untouched."""
+        if self._closed:
+            return
+        self._closed = True
+        if self._sink is not None:
+            self._sink.close()
+        self._partial.unlink(missing_ok=True)
@@ -0,0 +1,624 @@
+#!/usr/bin/python
+"""Batched, breadth-first loading of Flow Designer flows for ``collect_graph_for_roots``.
+
+Building a flow graph needs, for every flow reachable from the roots, its
+``sys_hub_flow`` metadata and its action instances. The per-flow walk asks for each
+of those separately, one round trip after another. A report over all active flows
+(up to 1000 roots) ends up sending thousands of requests in sequence.
+
+:class:`FlowCrawler` loads the same data one depth level at a time. For the whole
+frontier it reads the metadata of the level's flows with ``sys_idIN`` (through
+:meth:`get_records`). It reads their actions with ``flowIN`` queries, first from
+``sys_hub_action_instance_v2`` and then from ``sys_hub_action_instance`` for the
+flows that had none there. The queries are split to fit the URL limit and the
+chunks run concurrently. The subflows called by the level's actions form the next
+frontier. ``collect_graph_for_roots`` then builds the graph from the loaded data
+exactly as before, so the resulting :class:`FlowGraph` does not change.
+
+Metadata, action lists and decoded action ``values`` are kept in :class:`FlowMemo`
+instances for the length of a crawl. A subflow called from 200 flows is read once
+and its ``values`` blobs are base64-decoded and gunzipped once. With
+``SERVICENOW_FLOW_MEMO_TTL`` set, each memo is also backed by a process-wide
+:class:`~servicenow_api.references.LruTtlCache` per instance and auth identity, so
+later crawls as the same user reuse what earlier ones read. Hit and miss counts
+are reported by :meth:`FlowCrawler.summary`.
+
+A :class:`FlowCache` keeps crawled flows on disk between runs. Each entry holds a
+flow's metadata and action instances and is keyed by the flow's ``sys_id`` and
+``sys_updated_on``. Entries are scoped to the auth identity that read them, since
+ACLs can hide action instances from some users. A crawl with a cache first reads
+``sys_id,sys_updated_on`` of ``sys_hub_flow`` in one keyset-paged scan. Flows whose
+version matches their entry are taken from the cache and only the others are
+queried. Entries for the flows that were queried are written back when the crawl
+ends.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Hashable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+from urllib.parse import quote_plus
+
+from agent_utilities.base_utilities import get_logger
+from agent_utilities.core.config import setting
+
+from servicenow_api.lookup import MAX_URL_LENGTH, chunk_in_query, unique_ids
+from servicenow_api.references import LruTtlCache
+
+logger = get_logger(__name__)
+
+#: Fields read for flow metadata.
+FLOW_FIELDS = (
+    "sys_id,name,active,flow_type,description,sys_scope,application,sys_domain,"
+    "sys_updated_on,sys_created_on"
+)
+#: Action instance tables, in the order they are consulted.
+ACTION_TABLES = ("sys_hub_action_instance_v2", "sys_hub_action_instance")
+#: Fields read for action instances.
+ACTION_FIELDS = "sys_id,name,order,values,action,action_type,comment,display_text"
+#: Actions kept per flow, the cap of the per-flow query.
+MAX_ACTIONS_PER_FLOW = 500
+#: Rows requested per page of a batched action query.
+ACTION_PAGE_SIZE = 1000
+#: Seconds memoized flow data is shared between crawls (``SERVICENOW_FLOW_MEMO_TTL``);
+#: ``0`` keeps it to a single crawl.
+DEFAULT_MEMO_TTL = 0.0
+#: Entries per process-wide flow memo (``SERVICENOW_FLOW_MEMO_SIZE``).
+DEFAULT_MEMO_SIZE = 10_000
+#: Flows per page of the ``sys_updated_on`` scan of a cached crawl.
+VERSION_PAGE_SIZE = 10_000
+_FLOW_KEY = "flow.sys_id"
+_ACTION_ORDER = "^ORDERBYorder^ORDERBYsys_id"
+_MEMO_KINDS = ("metadata", "actions", "values")
+_MISS = object()
+
+_shared: dict[tuple[str, str, float], dict[str, LruTtlCache]] = {}
+_shared_lock = threading.Lock()
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS flow_cache (
+    instance TEXT NOT NULL,
+    identity TEXT NOT NULL,
+    sys_id TEXT NOT NULL,
+    sys_updated_on TEXT NOT NULL,
+    metadata TEXT NOT NULL,
+    actions TEXT NOT NULL,
+    cached_at REAL,
+    PRIMARY KEY (instance, identity, sys_id)
+) WITHOUT ROWID;
+"""
+
+
+def default_flow_cache_db() -> Path:
+    """Resolve the flow cache database path.
+
+    Override with ``SERVICENOW_FLOW_CACHE_DB``; otherwise
+    ``~/.servicenow-api/flows.sqlite3``.
+    """
+    configured = setting("SERVICENOW_FLOW_CACHE_DB", "")
+    path = (
+        Path(configured)
+        if configured
+        else Path.home() / ".servicenow-api" / "flows.sqlite3"
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def flow_cache_enabled() -> bool:
+    """Whether flow reports reuse the on-disk flow cache (``SERVICENOW_FLOW_CACHE``)."""
+    return str(setting("SERVICENOW_FLOW_CACHE", "true")).strip().lower() not in (
+        "0",
+        "false",
+        "no",
+        "off",
+    )
+
+
+def flow_metadata(flow: dict[str, Any]) -> dict[str, Any]:
+    """Metadata dict of a ``sys_hub_flow`` row read with display values."""
+
+    def get_val(item, key, default=""):
+        v = item.get(key)
+        if isinstance(v, dict):
+            return v.get("display_value", v.get("value", default))
+        return v if v is not None else default
+
+    return {
+        "sys_id": flow.get("sys_id"),
+        "name": get_val(flow, "name", "Unnamed Flow"),
+        "domain": get_val(flow, "sys_domain"),
+        "scope": get_val(flow, "sys_scope"),
+        "application": get_val(flow, "application", "Global"),
+        "active": str(flow.get("active", False)).lower() == "true",
+        "flow_type": flow.get("flow_type", "flow"),
+        "description": flow.get("description", ""),
+        "updated_on": flow.get("sys_updated_on"),
+        "created_on": flow.get("sys_created_on"),
+    }
+
+
+class FlowMemo:
+    """Memoized values of one kind for one crawl, counting hits and misses.
+
+    Only :meth:`cached` counts, and it is meant for the lookups that decide
+    whether to fetch or decode, so the counts reflect real reuse. Reading back a
+    value already counted goes through ``in``, ``[]`` or :meth:`get`.
+
+    :param shared: Process-wide cache consulted on a local miss and filled on
+        :meth:`set`; ``None`` keeps the memo local.
+    """
+
+    def __init__(self, shared: LruTtlCache | None = None):
+        self.hits = 0
+        self.misses = 0
+        self._values: dict[Hashable, Any] = {}
+        self._shared = shared
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._values
+
+    def __getitem__(self, key: Hashable) -> Any:
+        return self._values[key]
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        return self._values.get(key, default)
+
+    def cached(self, key: Hashable) -> bool:
+        """Whether ``key`` is memoized, counted as a hit or a miss."""
+        if key not in self._values and self._shared is not None:
+            value = self._shared.get(key, _MISS)
+            if value is not _MISS:
+                self._values[key] = value
+        if key in self._values:
+            self.hits += 1
+            return True
+        self.misses += 1
+        return False
+
+    def set(self, key: Hashable, value: Any, share: bool = True) -> None:
+        self._values[key] = value
+        if share and self._shared is not None:
+            self._shared.set(key, value)
+
+    @property
+    def stats(self) -> dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+def _shared_memos(url: str, identity: str, ttl: float) -> dict[str, LruTtlCache]:
+    size = int(setting("SERVICENOW_FLOW_MEMO_SIZE", DEFAULT_MEMO_SIZE))
+    key = (url, identity, ttl)
+    with _shared_lock:
+        caches = _shared.get(key)
+        if caches is None:
+            caches = _shared[key] = {
+                kind: LruTtlCache(max_entries=size, ttl=ttl) for kind in _MEMO_KINDS
+            }
+    return caches
+
+
+def clear_shared_memos() -> None:
+    """Forget the flow data shared between crawls."""
+    with _shared_lock:
+        _shared.clear()
+
+
+class FlowCache:
+    """SQLite cache of crawled flows, keyed by ``sys_id`` and ``sys_updated_on``.
+
+    Entries are stored per instance and auth identity
+    (:attr:`Api.identity <servicenow_api.api_client.Api>`).
+
+    :param path: Database file; :func:`default_flow_cache_db` if omitted.
+        ``":memory:"`` keeps it in memory.
+    """
+
+    def __init__(self, path: str | Path | None = None):
+        self.path = str(path if path is not None else default_flow_cache_db())
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._lock = threading.RLock()
+        with self._lock:
+            if self.path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            columns = {
+                row[1] for row in self._conn.execute("PRAGMA table_info(flow_cache)")
+            }
+            if columns and "identity" not in columns:
+                # Entries written before they were scoped to an identity.
+                self._conn.execute("DROP TABLE flow_cache")
+            self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def get(
+        self, instance: str, identity: str, versions: dict[str, str]
+    ) -> dict[str, tuple[dict[str, Any], list[dict[str, Any]]]]:
+        """Metadata and actions of the flows whose stored version is current.
+
+        :param identity: Auth identity the entries were read as.
+        :param versions: Current ``sys_updated_on`` of each wanted flow, by sys_id.
+        """
+        sys_ids = list(versions)
+        found: dict[str, tuple[dict[str, Any], list[dict[str, Any]]]] = {}
+        with self._lock:
+            for start in range(0, len(sys_ids), 500):
+                chunk = sys_ids[start : start + 500]
+                # Only "?" placeholders are formatted in; the sys_ids are bound.
+                rows = self._conn.execute(
+                    "SELECT sys_id, sys_updated_on, metadata, actions FROM flow_cache "  # nosec B608
+                    "WHERE instance=? AND identity=? "
+                    f"AND sys_id IN ({','.join('?' * len(chunk))})",
+                    (instance, identity, *chunk),
+                ).fetchall()
+                for sys_id, updated, metadata, actions in rows:
+                    if updated == versions[sys_id]:
+                        found[sys_id] = (json.loads(metadata), json.loads(actions))
+        return found
+
+    def put(
+        self,
+        instance: str,
+        identity: str,
+        entries: Iterable[tuple[str, str, dict[str, Any], list[dict[str, Any]]]],
+    ) -> int:
+        """Store ``(sys_id, sys_updated_on, metadata, actions)`` entries.
+
+        :param identity: Auth identity the entries were read as.
+        :return: Number of entries written.
+        """
+        now = time.time()
+        rows = [
+            (
+                instance,
+                identity,
+                sys_id,
+                updated,
+                json.dumps(metadata),
+                json.dumps(actions),
+                now,
+            )
+            for sys_id, updated, metadata, actions in entries
+        ]
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO flow_cache (instance, identity, sys_id, "
+                "sys_updated_on, metadata, actions, cached_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                rows,
+            )
+        return len(rows)
+
+    def clear(self, instance: str | None = None) -> None:
+        """Drop the entries of ``instance`` (all identities), or of every instance."""
+        with self._lock, self._conn:
+            if instance is None:
+                self._conn.execute("DELETE FROM flow_cache")
+            else:
+                self._conn.execute(
+                    "DELETE FROM flow_cache WHERE instance=?", (instance,)
+                )
+
+
+class FlowCrawler:
+    """Loads flow metadata and actions level by level, in batches.
+
+    :param api: :class:`~servicenow_api.api_client.Api` used for the queries.
+    :param decode: Decodes the ``values`` blob of an action instance.
+    :param find_subflow: Returns the sys_id of the subflow in decoded values, if any.
+    :param workers: Query chunks read concurrently (capped at ``pool_maxsize``).
+    :param memo_ttl: Seconds loaded data is shared with later crawls of the same
+        instance by the same auth identity; defaults to
+        ``SERVICENOW_FLOW_MEMO_TTL``, ``0`` disables sharing.
+    :param cache: On-disk cache to reuse unchanged flows from and to update.
+    """
+
+    def __init__(
+        self,
+        api,
+        decode: Callable[[str | None], list[dict[str, Any]]],
+        find_subflow: Callable[[list[dict[str, Any]]], str | None],
+        workers: int = 4,
+        memo_ttl: float | None = None,
+        cache: FlowCache | None = None,
+    ):
+        self.api = api
+        self.decode = decode
+        self.find_subflow = find_subflow
+        self.workers = workers
+        self.cache = cache
+        self.requests = 0
+        self.levels = 0
+        self.reused = 0
+        self._versions: dict[str, str] | None = None
+        self._fetched: set[str] = set()
+        ttl = float(
+            memo_ttl
+            if memo_ttl is not None
+            else setting("SERVICENOW_FLOW_MEMO_TTL", DEFAULT_MEMO_TTL)
+        )
+        shared = _shared_memos(api.url, api.identity, ttl) if ttl > 0 else {}
+        self._metadata = FlowMemo(shared.get("metadata"))
+        self._actions = FlowMemo(shared.get("actions"))
+        self._values = FlowMemo(shared.get("values"))
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Requests sent, levels crawled and memo hits/misses by kind."""
+        return {
+            "requests": self.requests,
+            "levels": self.levels,
+            "reused": self.reused,
+            "metadata": self._metadata.stats,
+            "actions": self._actions.stats,
+            "values": self._values.stats,
+        }
+
+    def summary(self) -> str:
+        """One-line memo hit rates, e.g. for a report summary."""
+        rates = []
+        for kind, memo in zip(
+            _MEMO_KINDS, (self._metadata, self._actions, self._values), strict=True
+        ):
+            total = memo.hits + memo.misses
+            rate = f"{memo.hits * 100 // total}%" if total else "-"
+            rates.append(f"{kind} {rate} ({memo.hits}/{total})")
+        cached = (
+            f"; {self.reused} flows from the flow cache"
+            if self.cache is not None
+            else ""
+        )
+        return f"memo hits: {', '.join(rates)}{cached}; {self.requests} requests"
+
+    def crawl(
+        self,
+        root_sys_ids: Iterable[str],
+        max_depth: int = 5,
+        known_metadata: dict[str, dict[str, Any]] | None = None,
+    ) -> None:
+        """Load every flow reachable from the roots within ``max_depth`` levels.
+
+        Flows at depth ``max_depth + 1`` only get their metadata, which their
+        callers' labels show.
+
+        :param known_metadata: Metadata the roots already have; they are not re-read.
+        """
+        known = known_metadata or {}
+        if self.cache is not None and self._versions is None:
+            self._versions = self._read_versions()
+        frontier = unique_ids(root_sys_ids)
+        seen = set(frontier)
+        wanted = [f for f in frontier if f not in known]
+        depth = 0
+        while frontier or wanted:
+            # Subflows called by the previous level need their metadata for the
+            # callers' labels, also when they were reached before.
+            self._load_metadata(
+                [f for f in unique_ids(wanted) if not self._metadata.cached(f)]
+            )
+            if depth > max_depth:
+                break
+            with_metadata = [
+                f
+                for f in frontier
+                if (known[f] if f in known else self._metadata.get(f))
+            ]
+            self._load_actions(
+                [f for f in with_metadata if not self._actions.cached(f)]
+            )
+            if with_metadata:
+                self.levels += 1
+            frontier, wanted = [], []
+            for flow in with_metadata:
+                for action in self._actions[flow]:
+                    sub_id = self.find_subflow(self._decoded(action.get("values")))
+                    if not sub_id:
+                        continue
+                    wanted.append(sub_id)
+                    if sub_id not in seen:
+                        seen.add(sub_id)
+                        frontier.append(sub_id)
+            depth += 1
+        if self.cache is not None:
+            self._store(known)
+
+    def metadata(self, flow_sys_id: str) -> dict[str, Any]:
+        """Metadata of a flow, ``{}`` when it does not exist or cannot be read."""
+        if flow_sys_id not in self._metadata and not self._metadata.cached(flow_sys_id):
+            self._load_metadata([flow_sys_id])
+        return self._metadata[flow_sys_id]
+
+    def actions(self, flow_sys_id: str) -> list[dict[str, Any]]:
+        """Action instances of a flow, ordered by ``order``."""
+        if flow_sys_id not in self._actions and not self._actions.cached(flow_sys_id):
+            self._load_actions([flow_sys_id])
+        return self._actions[flow_sys_id]
+
+    def decoded(self, raw_values: str | None) -> list[dict[str, Any]]:
+        """Decoded ``values`` of an action instance, decoded once per blob."""
+        if isinstance(raw_values, str) and raw_values in self._values:
+            return self._values[raw_values]
+        return self._decoded(raw_values)
+
+    def _decoded(self, raw_values: str | None) -> list[dict[str, Any]]:
+        if not raw_values or not isinstance(raw_values, str):
+            return self.decode(raw_values)
+        if not self._values.cached(raw_values):
+            self._values.set(raw_values, self.decode(raw_values))
+        return self._values[raw_values]
+
+    def _read_versions(self) -> dict[str, str]:
+        versions: dict[str, str] = {}
+        cursor = None
+        try:
+            while True:
+                page = self.api.get_table(
+                    table="sys_hub_flow",
+                    sysparm_fields="sys_id,sys_updated_on",
+                    sysparm_limit=VERSION_PAGE_SIZE,
+                    pagination="keyset",
+                    cursor=cursor,
+                    result_mode="dicts",
+                )
+                self.requests += 1
+                rows = list(page.result)
+                for row in rows:
+                    if row.get("sys_id") and row.get("sys_updated_on"):
+                        versions[row["sys_id"]] = row["sys_updated_on"]
+                cursor = page.next_cursor
+                if not rows or cursor is None:
+                    return versions
+        except Exception as e:
+            logger.error(
+                "Flow version scan failed, not using the flow cache: error_type=%s",
+                type(e).__name__,
+            )
+            return {}
+
+    def _from_cache(self, flow_ids: list[str]) -> list[str]:
+        """Take current flows from the cache; return the ids still to be loaded."""
+        if self.cache is None or not self._versions:
+            return flow_ids
+        versions = {f: self._versions[f] for f in flow_ids if f in self._versions}
+        found = (
+            self.cache.get(self.api.url, self.api.identity, versions)
+            if versions
+            else {}
+        )
+        for flow_id, (metadata, actions) in found.items():
+            if flow_id not in self._metadata:
+                self._metadata.set(flow_id, metadata)
+            self._actions.set(flow_id, actions)
+        self.reused += len(found)
+        return [f for f in flow_ids if f not in found]
+
+    def _store(self, known: dict[str, dict[str, Any]]) -> None:
+        entries = []
+        for flow_id in sorted(self._fetched):
+            metadata = known.get(flow_id) or self._metadata.get(flow_id)
+            version = (self._versions or {}).get(flow_id)
+            if metadata and version:
+                entries.append((flow_id, version, metadata, self._actions[flow_id]))
+        self._fetched.clear()
+        if not entries:
+            return
+        try:
+            self.cache.put(self.api.url, self.api.identity, entries)
+        except sqlite3.Error as e:
+            logger.warning(
+                "Flow cache update failed: flows=%d error_type=%s",
+                len(entries),
+                type(e).__name__,
+            )
+
+    def _load_metadata(self, flow_ids: list[str]) -> None:
+        flow_ids = self._from_cache(flow_ids)
+        if not flow_ids:
+            return
+        try:
+            found = self.api.get_records(
+                "sys_hub_flow",
+                flow_ids,
+                fields=FLOW_FIELDS,
+                workers=self.workers,
+                sysparm_display_value="true",
+                result_mode="dicts",
+            )
+            self.requests += found.requests
+            rows = found.records
+        except Exception as e:
+            logger.error(
+                "Flow metadata request failed: flows=%d error_type=%s",
+                len(flow_ids),
+                type(e).__name__,
+            )
+            rows = {}
+        for flow_id in flow_ids:
+            row = rows.get(flow_id)
+            if row is None:
+                logger.warning("No flow metadata was found")
+            # Failures and missing flows are not shared with later crawls.
+            self._metadata.set(
+                flow_id, flow_metadata(row) if row else {}, share=bool(row)
+            )
+
+    def _load_actions(self, flow_ids: list[str]) -> None:
+        pending = self._from_cache(flow_ids)
+        self._fetched.update(pending)
+        for table in ACTION_TABLES:
+            if not pending:
+                break
+            found = self._query_actions(table, pending)
+            for flow_id in pending:
+                if found.get(flow_id):
+                    logger.debug(
+                        f"Found {len(found[flow_id])} actions for flow {flow_id} in table {table}"
+                    )
+                    self._actions.set(flow_id, found[flow_id][:MAX_ACTIONS_PER_FLOW])
+            pending = [f for f in pending if f not in self._actions]
+        for flow_id in pending:
+            self._actions.set(flow_id, [])
+
+    def _query_actions(
+        self, table: str, flow_ids: list[str]
+    ) -> dict[str, list[dict[str, Any]]]:
+        fields = f"{ACTION_FIELDS},{_FLOW_KEY}"
+        url = f"{self.api.url}/now/table/{table}"
+        params = {
+            "sysparm_fields": fields,
+            "sysparm_display_value": "true",
+            "sysparm_offset": 0,
+        }
+        chunks = chunk_in_query(
+            flow_ids,
+            url,
+            params,
+            field="flow",
+            max_url_length=MAX_URL_LENGTH - len(quote_plus(_ACTION_ORDER)),
+        )
+
+        def fetch(chunk: list[str]) -> tuple[list[dict[str, Any]], int]:
+            rows: list[dict[str, Any]] = []
+            requests = 0
+            while True:
+                page = self.api.get_table(
+                    table=table,
+                    sysparm_query=f"flowIN{','.join(chunk)}{_ACTION_ORDER}",
+                    sysparm_fields=fields,
+                    sysparm_limit=ACTION_PAGE_SIZE,
+                    sysparm_offset=len(rows),
+                    sysparm_display_value="true",
+                    result_mode="dicts",
+                ).result
+                requests += 1
+                rows.extend(page)
+                if len(page) < ACTION_PAGE_SIZE:
+                    return rows, requests
+
+        workers = max(
+            min(self.workers, self.api.transport.pool_maxsize, len(chunks)), 1
+        )
+        if len(chunks) <= 1:
+            pages = [fetch(chunk) for chunk in chunks]
+        else:
+            with ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="flow-crawl"
+            ) as pool:
+                pages = list(pool.map(fetch, chunks))
+
+        found: dict[str, list[dict[str, Any]]] = {}
+        for rows, requests in pages:
+            self.requests += requests
+            for row in rows:
+                flow_id = row.pop(_FLOW_KEY, None)
+                if isinstance(flow_id, dict):
+                    flow_id = flow_id.get("value")
+                if flow_id:
+                    found.setdefault(flow_id, []).append(row)
+        return found
@@ -25,6 +25,8 @@
     media_store as _native_media_store,
 )
 
+from servicenow_api.choices import ChoiceCache, choice_display
+
 logger = logging.getLogger("servicenow_api.kg")
 
 _SOURCE = "servicenow-api"
@@ -83,11 +85,18 @@ def _as_dict(rec: Any) -> dict[str, Any]:
     return rec if isinstance(rec, dict) else {}
 
 
-def _disp(val: Any) -> Any:
-    """Human-readable value of a ServiceNow field (ReferenceField dict or scalar)."""
-    if isinstance(val, dict):
-        return val.get("display_value") or val.get("value") or val.get("name")
-    return val
+def _disp(
+    val: Any,
+    choices: ChoiceCache | None = None,
+    table: str | None = None,
+    element: str | None = None,
+) -> Any:
+    """Human-readable value of a ServiceNow field (ReferenceField dict or scalar).
+
+    With ``choices``, a raw value of the choice field ``table.element`` is rendered
+    as its label, as if the record had been read with display values.
+    """
+    return choice_display(val, choices, table, element)
 
 
 def _ref_id(val: Any) -> Any:
@@ -159,6 +168,7 @@ def ingest_incidents(
     *,
     client: Any | None = None,
     graph: str | None = None,
+    choices: ChoiceCache | None = None,
 ) -> dict[str, int]:
     """Map ServiceNow incident records → ``:Incident`` (+ CI/Person) nodes and ingest."""
     entities: list[dict[str, Any]] = []
@@ -175,11 +185,11 @@ def ingest_incidents(
                 "node_type": "Incident",
                 "number": _disp(rec.get("number")),
                 "shortDescription": _disp(rec.get("short_description")),
-                "state": _disp(rec.get("state")),
-                "priority": _disp(rec.get("priority")),
-                "impact": _disp(rec.get("impact")),
-                "urgency": _disp(rec.get("urgency")),
-                "category": _disp(rec.get("category")),
+                "state": _disp(rec.get("state"), choices, "incident", "state"),
+                "priority": _disp(rec.get("priority"), choices, "incident", "priority"),
+                "impact": _disp(rec.get("impact"), choices, "incident", "impact"),
+                "urgency": _disp(rec.get("urgency"), choices, "incident", "urgency"),
+                "category": _disp(rec.get("category"), choices, "incident", "category"),
                 "opened_at": rec.get("opened_at"),
                 "sys_updated_on": rec.get("sys_updated_on"),
                 "externalToolId": str(sid),
@@ -195,6 +205,7 @@ def ingest_changes(
     *,
     client: Any | None = None,
     graph: str | None = None,
+    choices: ChoiceCache | None = None,
 ) -> dict[str, int]:
     """Map ServiceNow change_request records → ``:Change`` (+ CI/Person) nodes and ingest."""
     entities: list[dict[str, Any]] = []
@@ -211,10 +222,12 @@ def ingest_changes(
                 "node_type": "Change",
                 "number": _disp(rec.get("number")),
                 "shortDescription": _disp(rec.get("short_description")),
-                "state": _disp(rec.get("state")),
-                "priority": _disp(rec.get("priority")),
-                "risk": _disp(rec.get("risk")),
-                "type_field": _disp(rec.get("type")),
+                "state": _disp(rec.get("state"), choices, "change_request", "state"),
+                "priority": _disp(
+                    rec.get("priority"), choices, "change_request", "priority"
+                ),
+                "risk": _disp(rec.get("risk"), choices, "change_request", "risk"),
+                "type_field": _disp(rec.get("type"), choices, "change_request", "type"),
                 "start_date": rec.get("start_date"),
                 "end_date": rec.get("end_date"),
                 "sys_updated_on": rec.get("sys_updated_on"),
@@ -231,6 +244,7 @@ def ingest_cmdb(
     *,
     client: Any | None = None,
     graph: str | None = None,
+    choices: ChoiceCache | None = None,
 ) -> dict[str, int]:
     """Map ServiceNow cmdb_ci records → ``:ConfigurationItem`` nodes and ingest."""
     entities: list[dict[str, Any]] = []
@@ -246,8 +260,18 @@ def ingest_cmdb(
                 "name": _disp(rec.get("name")),
                 "shortDescription": _disp(rec.get("short_description")),
                 "sys_class_name": _disp(rec.get("sys_class_name")),
-                "operational_status": _disp(rec.get("operational_status")),
-                "state": _disp(rec.get("install_status") or rec.get("state")),
+                "operational_status": _disp(
+                    rec.get("operational_status"),
+                    choices,
+                    "cmdb_ci",
+                    "operational_status",
+                ),
+                "state": _disp(
+                    rec.get("install_status") or rec.get("state"),
+                    choices,
+                    "cmdb_ci",
+                    "install_status" if rec.get("install_status") else "state",
+                ),
                 "externalToolId": str(sid),
             }
         )
@@ -0,0 +1,101 @@
+#!/usr/bin/python
+"""Fetching many records of one table by ``sys_id``.
+
+An enrichment step that holds thousands of ``sys_id`` values, such as the CIs of a
+set of incidents or the users behind their assignments, used to loop
+``get_table_record`` once per id. :meth:`get_records` instead asks for them with
+``sys_idIN<id>,<id>,…`` encoded queries. The id list is split into chunks so that
+every request URL stays under :data:`MAX_URL_LENGTH`, and the chunks are read
+concurrently. :func:`chunk_in_query` does the splitting from the exact encoded
+length of each value.
+"""
+
+from collections.abc import Iterable, Mapping
+from typing import Any
+from urllib.parse import quote_plus, urlencode
+
+from agent_utilities.core.exceptions import ParameterError
+from pydantic import BaseModel, Field
+
+#: Longest request URL sent. Instances (and the proxies in front of them) commonly
+#: reject request lines past 8 KiB, so stay a little below that.
+MAX_URL_LENGTH = 8000
+#: Most ids in one query, however short they are.
+MAX_IDS_PER_QUERY = 1000
+_ENCODED_COMMA = len(quote_plus(","))
+
+
+class RecordsResult(BaseModel):
+    """Records found by :meth:`get_records`, keyed by ``sys_id``."""
+
+    table: str
+    records: dict[str, Any] = Field(
+        default_factory=dict, description="Found records by sys_id, in request order."
+    )
+    missing: list[str] = Field(
+        default_factory=list,
+        description="Requested sys_ids the instance did not return (absent, "
+        "filtered out by the query or not readable by the user).",
+    )
+    requests: int = Field(default=0, description="Table API requests sent.")
+
+
+def unique_ids(values: Iterable[Any]) -> list[str]:
+    """Non-empty ids as strings, de-duplicated, in first-seen order."""
+    return list(dict.fromkeys(str(v) for v in values if v not in (None, "")))
+
+
+def chunk_in_query(
+    values: list[str],
+    url: str,
+    params: Mapping[str, Any],
+    field: str = "sys_id",
+    query: str | None = None,
+    max_url_length: int = MAX_URL_LENGTH,
+    max_values: int = MAX_IDS_PER_QUERY,
+) -> list[list[str]]:
+    """Split ``values`` so that each ``<field>IN…`` request URL fits ``max_url_length``.
+
+    The URL is ``url`` plus ``params``, ``sysparm_limit`` and a ``sysparm_query``
+    of ``<field>IN<chunk>`` ANDed into every ``^NQ`` branch of ``query``.
+
+    :raises ParameterError: If a single value cannot fit within the limit.
+    """
+    branches = query.count("^NQ") + 1 if query else 1
+    fixed = {**params, "sysparm_limit": max_values}
+    base = len(url) + 1 + len(urlencode(fixed)) + len("&sysparm_query=")
+    base += branches * len(quote_plus(f"{field}IN"))
+    if query:
+        # The condition is appended to each branch as "^<field>IN…".
+        base += len(quote_plus(query)) + branches * len(quote_plus("^"))
+    budget = max_url_length - base
+
+    chunks: list[list[str]] = []
+    chunk: list[str] = []
+    used = 0
+    for value in values:
+        cost = branches * len(quote_plus(value))
+        if chunk:
+            cost += branches * _ENCODED_COMMA
+        if chunk and (used + cost > budget or len(chunk) >= max_values):
+            chunks.append(chunk)
+            chunk, used = [], 0
+            cost = branches * len(quote_plus(value))
+        if cost > budget:
+            raise ParameterError(
+                f"{field} value {value[:40]!r} does not fit in a {max_url_length}-"
+                "character request URL"
+            )
+        chunk.append(value)
+        used += cost
+    if chunk:
+        chunks.append(chunk)
+    return chunks
+
+
+def record_key(record: Any, field: str = "sys_id") -> str | None:
+    """``record[field]`` as a string, also when it was returned as a display pair."""
+    value = record.get(field) if isinstance(record, dict) else None
+    if isinstance(value, dict):
+        value = value.get("value")
+    return value if isinstance(value, str) else None
@@ -4,11 +4,11 @@
 """
 
 from agent_utilities.mcp.action_dispatch import resolve_action
-from agent_utilities.mcp.concurrency import run_blocking
 from fastmcp import Context, FastMCP
 from fastmcp.dependencies import Depends
 from pydantic import Field
 
+from servicenow_api.async_client import call_client
 from servicenow_api.auth import get_client
 
 
@@ -44,5 +44,5 @@ async def servicenow_application(
         action = resolved
 
         if action == "get_application":
-            return await run_blocking(client.get_application, **kwargs)
+            return await call_client(client.get_application, **kwargs)
         raise ValueError(f"Unknown action: {action}")
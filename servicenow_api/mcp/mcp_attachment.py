@@ -4,11 +4,11 @@
 """
 
 from agent_utilities.mcp.action_dispatch import resolve_action
-from agent_utilities.mcp.concurrency import run_blocking
 from fastmcp import Context, FastMCP
 from fastmcp.dependencies import Depends
 from pydantic import Field
 
+from servicenow_api.async_client import call_client
 from servicenow_api.auth import get_client
 
 
@@ -48,9 +48,9 @@ async def servicenow_attachment(
         action = resolved
 
         if action == "get_attachment":
-            return await run_blocking(client.get_attachment, **kwargs)
+            return await call_client(client.get_attachment, **kwargs)
         if action == "upload_attachment":
-            return await run_blocking(client.upload_attachment, **kwargs)
+            return await call_client(client.upload_attachment, **kwargs)
         if action == "delete_attachment":
-            return await run_blocking(client.delete_attachment, **kwargs)
+            return await call_client(client.delete_attachment, **kwargs)
         raise ValueError(f"Unknown action: {action}")
@@ -4,11 +4,11 @@
 """
 
 from agent_utilities.mcp.action_dispatch import resolve_action
-from agent_utilities.mcp.concurrency import run_blocking
 from fastmcp import Context, FastMCP
 from fastmcp.dependencies import Depends
 from pydantic import Field
 
+from servicenow_api.async_client import call_client
 from servicenow_api.auth import get_client
 
 
@@ -46,5 +46,5 @@ async def servicenow_auth(
         action = resolved
 
         if action == "refresh_auth_token":
-            return await run_blocking(client.refresh_auth_token, **kwargs)
+            return await call_client(client.refresh_auth_token, **kwargs)
         raise ValueError(f"Unknown action: {action}")
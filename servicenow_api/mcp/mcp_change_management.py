@@ -4,12 +4,12 @@
 """
 
 from agent_utilities.mcp.action_dispatch import resolve_action
-from agent_utilities.mcp.concurrency import run_blocking
 from fastmcp import Context, FastMCP
 from fastmcp.dependencies import Depends
 from pydantic import Field
 
-from servicenow_api.auth import get_client
+from servicenow_api.async_client import call_client
+from servicenow_api.auth import get_async_client
 
 
 def register_change_management_tools(mcp: FastMCP):
@@ -21,12 +21,16 @@ async def servicenow_change_management(
         params_json: str = Field(
             default="{}", description="JSON string of parameters to pass to the action."
         ),
-        client=Depends(get_client),
+        client=Depends(get_async_client),
         ctx: Context | None = Field(
             default=None, description="MCP context for progress reporting"
         ),
     ) -> dict:
-        """Manage servicenow change management operations."""
+        """Manage servicenow change management operations.
+
+        get_change_requests with ``sysparm_limit`` and ``"pagination": "keyset"``
+        walks every page by sys_id instead of by ``sysparm_offset``.
+        """
         if ctx:
             ctx.info("Executing tool...")
         import json
@@ -74,69 +78,67 @@ async def servicenow_change_management(
         action = resolved
 
         if action == "get_change_requests":
-            return await run_blocking(client.get_change_requests, **kwargs)
+            return await call_client(client.get_change_requests, **kwargs)
         if action == "get_change_request_nextstate":
-            return await run_blocking(client.get_change_request_nextstate, **kwargs)
+            return await call_client(client.get_change_request_nextstate, **kwargs)
         if action == "get_change_request_schedule":
-            return await run_blocking(client.get_change_request_schedule, **kwargs)
+            return await call_client(client.get_change_request_schedule, **kwargs)
         if action == "get_change_request_tasks":
-            return await run_blocking(client.get_change_request_tasks, **kwargs)
+            return await call_client(client.get_change_request_tasks, **kwargs)
         if action == "get_change_request":
-            return await run_blocking(client.get_change_request, **kwargs)
+            return await call_client(client.get_change_request, **kwargs)
         if action == "get_change_request_ci":
-            return await run_blocking(client.get_change_request_ci, **kwargs)
+            return await call_client(client.get_change_request_ci, **kwargs)
         if action == "get_change_request_conflict":
-            return await run_blocking(client.get_change_request_conflict, **kwargs)
+            return await call_client(client.get_change_request_conflict, **kwargs)
         if action == "get_standard_change_request_templates":
-            return await run_blocking(
+            return await call_client(
                 client.get_standard_change_request_templates, **kwargs
             )
         if action == "get_change_request_models":
-            return await run_blocking(client.get_change_request_models, **kwargs)
+            return await call_client(client.get_change_request_models, **kwargs)
         if action == "get_standard_change_request_model":
-            return await run_blocking(
-                client.get_standard_change_request_model, **kwargs
-            )
+            return await call_client(client.get_standard_change_request_model, **kwargs)
         if action == "get_standard_change_request_template":
-            return await run_blocking(
+            return await call_client(
                 client.get_standard_change_request_template, **kwargs
             )
         if action == "get_change_request_worker":
-            return await run_blocking(client.get_change_request_worker, **kwargs)
+            return await call_client(client.get_change_request_worker, **kwargs)
         if action == "create_change_request":
-            return await run_blocking(client.create_change_request, **kwargs)
+            return await call_client(client.create_change_request, **kwargs)
         if action == "create_change_request_task":
-            return await run_blocking(client.create_change_request_task, **kwargs)
+            return await call_client(client.create_change_request_task, **kwargs)
         if action == "create_change_request_ci_association":
-            return await run_blocking(
+            return await call_client(
                 client.create_change_request_ci_association, **kwargs
             )
         if action == "calculate_standard_change_request_risk":
-            return await run_blocking(
+            return await call_client(
                 client.calculate_standard_change_request_risk, **kwargs
             )
         if action == "check_change_request_conflict":
-            return await run_blocking(client.check_change_request_conflict, **kwargs)
+            return await call_client(client.check_change_request_conflict, **kwargs)
         if action == "refresh_change_request_impacted_services":
-            return await run_blocking(
+            return await call_client(
                 client.refresh_change_request_impacted_services, **kwargs
             )
         if action == "approve_change_request":
-            return await run_blocking(client.approve_change_request, **kwargs)
+            return await call_client(client.approve_change_request, **kwargs)
         if action == "update_change_request":
-            return await run_blocking(client.update_change_request, **kwargs)
+            return await call_client(client.update_change_request, **kwargs)
         if action == "update_change_request_first_available":
-            return await run_blocking(
+            return await call_client(
                 client.update_change_request_first_available, **kwargs
             )
         if action == "update_change_request_task":
-            return await run_blocking(client.update_change_request_task, **kwargs)
+            return await call_client(client.update_change_request_task, **kwargs)
         if action == "delete_change_request":
-            return await run_blocking(client.delete_change_request, **kwargs)
+            return await call_client(client.delete_change_request, **kwargs)
         if action == "delete_change_request_task":
-            return await run_blocking(client.delete_change_request_task, **kwargs)
+            return await call_client(client.delete_change_request_task, **kwargs)
         if action == "delete_change_request_conflict_scan":
-            return await run_blocking(
+            return await call_client(
                 client.delete_change_request_conflict_scan, **kwargs
             )
         raise ValueError(f"Unknown action: {action}")
@@ -4,12 +4,12 @@
 """
 
 from agent_utilities.mcp.action_dispatch import resolve_action
-from agent_utilities.mcp.concurrency import run_blocking
 from fastmcp import Context, FastMCP
 from fastmcp.dependencies import Depends
 from pydantic import Field
 
-from servicenow_api.auth import get_client
+from servicenow_api.async_client import call_client
+from servicenow_api.auth import get_async_client
 
 
 def register_cicd_tools(mcp: FastMCP):
@@ -21,7 +21,7 @@ async def servicenow_cicd(
         params_json: str = Field(
             default="{}", description="JSON string of parameters to pass to the action."
         ),
-        client=Depends(get_client),
+        client=Depends(get_async_client),
         ctx: Context | None = Field(
             default=None, description="MCP context for progress reporting"
         ),
@@ -61,27 +61,27 @@ async def servicenow_cicd(
         action = resolved
 
         if action == "batch_install_result":
-            return await run_blocking(client.batch_install_result, **kwargs)
+            return await call_client(client.batch_install_result, **kwargs)
         if action == "instance_scan_progress":
-            return await run_blocking(client.instance_scan_progress, **kwargs)
+            return await call_client(client.instance_scan_progress, **kwargs)
         if action == "progress":
-            return await run_blocking(client.progress, **kwargs)
+            return await call_client(client.progress, **kwargs)
         if action == "batch_install":
-            return await run_blocking(client.batch_install, **kwargs)
+            return await call_client(client.batch_install, **kwargs)
         if action == "batch_rollback":
-            return await run_blocking(client.batch_rollback, **kwargs)
+            return await call_client(client.batch_rollback, **kwargs)
         if action == "app_repo_install":
-            return await run_blocking(client.app_repo_install, **kwargs)
+            return await call_client(client.app_repo_install, **kwargs)
         if action == "app_repo_publish":
-            return await run_blocking(client.app_repo_publish, **kwargs)
+            return await call_client(client.app_repo_publish, **kwargs)
         if action == "app_repo_rollback":
-            return await run_blocking(client.app_repo_rollback, **kwargs)
+            return await call_client(client.app_repo_rollback, **kwargs)
         if action == "full_scan":
-            return await run_blocking(client.full_scan, **kwargs)
+            return await call_client(client.full_scan, **kwargs)
         if action == "point_scan":
-            return await run_blocking(client.point_scan, **kwargs)
+            return await call_client(client.point_scan, **kwargs)
         if action == "combo_suite_scan":
-            return await run_blocking(client.combo_suite_scan, **kwargs)
+            return await call_client(client.combo_suite_scan, **kwargs)
         if action == "suite_scan":
-            return await run_blocking(client.suite_scan, **kwargs)
+            return await call_client(client.suite_scan, **kwargs)
         raise ValueError(f"Unknown action: {action}")
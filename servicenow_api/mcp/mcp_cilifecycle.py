@@ -4,11 +4,11 @@
 """
 
 from agent_utilities.mcp.action_dispatch import resolve_action
-from agent_utilities.mcp.concurrency import run_blocking
 from fastmcp import Context, FastMCP
 from fastmcp.dependencies import Depends
 from pydantic import Field
 
+from servicenow_api.async_client import call_client
 from servicenow_api.auth import get_client
 
 
@@ -62,37 +62,35 @@ async def servicenow_cilifecycle(
         action = resolved
 
         if action == "check_ci_lifecycle_compat_actions":
-            return await run_blocking(
-                client.check_ci_lifecycle_compat_actions, **kwargs
-            )
+            return await call_client(client.check_ci_lifecycle_compat_actions, **kwargs)
         if action == "register_ci_lifecycle_operator":
-            return await run_blocking(client.register_ci_lifecycle_operator, **kwargs)
+            return await call_client(client.register_ci_lifecycle_operator, **kwargs)
         if action == "unregister_ci_lifecycle_operator":
-            return await run_blocking(client.unregister_ci_lifecycle_operator, **kwargs)
+            return await call_client(client.unregister_ci_lifecycle_operator, **kwargs)
         if action == "add_ci_lifecycle_action":
-            return await run_blocking(client.add_ci_lifecycle_action, **kwargs)
+            return await call_client(client.add_ci_lifecycle_action, **kwargs)
         if action == "check_ci_lifecycle_lease_expired":
-            return await run_blocking(client.check_ci_lifecycle_lease_expired, **kwargs)
+            return await call_client(client.check_ci_lifecycle_lease_expired, **kwargs)
         if action == "check_ci_lifecycle_not_allowed_action":
-            return await run_blocking(
+            return await call_client(
                 client.check_ci_lifecycle_not_allowed_action, **kwargs
             )
         if action == "check_ci_lifecycle_not_allowed_ops_transition":
-            return await run_blocking(
+            return await call_client(
                 client.check_ci_lifecycle_not_allowed_ops_transition, **kwargs
             )
         if action == "check_ci_lifecycle_requestor_valid":
-            return await run_blocking(
+            return await call_client(
                 client.check_ci_lifecycle_requestor_valid, **kwargs
             )
         if action == "delete_ci_lifecycle_action":
-            return await run_blocking(client.delete_ci_lifecycle_action, **kwargs)
+            return await call_client(client.delete_ci_lifecycle_action, **kwargs)
         if action == "extend_ci_lifecycle_lease":
-            return await run_blocking(client.extend_ci_lifecycle_lease, **kwargs)
+            return await call_client(client.extend_ci_lifecycle_lease, **kwargs)
         if action == "get_ci_lifecycle_active_actions":
-            return await run_blocking(client.get_ci_lifecycle_active_actions, **kwargs)
+            return await call_client(client.get_ci_lifecycle_active_actions, **kwargs)
         if action == "get_ci_lifecycle_status":
-            return await run_blocking(client.get_ci_lifecycle_status, **kwargs)
+            return await call_client(client.get_ci_lifecycle_status, **kwargs)
         if action == "set_ci_lifecycle_status":
-            return await run_blocking(client.set_ci_lifecycle_status, **kwargs)
+            return await call_client(client.set_ci_lifecycle_status, **kwargs)
         raise ValueError(f"Unknown action: {action}")
@@ -4,12 +4,12 @@
 """
 
 from agent_utilities.mcp.action_dispatch import resolve_action
-from agent_utilities.mcp.concurrency import run_blocking
 from fastmcp import Context, FastMCP
 from fastmcp.dependencies import Depends
 from pydantic import Field
 
-from servicenow_api.auth import get_client
+from servicenow_api.async_client import call_client
+from servicenow_api.auth import get_async_client
 
 
 def register_cmdb_tools(mcp: FastMCP):
@@ -21,7 +21,7 @@ async def servicenow_cmdb(
         params_json: str = Field(
             default="{}", description="JSON string of parameters to pass to the action."
         ),
-        client=Depends(get_client),
+        client=Depends(get_async_client),
         ctx: Context | None = Field(
             default=None, description="MCP context for progress reporting"
         ),
@@ -58,21 +58,21 @@ async def servicenow_cmdb(
         action = resolved
 
         if action == "get_cmdb":
-            return await run_blocking(client.get_cmdb, **kwargs)
+            return await call_client(client.get_cmdb, **kwargs)
         if action == "delete_cmdb_relation":
-            return await run_blocking(client.delete_cmdb_relation, **kwargs)
+            return await call_client(client.delete_cmdb_relation, **kwargs)
         if action == "get_cmdb_instances":
-            return await run_blocking(client.get_cmdb_instances, **kwargs)
+            return await call_client(client.get_cmdb_instances, **kwargs)
         if action == "get_cmdb_instance":
-            return await run_blocking(client.get_cmdb_instance, **kwargs)
+            return await call_client(client.get_cmdb_instance, **kwargs)
         if action == "create_cmdb_instance":
-            return await run_blocking(client.create_cmdb_instance, **kwargs)
+            return await call_client(client.create_cmdb_instance, **kwargs)
         if action == "update_cmdb_instance":
-            return await run_blocking(client.update_cmdb_instance, **kwargs)
+            return await call_client(client.update_cmdb_instance, **kwargs)
         if action == "patch_cmdb_instance":
-            return await run_blocking(client.patch_cmdb_instance, **kwargs)
+            return await call_client(client.patch_cmdb_instance, **kwargs)
         if action == "create_cmdb_relation":
-            return await run_blocking(client.create_cmdb_relation, **kwargs)
+            return await call_client(client.create_cmdb_relation, **kwargs)
         if action == "ingest_cmdb_data":
-            return await run_blocking(client.ingest_cmdb_data, **kwargs)
+            return await call_client(client.ingest_cmdb_data, **kwargs)
         raise ValueError(f"Unknown action: {action}")
@@ -4,11 +4,11 @@
 """
 
 from agent_utilities.mcp.action_dispatch import resolve_action
-from agent_utilities.mcp.concurrency import run_blocking
 from fastmcp import Context, FastMCP
 from fastmcp.dependencies import Depends
 from pydantic import Field
 
+from servicenow_api.async_client import call_client
 from servicenow_api.auth import get_client
 
 
@@ -46,5 +46,5 @@ async def servicenow_data_classification(
         action = resolved
 
         if action == "get_data_classification":
-            return await run_blocking(client.get_data_classification, **kwargs)
+            return await call_client(client.get_data_classification, **kwargs)
         raise ValueError(f"Unknown action: {action}")
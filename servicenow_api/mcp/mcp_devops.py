@@ -4,11 +4,11 @@
 """
 
 from agent_utilities.mcp.action_dispatch import resolve_action
-from agent_utilities.mcp.concurrency import run_blocking
 from fastmcp import Context, FastMCP
 from fastmcp.dependencies import Depends
 from pydantic import Field
 
+from servicenow_api.async_client import call_client
 from servicenow_api.auth import get_client
 
 
@@ -57,19 +57,19 @@ async def servicenow_devops(
         action = resolved
 
         if action == "check_devops_change_control":
-            return await run_blocking(client.check_devops_change_control, **kwargs)
+            return await call_client(client.check_devops_change_control, **kwargs)
         if action == "register_devops_artifact":
-            return await run_blocking(client.register_devops_artifact, **kwargs)
+            return await call_client(client.register_devops_artifact, **kwargs)
         if action == "check_devops_step_mapping":
-            return await run_blocking(client.check_devops_step_mapping, **kwargs)
+            return await call_client(client.check_devops_step_mapping, **kwargs)
         if action == "get_devops_change_info":
-            return await run_blocking(client.get_devops_change_info, **kwargs)
+            return await call_client(client.get_devops_change_info, **kwargs)
         if action == "get_devops_code_schema":
-            return await run_blocking(client.get_devops_code_schema, **kwargs)
+            return await call_client(client.get_devops_code_schema, **kwargs)
         if action == "get_devops_onboarding_status":
-            return await run_blocking(client.get_devops_onboarding_status, **kwargs)
+            return await call_client(client.get_devops_onboarding_status, **kwargs)
         if action == "get_devops_orchestration_schema":
-            return await run_blocking(client.get_devops_orchestration_schema, **kwargs)
+            return await call_client(client.get_devops_orchestration_schema, **kwargs)
         if action == "get_devops_plan_schema":
-            return await run_blocking(client.get_devops_plan_schema, **kwargs)
+            return await call_client(client.get_devops_plan_schema, **kwargs)
         raise ValueError(f"Unknown action: {action}")
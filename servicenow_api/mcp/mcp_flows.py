@@ -4,11 +4,11 @@
 """
 
 from agent_utilities.mcp.action_dispatch import resolve_action
-from agent_utilities.mcp.concurrency import run_blocking
 from fastmcp import Context, FastMCP
 from fastmcp.dependencies import Depends
 from pydantic import Field
 
+from servicenow_api.async_client import call_client
 from servicenow_api.auth import get_client
 
 
@@ -48,9 +48,9 @@ async def servicenow_flows(
         action = resolved
 
         if action == "workflow_to_mermaid":
-            return await run_blocking(client.workflow_to_mermaid, **kwargs)
+            return await call_client(client.workflow_to_mermaid, **kwargs)
         if action == "collect_graph_for_roots":
-            return await run_blocking(client.collect_graph_for_roots, **kwargs)
+            return await call_client(client.collect_graph_for_roots, **kwargs)
         if action == "get_flow_metadata":
-            return await run_blocking(client.get_flow_metadata, **kwargs)
+            return await call_client(client.get_flow_metadata, **kwargs)
         raise ValueError(f"Unknown action: {action}")
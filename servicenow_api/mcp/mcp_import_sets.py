@@ -4,11 +4,11 @@
 """
 
 from agent_utilities.mcp.action_dispatch import resolve_action
-from agent_utilities.mcp.concurrency import run_blocking
 from fastmcp import Context, FastMCP
 from fastmcp.dependencies import Depends
 from pydantic import Field
 
+from servicenow_api.async_client import call_client
 from servicenow_api.auth import get_client
 
 
@@ -48,9 +48,9 @@ async def servicenow_import_sets(
         action = resolved
 
         if action == "get_import_set":
-            return await run_blocking(client.get_import_set, **kwargs)
+            return await call_client(client.get_import_set, **kwargs)
         if action == "insert_import_set":
-            return await run_blocking(client.insert_import_set, **kwargs)
+            return await call_client(client.insert_import_set, **kwargs)
         if action == "insert_multiple_import_sets":
-            return await run_blocking(client.insert_multiple_import_sets, **kwargs)
+            return await call_client(client.insert_multiple_import_sets, **kwargs)
         raise ValueError(f"Unknown action: {action}")
@@ -4,12 +4,12 @@
 """
 
 from agent_utilities.mcp.action_dispatch import resolve_action
-from agent_utilities.mcp.concurrency import run_blocking
 from fastmcp import Context, FastMCP
 from fastmcp.dependencies import Depends
 from pydantic import Field
 
-from servicenow_api.auth import get_client
+from servicenow_api.async_client import call_client
+from servicenow_api.auth import get_async_client
 
 
 def register_incidents_tools(mcp: FastMCP):
@@ -21,12 +21,16 @@ async def servicenow_incidents(
         params_json: str = Field(
             default="{}", description="JSON string of parameters to pass to the action."
         ),
-        client=Depends(get_client),
+        client=Depends(get_async_client),
         ctx: Context | None = Field(
             default=None, description="MCP context for progress reporting"
         ),
     ) -> dict:
-        """Manage servicenow incidents operations."""
+        """Manage servicenow incidents operations.
+
+        get_incidents accepts ``"pagination": "keyset"`` (or ``"keyset_updated"``);
+        page on by passing the returned ``next_cursor`` as ``"cursor"``.
+        """
         if ctx:
             await ctx.info("Executing tool...")
         import json
@@ -48,9 +52,9 @@ async def servicenow_incidents(
         action = resolved
 
         if action == "get_incidents":
-            return await run_blocking(client.get_incidents, **kwargs)
+            return await call_client(client.get_incidents, **kwargs)
         if action == "create_incident":
-            return await run_blocking(client.create_incident, **kwargs)
+            return await call_client(client.create_incident, **kwargs)
         if action == "get_incident":
-            return await run_blocking(client.get_incident, **kwargs)
+            return await call_client(client.get_incident, **kwargs)
         raise ValueError(f"Unknown action: {action}")
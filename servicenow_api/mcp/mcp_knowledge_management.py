@@ -4,12 +4,12 @@
 """
 
 from agent_utilities.mcp.action_dispatch import resolve_action
-from agent_utilities.mcp.concurrency import run_blocking
 from fastmcp import Context, FastMCP
 from fastmcp.dependencies import Depends
 from pydantic import Field
 
-from servicenow_api.auth import get_client
+from servicenow_api.async_client import call_client
+from servicenow_api.auth import get_async_client
 
 
 def register_knowledge_management_tools(mcp: FastMCP):
@@ -21,7 +21,7 @@ async def servicenow_knowledge_management(
         params_json: str = Field(
             default="{}", description="JSON string of parameters to pass to the action."
         ),
-        client=Depends(get_client),
+        client=Depends(get_async_client),
         ctx: Context | None = Field(
             default=None, description="MCP context for progress reporting"
         ),
@@ -54,15 +54,15 @@ async def servicenow_knowledge_management(
         action = resolved
 
         if action == "get_knowledge_articles":
-            return await run_blocking(client.get_knowledge_articles, **kwargs)
+            return await call_client(client.get_knowledge_articles, **kwargs)
         if action == "get_knowledge_article":
-            return await run_blocking(client.get_knowledge_article, **kwargs)
+            return await call_client(client.get_knowledge_article, **kwargs)
         if action == "get_knowledge_article_attachment":
-            return await run_blocking(client.get_knowledge_article_attachment, **kwargs)
+            return await call_client(client.get_knowledge_article_attachment, **kwargs)
         if action == "get_featured_knowledge_article":
-            return await run_blocking(client.get_featured_knowledge_article, **kwargs)
+            return await call_client(client.get_featured_knowledge_article, **kwargs)
         if action == "get_most_viewed_knowledge_articles":
-            return await run_blocking(
+            return await call_client(
                 client.get_most_viewed_knowledge_articles, **kwargs
             )
         raise ValueError(f"Unknown action: {action}")
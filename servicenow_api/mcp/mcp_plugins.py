@@ -4,11 +4,11 @@
 """
 
 from agent_utilities.mcp.action_dispatch import resolve_action
-from agent_utilities.mcp.concurrency import run_blocking
 from fastmcp import Context, FastMCP
 from fastmcp.dependencies import Depends
 from pydantic import Field
 
+from servicenow_api.async_client import call_client
 from servicenow_api.auth import get_client
 
 
@@ -46,7 +46,7 @@ async def servicenow_plugins(
         action = resolved
 
         if action == "activate_plugin":
-            return await run_blocking(client.activate_plugin, **kwargs)
+            return await call_client(client.activate_plugin, **kwargs)
         if action == "rollback_plugin":
-            return await run_blocking(client.rollback_plugin, **kwargs)
+            return await call_client(client.rollback_plugin, **kwargs)
         raise ValueError(f"Unknown action: {action}")
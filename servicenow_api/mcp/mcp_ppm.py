@@ -4,11 +4,11 @@
 """
 
 from agent_utilities.mcp.action_dispatch import resolve_action
-from agent_utilities.mcp.concurrency import run_blocking
 from fastmcp import Context, FastMCP
 from fastmcp.dependencies import Depends
 from pydantic import Field
 
+from servicenow_api.async_client import call_client
 from servicenow_api.auth import get_client
 
 
@@ -48,7 +48,7 @@ async def servicenow_ppm(
         action = resolved
 
         if action == "insert_cost_plans":
-            return await run_blocking(client.insert_cost_plans, **kwargs)
+            return await call_client(client.insert_cost_plans, **kwargs)
         if action == "insert_project_tasks":
-            return await run_blocking(client.insert_project_tasks, **kwargs)
+            return await call_client(client.insert_project_tasks, **kwargs)
         raise ValueError(f"Unknown action: {action}")
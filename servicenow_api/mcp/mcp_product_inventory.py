@@ -4,11 +4,11 @@
 """
 
 from agent_utilities.mcp.action_dispatch import resolve_action
-from agent_utilities.mcp.concurrency import run_blocking
 from fastmcp import Context, FastMCP
 from fastmcp.dependencies import Depends
 from pydantic import Field
 
+from servicenow_api.async_client import call_client
 from servicenow_api.auth import get_client
 
 
@@ -48,7 +48,7 @@ async def servicenow_product_inventory(
         action = resolved
 
         if action == "get_product_inventory":
-            return await run_blocking(client.get_product_inventory, **kwargs)
+            return await call_client(client.get_product_inventory, **kwargs)
         if action == "delete_product_inventory":
-            return await run_blocking(client.delete_product_inventory, **kwargs)
+            return await call_client(client.delete_product_inventory, **kwargs)
         raise ValueError(f"Unknown action: {action}")
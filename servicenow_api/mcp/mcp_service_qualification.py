@@ -4,11 +4,11 @@
 """
 
 from agent_utilities.mcp.action_dispatch import resolve_action
-from agent_utilities.mcp.concurrency import run_blocking
 from fastmcp import Context, FastMCP
 from fastmcp.dependencies import Depends
 from pydantic import Field
 
+from servicenow_api.async_client import call_client
 from servicenow_api.auth import get_client
 
 
@@ -52,11 +52,11 @@ async def servicenow_service_qualification(
         action = resolved
 
         if action == "check_service_qualification":
-            return await run_blocking(client.check_service_qualification, **kwargs)
+            return await call_client(client.check_service_qualification, **kwargs)
         if action == "get_service_qualification":
-            return await run_blocking(client.get_service_qualification, **kwargs)
+            return await call_client(client.get_service_qualification, **kwargs)
         if action == "process_service_qualification_result":
-            return await run_blocking(
+            return await call_client(
                 client.process_service_qualification_result, **kwargs
             )
         raise ValueError(f"Unknown action: {action}")
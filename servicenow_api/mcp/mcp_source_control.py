@@ -4,11 +4,11 @@
 """
 
 from agent_utilities.mcp.action_dispatch import resolve_action
-from agent_utilities.mcp.concurrency import run_blocking
 from fastmcp import Context, FastMCP
 from fastmcp.dependencies import Depends
 from pydantic import Field
 
+from servicenow_api.async_client import call_client
 from servicenow_api.auth import get_client
 
 
@@ -48,9 +48,9 @@ async def servicenow_source_control(
         action = resolved
 
         if action == "apply_remote_source_control_changes":
-            return await run_blocking(
+            return await call_client(
                 client.apply_remote_source_control_changes, **kwargs
             )
         if action == "import_repository":
-            return await run_blocking(client.import_repository, **kwargs)
+            return await call_client(client.import_repository, **kwargs)
         raise ValueError(f"Unknown action: {action}")
@@ -4,12 +4,12 @@
 """
 
 from agent_utilities.mcp.action_dispatch import resolve_action
-from agent_utilities.mcp.concurrency import run_blocking
 from fastmcp import Context, FastMCP
 from fastmcp.dependencies import Depends
 from pydantic import Field
 
-from servicenow_api.auth import get_client
+from servicenow_api.async_client import call_client
+from servicenow_api.auth import get_async_client
 
 
 def register_table_api_tools(mcp: FastMCP):
@@ -21,12 +21,19 @@ async def servicenow_table_api(
         params_json: str = Field(
             default="{}", description="JSON string of parameters to pass to the action."
         ),
-        client=Depends(get_client),
+        client=Depends(get_async_client),
         ctx: Context | None = Field(
             default=None, description="MCP context for progress reporting"
         ),
     ) -> dict:
-        """Manage servicenow table api operations."""
+        """Manage servicenow table api operations.
+
+        For deep result sets pass ``"pagination": "keyset"`` (or ``"keyset_updated"``)
+        to get_table and feed the returned ``next_cursor`` back as ``"cursor"``;
+        unlike ``sysparm_offset`` the cost per page stays flat. Pass
+        ``"use_mirror": true`` to get_table to answer from the local SQLite mirror
+        (falling back to the instance for queries it cannot answer).
+        """
         if ctx:
             ctx.info("Executing tool...")
         import json
@@ -37,6 +44,7 @@ async def servicenow_table_api(
             return {"error": "Operation failed"}
 
         kwargs = {k: v for k, v in kwargs.items() if v is not None}
+        use_mirror = bool(kwargs.pop("use_mirror", False))
 
         resolved = resolve_action(
             action,
@@ -55,15 +63,17 @@ async def servicenow_table_api(
         action = resolved
 
         if action == "delete_table_record":
-            return await run_blocking(client.delete_table_record, **kwargs)
+            return await call_client(client.delete_table_record, **kwargs)
         if action == "get_table":
-            return await run_blocking(client.get_table, **kwargs)
+            if use_mirror:
+                return await call_client(client.query_mirror, **kwargs)
+            return await call_client(client.get_table, **kwargs)
         if action == "get_table_record":
-            return await run_blocking(client.get_table_record, **kwargs)
+            return await call_client(client.get_table_record, **kwargs)
         if action == "patch_table_record":
-            return await run_blocking(client.patch_table_record, **kwargs)
+            return await call_client(client.patch_table_record, **kwargs)
         if action == "update_table_record":
-            return await run_blocking(client.update_table_record, **kwargs)
+            return await call_client(client.update_table_record, **kwargs)
         if action == "add_table_record":
-            return await run_blocking(client.add_table_record, **kwargs)
+            return await call_client(client.add_table_record, **kwargs)
         raise ValueError(f"Unknown action: {action}")
@@ -4,11 +4,11 @@
 """
 
 from agent_utilities.mcp.action_dispatch import resolve_action
-from agent_utilities.mcp.concurrency import run_blocking
 from fastmcp import Context, FastMCP
 from fastmcp.dependencies import Depends
 from pydantic import Field
 
+from servicenow_api.async_client import call_client
 from servicenow_api.auth import get_client
 
 
@@ -55,15 +55,15 @@ async def servicenow_update_sets(
         action = resolved
 
         if action == "update_set_create":
-            return await run_blocking(client.update_set_create, **kwargs)
+            return await call_client(client.update_set_create, **kwargs)
         if action == "update_set_retrieve":
-            return await run_blocking(client.update_set_retrieve, **kwargs)
+            return await call_client(client.update_set_retrieve, **kwargs)
         if action == "update_set_preview":
-            return await run_blocking(client.update_set_preview, **kwargs)
+            return await call_client(client.update_set_preview, **kwargs)
         if action == "update_set_commit":
-            return await run_blocking(client.update_set_commit, **kwargs)
+            return await call_client(client.update_set_commit, **kwargs)
         if action == "update_set_commit_multiple":
-            return await run_blocking(client.update_set_commit_multiple, **kwargs)
+            return await call_client(client.update_set_commit_multiple, **kwargs)
         if action == "update_set_back_out":
-            return await run_blocking(client.update_set_back_out, **kwargs)
+            return await call_client(client.update_set_back_out, **kwargs)
         raise ValueError(f"Unknown action: {action}")
@@ -25,7 +25,6 @@
 import httpx
 from agent_utilities.core.config import load_config, setting
 from agent_utilities.mcp.action_dispatch import resolve_action
-from agent_utilities.mcp.concurrency import run_blocking
 from agent_utilities.mcp.server_factory import (
     create_mcp_server,
 )
@@ -35,7 +34,8 @@
 from agent_utilities.mcp.verbose_tools import register_tool_surface
 
 from servicenow_api.api_client import Api
-from servicenow_api.auth import get_client
+from servicenow_api.async_client import call_client
+from servicenow_api.auth import get_async_client, get_client
 from servicenow_api.sdk_client import get_sdk_client
 
 __version__ = "2.2.0"
@@ -54,7 +54,7 @@ async def servicenow_ingest_incidents(
             default="{}",
             description="JSON string of get_incidents filters (e.g. sysparm_limit, sysparm_query, sysparm_display_value).",
         ),
-        client=Depends(get_client),
+        client=Depends(get_async_client),
         ctx: Context | None = Field(
             default=None, description="MCP context for progress reporting"
         ),
@@ -82,12 +82,18 @@ async def servicenow_ingest_incidents(
             return {"error": "Operation failed"}
         kwargs = {k: v for k, v in kwargs.items() if v is not None}
 
-        resp = await run_blocking(client.get_incidents, **kwargs)
+        resp = await call_client(client.get_incidents, **kwargs)
         data = getattr(resp, "result", resp)
         records = data if isinstance(data, list) else [data]
         records = [r for r in records if r is not None]
+        choices = None
+        if str(kwargs.get("sysparm_display_value", "")).lower() in ("", "false"):
+            try:
+                choices = await call_client(client.get_choice_cache)
+            except Exception:
+                choices = None
         try:
-            result = ingest_incidents(records)
+            result = ingest_incidents(records, choices=choices)
         except NativeIngestError:
             return {"listed": len(records), "ingested": None}
         return {"listed": len(records), "ingested": result}
@@ -129,11 +135,11 @@ async def servicenow_flows(
         action = resolved
 
         if action == "workflow_to_mermaid":
-            return await run_blocking(client.workflow_to_mermaid, **kwargs)
+            return await call_client(client.workflow_to_mermaid, **kwargs)
         if action == "collect_graph_for_roots":
-            return await run_blocking(client.collect_graph_for_roots, **kwargs)
+            return await call_client(client.collect_graph_for_roots, **kwargs)
         if action == "get_flow_metadata":
-            return await run_blocking(client.get_flow_metadata, **kwargs)
+            return await call_client(client.get_flow_metadata, **kwargs)
         raise ValueError(f"Unknown action: {action}")
 
 
@@ -169,7 +175,7 @@ async def servicenow_application(
         action = resolved
 
         if action == "get_application":
-            return await run_blocking(client.get_application, **kwargs)
+            return await call_client(client.get_application, **kwargs)
         raise ValueError(f"Unknown action: {action}")
 
 
@@ -182,7 +188,7 @@ async def servicenow_cmdb(
         params_json: str = Field(
             default="{}", description="JSON string of parameters to pass to the action."
         ),
-        client=Depends(get_client),
+        client=Depends(get_async_client),
         ctx: Context | None = Field(
             default=None, description="MCP context for progress reporting"
         ),
@@ -219,23 +225,23 @@ async def servicenow_cmdb(
         action = resolved
 
         if action == "get_cmdb":
-            return await run_blocking(client.get_cmdb, **kwargs)
+            return await call_client(client.get_cmdb, **kwargs)
         if action == "delete_cmdb_relation":
-            return await run_blocking(client.delete_cmdb_relation, **kwargs)
+            return await call_client(client.delete_cmdb_relation, **kwargs)
         if action == "get_cmdb_instances":
-            return await run_blocking(client.get_cmdb_instances, **kwargs)
+            return await call_client(client.get_cmdb_instances, **kwargs)
         if action == "get_cmdb_instance":
-            return await run_blocking(client.get_cmdb_instance, **kwargs)
+            return await call_client(client.get_cmdb_instance, **kwargs)
         if action == "create_cmdb_instance":
-            return await run_blocking(client.create_cmdb_instance, **kwargs)
+            return await call_client(client.create_cmdb_instance, **kwargs)
         if action == "update_cmdb_instance":
-            return await run_blocking(client.update_cmdb_instance, **kwargs)
+            return await call_client(client.update_cmdb_instance, **kwargs)
         if action == "patch_cmdb_instance":
-            return await run_blocking(client.patch_cmdb_instance, **kwargs)
+            return await call_client(client.patch_cmdb_instance, **kwargs)
         if action == "create_cmdb_relation":
-            return await run_blocking(client.create_cmdb_relation, **kwargs)
+            return await call_client(client.create_cmdb_relation, **kwargs)
         if action == "ingest_cmdb_data":
-            return await run_blocking(client.ingest_cmdb_data, **kwargs)
+            return await call_client(client.ingest_cmdb_data, **kwargs)
         raise ValueError(f"Unknown action: {action}")
 
 
@@ -248,7 +254,7 @@ async def servicenow_cicd(
         params_json: str = Field(
             default="{}", description="JSON string of parameters to pass to the action."
         ),
-        client=Depends(get_client),
+        client=Depends(get_async_client),
         ctx: Context | None = Field(
             default=None, description="MCP context for progress reporting"
         ),
@@ -288,29 +294,29 @@ async def servicenow_cicd(
         action = resolved
 
         if action == "batch_install_result":
-            return await run_blocking(client.batch_install_result, **kwargs)
+            return await call_client(client.batch_install_result, **kwargs)
         if action == "instance_scan_progress":
-            return await run_blocking(client.instance_scan_progress, **kwargs)
+            return await call_client(client.instance_scan_progress, **kwargs)
         if action == "progress":
-            return await run_blocking(client.progress, **kwargs)
+            return await call_client(client.progress, **kwargs)
         if action == "batch_install":
-            return await run_blocking(client.batch_install, **kwargs)
+            return await call_client(client.batch_install, **kwargs)
         if action == "batch_rollback":
-            return await run_blocking(client.batch_rollback, **kwargs)
+            return await call_client(client.batch_rollback, **kwargs)
         if action == "app_repo_install":
-            return await run_blocking(client.app_repo_install, **kwargs)
+            return await call_client(client.app_repo_install, **kwargs)
         if action == "app_repo_publish":
-            return await run_blocking(client.app_repo_publish, **kwargs)
+            return await call_client(client.app_repo_publish, **kwargs)
         if action == "app_repo_rollback":
-            return await run_blocking(client.app_repo_rollback, **kwargs)
+            return await call_client(client.app_repo_rollback, **kwargs)
         if action == "full_scan":
-            return await run_blocking(client.full_scan, **kwargs)
+            return await call_client(client.full_scan, **kwargs)
         if action == "point_scan":
-            return await run_blocking(client.point_scan, **kwargs)
+            return await call_client(client.point_scan, **kwargs)
         if action == "combo_suite_scan":
-            return await run_blocking(client.combo_suite_scan, **kwargs)
+            return await call_client(client.combo_suite_scan, **kwargs)
         if action == "suite_scan":
-            return await run_blocking(client.suite_scan, **kwargs)
+            return await call_client(client.suite_scan, **kwargs)
         raise ValueError(f"Unknown action: {action}")
 
 
@@ -348,9 +354,9 @@ async def servicenow_plugins(
         action = resolved
 
         if action == "activate_plugin":
-            return await run_blocking(client.activate_plugin, **kwargs)
+            return await call_client(client.activate_plugin, **kwargs)
         if action == "rollback_plugin":
-            return await run_blocking(client.rollback_plugin, **kwargs)
+            return await call_client(client.rollback_plugin, **kwargs)
         raise ValueError(f"Unknown action: {action}")
 
 
@@ -390,11 +396,11 @@ async def servicenow_source_control(
         action = resolved
 
         if action == "apply_remote_source_control_changes":
-            return await run_blocking(
+            return await call_client(
                 client.apply_remote_source_control_changes, **kwargs
             )
         if action == "import_repository":
-            return await run_blocking(client.import_repository, **kwargs)
+            return await call_client(client.import_repository, **kwargs)
         raise ValueError(f"Unknown action: {action}")
 
 
@@ -430,7 +436,7 @@ async def servicenow_testing(
         action = resolved
 
         if action == "run_test_suite":
-            return await run_blocking(client.run_test_suite, **kwargs)
+            return await call_client(client.run_test_suite, **kwargs)
         raise ValueError(f"Unknown action: {action}")
 
 
@@ -477,17 +483,17 @@ async def servicenow_update_sets(
         action = resolved
 
         if action == "update_set_create":
-            return await run_blocking(client.update_set_create, **kwargs)
+            return await call_client(client.update_set_create, **kwargs)
         if action == "update_set_retrieve":
-            return await run_blocking(client.update_set_retrieve, **kwargs)
+            return await call_client(client.update_set_retrieve, **kwargs)
         if action == "update_set_preview":
-            return await run_blocking(client.update_set_preview, **kwargs)
+            return await call_client(client.update_set_preview, **kwargs)
         if action == "update_set_commit":
-            return await run_blocking(client.update_set_commit, **kwargs)
+            return await call_client(client.update_set_commit, **kwargs)
         if action == "update_set_commit_multiple":
-            return await run_blocking(client.update_set_commit_multiple, **kwargs)
+            return await call_client(client.update_set_commit_multiple, **kwargs)
         if action == "update_set_back_out":
-            return await run_blocking(client.update_set_back_out, **kwargs)
+            return await call_client(client.update_set_back_out, **kwargs)
         raise ValueError(f"Unknown action: {action}")
 
 
@@ -523,7 +529,7 @@ async def servicenow_batch(
         action = resolved
 
         if action == "batch_request":
-            return await run_blocking(client.batch_request, **kwargs)
+            return await call_client(client.batch_request, **kwargs)
         raise ValueError(f"Unknown action: {action}")
 
 
@@ -536,12 +542,16 @@ async def servicenow_change_management(
         params_json: str = Field(
             default="{}", description="JSON string of parameters to pass to the action."
         ),
-        client=Depends(get_client),
+        client=Depends(get_async_client),
         ctx: Context | None = Field(
             default=None, description="MCP context for progress reporting"
         ),
     ) -> dict:
-        """Manage servicenow change management operations."""
+        """Manage servicenow change management operations.
+
+        get_change_requests with ``sysparm_limit`` and ``"pagination": "keyset"``
+        walks every page by sys_id instead of by ``sysparm_offset``.
+        """
         if ctx:
             ctx.info("Executing tool...")
         import json
@@ -589,69 +599,67 @@ async def servicenow_change_management(
         action = resolved
 
         if action == "get_change_requests":
-            return await run_blocking(client.get_change_requests, **kwargs)
+            return await call_client(client.get_change_requests, **kwargs)
         if action == "get_change_request_nextstate":
-            return await run_blocking(client.get_change_request_nextstate, **kwargs)
+            return await call_client(client.get_change_request_nextstate, **kwargs)
         if action == "get_change_request_schedule":
-            return await run_blocking(client.get_change_request_schedule, **kwargs)
+            return await call_client(client.get_change_request_schedule, **kwargs)
         if action == "get_change_request_tasks":
-            return await run_blocking(client.get_change_request_tasks, **kwargs)
+            return await call_client(client.get_change_request_tasks, **kwargs)
         if action == "get_change_request":
-            return await run_blocking(client.get_change_request, **kwargs)
+            return await call_client(client.get_change_request, **kwargs)
         if action == "get_change_request_ci":
-            return await run_blocking(client.get_change_request_ci, **kwargs)
+            return await call_client(client.get_change_request_ci, **kwargs)
         if action == "get_change_request_conflict":
-            return await run_blocking(client.get_change_request_conflict, **kwargs)
+            return await call_client(client.get_change_request_conflict, **kwargs)
         if action == "get_standard_change_request_templates":
-            return await run_blocking(
+            return await call_client(
                 client.get_standard_change_request_templates, **kwargs
             )
         if action == "get_change_request_models":
-            return await run_blocking(client.get_change_request_models, **kwargs)
+            return await call_client(client.get_change_request_models, **kwargs)
         if action == "get_standard_change_request_model":
-            return await run_blocking(
-                client.get_standard_change_request_model, **kwargs
-            )
+            return await call_client(client.get_standard_change_request_model, **kwargs)
         if action == "get_standard_change_request_template":
-            return await run_blocking(
+            return await call_client(
                 client.get_standard_change_request_template, **kwargs
             )
         if action == "get_change_request_worker":
-            return await run_blocking(client.get_change_request_worker, **kwargs)
+            return await call_client(client.get_change_request_worker, **kwargs)
         if action == "create_change_request":
-            return await run_blocking(client.create_change_request, **kwargs)
+            return await call_client(client.create_change_request, **kwargs)
         if action == "create_change_request_task":
-            return await run_blocking(client.create_change_request_task, **kwargs)
+            return await call_client(client.create_change_request_task, **kwargs)
         if action == "create_change_request_ci_association":
-            return await run_blocking(
+            return await call_client(
                 client.create_change_request_ci_association, **kwargs
             )
         if action == "calculate_standard_change_request_risk":
-            return await run_blocking(
+            return await call_client(
                 client.calculate_standard_change_request_risk, **kwargs
             )
         if action == "check_change_request_conflict":
-            return await run_blocking(client.check_change_request_conflict, **kwargs)
+            return await call_client(client.check_change_request_conflict, **kwargs)
         if action == "refresh_change_request_impacted_services":
-            return await run_blocking(
+            return await call_client(
                 client.refresh_change_request_impacted_services, **kwargs
             )
         if action == "approve_change_request":
-            return await run_blocking(client.approve_change_request, **kwargs)
+            return await call_client(client.approve_change_request, **kwargs)
         if action == "update_change_request":
-            return await run_blocking(client.update_change_request, **kwargs)
+            return await call_client(client.update_change_request, **kwargs)
         if action == "update_change_request_first_available":
-            return await run_blocking(
+            return await call_client(
                 client.update_change_request_first_available, **kwargs
             )
         if action == "update_change_request_task":
-            return await run_blocking(client.update_change_request_task, **kwargs)
+            return await call_client(client.update_change_request_task, **kwargs)
         if action == "delete_change_request":
-            return await run_blocking(client.delete_change_request, **kwargs)
+            return await call_client(client.delete_change_request, **kwargs)
         if action == "delete_change_request_task":
-            return await run_blocking(client.delete_change_request_task, **kwargs)
+            return await call_client(client.delete_change_request_task, **kwargs)
         if action == "delete_change_request_conflict_scan":
-            return await run_blocking(
+            return await call_client(
                 client.delete_change_request_conflict_scan, **kwargs
             )
         raise ValueError(f"Unknown action: {action}")
@@ -707,39 +715,37 @@ async def servicenow_cilifecycle(
         action = resolved
 
         if action == "check_ci_lifecycle_compat_actions":
-            return await run_blocking(
-                client.check_ci_lifecycle_compat_actions, **kwargs
-            )
+            return await call_client(client.check_ci_lifecycle_compat_actions, **kwargs)
         if action == "register_ci_lifecycle_operator":
-            return await run_blocking(client.register_ci_lifecycle_operator, **kwargs)
+            return await call_client(client.register_ci_lifecycle_operator, **kwargs)
         if action == "unregister_ci_lifecycle_operator":
-            return await run_blocking(client.unregister_ci_lifecycle_operator, **kwargs)
+            return await call_client(client.unregister_ci_lifecycle_operator, **kwargs)
         if action == "add_ci_lifecycle_action":
-            return await run_blocking(client.add_ci_lifecycle_action, **kwargs)
+            return await call_client(client.add_ci_lifecycle_action, **kwargs)
         if action == "check_ci_lifecycle_lease_expired":
-            return await run_blocking(client.check_ci_lifecycle_lease_expired, **kwargs)
+            return await call_client(client.check_ci_lifecycle_lease_expired, **kwargs)
         if action == "check_ci_lifecycle_not_allowed_action":
-            return await run_blocking(
+            return await call_client(
                 client.check_ci_lifecycle_not_allowed_action, **kwargs
             )
         if action == "check_ci_lifecycle_not_allowed_ops_transition":
-            return await run_blocking(
+            return await call_client(
                 client.check_ci_lifecycle_not_allowed_ops_transition, **kwargs
             )
         if action == "check_ci_lifecycle_requestor_valid":
-            return await run_blocking(
+            return await call_client(
                 client.check_ci_lifecycle_requestor_valid, **kwargs
             )
         if action == "delete_ci_lifecycle_action":
-            return await run_blocking(client.delete_ci_lifecycle_action, **kwargs)
+            return await call_client(client.delete_ci_lifecycle_action, **kwargs)
         if action == "extend_ci_lifecycle_lease":
-            return await run_blocking(client.extend_ci_lifecycle_lease, **kwargs)
+            return await call_client(client.extend_ci_lifecycle_lease, **kwargs)
         if action == "get_ci_lifecycle_active_actions":
-            return await run_blocking(client.get_ci_lifecycle_active_actions, **kwargs)
+            return await call_client(client.get_ci_lifecycle_active_actions, **kwargs)
         if action == "get_ci_lifecycle_status":
-            return await run_blocking(client.get_ci_lifecycle_status, **kwargs)
+            return await call_client(client.get_ci_lifecycle_status, **kwargs)
         if action == "set_ci_lifecycle_status":
-            return await run_blocking(client.set_ci_lifecycle_status, **kwargs)
+            return await call_client(client.set_ci_lifecycle_status, **kwargs)
         raise ValueError(f"Unknown action: {action}")
 
 
@@ -788,21 +794,21 @@ async def servicenow_devops(
         action = resolved
 
         if action == "check_devops_change_control":
-            return await run_blocking(client.check_devops_change_control, **kwargs)
+            return await call_client(client.check_devops_change_control, **kwargs)
         if action == "register_devops_artifact":
-            return await run_blocking(client.register_devops_artifact, **kwargs)
+            return await call_client(client.register_devops_artifact, **kwargs)
         if action == "check_devops_step_mapping":
-            return await run_blocking(client.check_devops_step_mapping, **kwargs)
+            return await call_client(client.check_devops_step_mapping, **kwargs)
         if action == "get_devops_change_info":
-            return await run_blocking(client.get_devops_change_info, **kwargs)
+            return await call_client(client.get_devops_change_info, **kwargs)
         if action == "get_devops_code_schema":
-            return await run_blocking(client.get_devops_code_schema, **kwargs)
+            return await call_client(client.get_devops_code_schema, **kwargs)
         if action == "get_devops_onboarding_status":
-            return await run_blocking(client.get_devops_onboarding_status, **kwargs)
+            return await call_client(client.get_devops_onboarding_status, **kwargs)
         if action == "get_devops_orchestration_schema":
-            return await run_blocking(client.get_devops_orchestration_schema, **kwargs)
+            return await call_client(client.get_devops_orchestration_schema, **kwargs)
         if action == "get_devops_plan_schema":
-            return await run_blocking(client.get_devops_plan_schema, **kwargs)
+            return await call_client(client.get_devops_plan_schema, **kwargs)
         raise ValueError(f"Unknown action: {action}")
 
 
@@ -842,11 +848,11 @@ async def servicenow_import_sets(
         action = resolved
 
         if action == "get_import_set":
-            return await run_blocking(client.get_import_set, **kwargs)
+            return await call_client(client.get_import_set, **kwargs)
         if action == "insert_import_set":
-            return await run_blocking(client.insert_import_set, **kwargs)
+            return await call_client(client.insert_import_set, **kwargs)
         if action == "insert_multiple_import_sets":
-            return await run_blocking(client.insert_multiple_import_sets, **kwargs)
+            return await call_client(client.insert_multiple_import_sets, **kwargs)
         raise ValueError(f"Unknown action: {action}")
 
 
@@ -859,12 +865,19 @@ async def servicenow_incidents(
         params_json: str = Field(
             default="{}", description="JSON string of parameters to pass to the action."
         ),
-        client=Depends(get_client),
+        client=Depends(get_async_client),
         ctx: Context | None = Field(
             default=None, description="MCP context for progress reporting"
         ),
     ) -> dict:
-        """Manage servicenow incidents operations."""
+        """Manage servicenow incidents operations.
+
+        get_incidents accepts ``"pagination": "keyset"`` (or ``"keyset_updated"``);
+        page on by passing the returned ``next_cursor`` as ``"cursor"``.
+        Pass ``"result_mode": "dicts"`` to skip per-row model validation and
+        ``"resolve_references": true`` to fill reference display values from the
+        client's cache instead of requesting ``sysparm_display_value``.
+        """
         if ctx:
             await ctx.info("Executing tool...")
         import json
@@ -892,15 +905,15 @@ async def servicenow_incidents(
         action = resolved
 
         if action == "get_incidents":
-            return await run_blocking(client.get_incidents, **kwargs)
+            return await call_client(client.get_incidents, **kwargs)
         if action == "create_incident":
-            return await run_blocking(client.create_incident, **kwargs)
+            return await call_client(client.create_incident, **kwargs)
         if action == "get_incident":
-            return await run_blocking(client.get_incident, **kwargs)
+            return await call_client(client.get_incident, **kwargs)
         if action == "update_incident":
-            return await run_blocking(client.update_incident, **kwargs)
+            return await call_client(client.update_incident, **kwargs)
         if action == "delete_incident":
-            return await run_blocking(client.delete_incident, **kwargs)
+            return await call_client(client.delete_incident, **kwargs)
         raise ValueError(f"Unknown action: {action}")
 
 
@@ -913,7 +926,7 @@ async def servicenow_problem(
         params_json: str = Field(
             default="{}", description="JSON string of parameters to pass to the action."
         ),
-        client=Depends(get_client),
+        client=Depends(get_async_client),
         ctx: Context | None = Field(
             default=None, description="MCP context for progress reporting"
         ),
@@ -946,15 +959,15 @@ async def servicenow_problem(
         action = resolved
 
         if action == "get_problems":
-            return await run_blocking(client.get_problems, **kwargs)
+            return await call_client(client.get_problems, **kwargs)
         if action == "get_problem":
-            return await run_blocking(client.get_problem, **kwargs)
+            return await call_client(client.get_problem, **kwargs)
         if action == "create_problem":
-            return await run_blocking(client.create_problem, **kwargs)
+            return await call_client(client.create_problem, **kwargs)
         if action == "update_problem":
-            return await run_blocking(client.update_problem, **kwargs)
+            return await call_client(client.update_problem, **kwargs)
         if action == "delete_problem":
-            return await run_blocking(client.delete_problem, **kwargs)
+            return await call_client(client.delete_problem, **kwargs)
         raise ValueError(f"Unknown action: {action}")
 
 
@@ -967,7 +980,7 @@ async def servicenow_knowledge_management(
         params_json: str = Field(
             default="{}", description="JSON string of parameters to pass to the action."
         ),
-        client=Depends(get_client),
+        client=Depends(get_async_client),
         ctx: Context | None = Field(
             default=None, description="MCP context for progress reporting"
         ),
@@ -1000,15 +1013,15 @@ async def servicenow_knowledge_management(
         action = resolved
 
         if action == "get_knowledge_articles":
-            return await run_blocking(client.get_knowledge_articles, **kwargs)
+            return await call_client(client.get_knowledge_articles, **kwargs)
         if action == "get_knowledge_article":
-            return await run_blocking(client.get_knowledge_article, **kwargs)
+            return await call_client(client.get_knowledge_article, **kwargs)
         if action == "get_knowledge_article_attachment":
-            return await run_blocking(client.get_knowledge_article_attachment, **kwargs)
+            return await call_client(client.get_knowledge_article_attachment, **kwargs)
         if action == "get_featured_knowledge_article":
-            return await run_blocking(client.get_featured_knowledge_article, **kwargs)
+            return await call_client(client.get_featured_knowledge_article, **kwargs)
         if action == "get_most_viewed_knowledge_articles":
-            return await run_blocking(
+            return await call_client(
                 client.get_most_viewed_knowledge_articles, **kwargs
             )
         raise ValueError(f"Unknown action: {action}")
@@ -1023,12 +1036,22 @@ async def servicenow_table_api(
         params_json: str = Field(
             default="{}", description="JSON string of parameters to pass to the action."
         ),
-        client=Depends(get_client),
+        client=Depends(get_async_client),
         ctx: Context | None = Field(
             default=None, description="MCP context for progress reporting"
         ),
     ) -> dict:
-        """Manage servicenow table api operations."""
+        """Manage servicenow table api operations.
+
+        For deep result sets pass ``"pagination": "keyset"`` (or ``"keyset_updated"``)
+        to get_table and feed the returned ``next_cursor`` back as ``"cursor"``;
+        unlike ``sysparm_offset`` the cost per page stays flat. Pass
+        ``"use_mirror": true`` to get_table to answer from the local SQLite mirror
+        (falling back to the instance for queries it cannot answer).
+        ``"result_mode": "dicts"`` returns the raw rows without per-row validation.
+        ``"resolve_references": true`` fills reference display values from the
+        client's cache instead of requesting ``sysparm_display_value``.
+        """
         if ctx:
             ctx.info("Executing tool...")
         import json
@@ -1039,6 +1062,7 @@ async def servicenow_table_api(
             return {"error": "Operation failed"}
 
         kwargs = {k: v for k, v in kwargs.items() if v is not None}
+        use_mirror = bool(kwargs.pop("use_mirror", False))
 
         resolved = resolve_action(
             action,
@@ -1057,17 +1081,19 @@ async def servicenow_table_api(
         action = resolved
 
         if action == "delete_table_record":
-            return await run_blocking(client.delete_table_record, **kwargs)
+            return await call_client(client.delete_table_record, **kwargs)
         if action == "get_table":
-            return await run_blocking(client.get_table, **kwargs)
+            if use_mirror:
+                return await call_client(client.query_mirror, **kwargs)
+            return await call_client(client.get_table, **kwargs)
         if action == "get_table_record":
-            return await run_blocking(client.get_table_record, **kwargs)
+            return await call_client(client.get_table_record, **kwargs)
         if action == "patch_table_record":
-            return await run_blocking(client.patch_table_record, **kwargs)
+            return await call_client(client.patch_table_record, **kwargs)
         if action == "update_table_record":
-            return await run_blocking(client.update_table_record, **kwargs)
+            return await call_client(client.update_table_record, **kwargs)
         if action == "add_table_record":
-            return await run_blocking(client.add_table_record, **kwargs)
+            return await call_client(client.add_table_record, **kwargs)
         raise ValueError(f"Unknown action: {action}")
 
 
@@ -1105,7 +1131,7 @@ async def servicenow_auth(
         action = resolved
 
         if action == "refresh_auth_token":
-            return await run_blocking(client.refresh_auth_token, **kwargs)
+            return await call_client(client.refresh_auth_token, **kwargs)
         raise ValueError(f"Unknown action: {action}")
 
 
@@ -1141,7 +1167,7 @@ async def servicenow_custom_api(
         action = resolved
 
         if action == "api_request":
-            return await run_blocking(client.api_request, **kwargs)
+            return await call_client(client.api_request, **kwargs)
         raise ValueError(f"Unknown action: {action}")
 
 
@@ -1177,7 +1203,7 @@ async def servicenow_email(
         action = resolved
 
         if action == "send_email":
-            return await run_blocking(client.send_email, **kwargs)
+            return await call_client(client.send_email, **kwargs)
         raise ValueError(f"Unknown action: {action}")
 
 
@@ -1215,7 +1241,7 @@ async def servicenow_data_classification(
         action = resolved
 
         if action == "get_data_classification":
-            return await run_blocking(client.get_data_classification, **kwargs)
+            return await call_client(client.get_data_classification, **kwargs)
         raise ValueError(f"Unknown action: {action}")
 
 
@@ -1251,7 +1277,7 @@ async def servicenow_aggregate(
         action = resolved
 
         if action == "get_stats":
-            return await run_blocking(client.get_stats, **kwargs)
+            return await call_client(client.get_stats, **kwargs)
         raise ValueError(f"Unknown action: {action}")
 
 
@@ -1289,7 +1315,7 @@ async def servicenow_activity_subscriptions(
         action = resolved
 
         if action == "get_activity_subscriptions":
-            return await run_blocking(client.get_activity_subscriptions, **kwargs)
+            return await call_client(client.get_activity_subscriptions, **kwargs)
         raise ValueError(f"Unknown action: {action}")
 
 
@@ -1325,7 +1351,7 @@ async def servicenow_account(
         action = resolved
 
         if action == "get_account":
-            return await run_blocking(client.get_account, **kwargs)
+            return await call_client(client.get_account, **kwargs)
         raise ValueError(f"Unknown action: {action}")
 
 
@@ -1361,7 +1387,7 @@ async def servicenow_hr(
         action = resolved
 
         if action == "get_hr_profile":
-            return await run_blocking(client.get_hr_profile, **kwargs)
+            return await call_client(client.get_hr_profile, **kwargs)
         raise ValueError(f"Unknown action: {action}")
 
 
@@ -1399,7 +1425,7 @@ async def servicenow_metricbase(
         action = resolved
 
         if action == "metricbase_insert":
-            return await run_blocking(client.metricbase_insert, **kwargs)
+            return await call_client(client.metricbase_insert, **kwargs)
         raise ValueError(f"Unknown action: {action}")
 
 
@@ -1439,11 +1465,11 @@ async def servicenow_attachment(
         action = resolved
 
         if action == "get_attachment":
-            return await run_blocking(client.get_attachment, **kwargs)
+            return await call_client(client.get_attachment, **kwargs)
         if action == "upload_attachment":
-            return await run_blocking(client.upload_attachment, **kwargs)
+            return await call_client(client.upload_attachment, **kwargs)
         if action == "delete_attachment":
-            return await run_blocking(client.delete_attachment, **kwargs)
+            return await call_client(client.delete_attachment, **kwargs)
         raise ValueError(f"Unknown action: {action}")
 
 
@@ -1487,11 +1513,11 @@ async def servicenow_service_qualification(
         action = resolved
 
         if action == "check_service_qualification":
-            return await run_blocking(client.check_service_qualification, **kwargs)
+            return await call_client(client.check_service_qualification, **kwargs)
         if action == "get_service_qualification":
-            return await run_blocking(client.get_service_qualification, **kwargs)
+            return await call_client(client.get_service_qualification, **kwargs)
         if action == "process_service_qualification_result":
-            return await run_blocking(
+            return await call_client(
                 client.process_service_qualification_result, **kwargs
             )
         raise ValueError(f"Unknown action: {action}")
@@ -1533,9 +1559,9 @@ async def servicenow_ppm(
         action = resolved
 
         if action == "insert_cost_plans":
-            return await run_blocking(client.insert_cost_plans, **kwargs)
+            return await call_client(client.insert_cost_plans, **kwargs)
         if action == "insert_project_tasks":
-            return await run_blocking(client.insert_project_tasks, **kwargs)
+            return await call_client(client.insert_project_tasks, **kwargs)
         raise ValueError(f"Unknown action: {action}")
 
 
@@ -1575,9 +1601,9 @@ async def servicenow_product_inventory(
         action = resolved
 
         if action == "get_product_inventory":
-            return await run_blocking(client.get_product_inventory, **kwargs)
+            return await call_client(client.get_product_inventory, **kwargs)
         if action == "delete_product_inventory":
-            return await run_blocking(client.delete_product_inventory, **kwargs)
+            return await call_client(client.delete_product_inventory, **kwargs)
         raise ValueError(f"Unknown action: {action}")
 
 
@@ -1628,17 +1654,17 @@ async def servicenow_sdk(
         action = resolved
 
         if action == "init":
-            return await run_blocking(client.init, **kwargs)
+            return await call_client(client.init, **kwargs)
         if action == "auth":
-            return await run_blocking(client.auth, **kwargs)
+            return await call_client(client.auth, **kwargs)
         if action == "build":
-            return await run_blocking(client.build, **kwargs)
+            return await call_client(client.build, **kwargs)
         if action == "deploy":
-            return await run_blocking(client.deploy, **kwargs)
+            return await call_client(client.deploy, **kwargs)
         if action == "transform":
-            return await run_blocking(client.transform, **kwargs)
+            return await call_client(client.transform, **kwargs)
         if action == "dependencies":
-            return await run_blocking(client.dependencies, **kwargs)
+            return await call_client(client.dependencies, **kwargs)
         raise ValueError(f"Unknown action: {action}")
 
 
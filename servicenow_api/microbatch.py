@@ -0,0 +1,396 @@
+#!/usr/bin/python
+"""Opt-in micro-batching of concurrent GET requests into ``/api/now/v1/batch`` calls.
+
+Agents and MCP sessions often issue many small reads at once, such as
+``get_table_record`` or ``get_incident`` by id. Each one pays a full round trip.
+With micro-batching enabled, GETs that arrive within a few milliseconds of each
+other are collected and sent as the :class:`~servicenow_api.servicenow_models.BatchRequestItem`
+entries of a single :class:`~servicenow_api.servicenow_models.BatchRequest`.
+Each :class:`~servicenow_api.servicenow_models.BatchResponseItem` is decoded
+(status, headers and base64 body) back into an ordinary response for the caller
+that asked for it, so the ``api_client_*`` mixins do not change.
+
+* :class:`MicroBatcher` serves :class:`~servicenow_api.api_client.Api`. It is
+  installed on the client's :class:`~servicenow_api.transport.ServiceNowSession`
+  and intercepts ``session.get``. The first caller in a window waits out the
+  window and then sends the batch for everyone in it, so no background thread
+  is needed.
+* :class:`AsyncMicroBatcher` does the same for the GETs of
+  :class:`~servicenow_api.async_client.AsyncApi`'s native record reads.
+
+A window holding a single request is sent as a plain GET. Entries the instance
+leaves unserviced or answers with a retryable status (429, 503 …), and every
+entry of a batch call that fails outright, are sent again individually through
+the normal retry path. Callers therefore see the same results with or without
+batching.
+
+Micro-batching is off by default. Enable it with ``micro_batch=`` on the client
+or with ``SERVICENOW_MICRO_BATCH_WINDOW`` (seconds).
+"""
+
+import asyncio
+import base64
+import threading
+import time
+import uuid
+from collections.abc import Awaitable, Callable, Collection, Mapping
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urlencode, urlsplit
+
+import requests
+from agent_utilities.base_utilities import get_logger
+from agent_utilities.core.config import setting
+from pydantic import BaseModel, ConfigDict, Field
+from requests.structures import CaseInsensitiveDict
+
+from servicenow_api.servicenow_models import BatchResponse, BatchResponseItem
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = get_logger(__name__)
+
+#: Path of the batch endpoint, relative to the instance.
+BATCH_PATH = "/api/now/v1/batch"
+#: Request keyword arguments a batched GET may carry; anything else is sent directly.
+_BATCHABLE_KWARGS = frozenset({"url", "params", "headers", "timeout"})
+#: Headers the batch entries inherit from the enclosing request instead.
+_INHERITED_HEADERS = frozenset({"authorization", "content-type", "content-length"})
+
+
+class MicroBatchConfig(BaseModel):
+    """How long to collect GETs and how many to send per batch."""
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+    window: float = Field(
+        default=0.0,
+        ge=0,
+        description="Seconds to collect concurrent GETs before sending them as one "
+        "batch; 0 disables micro-batching.",
+    )
+    max_batch: int = Field(
+        default=50, ge=2, description="Most requests packed into one batch call."
+    )
+
+    @property
+    def enabled(self) -> bool:
+        return self.window > 0
+
+    @classmethod
+    def from_settings(cls) -> "MicroBatchConfig":
+        """Build a config from ``SERVICENOW_MICRO_BATCH_*`` settings."""
+        defaults = cls()
+        window = setting("SERVICENOW_MICRO_BATCH_WINDOW", None)
+        size = setting("SERVICENOW_MICRO_BATCH_SIZE", None)
+        return cls(
+            window=float(window) if window not in (None, "") else defaults.window,
+            max_batch=int(size) if size not in (None, "") else defaults.max_batch,
+        )
+
+    @classmethod
+    def resolve(cls, value: "MicroBatchConfig | float | None") -> "MicroBatchConfig":
+        """Config for a client's ``micro_batch`` argument (a window in seconds, or
+        ``None`` for the settings)."""
+        if isinstance(value, cls):
+            return value
+        if value is None:
+            return cls.from_settings()
+        return cls(window=float(value))
+
+
+def _relative_url(path: str, params: Mapping[str, Any] | None) -> str:
+    """``path`` plus ``params`` encoded the way ``requests`` would (``None`` dropped)."""
+    pairs = [
+        (key, value)
+        for key, values in (params or {}).items()
+        for value in (values if isinstance(values, (list, tuple)) else [values])
+        if value is not None
+    ]
+    if not pairs:
+        return path
+    return f"{path}{'&' if '?' in path else '?'}{urlencode(pairs)}"
+
+
+def _batch_item(
+    item_id: str, url: str, headers: Mapping[str, str] | None
+) -> dict[str, Any]:
+    """A GET entry of a batch request body."""
+    entry_headers = [
+        {"name": name, "value": value}
+        for name, value in (headers or {}).items()
+        if name.lower() not in _INHERITED_HEADERS
+    ]
+    if not any(h["name"].lower() == "accept" for h in entry_headers):
+        entry_headers.append({"name": "Accept", "value": "application/json"})
+    return {"id": item_id, "method": "GET", "url": url, "headers": entry_headers}
+
+
+def _item_content(item: BatchResponseItem) -> bytes:
+    return base64.b64decode(item.body) if item.body else b""
+
+
+def _item_headers(item: BatchResponseItem) -> dict[str, str]:
+    return {h["name"]: h["value"] for h in item.headers or [] if "name" in h}
+
+
+def _needs_resend(
+    item: BatchResponseItem | None, retry_statuses: Collection[int]
+) -> bool:
+    return item is None or item.status_code in retry_statuses
+
+
+class _Window:
+    """Requests collected for one batch."""
+
+    __slots__ = ("items", "full")
+
+    def __init__(self, full: Any = None):
+        self.items: list[tuple[Any, Any]] = []
+        self.full = full
+
+
+class MicroBatcher:
+    """Collects concurrent ``Api`` GETs and sends them as one batch request.
+
+    :param config: Window and batch size.
+    :param origin: Instance base URL; only GETs under ``{origin}/api/`` are batched.
+    :param send_batch: The client's ``batch_request`` method.
+    :param send_direct: Sends one GET without batching: ``send_direct(**kwargs)``.
+    :param retry_statuses: Entry statuses that are re-sent individually.
+    """
+
+    def __init__(
+        self,
+        config: MicroBatchConfig,
+        origin: str,
+        send_batch: Callable[..., Any],
+        send_direct: Callable[..., requests.Response],
+        retry_statuses: Collection[int] = (429, 502, 503, 504),
+    ):
+        self.config = config
+        self.origin = origin.rstrip("/")
+        self.send_batch = send_batch
+        self.send_direct = send_direct
+        self.retry_statuses = retry_statuses
+        #: Batch calls sent, GETs they carried, and GETs sent on their own.
+        self.batches = 0
+        self.batched = 0
+        self.direct = 0
+        self._open: _Window | None = None
+        self._cond = threading.Condition()
+
+    def accepts(self, kwargs: Mapping[str, Any]) -> bool:
+        """Whether a ``session.get(**kwargs)`` call can go into a batch."""
+        url = kwargs.get("url")
+        params = kwargs.get("params")
+        return (
+            isinstance(url, str)
+            and url.startswith(f"{self.origin}/api/")
+            and not url.startswith(f"{self.origin}{BATCH_PATH}")
+            and (params is None or isinstance(params, Mapping))
+            and _BATCHABLE_KWARGS.issuperset(kwargs)
+        )
+
+    def get(self, **kwargs) -> requests.Response:
+        """Send a GET, batched with whatever else arrives within the window."""
+        future: Future = Future()
+        with self._cond:
+            window = self._open
+            leader = window is None
+            if leader:
+                window = self._open = _Window()
+            window.items.append((kwargs, future))
+            if len(window.items) >= self.config.max_batch:
+                self._open = None
+                self._cond.notify_all()
+        if leader:
+            deadline = time.monotonic() + self.config.window
+            with self._cond:
+                while self._open is window:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self._open = None
+                        break
+                    self._cond.wait(remaining)
+            self._flush(window.items)
+        return future.result()
+
+    def _flush(self, items: list[tuple[dict[str, Any], Future]]) -> None:
+        if len(items) == 1:
+            self._send_each(items)
+            return
+        try:
+            response = self.send_batch(
+                batch_request_id=uuid.uuid4().hex,
+                rest_requests=[
+                    _batch_item(
+                        str(i),
+                        _relative_url(
+                            kwargs["url"][len(self.origin) :], kwargs.get("params")
+                        ),
+                        kwargs.get("headers"),
+                    )
+                    for i, (kwargs, _) in enumerate(items)
+                ],
+            )
+            answers = {item.id: item for item in response.result.serviced_requests}
+        except Exception as e:
+            logger.warning(
+                "Batch of %s GETs failed, sending them individually: error_type=%s",
+                len(items),
+                type(e).__name__,
+            )
+            self._send_each(items)
+            return
+        self.batches += 1
+        resend = []
+        for i, (kwargs, future) in enumerate(items):
+            item = answers.get(str(i))
+            if _needs_resend(item, self.retry_statuses):
+                resend.append((kwargs, future))
+                continue
+            self.batched += 1
+            future.set_result(self._response(item, kwargs))
+        self._send_each(resend)
+
+    def _send_each(self, items: list[tuple[dict[str, Any], Future]]) -> None:
+        for kwargs, future in items:
+            self.direct += 1
+            try:
+                future.set_result(self.send_direct(**kwargs))
+            except BaseException as e:
+                future.set_exception(e)
+
+    @staticmethod
+    def _response(item: BatchResponseItem, kwargs: dict[str, Any]) -> requests.Response:
+        response = requests.Response()
+        response.status_code = item.status_code
+        response.reason = item.status_text or ""
+        response.headers = CaseInsensitiveDict(_item_headers(item))
+        response.url = _relative_url(kwargs["url"], kwargs.get("params"))
+        response.encoding = "utf-8"
+        response._content = _item_content(item)
+        response._content_consumed = True
+        return response
+
+
+class AsyncMicroBatcher:
+    """Collects concurrent ``AsyncApi`` GETs and sends them as one batch request.
+
+    :param config: Window and batch size.
+    :param base_url: The client's API root (``AsyncApi.url``, ending in ``/api``).
+    :param send_batch: Coroutine posting a batch body and returning the decoded
+        :class:`BatchResponse`.
+    :param send_direct: Coroutine sending one GET: ``send_direct(path, params)``.
+    :param retry_statuses: Entry statuses that are re-sent individually.
+    """
+
+    def __init__(
+        self,
+        config: MicroBatchConfig,
+        base_url: str,
+        send_batch: Callable[[dict[str, Any]], Awaitable[BatchResponse]],
+        send_direct: Callable[..., Awaitable["httpx.Response"]],
+        retry_statuses: Collection[int] = (429, 502, 503, 504),
+    ):
+        self.config = config
+        self.base_url = base_url
+        self.send_batch = send_batch
+        self.send_direct = send_direct
+        self.retry_statuses = retry_statuses
+        self.batches = 0
+        self.batched = 0
+        self.direct = 0
+        self._open: _Window | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+    async def get(
+        self, path: str, params: dict[str, Any] | None = None
+    ) -> "httpx.Response":
+        """Send a GET for ``{base_url}{path}``, batched with others in the window."""
+        future = asyncio.get_running_loop().create_future()
+        window = self._open
+        if window is None:
+            window = self._open = _Window(asyncio.Event())
+            # The flush runs as its own task so a cancelled caller cannot strand
+            # the rest of the window.
+            task = asyncio.create_task(self._run(window))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        window.items.append(((path, params), future))
+        if len(window.items) >= self.config.max_batch:
+            self._open = None
+            window.full.set()
+        return await future
+
+    async def _run(self, window: _Window) -> None:
+        try:
+            await asyncio.wait_for(window.full.wait(), self.config.window)
+        except asyncio.TimeoutError:
+            pass
+        if self._open is window:
+            self._open = None
+        await self._flush(window.items)
+
+    async def _flush(self, items: list[tuple[tuple, asyncio.Future]]) -> None:
+        if len(items) == 1:
+            await self._send_each(items)
+            return
+        api_path = urlsplit(self.base_url).path
+        body = {
+            "batch_request_id": uuid.uuid4().hex,
+            "rest_requests": [
+                _batch_item(str(i), _relative_url(f"{api_path}{path}", params), None)
+                for i, ((path, params), _) in enumerate(items)
+            ],
+        }
+        try:
+            result = await self.send_batch(body)
+            answers = {item.id: item for item in result.serviced_requests}
+        except Exception as e:
+            logger.warning(
+                "Batch of %s GETs failed, sending them individually: error_type=%s",
+                len(items),
+                type(e).__name__,
+            )
+            await self._send_each(items)
+            return
+        import httpx
+
+        self.batches += 1
+        resend = []
+        for i, ((path, params), future) in enumerate(items):
+            item = answers.get(str(i))
+            if _needs_resend(item, self.retry_statuses):
+                resend.append(((path, params), future))
+                continue
+            self.batched += 1
+            response = httpx.Response(
+                item.status_code,
+                headers=_item_headers(item),
+                content=_item_content(item),
+                request=httpx.Request(
+                    "GET", _relative_url(f"{self.base_url}{path}", params)
+                ),
+            )
+            if not future.done():
+                future.set_result(response)
+        await self._send_each(resend)
+
+    async def _send_each(self, items: list[tuple[tuple, asyncio.Future]]) -> None:
+        async def send(path, params, future):
+            self.direct += 1
+            try:
+                response = await self.send_direct(path, params)
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result(response)
+
+        await asyncio.gather(
+            *(send(path, params, future) for (path, params), future in items)
+        )
@@ -0,0 +1,471 @@
+#!/usr/bin/python
+"""Local SQLite mirror of ServiceNow tables with an offline query API.
+
+Dashboards and agents ask the same ``get_table`` questions of ``incident``,
+``change_request``, ``cmdb_ci`` and ``sys_user`` over and over. A
+:class:`TableMirror` materialises selected tables into SQLite and answers those
+reads locally:
+
+* each mirrored record is stored once as JSON, read with
+  ``sysparm_display_value=all`` so both the raw value and the display value of
+  every field (including reference fields) are available, with real, indexed
+  ``sys_id``, ``number`` and ``sys_updated_on`` columns;
+* it is kept fresh with :class:`~servicenow_api.sync.TableSync`, so a refresh
+  costs one request per page of *changes*, and deletes are picked up by the sync's
+  periodic reconciliation. A table is refreshed before a query when it is older
+  than ``SERVICENOW_MIRROR_MAX_AGE`` seconds;
+* :func:`compile_query` translates the common encoded-query operators (``=``,
+  ``!=``, ``<``/``>``, ``IN``, ``LIKE``, ``STARTSWITH``, ``ISEMPTY``, ``^OR``,
+  ``^NQ``, ``ORDERBY``...) to SQL. Anything it cannot answer exactly -- dot-walked
+  fields, relative dates, ``javascript:`` values, fields that are not mirrored --
+  raises :class:`MirrorMiss` so the caller can go to the instance instead.
+
+``Api.query_mirror`` wraps this with that live fallback and accepts the same
+arguments as ``Api.get_table``.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from agent_utilities.base_utilities import get_logger
+from agent_utilities.core.config import setting
+
+from servicenow_api.sync import (
+    DEFAULT_SYNC_PAGE_SIZE,
+    SyncResult,
+    SyncStore,
+    TableSync,
+)
+
+logger = get_logger(__name__)
+
+#: Tables mirrored on first use when ``SERVICENOW_MIRROR_TABLES`` is unset.
+DEFAULT_MIRROR_TABLES = ("incident", "change_request", "cmdb_ci", "sys_user")
+#: Seconds a mirrored table may age before a query triggers a refresh.
+DEFAULT_MAX_AGE_SECONDS = 300
+#: Fields the mirror keeps as indexed columns (and always reads).
+INDEXED_FIELDS = ("sys_id", "number", "sys_updated_on")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS mirror_table (
+    instance TEXT NOT NULL,
+    table_name TEXT NOT NULL,
+    fields TEXT,
+    refreshed REAL,
+    PRIMARY KEY (instance, table_name)
+);
+CREATE TABLE IF NOT EXISTS mirror_record (
+    instance TEXT NOT NULL,
+    table_name TEXT NOT NULL,
+    sys_id TEXT NOT NULL,
+    number TEXT,
+    sys_updated_on TEXT,
+    data TEXT NOT NULL,
+    PRIMARY KEY (instance, table_name, sys_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS mirror_record_number
+    ON mirror_record (instance, table_name, number);
+CREATE INDEX IF NOT EXISTS mirror_record_updated
+    ON mirror_record (instance, table_name, sys_updated_on);
+"""
+
+_CONDITION = re.compile(
+    r"([a-z_][a-z0-9_]*)"
+    r"(ISNOTEMPTY|ISEMPTY|ANYTHING|INSTANCEOF|NOT IN|NOT LIKE|STARTSWITH|ENDSWITH"
+    r"|LIKE|IN|!=|>=|<=|=|>|<)(.*)",
+    re.DOTALL,
+)
+_NUMBER = re.compile(r"-?\d+(\.\d+)?")
+
+
+class MirrorMiss(LookupError):
+    """The mirror cannot answer a request exactly; ask the instance instead."""
+
+
+def default_mirror_db() -> Path:
+    """Resolve the mirror database path.
+
+    Override with ``SERVICENOW_MIRROR_DB``; otherwise
+    ``~/.servicenow-api/mirror.sqlite3``.
+    """
+    configured = setting("SERVICENOW_MIRROR_DB", "")
+    path = (
+        Path(configured)
+        if configured
+        else Path.home() / ".servicenow-api" / "mirror.sqlite3"
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def configured_tables() -> list[str]:
+    """Tables mirrored on first use, from ``SERVICENOW_MIRROR_TABLES`` (comma-separated)."""
+    configured = setting("SERVICENOW_MIRROR_TABLES", ",".join(DEFAULT_MIRROR_TABLES))
+    return [t.strip() for t in str(configured).split(",") if t.strip()]
+
+
+def _value(record: dict[str, Any], field: str) -> Any:
+    value = record.get(field)
+    if isinstance(value, dict):
+        value = value.get("value")
+    return value
+
+
+def _column(field: str) -> str:
+    if field in INDEXED_FIELDS:
+        return field
+    return f"json_extract(data, '$.\"{field}\".value')"
+
+
+def _like(value: str, prefix: str, suffix: str) -> str:
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"{prefix}{escaped}{suffix}"
+
+
+class CompiledQuery(NamedTuple):
+    """SQL translation of an encoded query."""
+
+    where: str
+    args: list[Any]
+    order_by: list[str]
+    fields: set[str]
+
+
+def _condition(term: str, fields: set[str]) -> tuple[str, list[Any]]:
+    match = _CONDITION.fullmatch(term)
+    if match is None:
+        raise MirrorMiss(f"Unsupported query condition {term!r}")
+    field, op, value = match.groups()
+    if op == "INSTANCEOF" or value.startswith("javascript:"):
+        raise MirrorMiss(f"Unsupported query condition {term!r}")
+    fields.add(field)
+    column = _column(field)
+    text = f"COALESCE({column}, '')"
+    if op == "ANYTHING":
+        return "1", []
+    if op == "ISEMPTY":
+        return f"{text} = ''", []
+    if op == "ISNOTEMPTY":
+        return f"{text} != ''", []
+    if op in ("=", "!="):
+        return f"{text} {op} ? COLLATE NOCASE", [value]
+    if op in ("IN", "NOT IN"):
+        items = value.split(",")
+        marks = ",".join("?" * len(items))
+        negate = "NOT " if op == "NOT IN" else ""
+        return f"{text} COLLATE NOCASE {negate}IN ({marks})", items
+    if op == "STARTSWITH":
+        return f"{text} LIKE ? ESCAPE '\\'", [_like(value, "", "%")]
+    if op == "ENDSWITH":
+        return f"{text} LIKE ? ESCAPE '\\'", [_like(value, "%", "")]
+    if op in ("LIKE", "NOT LIKE"):
+        negate = "NOT " if op == "NOT LIKE" else ""
+        return f"{text} {negate}LIKE ? ESCAPE '\\'", [_like(value, "%", "%")]
+    if _NUMBER.fullmatch(value):
+        return f"CAST({column} AS REAL) {op} ?", [float(value)]
+    return f"{column} {op} ?", [value]
+
+
+def compile_query(query: str | None) -> CompiledQuery:
+    """Translate an encoded query to a SQL ``WHERE``/``ORDER BY`` over the mirror.
+
+    ``^OR`` binds to the preceding condition and ``^NQ`` separates top-level OR
+    groups, as on the instance. Raises :class:`MirrorMiss` for anything that cannot
+    be evaluated locally with the same result.
+    """
+    fields: set[str] = set()
+    order_by: list[str] = []
+    groups: list[str] = []
+    args: list[Any] = []
+    for segment in (query or "").split("^NQ"):
+        clauses: list[list[str]] = []
+        for term in segment.split("^"):
+            if not term or term == "EQ":
+                continue
+            if term.startswith("ORDERBY"):
+                descending = term.startswith("ORDERBYDESC")
+                field = term[len("ORDERBYDESC") if descending else len("ORDERBY") :]
+                if not re.fullmatch(r"[a-z_][a-z0-9_]*", field):
+                    raise MirrorMiss(f"Unsupported ordering {term!r}")
+                fields.add(field)
+                order_by.append(f"{_column(field)}{' DESC' if descending else ''}")
+                continue
+            joined = term.startswith("OR")
+            sql, values = _condition(term[2:] if joined else term, fields)
+            args.extend(values)
+            if joined:
+                if not clauses:
+                    raise MirrorMiss(f"Dangling OR condition {term!r}")
+                clauses[-1].append(sql)
+            else:
+                clauses.append([sql])
+        groups.append(
+            " AND ".join(f"({' OR '.join(c)})" if len(c) > 1 else c[0] for c in clauses)
+            or "1"
+        )
+    where = " OR ".join(f"({g})" for g in groups)
+    return CompiledQuery(where=where, args=args, order_by=order_by, fields=fields)
+
+
+def render_record(
+    record: dict[str, Any], fields: list[str] | None, display_value: str
+) -> dict[str, Any]:
+    """Shape a stored ``display_value=all`` record like a live response.
+
+    :param display_value: ``"false"`` (raw values), ``"true"`` or ``"all"``.
+    """
+    names = fields if fields else list(record)
+    shaped: dict[str, Any] = {}
+    for name in names:
+        if name not in record:
+            continue
+        cell = record[name]
+        if display_value != "all" and isinstance(cell, dict):
+            cell = cell.get("display_value" if display_value == "true" else "value")
+        shaped[name] = cell
+    return shaped
+
+
+class TableMirror:
+    """SQLite mirror of selected tables, refreshed incrementally.
+
+    :param api: :class:`~servicenow_api.api_client.Api` used for refreshes.
+    :param path: Database file; :func:`default_mirror_db` if omitted. ``":memory:"``
+        keeps it in memory.
+    :param max_age_seconds: Refresh a table before querying it once it is this old
+        (``SERVICENOW_MIRROR_MAX_AGE``); ``0`` refreshes on every query.
+    :param page_size: Records per request during refreshes.
+    """
+
+    def __init__(
+        self,
+        api,
+        path: str | Path | None = None,
+        max_age_seconds: float | None = None,
+        page_size: int = DEFAULT_SYNC_PAGE_SIZE,
+    ):
+        self.api = api
+        self.path = str(path if path is not None else default_mirror_db())
+        self.max_age = float(
+            max_age_seconds
+            if max_age_seconds is not None
+            else setting("SERVICENOW_MIRROR_MAX_AGE", DEFAULT_MAX_AGE_SECONDS)
+        )
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._lock = threading.RLock()
+        self._refresh_locks: dict[str, threading.Lock] = {}
+        with self._lock:
+            if self.path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+        self.syncer = TableSync(api, store=SyncStore(self.path), page_size=page_size)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+        self.syncer.store.close()
+
+    def tables(self) -> dict[str, list[str] | None]:
+        """Mirrored tables and their field lists (``None`` means every field)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT table_name, fields FROM mirror_table WHERE instance=?",
+                (self.api.url,),
+            ).fetchall()
+        return {name: json.loads(fields) for name, fields in rows}
+
+    def _state(self, table: str) -> tuple[list[str] | None, float | None] | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT fields, refreshed FROM mirror_table "
+                "WHERE instance=? AND table_name=?",
+                (self.api.url, table),
+            ).fetchone()
+        if row is None:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def add(self, table: str, fields: list[str] | None = None) -> None:
+        """Start mirroring ``table``; changing its field list re-materialises it.
+
+        :param fields: Fields to keep; every field when omitted. ``sys_id``,
+            ``number`` and ``sys_updated_on`` are always kept.
+        """
+        if fields is not None:
+            fields = sorted(set(fields) | set(INDEXED_FIELDS))
+        state = self._state(table)
+        if state is not None and state[0] == fields:
+            return
+        if state is not None:
+            self.drop(table)
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO mirror_table (instance, table_name, fields) "
+                "VALUES (?, ?, ?)",
+                (self.api.url, table, json.dumps(fields)),
+            )
+
+    def drop(self, table: str) -> None:
+        """Stop mirroring ``table`` and delete its rows."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM mirror_record WHERE instance=? AND table_name=?",
+                (self.api.url, table),
+            )
+            self._conn.execute(
+                "DELETE FROM mirror_table WHERE instance=? AND table_name=?",
+                (self.api.url, table),
+            )
+        self.syncer.store.reset(self.syncer._key(table, None))
+
+    def refresh(self, table: str, full: bool = False) -> SyncResult:
+        """Apply changes (and, when due, deletes) since the last refresh."""
+        state = self._state(table)
+        if state is None:
+            raise MirrorMiss(f"Table {table!r} is not mirrored")
+        fields = state[0]
+        lock = self._refresh_locks.setdefault(table, threading.Lock())
+        with lock:
+            result = self.syncer.sync(
+                table,
+                fields=fields,
+                on_records=lambda batch: self._upsert(table, batch),
+                on_deletes=lambda sys_ids: self._delete(table, sys_ids),
+                full=full,
+                params={
+                    "sysparm_display_value": "all",
+                    "sysparm_exclude_reference_link": "true",
+                },
+            )
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "UPDATE mirror_table SET refreshed=? "
+                    "WHERE instance=? AND table_name=?",
+                    (time.time(), self.api.url, table),
+                )
+        logger.info(
+            "Refreshed mirror of %s: %s changed, %s deleted",
+            table,
+            result.changed,
+            len(result.deleted),
+        )
+        return result
+
+    def _upsert(self, table: str, records: list[dict[str, Any]]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO mirror_record "
+                "(instance, table_name, sys_id, number, sys_updated_on, data) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        self.api.url,
+                        table,
+                        str(_value(r, "sys_id")),
+                        _value(r, "number"),
+                        _value(r, "sys_updated_on"),
+                        json.dumps(r),
+                    )
+                    for r in records
+                ],
+            )
+
+    def _delete(self, table: str, sys_ids: list[str]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM mirror_record WHERE instance=? AND table_name=? "
+                "AND sys_id=?",
+                [(self.api.url, table, sys_id) for sys_id in sys_ids],
+            )
+
+    def ensure_fresh(self, table: str) -> None:
+        """Refresh ``table`` if it was never loaded or is older than ``max_age``.
+
+        A failed refresh of a table that already has data is logged and the stale
+        rows are served; a table that was never loaded raises.
+        """
+        state = self._state(table)
+        if state is None:
+            raise MirrorMiss(f"Table {table!r} is not mirrored")
+        refreshed = state[1]
+        if refreshed is not None and time.time() - refreshed < self.max_age:
+            return
+        try:
+            self.refresh(table)
+        except Exception as e:
+            if refreshed is None:
+                raise
+            logger.warning(
+                "Serving stale mirror of %s; refresh failed: %s",
+                table,
+                type(e).__name__,
+            )
+
+    def query(
+        self,
+        table: str,
+        query: str | None = None,
+        fields: str | list[str] | None = None,
+        limit: int | None = None,
+        offset: int = 0,
+        display_value: str | bool = "false",
+    ) -> list[dict[str, Any]]:
+        """Answer a Table API read from the mirror.
+
+        :param table: Mirrored table.
+        :param query: Encoded query (see :func:`compile_query`).
+        :param fields: Fields to return; all mirrored fields when omitted.
+        :param limit: Maximum records returned.
+        :param offset: Records skipped first.
+        :param display_value: ``"false"``, ``"true"`` or ``"all"`` (any case, or a
+            bool), as ``sysparm_display_value``. Reference fields are returned as with
+            ``sysparm_exclude_reference_link=true``.
+        :return: Raw records shaped like the live response.
+        :raises MirrorMiss: If the table is not mirrored or the request cannot be
+            answered exactly.
+        """
+        display_value = str(display_value).lower()
+        if isinstance(fields, str):
+            fields = [f.strip() for f in fields.split(",") if f.strip()]
+        compiled = compile_query(query)
+        state = self._state(table)
+        if state is None:
+            raise MirrorMiss(f"Table {table!r} is not mirrored")
+        mirrored = state[0]
+        if mirrored is not None:
+            if not fields:
+                raise MirrorMiss(
+                    f"Only some fields of {table!r} are mirrored; pass sysparm_fields"
+                )
+            missing = (set(fields) | compiled.fields) - set(mirrored)
+            if missing:
+                raise MirrorMiss(
+                    f"Fields {sorted(missing)} of {table!r} are not mirrored"
+                )
+        self.ensure_fresh(table)
+        # compile_query only emits fields matching [a-z_][a-z0-9_]* and binds values.
+        sql = (
+            "SELECT data FROM mirror_record WHERE instance=? AND table_name=? "  # nosec B608
+            f"AND ({compiled.where}) ORDER BY "
+            + ", ".join([*compiled.order_by, "sys_id"])
+            + " LIMIT ? OFFSET ?"
+        )
+        with self._lock:
+            rows = self._conn.execute(
+                sql,
+                (
+                    self.api.url,
+                    table,
+                    *compiled.args,
+                    -1 if limit is None else int(limit),
+                    int(offset or 0),
+                ),
+            ).fetchall()
+        return [
+            render_record(json.loads(data), fields, display_value) for (data,) in rows
+        ]
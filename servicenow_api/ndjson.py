@@ -0,0 +1,282 @@
+#!/usr/bin/python
+"""Resumable NDJSON export of Table API records, optionally gzip/zstd compressed.
+
+:func:`export_ndjson` walks a table with a
+:class:`~servicenow_api.pagination.TableIterator` (no prefetch, records released
+as they are written) and appends one JSON object per line to the output file:
+
+* every page is written as a self-contained frame: plain bytes, a gzip member or a
+  zstd frame. Concatenated members/frames are valid gzip/zstd streams, so the file
+  can be read with ``zcat``/``zstdcat`` at any point;
+* after each frame the file is flushed and an :class:`NdjsonCheckpoint` records the
+  file size together with the position in the walk (keyset ``sys_id`` cursor or
+  offset). On restart the output is truncated back to that size and the walk
+  resumes from the saved position. No record is lost or written twice, even if the
+  process died halfway through a frame;
+* the checkpoint is removed once the export completes, so running the same export
+  again starts from scratch.
+
+zstd needs the optional ``zstandard`` package (``pip install servicenow-api[zstd]``).
+"""
+
+import json
+import os
+import zlib
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+from agent_utilities.base_utilities import get_logger
+from agent_utilities.core.exceptions import ParameterError
+from pydantic import BaseModel, Field
+
+from servicenow_api.pagination import (
+    DEFAULT_PAGE_SIZE,
+    PaginationProgress,
+    TableIterator,
+    TablePage,
+    pagination_strategy,
+)
+
+logger = get_logger(__name__)
+
+#: Compression codecs understood by :class:`NdjsonWriter`.
+NDJSON_COMPRESSIONS = ("gzip", "zstd")
+
+
+class NdjsonCheckpoint(BaseModel):
+    """Position of an unfinished :func:`export_ndjson` run."""
+
+    table: str
+    params: dict[str, Any] = Field(default_factory=dict)
+    pagination: str = "keyset"
+    compression: str | None = None
+    cursor: str | None = Field(
+        default=None, description="Keyset cursor after the last written record."
+    )
+    offset: int = Field(default=0, description="Offset after the last written record.")
+    records: int = 0
+    bytes: int = Field(default=0, description="Output size after the last frame.")
+
+    def save(self, path: str | os.PathLike) -> None:
+        """Atomically write the checkpoint as JSON."""
+        path = Path(path)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(self.model_dump_json(indent=2), encoding="utf-8")
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike) -> "NdjsonCheckpoint | None":
+        """Read a saved checkpoint, or ``None`` when the file does not exist."""
+        path = Path(path)
+        if not path.exists():
+            return None
+        return cls.model_validate(json.loads(path.read_text(encoding="utf-8")))
+
+
+class NdjsonExportResult(BaseModel):
+    """Summary of a finished :func:`export_ndjson` run."""
+
+    path: str
+    records: int = Field(default=0, description="Records in the file.")
+    bytes: int = 0
+    pages: int = Field(default=0, description="Pages fetched by this run.")
+    resumed: bool = Field(
+        default=False, description="The run continued an interrupted export."
+    )
+
+
+def _frame_compressor(compression: str | None):
+    if compression is None:
+        return None
+    if compression == "gzip":
+        return lambda: zlib.compressobj(6, zlib.DEFLATED, 31)
+    if compression == "zstd":
+        try:
+            import zstandard
+        except ImportError as e:
+            raise ImportError(
+                "zstd compression needs zstandard; install servicenow-api[zstd]"
+            ) from e
+        compressor = zstandard.ZstdCompressor()
+        return compressor.compressobj
+    raise ParameterError(
+        f"Unknown compression {compression!r}; expected None or one of "
+        f"{list(NDJSON_COMPRESSIONS)}"
+    )
+
+
+class NdjsonWriter:
+    """Append records to an NDJSON file in independently decodable frames.
+
+    :param path: Output file.
+    :param compression: ``None``, ``"gzip"`` or ``"zstd"``.
+    :param resume_at: Truncate an existing file to this size and append after it;
+        ``None`` starts a new file.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        compression: str | None = None,
+        resume_at: int | None = None,
+    ):
+        self.path = Path(path)
+        self.compression = compression
+        self._new_frame = _frame_compressor(compression)
+        if resume_at is None:
+            self._file = open(self.path, "wb")
+        else:
+            self._file = open(self.path, "r+b")
+            self._file.truncate(resume_at)
+            self._file.seek(resume_at)
+        self._frame = None
+
+    @property
+    def position(self) -> int:
+        """Bytes in the file up to the last finished frame."""
+        return self._file.tell()
+
+    def write(self, record: dict[str, Any]) -> None:
+        """Add one record to the current frame."""
+        line = (
+            json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n"
+        ).encode("utf-8")
+        if self._new_frame is None:
+            self._file.write(line)
+        else:
+            if self._frame is None:
+                self._frame = self._new_frame()
+            self._file.write(self._frame.compress(line))
+
+    def end_frame(self) -> int:
+        """Finish the current frame, flush it to disk and return the file size."""
+        if self._frame is not None:
+            self._file.write(self._frame.flush())
+            self._frame = None
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return self.position
+
+    def close(self) -> None:
+        """Close the file; an unfinished frame is dropped from the checkpoint's view."""
+        self._file.close()
+
+
+def export_ndjson(
+    fetch_page: Callable[[dict[str, Any]], TablePage],
+    table: str,
+    params: dict[str, Any],
+    path: str | Path,
+    compression: str | None = None,
+    pagination: str = "keyset",
+    page_size: int = DEFAULT_PAGE_SIZE,
+    checkpoint_path: str | Path | None = None,
+    max_records: int | None = None,
+    on_progress: Callable[[PaginationProgress], None] | None = None,
+) -> NdjsonExportResult:
+    """Stream a table walk to NDJSON, resuming from ``checkpoint_path`` if present.
+
+    :param fetch_page: Callable returning the :class:`TablePage` for a params dict.
+    :param table: Table name (checked against the checkpoint).
+    :param params: Base Table API parameters; ``sysparm_offset`` sets the start
+        of an offset walk.
+    :param path: Output file.
+    :param compression: ``None``, ``"gzip"`` or ``"zstd"``; one frame per page.
+    :param pagination: ``"keyset"`` (default), ``"keyset_updated"`` or ``"offset"``.
+    :param page_size: Records per request and per frame.
+    :param checkpoint_path: JSON checkpoint written after every page; ``None``
+        disables resuming.
+    :param max_records: Stop after this many records in total.
+    :param on_progress: Called with :class:`PaginationProgress` after each page.
+    :raises ParameterError: If the checkpoint belongs to another export or the
+        output file is shorter than the checkpoint says.
+    """
+    params = dict(params)
+    start = int(params.pop("sysparm_offset", 0) or 0)
+    state = NdjsonCheckpoint.load(checkpoint_path) if checkpoint_path else None
+    resumed = state is not None
+    if state is None:
+        state = NdjsonCheckpoint(
+            table=table,
+            params=params,
+            pagination=pagination,
+            compression=compression,
+            offset=start,
+        )
+    elif (state.table, state.params, state.pagination, state.compression) != (
+        table,
+        params,
+        pagination,
+        compression,
+    ):
+        raise ParameterError(
+            f"Checkpoint {checkpoint_path} belongs to a different export; "
+            "delete it or choose another path"
+        )
+    elif not Path(path).exists() or Path(path).stat().st_size < state.bytes:
+        raise ParameterError(
+            f"{path} is shorter than checkpoint {checkpoint_path} expects; "
+            "delete the checkpoint to start over"
+        )
+    if resumed:
+        logger.info(
+            "Resuming export of %s at %s records (%s bytes)",
+            table,
+            state.records,
+            state.bytes,
+        )
+
+    keyset = pagination != "offset"
+    remaining = None if max_records is None else max(max_records - state.records, 0)
+    rows = TableIterator(
+        fetch_page,
+        params,
+        page_size=page_size,
+        prefetch=False,
+        on_progress=on_progress,
+        max_records=remaining,
+        strategy=pagination_strategy(
+            pagination,
+            state.cursor if keyset else None,
+            start if keyset else state.offset,
+        ),
+        table=table,
+    )
+    writer = NdjsonWriter(
+        path, compression=compression, resume_at=state.bytes if resumed else None
+    )
+    pending = 0
+
+    def checkpoint() -> None:
+        nonlocal pending
+        state.bytes = writer.end_frame()
+        state.records += pending
+        if keyset:
+            state.cursor = rows.cursor
+        else:
+            state.offset += pending
+        pending = 0
+        if checkpoint_path:
+            state.save(checkpoint_path)
+
+    try:
+        with rows:
+            for record in rows:
+                writer.write(record)
+                pending += 1
+                if pending >= page_size:
+                    checkpoint()
+            if pending:
+                checkpoint()
+    finally:
+        writer.close()
+    if checkpoint_path:
+        Path(checkpoint_path).unlink(missing_ok=True)
+    return NdjsonExportResult(
+        path=str(path),
+        records=state.records,
+        bytes=state.bytes,
+        pages=rows.progress.pages,
+        resumed=resumed,
+    )
@@ -0,0 +1,564 @@
+#!/usr/bin/python
+"""Streaming, auto-paginating iteration over Table API results.
+
+``get_table`` returns one page as a materialised list, so walking a large table
+(``cmdb_ci``, ``sys_audit``) meant paging by hand and usually keeping every page
+in memory. :class:`TableIterator` yields one record at a time instead: at most
+the page being consumed and the page being prefetched are held, and the next
+request is already in flight while the caller works through the current page.
+
+Progress is taken from the ``X-Total-Count`` header of the first page (later
+pages are requested with ``sysparm_no_count=true`` so the instance does not run
+the count query again) and reported through an optional callback.
+
+Two paging strategies are available. :class:`OffsetPagination` is the classic
+``sysparm_offset`` walk; the instance has to skip ``offset`` rows for every page,
+so deep pages get progressively slower, and rows inserted or deleted during the
+walk shift the window (records are skipped or returned twice).
+:class:`KeysetPagination` orders by ``sys_id`` (or ``sys_updated_on,sys_id``) and
+asks for the rows after the last key seen, which the database answers from the
+index at the same cost at any depth. Its opaque cursor can be handed back to
+resume a walk, or returned to MCP callers as ``Response.next_cursor``.
+
+:class:`AsyncTableIterator` is the ``async for`` counterpart used by
+:class:`~servicenow_api.async_client.AsyncApi`.
+
+A page whose records are a :class:`~servicenow_api.streaming.StreamedRecords` is
+consumed while it downloads: records are yielded as they are decoded, and the
+next request is built once the page has been read to the end, so such pages are
+never prefetched.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterator
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, NamedTuple
+
+from agent_utilities.base_utilities import get_logger
+from agent_utilities.core.exceptions import ParameterError
+from pydantic import BaseModel, Field
+
+from servicenow_api.streaming import StreamedRecords
+
+logger = get_logger(__name__)
+_END = object()
+
+#: Records requested per page when the caller does not choose a page size.
+DEFAULT_PAGE_SIZE = 1000
+#: Accepted values of the ``pagination`` argument.
+PAGINATION_MODES = ("offset", "keyset", "keyset_updated")
+#: Sort keys used by each keyset mode; ``sys_id`` breaks ties so the order is total.
+KEYSET_KEYS = {
+    "keyset": ("sys_id",),
+    "keyset_updated": ("sys_updated_on", "sys_id"),
+}
+
+
+class TablePage(NamedTuple):
+    """One page of raw Table API records, or a stream of them still downloading."""
+
+    records: list[dict[str, Any]] | StreamedRecords
+    total: int | None = None
+
+
+class PaginationProgress(BaseModel):
+    """Progress of a paginated walk, reported after every page."""
+
+    table: str | None = Field(default=None, description="Table being read.")
+    fetched: int = Field(default=0, description="Records received so far.")
+    pages: int = Field(default=0, description="Pages received so far.")
+    total: int | None = Field(
+        default=None, description="Matching records reported by X-Total-Count."
+    )
+
+    @property
+    def fraction(self) -> float | None:
+        """Share of ``total`` fetched (0..1), or ``None`` when the total is unknown."""
+        if not self.total:
+            return None
+        return min(self.fetched / self.total, 1.0)
+
+
+def total_count(response: Any) -> int | None:
+    """Return the ``X-Total-Count`` header of a response as an int, if present."""
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        value = headers.get("X-Total-Count")
+    except Exception:
+        return None
+    try:
+        return int(value) if value not in (None, "") else None
+    except (TypeError, ValueError):
+        return None
+
+
+class OffsetPagination:
+    """Classic ``sysparm_offset`` paging.
+
+    :param start: Offset of the first record.
+    """
+
+    name = "offset"
+
+    def __init__(self, start: int = 0):
+        self.start = start
+
+    def first(self, params: dict[str, Any], page_size: int) -> dict[str, Any]:
+        return {**params, "sysparm_limit": page_size, "sysparm_offset": self.start}
+
+    def next(
+        self,
+        params: dict[str, Any],
+        page: TablePage,
+        progress: PaginationProgress,
+    ) -> dict[str, Any] | None:
+        """Parameters for the page after ``page``, or ``None`` when it was the last."""
+        if not page.records:
+            return None
+        offset = int(params.get("sysparm_offset") or 0) + len(page.records)
+        if progress.total is not None and offset >= progress.total:
+            return None
+        return {**params, "sysparm_offset": offset}
+
+
+def _field_value(record: dict[str, Any], field: str) -> Any:
+    value = record.get(field)
+    if isinstance(value, dict):
+        value = value.get("value")
+    return value
+
+
+class KeysetPagination:
+    """Seek-method paging on ``sys_id`` or ``(sys_updated_on, sys_id)``.
+
+    Each page is requested as ``<query>^<key> > <last key>^ORDERBY<key>`` instead of
+    with an offset. For the composite key the condition is expanded with ``^NQ``
+    into ``updated > ts OR (updated = ts AND sys_id > id)``, repeating the caller's
+    query in each branch.
+
+    :param mode: ``"keyset"`` (``sys_id``) or ``"keyset_updated"``.
+    :param after: Cursor to resume after (from ``next_cursor`` / ``TableIterator.cursor``).
+    """
+
+    name = "keyset"
+
+    def __init__(self, mode: str = "keyset", after: str | None = None):
+        if mode not in KEYSET_KEYS:
+            raise ParameterError(
+                f"Unknown keyset pagination mode {mode!r}; expected one of "
+                f"{sorted(KEYSET_KEYS)}"
+            )
+        self.mode = mode
+        self.keys = KEYSET_KEYS[mode]
+        self.after = after
+        self._base: dict[str, Any] = {}
+        self._last_cursor = after
+
+    def first(self, params: dict[str, Any], page_size: int | None) -> dict[str, Any]:
+        if params.get("sysparm_offset"):
+            raise ParameterError(
+                "sysparm_offset cannot be combined with keyset pagination; "
+                "pass the cursor from the previous page instead"
+            )
+        query = params.get("sysparm_query") or ""
+        if "ORDERBY" in query:
+            raise ParameterError(
+                f"Keyset pagination orders by {','.join(self.keys)}; "
+                "remove ORDERBY clauses from sysparm_query"
+            )
+        if (
+            "sys_updated_on" in self.keys
+            and str(params.get("sysparm_display_value", "")).lower() == "true"
+        ):
+            raise ParameterError(
+                "keyset_updated pagination needs raw sys_updated_on values; use "
+                "sysparm_display_value 'false' or 'all'"
+            )
+        base = {k: v for k, v in params.items() if k != "sysparm_offset"}
+        fields = base.get("sysparm_fields")
+        if fields:
+            present = [f.strip() for f in fields.split(",")]
+            missing = [k for k in self.keys if k not in present]
+            if missing:
+                base["sysparm_fields"] = ",".join([*present, *missing])
+        self._base = base
+        first = self.page_params(self.after)
+        if page_size is not None:
+            first["sysparm_limit"] = page_size
+        return first
+
+    def page_params(self, cursor: str | None) -> dict[str, Any]:
+        """Base parameters with the query rewritten to start after ``cursor``."""
+        base_query = self._base.get("sysparm_query") or ""
+        order = "^".join(f"ORDERBY{key}" for key in self.keys)
+        if cursor:
+            branches = [
+                f"{segment}^{condition}" if segment else condition
+                for segment in (base_query.split("^NQ") if base_query else [""])
+                for condition in self._conditions(cursor)
+            ]
+            query = "^NQ".join(branches)
+        else:
+            query = base_query
+        return {**self._base, "sysparm_query": f"{query}^{order}" if query else order}
+
+    def _conditions(self, cursor: str) -> list[str]:
+        if self.mode == "keyset":
+            return [f"sys_id>{cursor}"]
+        updated, _, sys_id = cursor.rpartition(",")
+        if not updated or not sys_id:
+            raise ParameterError(f"Invalid keyset_updated cursor {cursor!r}")
+        return [
+            f"sys_updated_on>{updated}",
+            f"sys_updated_on={updated}^sys_id>{sys_id}",
+        ]
+
+    def cursor_of(self, record: dict[str, Any]) -> str | None:
+        """Cursor positioned just after ``record``."""
+        values = [_field_value(record, key) for key in self.keys]
+        if any(value in (None, "") for value in values):
+            return None
+        return ",".join(str(value) for value in values)
+
+    def next(
+        self,
+        params: dict[str, Any],
+        page: TablePage,
+        progress: PaginationProgress,
+    ) -> dict[str, Any] | None:
+        """Parameters for the page after ``page``, or ``None`` when it was the last."""
+        if not page.records:
+            return None
+        if progress.total is not None and progress.fetched >= progress.total:
+            return None
+        cursor = self.cursor_of(page.records[-1])
+        if cursor is None:
+            raise ParameterError(
+                f"Records are missing {','.join(self.keys)}; keyset pagination "
+                "cannot continue"
+            )
+        if cursor == self._last_cursor:
+            raise ParameterError(
+                f"Keyset cursor did not advance past {cursor!r}; the instance "
+                "ignored the seek condition"
+            )
+        self._last_cursor = cursor
+        return self.page_params(cursor)
+
+    def next_cursor(
+        self, records: list[dict[str, Any]], total: int | None, limit: Any
+    ) -> str | None:
+        """Cursor for a single-page call, or ``None`` when nothing remains."""
+        if not records:
+            return None
+        if total is not None:
+            more = total > len(records)
+        else:
+            more = limit is not None and len(records) >= int(limit)
+        return self.cursor_of(records[-1]) if more else None
+
+
+def keyset_params(
+    params: dict[str, Any], mode: str | None, cursor: str | None = None
+) -> tuple[dict[str, Any], KeysetPagination | None]:
+    """Rewrite single-page request parameters for a ``pagination`` mode.
+
+    Returns ``(params, None)`` unchanged for offset paging, otherwise the keyset
+    parameters and the strategy whose :meth:`KeysetPagination.next_cursor` builds
+    the cursor for the following page.
+    """
+    if mode in (None, "offset"):
+        if cursor:
+            raise ParameterError("cursor requires keyset pagination")
+        return params, None
+    strategy = KeysetPagination(mode, after=cursor)
+    return strategy.first(params, None), strategy
+
+
+def pagination_strategy(
+    mode: str | None, cursor: str | None = None, start: int = 0
+) -> OffsetPagination | KeysetPagination:
+    """Return the paging strategy for a ``pagination`` argument value."""
+    if mode in (None, "offset"):
+        if cursor:
+            raise ParameterError("cursor requires keyset pagination")
+        return OffsetPagination(start)
+    if mode in KEYSET_KEYS:
+        if start:
+            raise ParameterError(
+                "sysparm_offset cannot be combined with keyset pagination; "
+                "pass a cursor instead"
+            )
+        return KeysetPagination(mode, after=cursor)
+    raise ParameterError(
+        f"Unknown pagination mode {mode!r}; expected one of {list(PAGINATION_MODES)}"
+    )
+
+
+class _PagedWalk:
+    """State shared by the sync and async iterators."""
+
+    def __init__(
+        self,
+        strategy,
+        params: dict[str, Any],
+        page_size: int,
+        parse: Callable[[dict[str, Any]], Any] | None,
+        on_progress: Callable[[PaginationProgress], None] | None,
+        max_records: int | None,
+        table: str | None,
+    ):
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+        self.strategy = strategy or OffsetPagination()
+        self.page_size = page_size
+        self.parse = parse
+        self.on_progress = on_progress
+        self.max_records = max_records
+        self.progress = PaginationProgress(table=table)
+        self._first_params = self.strategy.first(params, self._page_limit(page_size, 0))
+        self._page: list[dict[str, Any]] = []
+        self._index = 0
+        self._yielded = 0
+        self._last: dict[str, Any] | None = None
+        self._done = False
+
+    @property
+    def total(self) -> int | None:
+        return self.progress.total
+
+    @property
+    def fetched(self) -> int:
+        return self.progress.fetched
+
+    def _page_limit(self, page_size: int, fetched: int) -> int:
+        if self.max_records is None:
+            return page_size
+        return max(min(page_size, self.max_records - fetched), 0)
+
+    def _accept(self, params: dict[str, Any], page: TablePage) -> dict[str, Any] | None:
+        """Record a received page and return the parameters for the next one."""
+        if self.progress.pages == 0:
+            self.progress.total = page.total
+        self.progress.pages += 1
+        self.progress.fetched += len(page.records)
+        logger.debug(
+            "Fetched page %s of %s (%s/%s records)",
+            self.progress.pages,
+            self.progress.table,
+            self.progress.fetched,
+            self.progress.total,
+        )
+        if self.on_progress is not None:
+            self.on_progress(self.progress)
+        next_params = self.strategy.next(params, page, self.progress)
+        if next_params is None:
+            return None
+        limit = self._page_limit(self.page_size, self.progress.fetched)
+        if limit <= 0:
+            return None
+        return {**next_params, "sysparm_limit": limit, "sysparm_no_count": "true"}
+
+    @property
+    def cursor(self) -> str | None:
+        """Keyset cursor that resumes the walk after the last record yielded."""
+        if self._last is None or not hasattr(self.strategy, "cursor_of"):
+            return None
+        return self.strategy.cursor_of(self._last)
+
+    def _take(self) -> Any:
+        record = self._page[self._index]
+        self._page[self._index] = None
+        self._index += 1
+        return self._emit(record)
+
+    def _emit(self, record: dict[str, Any]) -> Any:
+        self._last = record
+        self._yielded += 1
+        return self.parse(record) if self.parse is not None else record
+
+    def _exhausted_page(self) -> bool:
+        return self._index >= len(self._page)
+
+    def _capped(self) -> bool:
+        return self.max_records is not None and self._yielded >= self.max_records
+
+
+class TableIterator(_PagedWalk):
+    """Iterator yielding Table API records page by page with one page prefetched.
+
+    Use as a plain iterator or as a context manager; closing it (or exhausting it)
+    stops the prefetch thread.
+
+    :param fetch_page: Callable returning the :class:`TablePage` for a params dict.
+    :param params: Base query parameters (``sysparm_query``, ``sysparm_fields``...).
+    :param page_size: Records per request.
+    :param parse: Applied to each raw record as it is yielded (e.g. ``Table.model_validate``).
+    :param prefetch: Request the next page while the current one is consumed.
+    :param on_progress: Called with :class:`PaginationProgress` after each page.
+    :param max_records: Stop after this many records.
+    :param strategy: :class:`OffsetPagination` (default) or :class:`KeysetPagination`.
+    :param table: Table name, for progress reporting.
+    """
+
+    def __init__(
+        self,
+        fetch_page: Callable[[dict[str, Any]], TablePage],
+        params: dict[str, Any],
+        page_size: int = DEFAULT_PAGE_SIZE,
+        parse: Callable[[dict[str, Any]], Any] | None = None,
+        prefetch: bool = True,
+        on_progress: Callable[[PaginationProgress], None] | None = None,
+        max_records: int | None = None,
+        strategy=None,
+        table: str | None = None,
+    ):
+        super().__init__(
+            strategy, params, page_size, parse, on_progress, max_records, table
+        )
+        self._fetch_page = fetch_page
+        self._executor = (
+            ThreadPoolExecutor(max_workers=1, thread_name_prefix="servicenow-prefetch")
+            if prefetch
+            else None
+        )
+        self._pending: Future | None = None
+        self._pending_params: dict[str, Any] | None = self._first_params
+        if self._first_params.get("sysparm_limit") == 0:
+            self._pending_params = None
+        self._stream: TablePage | None = None
+        self._stream_params: dict[str, Any] | None = None
+
+    def __iter__(self) -> Iterator[Any]:
+        return self
+
+    def __next__(self) -> Any:
+        while True:
+            if self._stream is not None:
+                record = next(self._stream.records, _END)
+                if record is not _END:
+                    return self._emit(record)
+                self._pending_params = self._accept(self._stream_params, self._stream)
+                self._stream = None
+            elif not self._exhausted_page():
+                return self._take()
+            if self._done or self._capped() or not self._load_next_page():
+                self.close()
+                raise StopIteration
+
+    def __enter__(self) -> "TableIterator":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def _load_next_page(self) -> bool:
+        params = self._pending_params
+        if params is None:
+            return False
+        if self._pending is not None:
+            page = self._pending.result()
+            self._pending = None
+        else:
+            page = self._fetch_page(params)
+        if isinstance(page.records, StreamedRecords):
+            self._stream, self._stream_params = page, params
+            self._pending_params = None
+            return True
+        self._page, self._index = page.records, 0
+        self._pending_params = self._accept(params, page)
+        if self._pending_params is not None and self._executor is not None:
+            self._pending = self._executor.submit(
+                self._fetch_page, self._pending_params
+            )
+        return bool(self._page)
+
+    def close(self) -> None:
+        """Stop iterating and release the prefetch thread."""
+        self._done = True
+        self._page = []
+        if self._stream is not None:
+            self._stream.records.close()
+            self._stream = None
+        if self._pending is not None:
+            self._pending.cancel()
+            self._pending = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+class AsyncTableIterator(_PagedWalk):
+    """``async for`` variant of :class:`TableIterator`; prefetches with a task.
+
+    :param fetch_page: Coroutine function returning the :class:`TablePage` for params.
+    """
+
+    def __init__(
+        self,
+        fetch_page: Callable[[dict[str, Any]], Awaitable[TablePage]],
+        params: dict[str, Any],
+        page_size: int = DEFAULT_PAGE_SIZE,
+        parse: Callable[[dict[str, Any]], Any] | None = None,
+        prefetch: bool = True,
+        on_progress: Callable[[PaginationProgress], None] | None = None,
+        max_records: int | None = None,
+        strategy=None,
+        table: str | None = None,
+    ):
+        super().__init__(
+            strategy, params, page_size, parse, on_progress, max_records, table
+        )
+        self._fetch_page = fetch_page
+        self._prefetch = prefetch
+        self._pending: asyncio.Task | None = None
+        self._pending_params: dict[str, Any] | None = self._first_params
+        if self._first_params.get("sysparm_limit") == 0:
+            self._pending_params = None
+
+    def __aiter__(self) -> AsyncIterator[Any]:
+        return self
+
+    async def __anext__(self) -> Any:
+        while self._exhausted_page():
+            if self._done or self._capped() or not await self._load_next_page():
+                await self.aclose()
+                raise StopAsyncIteration
+        return self._take()
+
+    async def __aenter__(self) -> "AsyncTableIterator":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
+
+    async def _load_next_page(self) -> bool:
+        params = self._pending_params
+        if params is None:
+            return False
+        if self._pending is not None:
+            page = await self._pending
+            self._pending = None
+        else:
+            page = await self._fetch_page(params)
+        self._page, self._index = page.records, 0
+        self._pending_params = self._accept(params, page)
+        if self._pending_params is not None and self._prefetch:
+            self._pending = asyncio.ensure_future(
+                self._fetch_page(self._pending_params)
+            )
+        return bool(self._page)
+
+    async def aclose(self) -> None:
+        """Stop iterating and cancel any prefetch in flight."""
+        self._done = True
+        self._page = []
+        if self._pending is not None:
+            self._pending.cancel()
+            try:
+                await self._pending
+            except (asyncio.CancelledError, Exception):
+                pass
+            self._pending = None
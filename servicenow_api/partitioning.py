@@ -0,0 +1,397 @@
+#!/usr/bin/python
+"""Parallel, partitioned extraction of a whole table.
+
+:meth:`~servicenow_api.api.api_client_system.ServiceNowApiSystem.iter_table` reads a
+table one page at a time, so a full extract of ``task`` is bounded by the latency
+of a single request chain. :class:`PartitionedExport` splits the table into
+disjoint partitions and reads them on a pool of worker threads:
+
+* ``"sys_id"`` (default) — hexadecimal ``sys_id`` ranges (``sys_id>=4000^sys_id<8000``),
+  each walked with keyset pagination. No count query is needed and every page
+  costs the same regardless of depth.
+* ``"offset"`` — ``sysparm_offset`` windows sized from the table's
+  ``X-Total-Count``, ordered by ``sys_id`` so that windows do not overlap.
+
+Records from all partitions are merged into one stream, either in partition
+order (``ordered=True``; for ``sys_id`` partitions that is ``sys_id`` order) or
+as they arrive. Workers share the client's connection pool and
+:class:`~servicenow_api.retry.RateLimiter`, so the fan-out stays inside the
+instance limit, and the worker count is capped at the pool size.
+
+Progress of every partition (its keyset cursor or offset) is recorded in an
+:class:`ExportState` that can be checkpointed to a JSON file. A partition is
+only advanced once the consumer has taken all records of a page, so re-running
+an interrupted or partly failed export with the same ``state_path`` resumes each
+unfinished partition where it stopped and skips the finished ones.
+"""
+
+import json
+import os
+import queue
+import threading
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from agent_utilities.base_utilities import get_logger
+from agent_utilities.core.exceptions import ParameterError
+from pydantic import BaseModel, Field
+
+from servicenow_api.pagination import (
+    DEFAULT_PAGE_SIZE,
+    KeysetPagination,
+    PaginationProgress,
+    TablePage,
+)
+
+logger = get_logger(__name__)
+
+#: Partitioning schemes accepted by ``partitioning``.
+PARTITIONING_MODES = ("sys_id", "offset")
+#: Pages buffered per partition (ordered) or per worker (unordered).
+_QUEUE_PAGES = 2
+_SYS_ID_PREFIX_DIGITS = 4
+
+
+class Partition(BaseModel):
+    """One disjoint slice of the table and how far it has been read."""
+
+    index: int
+    low: str | None = Field(default=None, description="Inclusive lower sys_id bound.")
+    high: str | None = Field(default=None, description="Exclusive upper sys_id bound.")
+    start: int | None = Field(default=None, description="First offset of the window.")
+    stop: int | None = Field(default=None, description="Offset after the window.")
+    cursor: str | None = Field(
+        default=None,
+        description="Resume point: last sys_id delivered, or next offset to read.",
+    )
+    fetched: int = Field(default=0, description="Records delivered so far.")
+    done: bool = False
+    error: str | None = None
+
+
+class ExportState(BaseModel):
+    """Checkpointable progress of a partitioned export."""
+
+    table: str
+    query: str | None = None
+    partitioning: str = "sys_id"
+    total: int | None = None
+    partitions: list[Partition] = Field(default_factory=list)
+
+    @property
+    def fetched(self) -> int:
+        return sum(p.fetched for p in self.partitions)
+
+    @property
+    def complete(self) -> bool:
+        return all(p.done for p in self.partitions)
+
+    def save(self, path: str | os.PathLike) -> None:
+        """Atomically write the state as JSON."""
+        path = Path(path)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(self.model_dump_json(indent=2), encoding="utf-8")
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: str | os.PathLike) -> "ExportState | None":
+        """Read a saved state, or ``None`` when the file does not exist."""
+        path = Path(path)
+        if not path.exists():
+            return None
+        return cls.model_validate(json.loads(path.read_text(encoding="utf-8")))
+
+
+class PartitionExportError(RuntimeError):
+    """Raised after the stream ends when one or more partitions failed."""
+
+    def __init__(self, failed: list[Partition]):
+        self.failed = failed
+        super().__init__(
+            f"{len(failed)} partition(s) failed: "
+            + ", ".join(f"#{p.index} ({p.error})" for p in failed)
+        )
+
+
+def and_condition(query: str | None, condition: str) -> str:
+    """AND ``condition`` into every ``^NQ`` branch of an encoded query."""
+    if not query:
+        return condition
+    return "^NQ".join(f"{branch}^{condition}" for branch in query.split("^NQ"))
+
+
+def plan_sys_id_partitions(count: int) -> list[Partition]:
+    """Split the hexadecimal ``sys_id`` space into ``count`` contiguous ranges."""
+    space = 16**_SYS_ID_PREFIX_DIGITS
+    bounds = [
+        format(i * space // count, f"0{_SYS_ID_PREFIX_DIGITS}x") for i in range(count)
+    ]
+    return [
+        Partition(
+            index=i,
+            low=bounds[i] if i else None,
+            high=bounds[i + 1] if i + 1 < count else None,
+        )
+        for i in range(count)
+    ]
+
+
+def plan_offset_partitions(total: int, count: int) -> list[Partition]:
+    """Split ``total`` rows into ``count`` offset windows of near-equal size."""
+    count = max(min(count, total), 1)
+    edges = [i * total // count for i in range(count + 1)]
+    return [Partition(index=i, start=edges[i], stop=edges[i + 1]) for i in range(count)]
+
+
+class PartitionedExport:
+    """Iterator over a table read by several workers in disjoint partitions.
+
+    :param fetch_page: Callable returning a :class:`TablePage` for a params dict
+        (thread-safe; normally ``Api._fetch_table_page`` bound to the table).
+    :param table: Table name.
+    :param params: Base query parameters (``sysparm_query``, ``sysparm_fields``...).
+    :param workers: Concurrent partitions.
+    :param partitioning: ``"sys_id"`` ranges or ``"offset"`` windows.
+    :param partitions: Number of partitions (defaults to ``workers``).
+    :param ordered: Yield partitions in order instead of as pages arrive.
+    :param page_size: Records per request.
+    :param parse: Applied to each raw record as it is yielded.
+    :param state_path: JSON checkpoint; resumed from when it exists.
+    :param on_progress: Called with a :class:`PaginationProgress` after every page.
+    """
+
+    def __init__(
+        self,
+        fetch_page: Callable[[dict[str, Any]], TablePage],
+        table: str,
+        params: dict[str, Any],
+        workers: int = 4,
+        partitioning: str = "sys_id",
+        partitions: int | None = None,
+        ordered: bool = False,
+        page_size: int = DEFAULT_PAGE_SIZE,
+        parse: Callable[[dict[str, Any]], Any] | None = None,
+        state_path: str | os.PathLike | None = None,
+        on_progress: Callable[[PaginationProgress], None] | None = None,
+    ):
+        if partitioning not in PARTITIONING_MODES:
+            raise ParameterError(
+                f"Unknown partitioning {partitioning!r}; expected one of "
+                f"{list(PARTITIONING_MODES)}"
+            )
+        if workers < 1 or page_size < 1:
+            raise ParameterError("workers and page_size must be at least 1")
+        query = params.get("sysparm_query") or None
+        if partitioning == "sys_id" and query and "ORDERBY" in query:
+            raise ParameterError(
+                "sys_id partitioning orders by sys_id; remove ORDERBY clauses "
+                "from the query"
+            )
+        self._fetch_page = fetch_page
+        self.table = table
+        self.params = {
+            k: v
+            for k, v in params.items()
+            if k not in ("sysparm_limit", "sysparm_offset")
+        }
+        self.workers = workers
+        self.ordered = ordered
+        self.page_size = page_size
+        self.parse = parse
+        self.state_path = state_path
+        self.on_progress = on_progress
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._started = False
+
+        state = ExportState.load(state_path) if state_path else None
+        if state is not None:
+            if (state.table, state.query, state.partitioning) != (
+                table,
+                query,
+                partitioning,
+            ):
+                raise ParameterError(
+                    f"Checkpoint {state_path} belongs to a different export "
+                    f"({state.table}, {state.query!r}, {state.partitioning})"
+                )
+            for partition in state.partitions:
+                partition.error = None
+            logger.info(
+                "Resuming export of %s: %s/%s partitions done, %s records delivered",
+                table,
+                sum(p.done for p in state.partitions),
+                len(state.partitions),
+                state.fetched,
+            )
+        else:
+            state = ExportState(table=table, query=query, partitioning=partitioning)
+            count = partitions or workers
+            if partitioning == "sys_id":
+                state.partitions = plan_sys_id_partitions(count)
+            else:
+                state.total = self._count()
+                state.partitions = plan_offset_partitions(state.total, count)
+        self.state = state
+        self.progress = PaginationProgress(
+            table=table, total=state.total, fetched=state.fetched
+        )
+
+    # -- planning ------------------------------------------------------------------
+
+    def _count(self) -> int:
+        probe = {**self.params, "sysparm_limit": 1}
+        probe.pop("sysparm_no_count", None)
+        page = self._fetch_page(probe)
+        if page.total is None:
+            raise ParameterError(
+                "offset partitioning needs X-Total-Count; the instance did not "
+                "return it (use partitioning='sys_id')"
+            )
+        return page.total
+
+    def _partition_params(self, partition: Partition) -> dict[str, Any]:
+        query = self.params.get("sysparm_query") or ""
+        if self.state.partitioning == "sys_id":
+            for condition in (
+                f"sys_id>={partition.low}" if partition.low else None,
+                f"sys_id<{partition.high}" if partition.high else None,
+            ):
+                if condition:
+                    query = and_condition(query, condition)
+        elif "ORDERBY" not in query:
+            query = f"{query}^ORDERBYsys_id" if query else "ORDERBYsys_id"
+        params = {**self.params, "sysparm_no_count": "true"}
+        if query:
+            params["sysparm_query"] = query
+        return params
+
+    # -- workers -------------------------------------------------------------------
+
+    def _pages(self, partition: Partition) -> Iterator[tuple[list, str | None]]:
+        """Yield ``(records, cursor_after_page)`` for the unread part of a partition."""
+        params = self._partition_params(partition)
+        if self.state.partitioning == "sys_id":
+            strategy = KeysetPagination("keyset", after=partition.cursor)
+            page_params = strategy.first(params, self.page_size)
+            progress = PaginationProgress()
+            while page_params is not None:
+                page = self._fetch_page(page_params)
+                if not page.records:
+                    return
+                yield page.records, strategy.cursor_of(page.records[-1])
+                page_params = strategy.next(page_params, page, progress)
+                if page_params is not None:
+                    page_params = {
+                        **page_params,
+                        "sysparm_limit": self.page_size,
+                        "sysparm_no_count": "true",
+                    }
+        else:
+            offset = int(partition.cursor or partition.start)
+            while offset < partition.stop:
+                limit = min(self.page_size, partition.stop - offset)
+                page = self._fetch_page(
+                    {**params, "sysparm_offset": offset, "sysparm_limit": limit}
+                )
+                if not page.records:
+                    return
+                offset += len(page.records)
+                yield page.records, str(offset)
+
+    def _put(self, channel: queue.Queue, item: tuple) -> bool:
+        while not self._stop.is_set():
+            try:
+                channel.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _run(self, partition: Partition, channel: queue.Queue) -> None:
+        try:
+            for records, cursor in self._pages(partition):
+                if self._stop.is_set() or not self._put(
+                    channel, ("page", partition.index, records, cursor)
+                ):
+                    return
+            self._put(channel, ("done", partition.index, None, None))
+        except Exception as e:
+            logger.warning(
+                "Partition %s of %s failed: %s", partition.index, self.table, e
+            )
+            self._put(channel, ("error", partition.index, e, None))
+
+    # -- consumer ------------------------------------------------------------------
+
+    def _checkpoint(self) -> None:
+        if self.state_path:
+            self.state.save(self.state_path)
+
+    def _deliver(self, partition: Partition, records: list, cursor: str | None):
+        for record in records:
+            yield self.parse(record) if self.parse is not None else record
+        with self._lock:
+            partition.cursor = cursor
+            partition.fetched += len(records)
+            self.progress.pages += 1
+            self.progress.fetched += len(records)
+            self._checkpoint()
+        if self.on_progress is not None:
+            self.on_progress(self.progress)
+
+    def _finish(self, partition: Partition, kind: str, error: Any) -> None:
+        with self._lock:
+            if kind == "done":
+                partition.done = True
+            else:
+                partition.error = f"{type(error).__name__}: {error}"
+            self._checkpoint()
+
+    def __iter__(self) -> Iterator[Any]:
+        if self._started:
+            raise RuntimeError("PartitionedExport can only be iterated once")
+        self._started = True
+        pending = [p for p in self.state.partitions if not p.done]
+        by_index = {p.index: p for p in pending}
+        workers = min(self.workers, max(len(pending), 1))
+        executor = ThreadPoolExecutor(
+            max_workers=workers, thread_name_prefix="servicenow-export"
+        )
+        try:
+            if self.ordered:
+                channels = {p.index: queue.Queue(_QUEUE_PAGES) for p in pending}
+                for partition in pending:
+                    executor.submit(self._run, partition, channels[partition.index])
+                for partition in pending:
+                    while True:
+                        kind, _, payload, cursor = channels[partition.index].get()
+                        if kind != "page":
+                            self._finish(partition, kind, payload)
+                            break
+                        yield from self._deliver(partition, payload, cursor)
+            else:
+                channel: queue.Queue = queue.Queue(_QUEUE_PAGES * workers)
+                for partition in pending:
+                    executor.submit(self._run, partition, channel)
+                remaining = len(pending)
+                while remaining:
+                    kind, index, payload, cursor = channel.get()
+                    partition = by_index[index]
+                    if kind != "page":
+                        self._finish(partition, kind, payload)
+                        remaining -= 1
+                        continue
+                    yield from self._deliver(partition, payload, cursor)
+        finally:
+            self._stop.set()
+            executor.shutdown(wait=True, cancel_futures=True)
+        failed = [p for p in self.state.partitions if p.error]
+        if failed:
+            raise PartitionExportError(failed)
+
+    def close(self) -> None:
+        """Stop the workers; the checkpoint keeps what was delivered."""
+        self._stop.set()
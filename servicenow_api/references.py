@@ -0,0 +1,298 @@
+#!/usr/bin/python
+"""Local resolution of reference-field display values.
+
+A Table API row read without ``sysparm_display_value`` carries each reference
+field (``assigned_to``, ``assignment_group``, ``cmdb_ci``, ``caller_id`` …) as
+``{"link": ".../table/sys_user/<sys_id>", "value": "<sys_id>"}``. Agents need the
+name behind it. Asking the instance for ``sysparm_display_value=all`` roughly
+doubles the payload and the server-side work on every page. Looking each id up
+separately is an N+1 query.
+
+:class:`ReferenceResolver` keeps a per-table LRU cache with a TTL of display
+values. For a page of rows it gathers the referenced ids that are not cached,
+fetches them in one chunked ``sys_idIN`` query per target table (through
+:meth:`~servicenow_api.api.api_client_system.ServiceNowApiSystem.get_records`), and
+writes ``display_value`` into the reference fields in place. The same users,
+groups and CIs recur across pages, so after the first page most references are
+answered from the cache. Display values that rows already carry (for example from
+``sysparm_display_value=all``) are added to the cache as they pass through.
+
+The display column of a table comes from :data:`DISPLAY_FIELDS` or, for other
+tables, from its ``sys_dictionary`` entry marked ``display=true`` (searched up
+the ``super_class`` chain). ``name`` is the fallback.
+"""
+
+import re
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable, Hashable, Iterable
+from typing import Any
+
+from agent_utilities.base_utilities import get_logger
+from agent_utilities.core.config import setting
+
+logger = get_logger(__name__)
+
+#: Display column of common reference targets.
+DISPLAY_FIELDS = {
+    "sys_user": "name",
+    "sys_user_group": "name",
+    "cmdb_ci": "name",
+    "cmn_location": "name",
+    "cmn_department": "name",
+    "core_company": "name",
+    "task": "number",
+    "incident": "number",
+    "problem": "number",
+    "change_request": "number",
+    "sc_request": "number",
+    "sc_req_item": "number",
+    "sc_task": "number",
+    "kb_knowledge": "number",
+}
+#: Cached display values per referenced table (``SERVICENOW_REFERENCE_CACHE_SIZE``).
+DEFAULT_CACHE_SIZE = 10_000
+#: Seconds a cached display value is trusted (``SERVICENOW_REFERENCE_CACHE_TTL``).
+DEFAULT_CACHE_TTL = 900.0
+_FALLBACK_DISPLAY_FIELD = "name"
+_MAX_SUPER_CLASS_DEPTH = 10
+_LINK = re.compile(r"/table/([A-Za-z0-9_]+)/([^/?#]+)/?$")
+_MISS = object()
+
+
+class LruTtlCache:
+    """Thread-safe mapping that evicts the least recently used entry when full and
+    forgets entries ``ttl`` seconds after they were stored.
+
+    :param max_entries: Capacity.
+    :param ttl: Lifetime of an entry in seconds; ``0`` disables expiry.
+    :param clock: Monotonic time source.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_CACHE_SIZE,
+        ttl: float = DEFAULT_CACHE_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_entries = max(max_entries, 1)
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._clock = clock
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (not self.ttl or entry[0] > self._clock()):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return default
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[key] = (self._clock() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def reference_target(value: Any) -> tuple[str, str] | None:
+    """``(table, sys_id)`` of a reference field value that has a ``link``."""
+    if isinstance(value, dict):
+        link, sys_id = value.get("link"), value.get("value")
+    else:
+        link, sys_id = getattr(value, "link", None), getattr(value, "value", None)
+    if not isinstance(link, str) or not sys_id:
+        return None
+    match = _LINK.search(link)
+    if match is None:
+        return None
+    return match.group(1), str(sys_id)
+
+
+def _fields(record: Any) -> Iterable[tuple[str, Any]]:
+    if isinstance(record, dict):
+        return record.items()
+    values = dict(getattr(record, "__dict__", {}))
+    values.update(getattr(record, "model_extra", None) or {})
+    return values.items()
+
+
+def _display_of(value: Any) -> Any:
+    if isinstance(value, dict):
+        return value.get("display_value")
+    return getattr(value, "display_value", None)
+
+
+def _set_display(value: Any, display: Any) -> None:
+    if isinstance(value, dict):
+        value["display_value"] = display
+    else:
+        value.display_value = display
+
+
+class ReferenceResolver:
+    """Fills in reference-field display values from a per-table LRU+TTL cache.
+
+    :param api: :class:`~servicenow_api.api_client.Api` used for lookups.
+    :param max_entries: Cache capacity per referenced table.
+    :param ttl: Seconds a display value is cached; ``0`` keeps it until evicted.
+    :param display_fields: Display column overrides, by table.
+    """
+
+    def __init__(
+        self,
+        api,
+        max_entries: int | None = None,
+        ttl: float | None = None,
+        display_fields: dict[str, str] | None = None,
+    ):
+        self.api = api
+        self.max_entries = int(
+            max_entries
+            if max_entries is not None
+            else setting("SERVICENOW_REFERENCE_CACHE_SIZE", DEFAULT_CACHE_SIZE)
+        )
+        self.ttl = float(
+            ttl
+            if ttl is not None
+            else setting("SERVICENOW_REFERENCE_CACHE_TTL", DEFAULT_CACHE_TTL)
+        )
+        self._display_fields = {**DISPLAY_FIELDS, **(display_fields or {})}
+        self._caches: dict[str, LruTtlCache] = {}
+        self._lock = threading.Lock()
+
+    def cache(self, table: str) -> LruTtlCache:
+        """The display-value cache of ``table``."""
+        with self._lock:
+            cache = self._caches.get(table)
+            if cache is None:
+                cache = self._caches[table] = LruTtlCache(self.max_entries, self.ttl)
+            return cache
+
+    @property
+    def stats(self) -> dict[str, dict[str, int]]:
+        """Entries, hits and misses per cached table."""
+        with self._lock:
+            caches = dict(self._caches)
+        return {
+            table: {"entries": len(c), "hits": c.hits, "misses": c.misses}
+            for table, c in caches.items()
+        }
+
+    def display_field(self, table: str) -> str:
+        """Column shown for records of ``table``."""
+        field = self._display_fields.get(table)
+        if field is None:
+            field = self._lookup_display_field(table) or _FALLBACK_DISPLAY_FIELD
+            self._display_fields[table] = field
+        return field
+
+    def _lookup_display_field(self, table: str) -> str | None:
+        current: str | None = table
+        try:
+            for _ in range(_MAX_SUPER_CLASS_DEPTH):
+                if current is None:
+                    return None
+                if current in DISPLAY_FIELDS and current != table:
+                    return DISPLAY_FIELDS[current]
+                rows = self.api.get_table(
+                    table="sys_dictionary",
+                    sysparm_query=f"name={current}^display=true",
+                    sysparm_fields="element",
+                    sysparm_limit=1,
+                    result_mode="dicts",
+                ).result
+                if rows and rows[0].get("element"):
+                    return rows[0]["element"]
+                rows = self.api.get_table(
+                    table="sys_db_object",
+                    sysparm_query=f"name={current}",
+                    sysparm_fields="super_class.name",
+                    sysparm_limit=1,
+                    result_mode="dicts",
+                ).result
+                current = rows[0].get("super_class.name") or None if rows else None
+        except Exception as e:
+            logger.debug(
+                "Display field lookup failed: table=%s error_type=%s",
+                table,
+                type(e).__name__,
+            )
+        return None
+
+    def resolve(self, table: str, sys_ids: Iterable[str]) -> dict[str, Any]:
+        """Display values of ``sys_ids`` in ``table``; ``None`` for records not found.
+
+        Ids missing from the cache are fetched together with one chunked query.
+        """
+        cache = self.cache(table)
+        resolved: dict[str, Any] = {}
+        unknown = []
+        for sys_id in dict.fromkeys(sys_ids):
+            value = cache.get(sys_id, _MISS)
+            if value is _MISS:
+                unknown.append(sys_id)
+            else:
+                resolved[sys_id] = value
+        if unknown:
+            field = self.display_field(table)
+            found = self.api.get_records(
+                table,
+                unknown,
+                fields=[field],
+                sysparm_display_value="true",
+                result_mode="dicts",
+            ).records
+            for sys_id in unknown:
+                row = found.get(sys_id)
+                value = row.get(field) if row else None
+                if isinstance(value, dict):
+                    value = value.get("display_value") or value.get("value")
+                cache.set(sys_id, value)
+                resolved[sys_id] = value
+        return resolved
+
+    def annotate(self, records: Iterable[Any], fields: Iterable[str] | None = None):
+        """Set ``display_value`` on the reference fields of ``records`` in place.
+
+        :param records: Raw row dicts or parsed models (``ReferenceField`` values).
+        :param fields: Only these fields; every reference field when omitted.
+        :return: ``records``.
+        """
+        wanted = set(fields) if fields is not None else None
+        pending: dict[str, list[tuple[str, Any]]] = {}
+        for record in records:
+            for name, value in _fields(record):
+                if wanted is not None and name not in wanted:
+                    continue
+                target = reference_target(value)
+                if target is None:
+                    continue
+                table, sys_id = target
+                display = _display_of(value)
+                if display not in (None, ""):
+                    self.cache(table).set(sys_id, display)
+                    continue
+                pending.setdefault(table, []).append((sys_id, value))
+        for table, refs in pending.items():
+            resolved = self.resolve(table, (sys_id for sys_id, _ in refs))
+            for sys_id, value in refs:
+                if resolved.get(sys_id) is not None:
+                    _set_display(value, resolved[sys_id])
+        return records
@@ -0,0 +1,95 @@
+#!/usr/bin/python
+"""How list endpoints hand back their rows: validated models, raw dicts or lazily.
+
+``get_table``, ``get_incidents``, ``get_problems``, ``get_change_requests`` and
+``get_knowledge_articles`` validate every row into a pydantic model by default.
+On large pages that validation dominates CPU, most of all for incidents, whose
+``ReferenceField | str`` unions are tried member by member. ``result_mode`` picks
+the trade-off per client (``Api(result_mode=...)`` / ``SERVICENOW_RESULT_MODE``) or
+per call (``result_mode=...``):
+
+* ``"models"`` -- validate every row up front (default, unchanged behaviour);
+* ``"dicts"`` -- return the decoded JSON rows untouched;
+* ``"lazy"`` -- return a :class:`LazyRecords` list that validates a row the first
+  time it is accessed and keeps the model.
+"""
+
+from collections.abc import Iterator
+from typing import Any
+
+from agent_utilities.core.config import setting
+from agent_utilities.core.exceptions import ParameterError
+
+#: Accepted ``result_mode`` values.
+RESULT_MODES = ("models", "dicts", "lazy")
+#: Mode used when neither the call nor the client chooses one.
+DEFAULT_RESULT_MODE = "models"
+
+
+def validate_result_mode(mode: str | None) -> str | None:
+    """Return ``mode`` if it is a known result mode (or ``None``), else raise."""
+    if mode is not None and mode not in RESULT_MODES:
+        raise ParameterError(
+            f"Unknown result_mode {mode!r}; expected one of {list(RESULT_MODES)}"
+        )
+    return mode
+
+
+def default_result_mode() -> str:
+    """Client default from ``SERVICENOW_RESULT_MODE``."""
+    return validate_result_mode(
+        str(setting("SERVICENOW_RESULT_MODE", DEFAULT_RESULT_MODE)).lower()
+    )
+
+
+class LazyRecords(list):
+    """List of raw rows that validates each row into ``model`` on first access.
+
+    It stays a real ``list``, so ``len``, truthiness and pydantic serialization
+    (``Response.model_dump`` / ``model_dump_json``) work without validating
+    anything; rows that were never read are serialized as the raw JSON they
+    arrived as. Plain ``json.dumps`` iterates the list and so validates every row
+    into a model it cannot encode; encode ``model_dump(mode="json")`` instead.
+    """
+
+    def __init__(self, model: Any, rows: list[dict[str, Any]]):
+        super().__init__(rows)
+        self.model = model
+
+    def _validated(self, index: int) -> Any:
+        row = super().__getitem__(index)
+        if isinstance(row, dict):
+            row = self.model.model_validate(row)
+            super().__setitem__(index, row)
+        return row
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._validated(i) for i in range(*index.indices(len(self)))]
+        return self._validated(index)
+
+    def __iter__(self) -> Iterator[Any]:
+        for index in range(len(self)):
+            yield self._validated(index)
+
+    def __reversed__(self) -> Iterator[Any]:
+        for index in range(len(self) - 1, -1, -1):
+            yield self._validated(index)
+
+    @property
+    def validated(self) -> int:
+        """Rows validated so far."""
+        return sum(
+            1
+            for index in range(len(self))
+            if not isinstance(list.__getitem__(self, index), dict)
+        )
+
+
+def parse_records(model: Any, rows: list[dict[str, Any]], mode: str) -> list[Any]:
+    """Turn decoded JSON rows into the list a list endpoint returns for ``mode``."""
+    if mode == "dicts":
+        return rows
+    if mode == "lazy":
+        return LazyRecords(model, rows)
+    return [model.model_validate(row) for row in rows]
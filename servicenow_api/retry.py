@@ -0,0 +1,339 @@
+#!/usr/bin/python
+"""Rate-limit aware retries for ServiceNow REST calls.
+
+ServiceNow enforces per-user REST rate-limit rules: once a rule's quota is spent
+the instance answers ``429 Too Many Requests`` with a ``Retry-After`` header, and
+every response carries ``X-RateLimit-Limit`` / ``X-RateLimit-Remaining`` /
+``X-RateLimit-Reset``. Nodes that are restarting or overloaded answer ``503``.
+Previously each mixin passed those straight to the caller via
+``raise_for_status()``.
+
+This module provides the pieces :class:`~servicenow_api.transport.ServiceNowSession`
+(and :class:`~servicenow_api.async_client.AsyncApi`) use to absorb them centrally:
+
+* :class:`RetryPolicy` — which statuses/methods are retried, exponential backoff
+  with full jitter, and ``Retry-After`` honoured (capped). Unsafe methods
+  (``POST``/``PATCH``) are only retried when the request carries an idempotency
+  key, which the policy can add automatically;
+* :class:`RetryBudget` — caps retries to a fraction of recent traffic so that a
+  struggling instance is not hit with a retry storm;
+* :class:`RateLimiter` — a token bucket shared by every thread using one client,
+  re-calibrated from the ``X-RateLimit-*`` headers it observes so bulk jobs pace
+  themselves at the instance limit instead of tripping it.
+"""
+
+import random
+import threading
+import time
+import uuid
+from collections import deque
+from collections.abc import Callable, Mapping
+from datetime import timezone
+from email.utils import parsedate_to_datetime
+from typing import Any
+
+from agent_utilities.base_utilities import get_logger
+from agent_utilities.core.config import setting
+from pydantic import BaseModel, ConfigDict, Field
+
+logger = get_logger(__name__)
+
+#: Methods that may be repeated without changing the outcome (RFC 9110 §9.2.2).
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+#: Header carrying a client-generated key that makes an unsafe write retryable.
+IDEMPOTENCY_HEADER = "Idempotency-Key"
+
+
+def parse_retry_after(value: Any, now: float | None = None) -> float | None:
+    """Return the delay in seconds described by a ``Retry-After`` header value.
+
+    Accepts both the delta-seconds and the HTTP-date forms; ``None`` when absent or
+    unparsable.
+    """
+    if not isinstance(value, (str, int, float)) or value == "":
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(str(value))
+    except (TypeError, ValueError):
+        return None
+    if when.tzinfo is None:
+        when = when.replace(tzinfo=timezone.utc)
+    now = time.time() if now is None else now
+    return max(when.timestamp() - now, 0.0)
+
+
+def _header_number(headers: Mapping[str, Any] | None, name: str) -> float | None:
+    if not headers:
+        return None
+    try:
+        value = headers.get(name)
+    except Exception:
+        return None
+    if not isinstance(value, (str, int, float)):
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        return None
+
+
+class RetryPolicy(BaseModel):
+    """When and how long to wait before re-sending a failed request."""
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+    max_attempts: int = Field(
+        default=4, ge=1, description="Total attempts, including the first one."
+    )
+    backoff_base: float = Field(
+        default=0.5, ge=0, description="Backoff before the first retry, in seconds."
+    )
+    backoff_max: float = Field(
+        default=30.0, ge=0, description="Upper bound on a computed backoff."
+    )
+    max_retry_after: float = Field(
+        default=120.0,
+        ge=0,
+        description="Longest Retry-After the client will wait; longer waits fail fast.",
+    )
+    retry_statuses: frozenset[int] = Field(
+        default=frozenset({429, 502, 503, 504}),
+        description="Response statuses that are retried.",
+    )
+    retry_on_connection_errors: bool = Field(
+        default=True, description="Retry idempotent requests after connect/read errors."
+    )
+    idempotency_keys: bool = Field(
+        default=False,
+        description="Attach an Idempotency-Key to POST/PATCH requests so they can be "
+        "retried; the instance must de-duplicate on it (e.g. a scripted REST API).",
+    )
+
+    @classmethod
+    def from_settings(cls) -> "RetryPolicy":
+        """Build a policy from ``SERVICENOW_RETRY_*`` settings (env / config file)."""
+        defaults = cls()
+        idempotency = setting("SERVICENOW_IDEMPOTENCY_KEYS", None)
+        return cls(
+            max_attempts=int(
+                setting("SERVICENOW_RETRY_MAX_ATTEMPTS", defaults.max_attempts)
+            ),
+            backoff_base=float(
+                setting("SERVICENOW_RETRY_BACKOFF_BASE", defaults.backoff_base)
+            ),
+            backoff_max=float(
+                setting("SERVICENOW_RETRY_BACKOFF_MAX", defaults.backoff_max)
+            ),
+            max_retry_after=float(
+                setting("SERVICENOW_RETRY_MAX_RETRY_AFTER", defaults.max_retry_after)
+            ),
+            idempotency_keys=(
+                defaults.idempotency_keys
+                if idempotency in (None, "")
+                else str(idempotency).strip().lower() in ("1", "true", "yes", "on")
+            ),
+        )
+
+    def is_retryable_method(
+        self, method: str, headers: Mapping[str, Any] | None
+    ) -> bool:
+        """Whether a request with this method/headers may safely be sent again."""
+        if method.upper() in IDEMPOTENT_METHODS:
+            return True
+        return bool(headers) and IDEMPOTENCY_HEADER in headers
+
+    def with_idempotency_key(
+        self, method: str, headers: Mapping[str, Any] | None
+    ) -> Mapping[str, Any] | None:
+        """Return ``headers`` plus a fresh idempotency key for unsafe writes.
+
+        The caller's mapping is never mutated (mixins pass the client's shared
+        ``self.headers``); the same key is reused by every retry of the call.
+        """
+        if (
+            not self.idempotency_keys
+            or method.upper() not in ("POST", "PATCH")
+            or (headers and IDEMPOTENCY_HEADER in headers)
+        ):
+            return headers
+        return {**(headers or {}), IDEMPOTENCY_HEADER: str(uuid.uuid4())}
+
+    def backoff(
+        self, retry_number: int, rng: Callable[[], float] = random.random
+    ) -> float:
+        """Full-jitter exponential backoff for the ``retry_number``-th retry (1-based)."""
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** (retry_number - 1)))
+        return ceiling * rng()
+
+    def retry_delay(
+        self,
+        retry_number: int,
+        headers: Mapping[str, Any] | None = None,
+        rng: Callable[[], float] = random.random,
+    ) -> float | None:
+        """Seconds to wait before the next attempt, or ``None`` to give up.
+
+        A ``Retry-After`` header wins over the computed backoff; one longer than
+        ``max_retry_after`` makes the request fail immediately instead.
+        """
+        retry_after = None
+        if headers:
+            try:
+                retry_after = parse_retry_after(headers.get("Retry-After"))
+            except Exception:
+                retry_after = None
+        if retry_after is not None:
+            if retry_after > self.max_retry_after:
+                return None
+            return retry_after
+        return self.backoff(retry_number, rng)
+
+
+class RetryBudget:
+    """Limits retries to a fraction of recent requests.
+
+    A retry is allowed while retries in the last ``window`` seconds stay below
+    ``min_retries + ratio * requests``; beyond that failures surface immediately,
+    so a degraded instance sees at most ``1 + ratio`` times its normal load.
+
+    :param ratio: Retries permitted per request sent.
+    :param min_retries: Retries always permitted per window (low-traffic floor).
+    :param window: Sliding window in seconds.
+    :param clock: Monotonic time source (injectable for tests).
+    """
+
+    def __init__(
+        self,
+        ratio: float = 0.2,
+        min_retries: int = 10,
+        window: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ratio = ratio
+        self.min_retries = min_retries
+        self.window = window
+        self._clock = clock
+        self._requests: deque[float] = deque()
+        self._retries: deque[float] = deque()
+        self._lock = threading.Lock()
+        self.exhausted = 0
+
+    def _trim(self, now: float) -> None:
+        horizon = now - self.window
+        for events in (self._requests, self._retries):
+            while events and events[0] < horizon:
+                events.popleft()
+
+    def record_request(self) -> None:
+        """Count one request (first attempts only)."""
+        with self._lock:
+            now = self._clock()
+            self._trim(now)
+            self._requests.append(now)
+
+    def try_acquire(self) -> bool:
+        """Claim one retry; False when the budget is spent."""
+        with self._lock:
+            now = self._clock()
+            self._trim(now)
+            allowed = self.min_retries + self.ratio * len(self._requests)
+            if len(self._retries) >= allowed:
+                self.exhausted += 1
+                return False
+            self._retries.append(now)
+            return True
+
+
+class RateLimiter:
+    """Token bucket shared by all threads (and coroutines) using one client.
+
+    Unconfigured, it admits everything until the instance reports a limit through
+    ``X-RateLimit-*`` headers; from then on it spreads the remaining quota evenly
+    over the time left until ``X-RateLimit-Reset``. A 429 with ``Retry-After``
+    pauses every caller until the instance is ready again.
+
+    :param rate: Static requests per second, or ``None`` to rely on observed headers.
+    :param burst: Bucket capacity (requests that may be sent back to back).
+    :param clock: Wall-clock time source (``X-RateLimit-Reset`` is epoch seconds).
+    """
+
+    def __init__(
+        self,
+        rate: float | None = None,
+        burst: float = 10.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._tokens = burst
+        self._updated = clock()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_settings(cls) -> "RateLimiter":
+        """Build a limiter from ``SERVICENOW_RATE_LIMIT`` / ``SERVICENOW_RATE_LIMIT_BURST``."""
+        rate = setting("SERVICENOW_RATE_LIMIT", None)
+        return cls(
+            rate=float(rate) if rate not in (None, "") else None,
+            burst=float(setting("SERVICENOW_RATE_LIMIT_BURST", 10.0)),
+        )
+
+    def _refill(self, now: float) -> None:
+        if self.rate is not None:
+            elapsed = max(now - self._updated, 0.0)
+            self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Take a token and return how long the caller must wait before sending."""
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            wait = max(self._blocked_until - now, 0.0)
+            if self.rate is None:
+                return wait
+            self._tokens -= 1
+            if self._tokens < 0:
+                wait = max(wait, -self._tokens / self.rate)
+            return wait
+
+    def acquire(self, sleep: Callable[[float], None] = time.sleep) -> float:
+        """Block until a request may be sent; returns the time waited."""
+        wait = self.reserve()
+        if wait > 0:
+            sleep(wait)
+        return wait
+
+    def observe(self, status_code: Any, headers: Mapping[str, Any] | None) -> None:
+        """Re-calibrate from a response's rate-limit headers."""
+        remaining = _header_number(headers, "X-RateLimit-Remaining")
+        reset = _header_number(headers, "X-RateLimit-Reset")
+        retry_after = None
+        if status_code == 429 and headers:
+            try:
+                retry_after = parse_retry_after(headers.get("Retry-After"))
+            except Exception:
+                retry_after = None
+        if remaining is None and retry_after is None:
+            return
+        with self._lock:
+            now = self._clock()
+            self._refill(now)
+            if retry_after is not None:
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+            if remaining is not None:
+                window = max((reset - now) if reset is not None else 3600.0, 1.0)
+                self.rate = max(remaining, 0.0) / window or 1.0 / window
+                self._tokens = min(self._tokens, max(remaining, 0.0), self.burst)
+                logger.debug(
+                    "Rate limit observed: remaining=%s reset_in=%.0fs rate=%.3f/s",
+                    remaining,
+                    window,
+                    self.rate,
+                )
@@ -1,4 +1,4 @@
-from typing import Any, Generic, TypeVar
+from typing import Any, ClassVar, Generic, TypeVar
 
 import requests
 from agent_utilities.core.exceptions import (
@@ -13,6 +13,10 @@
     model_validator,
 )
 
+from servicenow_api.choices import ChoiceCache, choice_display
+from servicenow_api.results import LazyRecords
+from servicenow_api.results import validate_result_mode as check_result_mode
+
 
 class ServiceNowQueryModel(BaseModel):
     """Base for ServiceNow request/query-parameter models.
@@ -574,6 +578,9 @@ class ChangeManagementModel(ServiceNowQueryModel):
     - response_length (int): Length of the response (default is 10).
     - api_parameters (str): API parameters.
     - data (Dict): Dictionary containing data.
+    - pagination (Optional[str]): Paging mode: 'offset' (default), 'keyset' (sys_id) or 'keyset_updated' (sys_updated_on,sys_id).
+    - cursor (Optional[str]): Keyset cursor returned as next_cursor by the previous page.
+    - result_mode (Optional[str]): List rows as 'models' (default), raw 'dicts' or 'lazy' (validated on access).
 
     Note:
     The class includes field_validator functions for specific attribute validations.
@@ -599,9 +606,37 @@ class ChangeManagementModel(ServiceNowQueryModel):
     change_type: str | None = None
     standard_change_template_id: str | None = None
     response_length: int = 10
+    pagination: str | None = Field(
+        default=None,
+        description="Paging mode: 'offset', 'keyset' or 'keyset_updated'",
+    )
+    cursor: str | None = Field(
+        default=None, description="Keyset cursor from the previous page's next_cursor"
+    )
+    result_mode: str | None = Field(
+        default=None,
+        description="How list rows are returned: 'models', 'dicts' or 'lazy'",
+    )
     api_parameters: dict | None = Field(description="API Parameters", default=None)
     data: dict | None = None
 
+    @field_validator("result_mode")
+    @classmethod
+    def validate_result_mode(cls, v):
+        """
+        Validate the 'result_mode' parameter to ensure it is a known result mode.
+
+        Args:
+        - v: The value of 'result_mode'.
+
+        Returns:
+        - str: The validated 'result_mode'.
+
+        Raises:
+        - ParameterError: If 'result_mode' is not 'models', 'dicts' or 'lazy'.
+        """
+        return check_result_mode(v)
+
     @field_validator(
         "change_request_sys_id",
         "cmdb_ci_sys_ids",
@@ -733,6 +768,25 @@ def build_data(cls, values: dict) -> dict:
             values["data"] = data
         return values
 
+    @field_validator("pagination")
+    @classmethod
+    def validate_pagination(cls, v):
+        """
+        Validate the 'pagination' parameter to ensure it is a known paging mode.
+
+        Args:
+        - v: The value of 'pagination'.
+
+        Returns:
+        - str: The validated 'pagination'.
+
+        Raises:
+        - ParameterError: If 'pagination' is not 'offset', 'keyset' or 'keyset_updated'.
+        """
+        if v not in ["offset", "keyset", "keyset_updated", None]:
+            raise ParameterError
+        return v
+
     def model_post_init(self, _context):
         """
         Build the API parameters
@@ -791,6 +845,10 @@ class IncidentModel(ServiceNowQueryModel):
     Attributes:
     - incident_id (Union[int, str]): Identifier for the incident.
     - data (Dict): Dictionary containing additional data.
+    - pagination (Optional[str]): Paging mode: 'offset' (default), 'keyset' (sys_id) or 'keyset_updated' (sys_updated_on,sys_id).
+    - cursor (Optional[str]): Keyset cursor returned as next_cursor by the previous page.
+    - result_mode (Optional[str]): List rows as 'models' (default), raw 'dicts' or 'lazy' (validated on access).
+    - resolve_references (Optional[bool]): Fill reference-field display values from the client's reference cache.
     """
 
     incident_id: int | str = None
@@ -806,11 +864,43 @@ class IncidentModel(ServiceNowQueryModel):
     sysparm_query_no_domain: bool | None = None
     sysparm_suppress_pagination_header: bool | None = None
     sysparm_view: str | None = None
+    pagination: str | None = Field(
+        default=None,
+        description="Paging mode: 'offset', 'keyset' or 'keyset_updated'",
+    )
+    cursor: str | None = Field(
+        default=None, description="Keyset cursor from the previous page's next_cursor"
+    )
+    result_mode: str | None = Field(
+        default=None,
+        description="How list rows are returned: 'models', 'dicts' or 'lazy'",
+    )
+    resolve_references: bool | None = Field(
+        default=None,
+        description="Fill reference display values from the client-side cache",
+    )
     api_parameters: dict | None = Field(description="API Parameters", default=None)
     data: dict | None = Field(
         default=None, description="Table dictionary value to insert"
     )
 
+    @field_validator("result_mode")
+    @classmethod
+    def validate_result_mode(cls, v):
+        """
+        Validate the 'result_mode' parameter to ensure it is a known result mode.
+
+        Args:
+        - v: The value of 'result_mode'.
+
+        Returns:
+        - str: The validated 'result_mode'.
+
+        Raises:
+        - ParameterError: If 'result_mode' is not 'models', 'dicts' or 'lazy'.
+        """
+        return check_result_mode(v)
+
     @field_validator("incident_id")
     @classmethod
     def validate_string_parameters(cls, v):
@@ -889,6 +979,25 @@ def validate_sysparm_display_value(cls, v):
             raise ParameterError
         return v
 
+    @field_validator("pagination")
+    @classmethod
+    def validate_pagination(cls, v):
+        """
+        Validate the 'pagination' parameter to ensure it is a known paging mode.
+
+        Args:
+        - v: The value of 'pagination'.
+
+        Returns:
+        - str: The validated 'pagination'.
+
+        Raises:
+        - ParameterError: If 'pagination' is not 'offset', 'keyset' or 'keyset_updated'.
+        """
+        if v not in ["offset", "keyset", "keyset_updated", None]:
+            raise ParameterError
+        return v
+
     def model_post_init(self, _context):
         """
         Build the API parameters
@@ -939,6 +1048,7 @@ class KnowledgeManagementModel(ServiceNowQueryModel):
     - sysparm_search_rank (Optional[int]): Sysparm search rank.
     - sysparm_update_view (Optional[bool]): Flag indicating whether to update the view.
     - api_parameters (str): API parameters.
+    - result_mode (Optional[str]): List rows as 'models' (default), raw 'dicts' or 'lazy' (validated on access).
 
     Note:
     The class includes field_validator functions for specific attribute validations.
@@ -955,8 +1065,29 @@ class KnowledgeManagementModel(ServiceNowQueryModel):
     sysparm_update_view: bool | None = None
     name_value_pairs: str | None = None
     textSearch: str | None = None
+    result_mode: str | None = Field(
+        default=None,
+        description="How list rows are returned: 'models', 'dicts' or 'lazy'",
+    )
     api_parameters: dict | None = Field(description="API Parameters", default=None)
 
+    @field_validator("result_mode")
+    @classmethod
+    def validate_result_mode(cls, v):
+        """
+        Validate the 'result_mode' parameter to ensure it is a known result mode.
+
+        Args:
+        - v: The value of 'result_mode'.
+
+        Returns:
+        - str: The validated 'result_mode'.
+
+        Raises:
+        - ParameterError: If 'result_mode' is not 'models', 'dicts' or 'lazy'.
+        """
+        return check_result_mode(v)
+
     def model_post_init(self, _context):
         """
         Build the API parameters
@@ -1001,6 +1132,10 @@ class TableModel(ServiceNowQueryModel):
     - sysparm_view (Optional[str]): Sysparm view.
     - api_parameters (str): API parameters.
     - data (Dict): Dictionary containing additional data.
+    - pagination (Optional[str]): Paging mode: 'offset' (default), 'keyset' (sys_id) or 'keyset_updated' (sys_updated_on,sys_id).
+    - cursor (Optional[str]): Keyset cursor returned as next_cursor by the previous page.
+    - result_mode (Optional[str]): List rows as 'models' (default), raw 'dicts' or 'lazy' (validated on access).
+    - resolve_references (Optional[bool]): Fill reference-field display values from the client's reference cache.
 
     Note:
     The class includes field_validator functions for specific attribute validations.
@@ -1020,11 +1155,43 @@ class TableModel(ServiceNowQueryModel):
     sysparm_query_no_domain: bool | None = None
     sysparm_suppress_pagination_header: bool | None = None
     sysparm_view: str | None = None
+    pagination: str | None = Field(
+        default=None,
+        description="Paging mode: 'offset', 'keyset' or 'keyset_updated'",
+    )
+    cursor: str | None = Field(
+        default=None, description="Keyset cursor from the previous page's next_cursor"
+    )
+    result_mode: str | None = Field(
+        default=None,
+        description="How list rows are returned: 'models', 'dicts' or 'lazy'",
+    )
+    resolve_references: bool | None = Field(
+        default=None,
+        description="Fill reference display values from the client-side cache",
+    )
     api_parameters: dict | None = Field(description="API Parameters", default=None)
     data: dict | None = Field(
         default=None, description="Table dictionary value to insert"
     )
 
+    @field_validator("result_mode")
+    @classmethod
+    def validate_result_mode(cls, v):
+        """
+        Validate the 'result_mode' parameter to ensure it is a known result mode.
+
+        Args:
+        - v: The value of 'result_mode'.
+
+        Returns:
+        - str: The validated 'result_mode'.
+
+        Raises:
+        - ParameterError: If 'result_mode' is not 'models', 'dicts' or 'lazy'.
+        """
+        return check_result_mode(v)
+
     @field_validator("table", "table_record_sys_id")
     @classmethod
     def validate_string_parameters(cls, v):
@@ -1103,6 +1270,25 @@ def validate_sysparm_display_value(cls, v):
             raise ParameterError
         return v
 
+    @field_validator("pagination")
+    @classmethod
+    def validate_pagination(cls, v):
+        """
+        Validate the 'pagination' parameter to ensure it is a known paging mode.
+
+        Args:
+        - v: The value of 'pagination'.
+
+        Returns:
+        - str: The validated 'pagination'.
+
+        Raises:
+        - ParameterError: If 'pagination' is not 'offset', 'keyset' or 'keyset_updated'.
+        """
+        if v not in ["offset", "keyset", "keyset_updated", None]:
+            raise ParameterError
+        return v
+
     def model_post_init(self, _context):
         """
         Build the API parameters
@@ -1342,7 +1528,29 @@ class State(BaseModel):
     )
 
 
-class ChangeRequest(BaseModel):
+class ChoiceLabels:
+    """
+    Local rendering of choice fields (state, priority, impact, ...) for record models.
+
+    Records read without ``sysparm_display_value`` hold raw choice values; a
+    :class:`~servicenow_api.choices.ChoiceCache` turns them into the labels the
+    instance would have returned.
+    """
+
+    choice_table: ClassVar[str] = ""
+
+    def choice_label(self, field: str, choices: ChoiceCache | None = None) -> Any:
+        """
+        Label of a field: its display value if present, else the choice label of its
+        raw value from ``choices``, else the raw value.
+        """
+        return choice_display(
+            getattr(self, field, None), choices, self.choice_table, field
+        )
+
+
+class ChangeRequest(ChoiceLabels, BaseModel):
+    choice_table: ClassVar[str] = "change_request"
     model_config = ConfigDict(extra="allow")
     __hash__ = object.__hash__
     base_type: str = Field(default="ChangeRequest")
@@ -1884,7 +2092,8 @@ class ReferenceField(BaseModel):
     )
 
 
-class Incident(BaseModel):
+class Incident(ChoiceLabels, BaseModel):
+    choice_table: ClassVar[str] = "incident"
     model_config = ConfigDict(extra="allow")
     base_type: str = Field(default="Incident")
     __hash__ = object.__hash__
@@ -2024,6 +2233,7 @@ class ProblemModel(ServiceNowQueryModel):
     Attributes:
     - problem_id (Union[int, str]): Identifier for the problem.
     - data (Dict): Dictionary containing additional data.
+    - result_mode (Optional[str]): List rows as 'models' (default), raw 'dicts' or 'lazy' (validated on access).
     """
 
     problem_id: int | str = None
@@ -2039,11 +2249,32 @@ class ProblemModel(ServiceNowQueryModel):
     sysparm_query_no_domain: bool | None = None
     sysparm_suppress_pagination_header: bool | None = None
     sysparm_view: str | None = None
+    result_mode: str | None = Field(
+        default=None,
+        description="How list rows are returned: 'models', 'dicts' or 'lazy'",
+    )
     api_parameters: dict | None = Field(description="API Parameters", default=None)
     data: dict | None = Field(
         default=None, description="Table dictionary value to insert"
     )
 
+    @field_validator("result_mode")
+    @classmethod
+    def validate_result_mode(cls, v):
+        """
+        Validate the 'result_mode' parameter to ensure it is a known result mode.
+
+        Args:
+        - v: The value of 'result_mode'.
+
+        Returns:
+        - str: The validated 'result_mode'.
+
+        Raises:
+        - ParameterError: If 'result_mode' is not 'models', 'dicts' or 'lazy'.
+        """
+        return check_result_mode(v)
+
     @field_validator("problem_id")
     @classmethod
     def validate_string_parameters(cls, v):
@@ -2157,7 +2388,8 @@ def model_post_init(self, _context):
             self.api_parameters["sysparm_offset"] = self.sysparm_offset
 
 
-class Problem(BaseModel):
+class Problem(ChoiceLabels, BaseModel):
+    choice_table: ClassVar[str] = "problem"
     model_config = ConfigDict(extra="allow")
     base_type: str = Field(default="Problem")
     __hash__ = object.__hash__
@@ -3382,15 +3614,18 @@ class ProductInventoryQueryParams(BaseModel):
 
 class Response(BaseModel, Generic[T]):
     """
-    A wrapper class to hold the original requests.Response along with the parsed Pydantic data.
+    A wrapper class to hold the original requests.Response (or httpx.Response, for
+    AsyncApi) along with the parsed Pydantic data.
     This allows access to response metadata (e.g., status_code, headers) while providing
     the parsed result in Pydantic models.
     """
 
     model_config = ConfigDict(extra="forbid", arbitrary_types_allowed=True)
     base_type: str = Field(default="Response")
-    response: requests.Response = Field(
-        default=None, description="The original requests.Response object", exclude=True
+    # requests.Response, or httpx.Response from AsyncApi. Typed loosely so that
+    # httpx (only needed for AsyncApi) stays out of the synchronous import path.
+    response: requests.Response | Any = Field(
+        default=None, description="The original HTTP response object", exclude=True
     )
     result: T | list[T] | None = Field(
         default=None, description="The Pydantic models converted from the response"
@@ -3408,6 +3643,22 @@ class Response(BaseModel, Generic[T]):
         default=None,
         description="sysparm_offset to pass on the next call to continue paging, when truncated.",
     )
+    next_cursor: str | None = Field(
+        default=None,
+        description="Keyset cursor to pass as cursor on the next call, when more records remain.",
+    )
+    from_mirror: bool = Field(
+        default=False,
+        description="True if the result was answered from the local table mirror.",
+    )
+
+    @field_validator("result", mode="wrap")
+    @classmethod
+    def keep_lazy_records(cls, v, handler):
+        """Keep a lazily validated result list as-is instead of copying it."""
+        if isinstance(v, LazyRecords):
+            return v
+        return handler(v)
 
 
 class FlowNode(BaseModel):
@@ -0,0 +1,222 @@
+#!/usr/bin/python
+"""Incremental decoding of the ``result`` array while a response is still arriving.
+
+A buffered page is only usable after the whole body has been downloaded and
+decoded, so a 50k-row page holds the raw bytes, the decoded text and every parsed
+record at the same time. :func:`iter_json_array` instead reads the body chunk by
+chunk (``requests`` ``stream=True``) and yields each element of the top-level
+``result`` array as soon as its closing brace arrives. Only the current chunk and
+the record being parsed are held, so peak memory is about one record.
+
+Elements are decoded with the standard library's C scanner
+(``json.JSONDecoder.raw_decode``). When an element is cut off at the end of the
+buffer it is parsed again after more bytes arrive. The buffer at least doubles
+before each retry, so records larger than a chunk still cost linear time.
+
+:class:`StreamedRecords` wraps one streamed page for
+:class:`~servicenow_api.pagination.TableIterator`. Once it is consumed, ``len()`` and
+``[-1]`` report the count and the last record, which is what the paging strategies
+use to build the next request.
+"""
+
+import codecs
+import json
+from collections.abc import Callable, Iterable, Iterator
+from typing import Any
+
+import requests
+
+#: Bytes requested from the socket per read.
+STREAM_CHUNK_SIZE = 64 * 1024
+_WHITESPACE = " \t\r\n"
+_decoder = json.JSONDecoder()
+
+
+class _Buffer:
+    """Text decoded so far from a byte-chunk iterator, with a read position."""
+
+    def __init__(self, chunks: Iterable[bytes]):
+        self._chunks = iter(chunks)
+        self._utf8 = codecs.getincrementaldecoder("utf-8")()
+        self.text = ""
+        self.pos = 0
+        self.eof = False
+
+    def fill(self, at_least: int = 1) -> bool:
+        """Append at least ``at_least`` more characters; ``False`` at end of body."""
+        if self.eof:
+            return False
+        parts = [self.text[self.pos :]]
+        added = 0
+        while added < at_least:
+            chunk = next(self._chunks, None)
+            if chunk is None:
+                parts.append(self._utf8.decode(b"", final=True))
+                self.eof = True
+                break
+            text = self._utf8.decode(chunk)
+            parts.append(text)
+            added += len(text)
+        self.text = "".join(parts)
+        self.pos = 0
+        return added > 0 or not self.eof
+
+    def peek(self) -> str:
+        """Next non-whitespace character without consuming it, ``""`` at the end."""
+        while True:
+            text, pos = self.text, self.pos
+            while pos < len(text) and text[pos] in _WHITESPACE:
+                pos += 1
+            self.pos = pos
+            if pos < len(text):
+                return text[pos]
+            if not self.fill():
+                return ""
+
+    def expect(self, chars: str) -> str:
+        """Consume the next non-whitespace character, which must be in ``chars``."""
+        char = self.peek()
+        if not char or char not in chars:
+            expected = " or ".join(repr(c) for c in chars)
+            raise json.JSONDecodeError(f"Expecting {expected}", self.text, self.pos)
+        self.pos += 1
+        return char
+
+    def value(self) -> Any:
+        """Decode the next complete JSON value."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.text, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill(max(len(self.text) - self.pos, 1)):
+                    raise
+                continue
+            # A number at the very end of the buffer may continue in the next chunk.
+            if (
+                end == len(self.text)
+                and isinstance(value, (int, float))
+                and not isinstance(value, bool)
+                and self.fill()
+            ):
+                continue
+            self.pos = end
+            return value
+
+
+def _array_elements(buffer: _Buffer) -> Iterator[Any]:
+    if buffer.peek() == "]":
+        buffer.pos += 1
+        return
+    while True:
+        yield buffer.value()
+        if buffer.expect(",]") == "]":
+            return
+
+
+def iter_json_array(chunks: Iterable[bytes], key: str = "result") -> Iterator[Any]:
+    """Yield the elements of ``body[key]`` (or of a top-level array) as they arrive.
+
+    Other members of the top-level object are parsed and skipped. A ``key`` whose
+    value is not an array is yielded as a single element.
+
+    :param chunks: The response body as an iterable of UTF-8 byte chunks.
+    :param key: Member of the top-level object holding the array.
+    :raises json.JSONDecodeError: If the body is not valid JSON.
+    """
+    buffer = _Buffer(chunks)
+    if buffer.expect("{[") == "[":
+        yield from _array_elements(buffer)
+        return
+    if buffer.peek() == "}":
+        return
+    while True:
+        name = buffer.value()
+        buffer.expect(":")
+        if name == key and buffer.peek() == "[":
+            buffer.pos += 1
+            yield from _array_elements(buffer)
+        else:
+            value = buffer.value()
+            if name == key:
+                yield value
+        if buffer.expect(",}") == "}":
+            return
+
+
+class StreamedRecords:
+    """Iterator over the records of one page, decoded as the body downloads.
+
+    After it has been consumed, ``len()`` and ``[-1]`` give the number of records and
+    the last one; nothing else is kept. Exhausting or closing it closes the response.
+
+    :param records: Iterator of decoded records.
+    :param close: Called once when the records are exhausted, fail or are closed.
+    """
+
+    def __init__(self, records: Iterator[Any], close: Callable[[], None] | None = None):
+        self._records = records
+        self._close = close
+        self._count = 0
+        self._last: Any = None
+        self._consumed = False
+
+    def __iter__(self) -> "StreamedRecords":
+        return self
+
+    def __next__(self) -> Any:
+        try:
+            record = next(self._records)
+        except StopIteration:
+            self._consumed = True
+            self.close()
+            raise
+        except BaseException:
+            self.close()
+            raise
+        self._count += 1
+        self._last = record
+        return record
+
+    def _require_consumed(self) -> None:
+        if not self._consumed:
+            raise TypeError("A streamed page has no length until it is consumed")
+
+    def __len__(self) -> int:
+        self._require_consumed()
+        return self._count
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def __getitem__(self, index: int) -> Any:
+        self._require_consumed()
+        if self._count and index in (-1, self._count - 1):
+            return self._last
+        raise IndexError("A streamed page keeps only its last record")
+
+    def close(self) -> None:
+        """Stop decoding and release the response."""
+        close = getattr(self._records, "close", None)
+        if close is not None:
+            close()
+        if self._close is not None:
+            self._close, callback = None, self._close
+            callback()
+
+
+def _decode_stream(response: requests.Response, chunk_size: int) -> Iterator[Any]:
+    try:
+        yield from iter_json_array(response.iter_content(chunk_size=chunk_size))
+    except json.JSONDecodeError as e:
+        raise requests.JSONDecodeError(e.msg, "", e.pos) from e
+
+
+def stream_records(
+    response: requests.Response, chunk_size: int = STREAM_CHUNK_SIZE
+) -> StreamedRecords:
+    """Records of a ``stream=True`` Table API response, decoded as they arrive.
+
+    :raises requests.JSONDecodeError: While iterating, if the body is not valid JSON.
+    """
+    return StreamedRecords(_decode_stream(response, chunk_size), close=response.close)
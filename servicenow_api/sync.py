@@ -0,0 +1,469 @@
+#!/usr/bin/python
+"""Incremental table sync driven by ``sys_updated_on`` watermarks.
+
+The source presets (``connectors/mcp_source_presets.json``) already name
+``sys_updated_on`` as the update field of incidents and knowledge articles, but a
+sync used to re-read the whole table every run. :class:`TableSync` keeps a
+watermark per ``(instance, table, query)`` in a local SQLite :class:`SyncStore`
+and, on each run, asks only for records updated since then:
+
+* the request is ``<query>^sys_updated_on>=<watermark - overlap>``, walked with
+  ``keyset_updated`` pagination (``ORDERBYsys_updated_on^ORDERBYsys_id``). The
+  overlap window re-reads records that share the watermark's timestamp or were
+  committed late by a long-running transaction;
+* the store remembers each synced ``sys_id`` with its ``sys_updated_on``, so
+  records re-read inside the overlap window and unchanged are not reported again;
+* the watermark is committed together with each batch, so an interrupted run
+  resumes from the last delivered batch;
+* deletes (and records that no longer match the query) cannot be seen through
+  ``sys_updated_on``. A periodic reconciliation pass streams the live ``sys_id``
+  list in ``sys_id`` order and merges it against the stored ids in the same
+  order, so it needs constant memory.
+
+An hourly sync therefore costs one request per page of *changes* plus, once per
+reconcile interval, a ``sys_id``-only scan.
+"""
+
+import sqlite3
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from agent_utilities.base_utilities import get_logger
+from agent_utilities.core.config import setting
+from agent_utilities.core.exceptions import ParameterError
+from pydantic import BaseModel, Field
+
+from servicenow_api.pagination import KeysetPagination, TableIterator
+from servicenow_api.partitioning import and_condition
+
+logger = get_logger(__name__)
+
+#: ServiceNow's internal (UTC) date-time format, as returned without display values.
+SN_DATETIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+#: Seconds re-read before the watermark on every run.
+DEFAULT_OVERLAP_SECONDS = 120
+#: Seconds between reconciliation passes for deletes.
+DEFAULT_RECONCILE_SECONDS = 24 * 3600
+#: Records requested per page for change and reconciliation scans.
+DEFAULT_SYNC_PAGE_SIZE = 1000
+_RECONCILE_PAGE_SIZE = 10000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sync_watermark (
+    instance TEXT NOT NULL,
+    table_name TEXT NOT NULL,
+    query TEXT NOT NULL,
+    watermark TEXT,
+    last_sync REAL,
+    last_reconcile REAL,
+    PRIMARY KEY (instance, table_name, query)
+);
+CREATE TABLE IF NOT EXISTS sync_record (
+    instance TEXT NOT NULL,
+    table_name TEXT NOT NULL,
+    query TEXT NOT NULL,
+    sys_id TEXT NOT NULL,
+    sys_updated_on TEXT,
+    PRIMARY KEY (instance, table_name, query, sys_id)
+) WITHOUT ROWID;
+"""
+
+
+def default_sync_db() -> Path:
+    """Resolve the checkpoint database path.
+
+    Override with ``SERVICENOW_SYNC_DB``; otherwise ``~/.servicenow-api/sync.sqlite3``.
+    """
+    configured = setting("SERVICENOW_SYNC_DB", "")
+    path = (
+        Path(configured)
+        if configured
+        else Path.home() / ".servicenow-api" / "sync.sqlite3"
+    )
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _value(record: dict[str, Any], field: str) -> Any:
+    value = record.get(field)
+    if isinstance(value, dict):
+        value = value.get("value")
+    return value
+
+
+class Watermark(BaseModel):
+    """Stored sync position for one ``(instance, table, query)``."""
+
+    watermark: str | None = Field(
+        default=None, description="Highest sys_updated_on delivered so far."
+    )
+    last_sync: float | None = None
+    last_reconcile: float | None = None
+
+
+class SyncResult(BaseModel):
+    """Outcome of one :meth:`TableSync.sync` run."""
+
+    table: str
+    query: str = ""
+    full: bool = Field(
+        default=False, description="The whole table was read (first run or full=True)."
+    )
+    fetched: int = Field(default=0, description="Records received from the instance.")
+    changed: int = Field(default=0, description="New or updated records delivered.")
+    skipped: int = Field(
+        default=0, description="Unchanged records re-read in the overlap window."
+    )
+    deleted: list[str] = Field(
+        default_factory=list, description="sys_ids gone since the last reconcile."
+    )
+    reconciled: bool = False
+    watermark: str | None = None
+    records: list[dict[str, Any]] = Field(
+        default_factory=list,
+        description="Changed records, when no on_records callback was given.",
+    )
+
+
+class SyncStore:
+    """SQLite store of sync watermarks and the synced ``sys_id`` set.
+
+    :param path: Database file; :func:`default_sync_db` if omitted. ``":memory:"``
+        keeps it in memory.
+    """
+
+    def __init__(self, path: str | Path | None = None):
+        self.path = str(path if path is not None else default_sync_db())
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._lock = threading.RLock()
+        with self._lock:
+            if self.path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def get_watermark(self, key: tuple[str, str, str]) -> Watermark | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT watermark, last_sync, last_reconcile FROM sync_watermark "
+                "WHERE instance=? AND table_name=? AND query=?",
+                key,
+            ).fetchone()
+        if row is None:
+            return None
+        return Watermark(watermark=row[0], last_sync=row[1], last_reconcile=row[2])
+
+    def stored_versions(
+        self, key: tuple[str, str, str], sys_ids: list[str]
+    ) -> dict[str, str | None]:
+        """Return the stored ``sys_updated_on`` of each known id in ``sys_ids``."""
+        found: dict[str, str | None] = {}
+        with self._lock:
+            for start in range(0, len(sys_ids), 500):
+                chunk = sys_ids[start : start + 500]
+                # Only "?" placeholders are formatted in; the sys_ids are bound.
+                rows = self._conn.execute(
+                    "SELECT sys_id, sys_updated_on FROM sync_record "  # nosec B608
+                    "WHERE instance=? AND table_name=? AND query=? "
+                    f"AND sys_id IN ({','.join('?' * len(chunk))})",
+                    (*key, *chunk),
+                ).fetchall()
+                found.update(rows)
+        return found
+
+    def commit_batch(
+        self,
+        key: tuple[str, str, str],
+        versions: Iterable[tuple[str, str | None]],
+        watermark: str | None,
+    ) -> None:
+        """Record synced versions and advance the watermark in one transaction."""
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO sync_record "
+                "(instance, table_name, query, sys_id, sys_updated_on) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(*key, sys_id, updated) for sys_id, updated in versions],
+            )
+            self._conn.execute(
+                "INSERT INTO sync_watermark (instance, table_name, query, watermark, "
+                "last_sync) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (instance, table_name, query) DO UPDATE SET "
+                "watermark=COALESCE(excluded.watermark, watermark), "
+                "last_sync=excluded.last_sync",
+                (*key, watermark, time.time()),
+            )
+
+    def iter_known_ids(self, key: tuple[str, str, str]) -> Iterator[str]:
+        """Yield the synced ``sys_id`` set in ascending order."""
+        last = ""
+        while True:
+            with self._lock:
+                rows = self._conn.execute(
+                    "SELECT sys_id FROM sync_record WHERE instance=? AND "
+                    "table_name=? AND query=? AND sys_id>? ORDER BY sys_id LIMIT 5000",
+                    (*key, last),
+                ).fetchall()
+            if not rows:
+                return
+            for (sys_id,) in rows:
+                yield sys_id
+            last = rows[-1][0]
+
+    def delete_records(self, key: tuple[str, str, str], sys_ids: list[str]) -> None:
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "DELETE FROM sync_record WHERE instance=? AND table_name=? "
+                "AND query=? AND sys_id=?",
+                [(*key, sys_id) for sys_id in sys_ids],
+            )
+
+    def mark_reconciled(self, key: tuple[str, str, str], when: float) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "UPDATE sync_watermark SET last_reconcile=? "
+                "WHERE instance=? AND table_name=? AND query=?",
+                (when, *key),
+            )
+
+    def reset(self, key: tuple[str, str, str]) -> None:
+        """Forget a sync so the next run reads the whole table again."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM sync_record WHERE instance=? AND table_name=? AND query=?",
+                key,
+            )
+            self._conn.execute(
+                "DELETE FROM sync_watermark "
+                "WHERE instance=? AND table_name=? AND query=?",
+                key,
+            )
+
+
+class TableSync:
+    """Incremental sync of Table API records into a caller-supplied sink.
+
+    :param api: :class:`~servicenow_api.api_client.Api` used for the reads.
+    :param store: Checkpoint store; a :class:`SyncStore` at :func:`default_sync_db`
+        if omitted.
+    :param overlap_seconds: Re-read window before the watermark.
+    :param reconcile_seconds: Minimum interval between delete reconciliation passes.
+    :param page_size: Records per request.
+    """
+
+    def __init__(
+        self,
+        api,
+        store: SyncStore | None = None,
+        overlap_seconds: float | None = None,
+        reconcile_seconds: float | None = None,
+        page_size: int = DEFAULT_SYNC_PAGE_SIZE,
+    ):
+        self.api = api
+        self.store = store or SyncStore()
+        self.overlap = timedelta(
+            seconds=float(
+                overlap_seconds
+                if overlap_seconds is not None
+                else setting("SERVICENOW_SYNC_OVERLAP", DEFAULT_OVERLAP_SECONDS)
+            )
+        )
+        self.reconcile_seconds = float(
+            reconcile_seconds
+            if reconcile_seconds is not None
+            else setting(
+                "SERVICENOW_SYNC_RECONCILE_INTERVAL", DEFAULT_RECONCILE_SECONDS
+            )
+        )
+        self.page_size = page_size
+
+    def _key(self, table: str, query: str | None) -> tuple[str, str, str]:
+        return (self.api.url, table, query or "")
+
+    def _fetch(self, table: str):
+        return lambda params: self.api._fetch_table_page(table, params)
+
+    def _since(self, watermark: str) -> str:
+        try:
+            moment = datetime.strptime(watermark, SN_DATETIME_FORMAT)
+        except ValueError as e:
+            raise ParameterError(f"Unparsable sync watermark {watermark!r}") from e
+        return (moment - self.overlap).strftime(SN_DATETIME_FORMAT)
+
+    def sync(
+        self,
+        table: str,
+        query: str | None = None,
+        fields: str | list[str] | None = None,
+        on_records: Callable[[list[dict[str, Any]]], None] | None = None,
+        on_deletes: Callable[[list[str]], None] | None = None,
+        reconcile: bool | None = None,
+        full: bool = False,
+        params: dict[str, Any] | None = None,
+    ) -> SyncResult:
+        """Deliver records changed since the last run, then reconcile deletes if due.
+
+        :param table: Table to sync.
+        :param query: Encoded query selecting the synced records (part of the key).
+        :param fields: Fields to read; ``sys_id`` and ``sys_updated_on`` are added.
+        :param on_records: Receives each batch of new/updated raw records before the
+            watermark is advanced past it. Without it, records are collected in
+            ``SyncResult.records``.
+        :param on_deletes: Receives the ``sys_id`` list found deleted by reconciliation.
+        :param reconcile: Force (True) or skip (False) reconciliation; by default it
+            runs when ``reconcile_seconds`` have passed since the last one.
+        :param full: Ignore the watermark and read the whole table.
+        :param params: Extra Table API parameters for the change scan, e.g.
+            ``{"sysparm_display_value": "all"}``.
+        :return: Counts, deleted ids and the new watermark.
+        """
+        if isinstance(fields, (list, tuple)):
+            fields = ",".join(fields)
+        key = self._key(table, query)
+        state = self.store.get_watermark(key)
+        first_run = state is None
+        result = SyncResult(table=table, query=query or "", full=full or first_run)
+
+        request_query = query or ""
+        if not result.full and state.watermark:
+            request_query = and_condition(
+                request_query, f"sys_updated_on>={self._since(state.watermark)}"
+            )
+        params = dict(params or {})
+        if request_query:
+            params["sysparm_query"] = request_query
+        if fields:
+            params["sysparm_fields"] = fields
+
+        watermark = None if result.full else state.watermark
+        batch: list[dict[str, Any]] = []
+        for page in self._pages(table, params):
+            result.fetched += len(page)
+            known = self.store.stored_versions(
+                key, [str(_value(r, "sys_id")) for r in page]
+            )
+            for record in page:
+                sys_id = str(_value(record, "sys_id"))
+                updated = _value(record, "sys_updated_on")
+                if sys_id in known and known[sys_id] == updated:
+                    result.skipped += 1
+                else:
+                    batch.append(record)
+                if updated and (watermark is None or updated > watermark):
+                    watermark = updated
+            self._deliver(key, batch, watermark, on_records, result)
+            batch = []
+        self._deliver(key, batch, watermark, on_records, result)
+        result.watermark = watermark
+
+        if reconcile is None:
+            reconcile = full or (
+                not first_run
+                and (
+                    state.last_reconcile is None
+                    or time.time() - state.last_reconcile >= self.reconcile_seconds
+                )
+            )
+        if first_run:
+            # The first full read is the baseline; nothing can be deleted yet.
+            self.store.mark_reconciled(key, time.time())
+        elif reconcile:
+            result.deleted = self.reconcile(table, query, on_deletes)
+            result.reconciled = True
+        logger.info(
+            "Synced %s (%s): %s changed, %s unchanged in overlap, %s deleted, "
+            "watermark %s",
+            table,
+            query or "all",
+            result.changed,
+            result.skipped,
+            len(result.deleted),
+            watermark,
+        )
+        return result
+
+    def _pages(
+        self, table: str, params: dict[str, Any]
+    ) -> Iterator[list[dict[str, Any]]]:
+        rows = TableIterator(
+            self._fetch(table),
+            params,
+            page_size=self.page_size,
+            strategy=KeysetPagination("keyset_updated"),
+            table=table,
+        )
+        page: list[dict[str, Any]] = []
+        for record in rows:
+            page.append(record)
+            if len(page) >= self.page_size:
+                yield page
+                page = []
+        if page:
+            yield page
+
+    def _deliver(
+        self,
+        key: tuple[str, str, str],
+        batch: list[dict[str, Any]],
+        watermark: str | None,
+        on_records: Callable[[list[dict[str, Any]]], None] | None,
+        result: SyncResult,
+    ) -> None:
+        if batch:
+            if on_records is not None:
+                on_records(batch)
+            else:
+                result.records.extend(batch)
+            result.changed += len(batch)
+        self.store.commit_batch(
+            key,
+            [(str(_value(r, "sys_id")), _value(r, "sys_updated_on")) for r in batch],
+            watermark,
+        )
+
+    def reconcile(
+        self,
+        table: str,
+        query: str | None = None,
+        on_deletes: Callable[[list[str]], None] | None = None,
+    ) -> list[str]:
+        """Find synced records that are gone (or left the query) and forget them.
+
+        Streams live ``sys_id`` values in ascending order and merges them with the
+        stored ids, so memory stays constant however large the table is.
+        """
+        key = self._key(table, query)
+        started = time.time()
+        params: dict[str, Any] = {"sysparm_fields": "sys_id"}
+        if query:
+            params["sysparm_query"] = query
+        live = (
+            str(_value(r, "sys_id"))
+            for r in TableIterator(
+                self._fetch(table),
+                params,
+                page_size=_RECONCILE_PAGE_SIZE,
+                strategy=KeysetPagination("keyset"),
+                table=table,
+            )
+        )
+        deleted: list[str] = []
+        remote = next(live, None)
+        for known in self.store.iter_known_ids(key):
+            while remote is not None and remote < known:
+                remote = next(live, None)
+            if remote != known:
+                deleted.append(known)
+        if deleted:
+            if on_deletes is not None:
+                on_deletes(deleted)
+            self.store.delete_records(key, deleted)
+        self.store.mark_reconciled(key, started)
+        return deleted
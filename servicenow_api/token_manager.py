@@ -0,0 +1,300 @@
+#!/usr/bin/python
+"""OAuth access-token lifecycle for :class:`~servicenow_api.api.api_client_base.ServiceNowApiBase`.
+
+ServiceNow's ``/oauth_token.do`` returns an access token together with its
+lifetime (``expires_in``) and a ``refresh_token``. The client used to keep only the
+access token, so a long-running process (a pooled client, a multi-hour batch)
+would eventually start failing with 401s and nothing renewed the token.
+
+:class:`OAuthTokenManager` records the full :class:`~servicenow_api.servicenow_models.Authentication`
+payload and keeps the token fresh:
+
+* a daemon thread refreshes the token ahead of expiry (``refresh_margin`` seconds
+  before it lapses, or half-way through very short lifetimes), using the real
+  ``refresh_token`` and falling back to the original password grant if the refresh
+  token has itself been revoked or expired;
+* refreshes are single-flight — N threads that see an expired token (or a 401)
+  at the same moment trigger one ``/oauth_token.do`` round trip and all reuse its
+  result;
+* :meth:`OAuthTokenManager.response_hook` is installed as a ``requests`` response
+  hook, so any request answered with 401 is retried once with a freshly
+  refreshed token, transparently to every ``api_client_*`` mixin.
+
+The ``on_token`` callback lets the owning client update its ``Authorization``
+header in place whenever a new token is issued. A bound-method callback is held
+weakly and the refresher thread only holds the manager weakly, so a client that is
+dropped without ``close()`` is still garbage collected and its refresher exits.
+"""
+
+import threading
+import time
+import weakref
+from collections.abc import Callable
+from typing import Any
+from urllib.parse import urlencode
+
+import requests
+from agent_utilities.base_utilities import get_logger
+
+from servicenow_api.servicenow_models import Authentication
+
+logger = get_logger(__name__)
+
+#: Refresh this many seconds before the access token expires.
+DEFAULT_REFRESH_MARGIN_SECONDS = 60.0
+#: Back-off between background refresh attempts after a failure.
+_RETRY_DELAY_SECONDS = 5.0
+
+
+class OAuthTokenManager:
+    """Owns the OAuth token for one client session.
+
+    :param session: The ``requests.Session`` token requests are issued on (so the
+        client's TLS profile applies to them too).
+    :param token_url: Absolute URL of the instance's ``/oauth_token.do`` endpoint.
+    :param auth_data: The password-grant form fields (``grant_type``, ``client_id``,
+        ``client_secret``, ``username``, ``password``).
+    :param auth_headers: Headers for the token POST.
+    :param refresh_margin: Seconds before expiry at which the token is renewed.
+    :param timeout: Timeout (seconds) for token requests.
+    :param on_token: Called with each newly issued access token.
+    """
+
+    def __init__(
+        self,
+        session: requests.Session,
+        token_url: str,
+        auth_data: dict[str, Any],
+        auth_headers: dict[str, str] | None = None,
+        refresh_margin: float = DEFAULT_REFRESH_MARGIN_SECONDS,
+        timeout: float = 30,
+        on_token: Callable[[str], None] | None = None,
+    ):
+        self._session = session
+        self.token_url = token_url
+        self.auth_data = auth_data
+        self.auth_headers = auth_headers or {
+            "Content-Type": "application/x-www-form-urlencoded"
+        }
+        self.refresh_margin = refresh_margin
+        self.timeout = timeout
+        self.on_token = on_token
+
+        self.access_token: str | None = None
+        self.refresh_token: str | None = None
+        self.token_type: str | None = None
+        self.expires_in: int | None = None
+        self.expires_at: float | None = None
+        self.issued_at: float | None = None
+        self.last_response: requests.Response | None = None
+        self.refresh_count = 0
+
+        self._refresh_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        # Wake the refresher when the manager is collected without stop().
+        weakref.finalize(self, self._stop.set)
+
+    @property
+    def on_token(self) -> Callable[[str], None] | None:
+        """Callback for newly issued tokens (bound methods are referenced weakly)."""
+        callback = self._on_token
+        if isinstance(callback, weakref.WeakMethod):
+            return callback()
+        return callback
+
+    @on_token.setter
+    def on_token(self, callback: Callable[[str], None] | None) -> None:
+        if hasattr(callback, "__self__") and hasattr(callback, "__func__"):
+            callback = weakref.WeakMethod(callback)
+        self._on_token = callback
+
+    # -- token acquisition -------------------------------------------------------
+
+    def _request_token(self, form: dict[str, Any]) -> Authentication:
+        response = self._session.post(
+            url=self.token_url,
+            data=urlencode(form),
+            headers=self.auth_headers,
+            timeout=self.timeout,
+        )
+        self.last_response = response
+        response.raise_for_status()
+        json_response = response.json()
+        access_token = json_response["access_token"]
+        parsed = Authentication.model_validate(json_response)
+        self._apply(access_token, parsed)
+        return parsed
+
+    def _apply(self, access_token: str, parsed: Authentication) -> None:
+        now = time.time()
+        self.access_token = access_token
+        if parsed.refresh_token:
+            self.refresh_token = parsed.refresh_token
+        self.token_type = parsed.token_type
+        self.expires_in = parsed.expires_in
+        self.issued_at = now
+        self.expires_at = now + parsed.expires_in if parsed.expires_in else None
+        on_token = self.on_token
+        if on_token is not None:
+            on_token(access_token)
+
+    def fetch(self) -> Authentication:
+        """Obtain a new token with the configured (password) grant."""
+        return self._request_token(self.auth_data)
+
+    def refresh(self) -> Authentication:
+        """Renew the token with the ``refresh_token`` grant.
+
+        Falls back to the original grant when no refresh token was issued or the
+        instance rejects it (revoked/expired refresh token).
+        """
+        self.refresh_count += 1
+        if self.refresh_token:
+            form = {
+                "grant_type": "refresh_token",
+                "client_id": self.auth_data.get("client_id"),
+                "client_secret": self.auth_data.get("client_secret"),
+                "refresh_token": self.refresh_token,
+            }
+            try:
+                return self._request_token(form)
+            except requests.HTTPError as e:
+                status = getattr(e.response, "status_code", None)
+                if status not in (400, 401):
+                    raise
+                logger.info(
+                    "Refresh token rejected, re-authenticating: status_code=%s",
+                    status,
+                )
+                self.refresh_token = None
+        return self.fetch()
+
+    def force_refresh(self) -> Authentication:
+        """Refresh now, serialised with any concurrent (background/401) refresh."""
+        with self._refresh_lock:
+            return self.refresh()
+
+    def needs_refresh(self, now: float | None = None) -> bool:
+        """Whether the current token is missing or inside its refresh window."""
+        if self.access_token is None:
+            return True
+        if self.expires_at is None:
+            return False
+        now = time.time() if now is None else now
+        return now >= self.expires_at - self._lead_time()
+
+    def _lead_time(self) -> float:
+        lifetime = self.expires_in or 0
+        return min(self.refresh_margin, lifetime / 2) if lifetime else 0.0
+
+    def get_token(self) -> str | None:
+        """Return a valid access token, refreshing first if it is about to expire."""
+        if self.needs_refresh():
+            with self._refresh_lock:
+                if self.needs_refresh():
+                    self.refresh()
+        return self.access_token
+
+    def handle_unauthorized(self, stale_token: str | None) -> str | None:
+        """Refresh after a 401 unless another thread already replaced ``stale_token``."""
+        with self._refresh_lock:
+            if self.access_token and self.access_token != stale_token:
+                return self.access_token
+            try:
+                self.refresh()
+            except Exception as e:
+                logger.error(
+                    "Token refresh after 401 failed: error_type=%s", type(e).__name__
+                )
+                return None
+            return self.access_token
+
+    # -- requests integration ----------------------------------------------------
+
+    def response_hook(
+        self, response: requests.Response, *args, **kwargs
+    ) -> requests.Response:
+        """``requests`` response hook: retry a 401 once with a refreshed token."""
+        request = response.request
+        if (
+            response.status_code != 401
+            or request is None
+            or getattr(request, "_servicenow_auth_retry", False)
+            or str(request.url).startswith(self.token_url)
+        ):
+            return response
+
+        authorization = request.headers.get("Authorization", "")
+        stale = authorization[len("Bearer ") :] if authorization else None
+        token = self.handle_unauthorized(stale)
+        if not token or token == stale:
+            return response
+
+        # Drain and release the rejected response before re-sending.
+        _ = response.content
+        response.close()
+        retry = request.copy()
+        retry.headers["Authorization"] = f"Bearer {token}"
+        retry._servicenow_auth_retry = True
+        new_response = response.connection.send(retry, **kwargs)
+        new_response.history.append(response)
+        new_response.request = retry
+        return new_response
+
+    # -- background refresh ------------------------------------------------------
+
+    def start(self) -> None:
+        """Start the background refresher (no-op when the token never expires)."""
+        if self.expires_at is None or (self._thread and self._thread.is_alive()):
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=_refresh_loop,
+            args=(weakref.ref(self), self._stop),
+            name="servicenow-token-refresh",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the background refresher."""
+        self._stop.set()
+        thread = self._thread
+        if thread and thread.is_alive() and thread is not threading.current_thread():
+            thread.join(timeout=1)
+        self._thread = None
+
+    def _refresh_due(self) -> float | None:
+        """Refresh if due; return seconds until the next attempt (``None`` to stop)."""
+        if self.expires_at is None:
+            return None
+        delay = self.expires_at - self._lead_time() - time.time()
+        if delay > 0:
+            return delay
+        try:
+            with self._refresh_lock:
+                if self.needs_refresh():
+                    self.refresh()
+                    logger.debug("Background token refresh completed")
+        except Exception as e:
+            logger.error(
+                "Background token refresh failed: error_type=%s",
+                type(e).__name__,
+            )
+            return _RETRY_DELAY_SECONDS
+        return 0.0
+
+
+def _refresh_loop(
+    manager_ref: "weakref.ref[OAuthTokenManager]", stop: threading.Event
+) -> None:
+    """Background refresher body; holds the manager only while it works."""
+    while not stop.is_set():
+        manager = manager_ref()
+        if manager is None:
+            return
+        delay = manager._refresh_due()
+        del manager
+        if delay is None or (delay > 0 and stop.wait(delay)):
+            return
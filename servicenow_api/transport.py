@@ -0,0 +1,387 @@
+#!/usr/bin/python
+"""HTTP transport settings shared by every ``api_client_*`` mixin.
+
+Out of the box ``requests`` keeps at most 10 pooled connections per host and
+applies no timeout at all, so under concurrency callers queue for a connection
+and a single hung instance node can pin a worker thread forever.
+
+:class:`TransportConfig` gathers the knobs in one place — pool sizing, connect and
+read timeouts, HTTP keep-alive, ``TCP_NODELAY`` and a per-request deadline — and
+is read from ``SERVICENOW_*`` settings by :meth:`TransportConfig.from_settings`.
+:class:`ServiceNowSession` wraps the client's ``requests.Session`` so that every
+``self._session.get/post/put/patch/delete`` call in the mixins picks the defaults
+up without touching the call sites. :class:`AsyncApi <servicenow_api.async_client.AsyncApi>`
+derives its ``httpx`` limits and timeouts from the same config.
+"""
+
+import functools
+import socket
+import time
+from typing import TYPE_CHECKING, Any
+
+import requests
+from agent_utilities.base_utilities import get_logger
+from agent_utilities.core.config import setting
+from pydantic import BaseModel, ConfigDict, Field
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+
+from servicenow_api.codec import JsonCodec
+from servicenow_api.retry import RateLimiter, RetryBudget, RetryPolicy
+
+if TYPE_CHECKING:
+    import httpx
+
+logger = get_logger(__name__)
+
+_TRUE_VALUES = ("1", "true", "yes", "on")
+#: Bytes read per iteration when enforcing a request deadline.
+_STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def _bool_setting(name: str, default: bool) -> bool:
+    value = setting(name, None)
+    if value is None or value == "":
+        return default
+    return str(value).strip().lower() in _TRUE_VALUES
+
+
+def _float_setting(name: str, default: float | None) -> float | None:
+    value = setting(name, None)
+    if value is None or value == "":
+        return default
+    return float(value)
+
+
+class TransportConfig(BaseModel):
+    """Connection pool, timeout and socket settings for a ServiceNow client."""
+
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+    pool_connections: int = Field(
+        default=10, ge=1, description="Number of per-host connection pools to cache."
+    )
+    pool_maxsize: int = Field(
+        default=50, ge=1, description="Maximum connections kept per host."
+    )
+    pool_block: bool = Field(
+        default=False,
+        description="Block for a free connection instead of opening an overflow one.",
+    )
+    connect_timeout: float = Field(
+        default=10.0, gt=0, description="Seconds allowed to establish a connection."
+    )
+    read_timeout: float = Field(
+        default=60.0, gt=0, description="Seconds allowed between bytes of a response."
+    )
+    keep_alive: bool = Field(
+        default=True,
+        description="Reuse connections (HTTP keep-alive) and enable TCP keep-alive probes.",
+    )
+    keepalive_expiry: float = Field(
+        default=30.0, ge=0, description="Seconds an idle async connection is kept."
+    )
+    tcp_nodelay: bool = Field(
+        default=True, description="Disable Nagle's algorithm on client sockets."
+    )
+    deadline: float | None = Field(
+        default=None,
+        gt=0,
+        description="Upper bound in seconds on a request's total wall time; the "
+        "connect/read timeouts are clamped to whatever remains of it.",
+    )
+
+    @classmethod
+    def from_settings(cls) -> "TransportConfig":
+        """Build a config from ``SERVICENOW_*`` settings (env / config file)."""
+        defaults = cls()
+        return cls(
+            pool_connections=int(
+                setting("SERVICENOW_POOL_CONNECTIONS", defaults.pool_connections)
+            ),
+            pool_maxsize=int(setting("SERVICENOW_POOL_MAXSIZE", defaults.pool_maxsize)),
+            pool_block=_bool_setting("SERVICENOW_POOL_BLOCK", defaults.pool_block),
+            connect_timeout=_float_setting(
+                "SERVICENOW_CONNECT_TIMEOUT", defaults.connect_timeout
+            ),
+            read_timeout=_float_setting(
+                "SERVICENOW_READ_TIMEOUT", defaults.read_timeout
+            ),
+            keep_alive=_bool_setting("SERVICENOW_KEEP_ALIVE", defaults.keep_alive),
+            keepalive_expiry=_float_setting(
+                "SERVICENOW_KEEPALIVE_EXPIRY", defaults.keepalive_expiry
+            ),
+            tcp_nodelay=_bool_setting("SERVICENOW_TCP_NODELAY", defaults.tcp_nodelay),
+            deadline=_float_setting("SERVICENOW_REQUEST_DEADLINE", defaults.deadline),
+        )
+
+    def socket_options(self) -> list[tuple[int, int, int]]:
+        """``(level, option, value)`` tuples applied to each new connection."""
+        options = [
+            opt
+            for opt in HTTPConnection.default_socket_options
+            if opt[:2] != (socket.IPPROTO_TCP, socket.TCP_NODELAY)
+        ]
+        options.append(
+            (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1 if self.tcp_nodelay else 0)
+        )
+        if self.keep_alive:
+            options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+        return options
+
+    def requests_timeout(self, elapsed: float = 0.0) -> tuple[float, float]:
+        """``(connect, read)`` timeout for ``requests``, clamped to the deadline."""
+        connect, read = self.connect_timeout, self.read_timeout
+        if self.deadline is not None:
+            remaining = max(self.deadline - elapsed, 0.001)
+            connect, read = min(connect, remaining), min(read, remaining)
+        return connect, read
+
+    def httpx_timeout(self) -> "httpx.Timeout":
+        """Equivalent ``httpx.Timeout`` (pool wait is bounded by the connect timeout)."""
+        import httpx
+
+        connect, read = self.requests_timeout()
+        return httpx.Timeout(read, connect=connect, pool=connect)
+
+    def httpx_limits(self) -> "httpx.Limits":
+        """Equivalent ``httpx.Limits`` for :class:`~servicenow_api.async_client.AsyncApi`."""
+        import httpx
+
+        return httpx.Limits(
+            max_connections=self.pool_maxsize,
+            max_keepalive_connections=self.pool_maxsize if self.keep_alive else 0,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+
+class ServiceNowAdapter(HTTPAdapter):
+    """``HTTPAdapter`` sized and tuned from a :class:`TransportConfig`."""
+
+    def __init__(self, config: TransportConfig, **kwargs):
+        self.transport_config = config
+        super().__init__(
+            pool_connections=config.pool_connections,
+            pool_maxsize=config.pool_maxsize,
+            pool_block=config.pool_block,
+            **kwargs,
+        )
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["socket_options"] = self.transport_config.socket_options()
+        super().init_poolmanager(*args, **kwargs)
+
+
+class ServiceNowSession:
+    """Applies a :class:`TransportConfig` and retry policy to every request on a session.
+
+    Wraps the client's ``requests.Session``. The HTTP verb methods:
+
+    * fill in the configured ``timeout`` when the caller did not pass one and, when
+      a deadline is configured, read the body under it;
+    * pace requests through the shared :class:`~servicenow_api.retry.RateLimiter`
+      and feed it the ``X-RateLimit-*`` headers of every response;
+    * retry 429/5xx responses and connection errors per the
+      :class:`~servicenow_api.retry.RetryPolicy`, within the
+      :class:`~servicenow_api.retry.RetryBudget` and the deadline;
+    * encode ``json=`` bodies and decode ``response.json()`` with the
+      :class:`~servicenow_api.codec.JsonCodec`;
+    * hand GETs to the :class:`~servicenow_api.microbatch.MicroBatcher` in
+      ``batcher``, when micro-batching is enabled.
+
+    Everything else (``headers``, ``hooks``, ``mount``, ``close`` …) is delegated to
+    the wrapped session unchanged.
+
+    :param session: The session to wrap.
+    :param config: Transport settings; :meth:`TransportConfig.from_settings` if omitted.
+    :param retry_policy: Retry settings; :meth:`RetryPolicy.from_settings` if omitted.
+    :param rate_limiter: Client-side limiter; :meth:`RateLimiter.from_settings` if omitted.
+    :param retry_budget: Retry budget; a default :class:`RetryBudget` if omitted.
+    :param codec: JSON codec; :meth:`JsonCodec.from_settings` if omitted.
+    """
+
+    def __init__(
+        self,
+        session: requests.Session,
+        config: TransportConfig | None = None,
+        retry_policy: RetryPolicy | None = None,
+        rate_limiter: RateLimiter | None = None,
+        retry_budget: RetryBudget | None = None,
+        codec: JsonCodec | None = None,
+    ):
+        self.session = session
+        self.config = config or TransportConfig.from_settings()
+        self.retry_policy = retry_policy or RetryPolicy.from_settings()
+        self.rate_limiter = rate_limiter or RateLimiter.from_settings()
+        self.retry_budget = retry_budget or RetryBudget()
+        self.codec = codec or JsonCodec.from_settings()
+        #: Micro-batcher for GETs, installed by the client when enabled.
+        self.batcher: Any = None
+        self._sleep = time.sleep
+        adapter = ServiceNowAdapter(self.config)
+        session.mount("https://", adapter)
+        session.mount("http://", adapter)
+        if not self.config.keep_alive:
+            session.headers["Connection"] = "close"
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.session, name)
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        return self._send(method.lower(), url=url, **kwargs)
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        batcher = self.batcher
+        if batcher is not None and batcher.accepts({"url": url, **kwargs}):
+            return self._with_codec(batcher.get(url=url, **kwargs))
+        return self._send("get", url=url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self._send("post", url=url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> requests.Response:
+        return self._send("put", url=url, **kwargs)
+
+    def patch(self, url: str, **kwargs) -> requests.Response:
+        return self._send("patch", url=url, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> requests.Response:
+        return self._send("delete", url=url, **kwargs)
+
+    def _send(self, method: str, **kwargs) -> requests.Response:
+        policy = self.retry_policy
+        verb = method.upper()
+        headers = policy.with_idempotency_key(verb, kwargs.get("headers"))
+        if headers is not kwargs.get("headers"):
+            kwargs["headers"] = headers
+        retryable = policy.is_retryable_method(verb, headers)
+        if "json" in kwargs:
+            self._encode_json(kwargs)
+        caller_timeout = "timeout" in kwargs
+        started = time.monotonic()
+        self.retry_budget.record_request()
+        attempt = 1
+        while True:
+            self._wait_for_rate_limit(verb, kwargs.get("url"), started)
+            if not caller_timeout:
+                kwargs["timeout"] = self.config.requests_timeout(
+                    time.monotonic() - started
+                )
+            try:
+                response = self._send_once(method, started, kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                # A connect timeout never reached the server, so any method is safe.
+                safe = retryable or isinstance(e, requests.ConnectTimeout)
+                delay = self._next_delay(
+                    attempt, safe and policy.retry_on_connection_errors, None, started
+                )
+                if delay is None:
+                    raise
+                logger.warning(
+                    "Retrying after connection error: method=%s attempt=%s delay=%.2fs error_type=%s",
+                    verb,
+                    attempt,
+                    delay,
+                    type(e).__name__,
+                )
+            else:
+                status = getattr(response, "status_code", None)
+                headers = getattr(response, "headers", None)
+                self.rate_limiter.observe(status, headers)
+                if status not in policy.retry_statuses:
+                    return self._with_codec(response)
+                delay = self._next_delay(attempt, retryable, headers, started)
+                if delay is None:
+                    return self._with_codec(response)
+                logger.warning(
+                    "Retrying after HTTP %s: method=%s attempt=%s delay=%.2fs",
+                    status,
+                    verb,
+                    attempt,
+                    delay,
+                )
+                response.close()
+            self._sleep(delay)
+            attempt += 1
+
+    def _encode_json(self, kwargs: dict[str, Any]) -> None:
+        """Replace a ``json=`` body with ``data=`` bytes from the codec, once per call."""
+        body = kwargs.pop("json")
+        if body is None or kwargs.get("data") is not None:
+            return
+        kwargs["data"] = self.codec.dumps(body)
+        headers = dict(kwargs.get("headers") or {})
+        if not any(k.lower() == "content-type" for k in headers):
+            headers["Content-Type"] = "application/json"
+        kwargs["headers"] = headers
+
+    def _with_codec(self, response: Any) -> Any:
+        """Make ``response.json()`` decode ``response.content`` with the codec.
+
+        Responses whose class brings its own ``json()`` are left alone.
+        """
+        if (
+            isinstance(response, requests.Response)
+            and getattr(type(response), "json", None) is requests.Response.json
+        ):
+            response.json = functools.partial(self.codec.decode_response, response)
+        return response
+
+    def _next_delay(
+        self,
+        attempt: int,
+        retryable: bool,
+        headers: Any,
+        started: float,
+    ) -> float | None:
+        """Delay before attempt ``attempt + 1``, or ``None`` if it must not happen."""
+        if not retryable or attempt >= self.retry_policy.max_attempts:
+            return None
+        delay = self.retry_policy.retry_delay(attempt, headers)
+        if delay is None:
+            return None
+        deadline = self.config.deadline
+        if deadline is not None and time.monotonic() - started + delay >= deadline:
+            return None
+        if not self.retry_budget.try_acquire():
+            logger.warning("Retry budget exhausted; not retrying")
+            return None
+        return delay
+
+    def _wait_for_rate_limit(self, verb: str, url: Any, started: float) -> None:
+        wait = self.rate_limiter.reserve()
+        if wait <= 0:
+            return
+        deadline = self.config.deadline
+        if deadline is not None and time.monotonic() - started + wait >= deadline:
+            raise requests.Timeout(
+                f"{verb} {url} would wait {wait:.1f}s for the rate limit, past the "
+                f"{deadline:g}s request deadline"
+            )
+        self._sleep(wait)
+
+    def _send_once(
+        self, method: str, started: float, kwargs: dict[str, Any]
+    ) -> requests.Response:
+        deadline = self.config.deadline
+        if deadline is None or kwargs.get("stream"):
+            return getattr(self.session, method)(**kwargs)
+
+        # Stream the body so a slow trickle of bytes — which never trips the
+        # per-read timeout — still cannot run past the deadline.
+        response = getattr(self.session, method)(**{**kwargs, "stream": True})
+        chunks = []
+        try:
+            for chunk in response.iter_content(chunk_size=_STREAM_CHUNK_SIZE):
+                chunks.append(chunk)
+                if time.monotonic() - started > deadline:
+                    raise requests.Timeout(
+                        f"{method.upper()} {kwargs.get('url')} exceeded the "
+                        f"{deadline:g}s request deadline"
+                    )
+        except Exception:
+            response.close()
+            raise
+        response._content = b"".join(chunks)
+        response._content_consumed = True
+        return response
@@ -31,10 +31,21 @@ def raise_for_status(self):
             raise requests.HTTPError(f"HTTP {self.status_code}")
 
 
+def _body(data, json_body):
+    """JSON request body, sent either as ``json=`` or as encoded ``data=`` bytes."""
+    if json_body is not None:
+        return json_body
+    return json.loads(data) if data else {}
+
+
 class MockSession:
     def __init__(self, *args, **kwargs):
         self.headers = {}
         self.proxies = {}
+        self.adapters = {}
+
+    def mount(self, prefix, adapter):
+        self.adapters[prefix] = adapter
 
     def get(self, url, params=None, **kwargs):
         url_parsed = urlparse(url)
@@ -87,7 +98,7 @@ def post(self, url, data=None, json=None, **kwargs):
         path = url_parsed.path
 
         if "incident" in path:
-            payload = json or {}
+            payload = _body(data, json)
             short_desc = payload.get("short_description", "Mocked Short Description")
             desc = payload.get("description", "Mocked Description")
             return MockResponse(
@@ -102,7 +113,7 @@ def post(self, url, data=None, json=None, **kwargs):
             )
 
         if "problem" in path:
-            payload = json or {}
+            payload = _body(data, json)
             short_desc = payload.get("short_description", "Mocked Short Description")
             desc = payload.get("description", "Mocked Description")
             return MockResponse(
@@ -126,7 +137,7 @@ def patch(self, url, data=None, json=None, **kwargs):
         path = url_parsed.path
 
         if "problem" in path or "incident" in path:
-            payload = json or {}
+            payload = _body(data, json)
             return MockResponse(
                 {
                     "result": {
@@ -143,6 +154,53 @@ def delete(self, url, **kwargs):
         return MockResponse({"result": {}}, 200)
 
 
+def matches_condition(row, condition):
+    """Evaluate one ``field<op>value`` encoded-query term against ``row``."""
+    for op in (">=", "<=", ">", "<", "="):
+        field, sep, value = condition.partition(op)
+        if sep:
+            actual = str(row.get(field, ""))
+            return {
+                ">=": actual >= value,
+                "<=": actual <= value,
+                ">": actual > value,
+                "<": actual < value,
+                "=": actual == value,
+            }[op]
+    raise AssertionError(condition)
+
+
+def serve_encoded_query(rows, params):
+    """Answer a Table API read from ``rows``, as the instance would.
+
+    Understands the encoded queries the clients emit (``^``-joined terms, ``^NQ``
+    branches, ``ORDERBY``) and ``sysparm_offset``, ``sysparm_limit``,
+    ``sysparm_fields`` and ``sysparm_no_count``. Returns ``(records, total)``;
+    ``total`` is ``None`` when the count was switched off.
+    """
+    query = params.get("sysparm_query") or ""
+    order = [t[len("ORDERBY") :] for t in query.split("^") if t.startswith("ORDERBY")]
+    branches = [
+        [t for t in branch.split("^") if t and not t.startswith("ORDERBY")]
+        for branch in query.split("^NQ")
+    ]
+    hits = [
+        r
+        for r in rows
+        if any(all(matches_condition(r, c) for c in b) for b in branches)
+    ]
+    hits.sort(key=lambda r: tuple(str(r.get(k, "")) for k in order))
+    offset = int(params.get("sysparm_offset") or 0)
+    limit = int(params.get("sysparm_limit") or len(hits))
+    page = hits[offset : offset + limit]
+    fields = params.get("sysparm_fields")
+    if fields:
+        wanted = fields.split(",")
+        page = [{k: r[k] for k in wanted if k in r} for r in page]
+    counted = str(params.get("sysparm_no_count", "false")).lower() != "true"
+    return page, (len(hits) if counted else None)
+
+
 def mock_post(url, *args, **kwargs):
     if "oauth" in url:
         return MockResponse({"access_token": "mocked_oauth_token"}, 200)
@@ -156,6 +214,24 @@ def mock_requests_session():
         yield
 
 
+@pytest.fixture(autouse=True)
+def reset_client_pool():
+    """Keep pooled clients from leaking between tests that patch ``Api``."""
+    from servicenow_api.client_pool import get_client_pool
+
+    get_client_pool().clear()
+    yield
+    get_client_pool().clear()
+
+
+@pytest.fixture(autouse=True)
+def isolated_local_stores(tmp_path, monkeypatch):
+    """Keep the on-disk stores out of ``~/.servicenow-api``."""
+    monkeypatch.setenv("SERVICENOW_FLOW_CACHE_DB", str(tmp_path / "flows.sqlite3"))
+    monkeypatch.setenv("SERVICENOW_SYNC_DB", str(tmp_path / "sync.sqlite3"))
+    monkeypatch.setenv("SERVICENOW_MIRROR_DB", str(tmp_path / "mirror.sqlite3"))
+
+
 @pytest.fixture(scope="session")
 def servicenow_config():
     """Fixture to provide ServiceNow configuration from environment variables or mock defaults."""
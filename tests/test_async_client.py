@@ -0,0 +1,251 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from unittest.mock import MagicMock, patch
+from urllib.parse import parse_qs
+
+import httpx
+import pytest
+
+from servicenow_api.async_client import AsyncApi, call_client
+from servicenow_api.auth import get_async_client
+from servicenow_api.servicenow_models import Incident, Response, Table
+
+BASE = "https://dev12345.service-now.com"
+
+
+def _client(handler, **kwargs):
+    transport = httpx.MockTransport(handler)
+    return AsyncApi(
+        url=BASE,
+        client=httpx.AsyncClient(transport=transport),
+        **({"username": "admin", "password": "pw"} | kwargs),
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_table_returns_parsed_models():
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        return httpx.Response(200, json={"result": [{"sys_id": "a"}, {"sys_id": "b"}]})
+
+    async with _client(handler) as api:
+        resp = await api.get_table(table="incident", sysparm_limit=2)
+
+    assert isinstance(resp, Response)
+    assert [r.sys_id for r in resp.result] == ["a", "b"]
+    assert all(isinstance(r, Table) for r in resp.result)
+    assert seen[0].url.path == "/api/now/table/incident"
+    assert seen[0].url.params["sysparm_limit"] == "2"
+    assert seen[0].headers["Authorization"].startswith("Basic ")
+
+
+@pytest.mark.asyncio
+async def test_get_incidents_discloses_default_limit():
+    def handler(request):
+        return httpx.Response(
+            200,
+            json={"result": [{"sys_id": "i1"}]},
+            headers={"X-Total-Count": "120"},
+        )
+
+    async with _client(handler) as api:
+        resp = await api.get_incidents()
+
+    assert isinstance(resp.result[0], Incident)
+    assert resp.applied_limit == 50
+    assert resp.truncated is True
+    assert resp.next_offset == 1
+
+
+@pytest.mark.asyncio
+async def test_patch_table_record_sends_json_body():
+    bodies = []
+
+    def handler(request):
+        bodies.append((request.method, json.loads(request.content)))
+        return httpx.Response(200, json={"result": {"sys_id": "x", "state": "2"}})
+
+    async with _client(handler) as api:
+        resp = await api.patch_table_record(
+            table="incident", table_record_sys_id="x", data={"state": "2"}
+        )
+
+    assert bodies == [("PATCH", {"state": "2"})]
+    assert resp.result.sys_id == "x"
+
+
+@pytest.mark.asyncio
+async def test_delete_with_empty_body():
+    async with _client(lambda request: httpx.Response(204)) as api:
+        resp = await api.delete_table_record(table="incident", table_record_sys_id="x")
+    assert resp.result == {"status": "deleted"}
+
+
+@pytest.mark.asyncio
+async def test_http_errors_propagate():
+    async with _client(lambda request: httpx.Response(500)) as api:
+        with pytest.raises(httpx.HTTPStatusError):
+            await api.get_incident(incident_id="INC1")
+
+
+@pytest.mark.asyncio
+async def test_oauth_token_fetched_once_and_renewed_on_401():
+    token_forms = []
+    table_calls = []
+
+    def handler(request):
+        if request.url.path == "/oauth_token.do":
+            form = parse_qs(request.content.decode())
+            token_forms.append(form)
+            n = len(token_forms)
+            return httpx.Response(
+                200,
+                json={
+                    "access_token": f"a{n}",
+                    "refresh_token": f"r{n}",
+                    "expires_in": 1800,
+                },
+            )
+        table_calls.append(request.headers["Authorization"])
+        if request.headers["Authorization"] == "Bearer a1" and len(table_calls) > 3:
+            return httpx.Response(401)
+        return httpx.Response(200, json={"result": []})
+
+    async with _client(handler, client_id="cid", client_secret="csec") as api:
+        await asyncio.gather(*(api.get_table(table="incident") for _ in range(3)))
+        assert len(token_forms) == 1
+        await api.get_table(table="incident")
+
+    assert token_forms[1]["grant_type"] == ["refresh_token"]
+    assert token_forms[1]["refresh_token"] == ["r1"]
+    assert table_calls[-2:] == ["Bearer a1", "Bearer a2"]
+
+
+@pytest.mark.asyncio
+async def test_unported_methods_run_sync_api_in_thread():
+    api = _client(lambda request: httpx.Response(200, json={"result": []}))
+    sync_api = MagicMock()
+    sync_api.get_import_set.return_value = "ok"
+    api._sync_api = sync_api
+
+    assert await api.get_import_set(table="x", import_set_sys_id="y") == "ok"
+    sync_api.get_import_set.assert_called_once_with(table="x", import_set_sys_id="y")
+    with pytest.raises(AttributeError):
+        api.not_a_real_method  # noqa: B018
+    await api._client.aclose()
+
+
+@pytest.mark.asyncio
+async def test_call_client_awaits_coroutines_and_offloads_sync():
+    async def native(**kwargs):
+        return ("native", kwargs)
+
+    assert await call_client(native, a=1) == ("native", {"a": 1})
+
+    offloaded = []
+
+    async def fake_run_blocking(fn, **kw):
+        offloaded.append(fn)
+        return fn(**kw)
+
+    sync = MagicMock(return_value="sync")
+    with patch("agent_utilities.mcp.concurrency.run_blocking", new=fake_run_blocking):
+        assert await call_client(sync, b=2) == "sync"
+    sync.assert_called_once_with(b=2)
+    assert offloaded == [sync]
+
+
+def test_get_async_client_is_pooled_separately_from_sync():
+    with patch.dict(
+        os.environ, {"SERVICENOW_INSTANCE": "https://dev12345.service-now.com"}
+    ):
+        with patch(
+            "agent_utilities.mcp.delegated_auth.is_delegation_enabled",
+            return_value=False,
+        ):
+            with patch(
+                "servicenow_api.auth.AsyncApi", side_effect=lambda **kw: MagicMock()
+            ) as mock_async_cls:
+                first = get_async_client(username="admin", password="pw")
+                second = get_async_client(username="admin", password="pw")
+
+    assert first is second
+    assert mock_async_cls.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_bearer_token_client():
+    seen = []
+
+    def handler(request):
+        seen.append(request.headers["Authorization"])
+        return httpx.Response(200, json={"result": {"sys_id": "k"}})
+
+    async with _client(handler, username=None, password=None, token="tok") as api:
+        await api.get_knowledge_article(article_sys_id="k")
+
+    assert seen == ["Bearer tok"]
+
+
+def test_pooled_client_rebinds_to_each_new_event_loop():
+    real_client = httpx.AsyncClient
+    built = []
+
+    def client(**kwargs):
+        built.append(
+            real_client(
+                transport=httpx.MockTransport(
+                    lambda request: httpx.Response(200, json={"result": []})
+                )
+            )
+        )
+        return built[-1]
+
+    with patch.object(httpx, "AsyncClient", side_effect=client):
+        api = AsyncApi(url=BASE, username="admin", password="pw")
+    first_lock = api._token_lock
+
+    asyncio.run(api.get_table(table="incident"))
+    first_loop = api._loop
+    asyncio.run(api.get_table(table="incident"))
+
+    assert len(built) == 2 and api._client is built[1]
+    assert api._loop is not first_loop
+    assert api._token_lock is not first_lock
+    asyncio.run(api.aclose())
+
+
+def test_close_from_another_thread_runs_on_the_clients_loop():
+    loop = asyncio.new_event_loop()
+    runner = threading.Thread(target=loop.run_forever, daemon=True)
+    runner.start()
+    api = _client(lambda request: httpx.Response(200, json={"result": []}))
+    closed_on = []
+    aclose = api._client.aclose
+
+    async def tracked_aclose():
+        closed_on.append(asyncio.get_running_loop())
+        await aclose()
+
+    api._client.aclose = tracked_aclose
+    try:
+        asyncio.run_coroutine_threadsafe(api.get_table(table="incident"), loop).result(
+            5
+        )
+
+        api.close()
+
+        deadline = time.time() + 5
+        while not api._client.is_closed and time.time() < deadline:
+            time.sleep(0.01)
+        assert api._client.is_closed
+        assert closed_on == [loop]
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        runner.join(5)
+        loop.close()
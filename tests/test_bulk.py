@@ -0,0 +1,197 @@
+import base64
+import json
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+from agent_utilities.core.exceptions import ParameterError
+
+from servicenow_api.api_client import Api
+from servicenow_api.bulk import AdaptiveConcurrency, BulkOperation
+
+BASE = "https://dev12345.service-now.com"
+
+
+def _response(status, body=None, reason=""):
+    response = requests.Response()
+    response.status_code = status
+    response.reason = reason
+    response._content = json.dumps(body).encode() if body is not None else b""
+    return response
+
+
+def _api(handler):
+    """Api whose session answers every write with ``handler(method, url, kwargs)``."""
+    session = MagicMock()
+    for method in ("post", "put", "patch", "delete"):
+        getattr(session, method).side_effect = (
+            lambda m: lambda url, **kw: handler(m, url, kw)
+        )(method)
+    with patch("requests.Session", return_value=session):
+        api = Api(url=BASE, username="admin", password="pw")
+    return api, session
+
+
+def test_operations_are_validated():
+    assert BulkOperation(op="PATCH", sys_id="a", data={}).method == "PATCH"
+    with pytest.raises(ParameterError):
+        BulkOperation(op="upsert", data={})
+    with pytest.raises(ParameterError):
+        BulkOperation(op="delete")
+    with pytest.raises(ParameterError):
+        BulkOperation(op="create")
+
+
+def test_mixed_operations_report_per_record_results():
+    def handler(method, url, kwargs):
+        if method == "post":
+            return _response(
+                201, {"result": {"sys_id": "new1", **json.loads(kwargs["data"])}}
+            )
+        if url.endswith("/missing"):
+            body = {"error": {"message": "No Record found", "detail": "missing"}}
+            return _response(404, body, "Not Found")
+        if method == "delete":
+            return _response(204)
+        return _response(200, {"result": {"sys_id": url.rsplit("/", 1)[1]}})
+
+    api, session = _api(handler)
+
+    result = api.bulk_write(
+        "incident",
+        [
+            {"op": "create", "data": {"short_description": "a"}},
+            {"op": "patch", "sys_id": "s1", "data": {"state": "2"}},
+            BulkOperation(op="update", sys_id="missing", data={"state": "2"}),
+            {"op": "delete", "sys_id": "s2"},
+        ],
+        fields=["sys_id", "short_description"],
+    )
+
+    assert [r.ok for r in result.results] == [True, True, False, True]
+    assert (result.succeeded, result.failed) == (3, 1)
+    assert result.results[0].sys_id == "new1"
+    assert result.results[0].result["short_description"] == "a"
+    assert result.failures[0].index == 2
+    assert result.failures[0].status_code == 404
+    assert result.failures[0].error == "No Record found: missing"
+    post = session.post.call_args.kwargs
+    assert post["url"] == f"{BASE}/api/now/table/incident"
+    assert post["params"] == {"sysparm_fields": "sys_id,short_description"}
+
+
+def test_exceptions_are_recorded_without_aborting():
+    def handler(method, url, kwargs):
+        if url.endswith("/bad"):
+            raise requests.ConnectionError("reset")
+        return _response(200, {"result": {}})
+
+    api, _ = _api(handler)
+
+    result = api.bulk_write(
+        "incident",
+        [{"op": "delete", "sys_id": f"s{i}"} for i in range(5)]
+        + [{"op": "delete", "sys_id": "bad"}],
+        workers=3,
+    )
+
+    assert result.succeeded == 5
+    assert result.failures[0].error == "ConnectionError: reset"
+
+
+def test_429s_shrink_concurrency_and_are_retried():
+    lock = threading.Lock()
+    throttled = []
+
+    def handler(method, url, kwargs):
+        sys_id = url.rsplit("/", 1)[1]
+        with lock:
+            throttle = len(throttled) < 4 and sys_id in ("s3", "s7")
+            if throttle:
+                throttled.append(sys_id)
+        if throttle:
+            return _response(429, {"error": {"message": "Too many requests"}})
+        return _response(200, {"result": {"sys_id": sys_id}})
+
+    api, _ = _api(handler)
+
+    result = api.bulk_write(
+        "incident",
+        [{"op": "patch", "sys_id": f"s{i}", "data": {"n": i}} for i in range(40)],
+        workers=8,
+    )
+
+    assert result.ok and result.throttled == 4
+    assert result.min_concurrency < 8
+    assert {r.attempts for r in result.results if r.sys_id in ("s3", "s7")} == {3}
+
+
+def test_429s_past_max_attempts_fail():
+    api, _ = _api(lambda method, url, kwargs: _response(429))
+
+    result = api.bulk_write(
+        "incident", [{"op": "create", "data": {"n": 1}}], max_attempts=2
+    )
+
+    assert result.results[0].attempts == 2
+    assert (result.results[0].status_code, result.results[0].error) == (429, "HTTP 429")
+
+
+def test_batch_mode_packs_envelopes_and_retries_unserviced():
+    envelopes = []
+
+    def handler(method, url, kwargs):
+        assert url == f"{BASE}/api/now/v1/batch"
+        batch = json.loads(kwargs["data"])
+        envelopes.append(batch["rest_requests"])
+        serviced = []
+        for item in batch["rest_requests"][: 2 if len(envelopes) == 1 else None]:
+            data = json.loads(base64.b64decode(item["body"]))
+            status = 400 if data.get("bad") else 201
+            body = (
+                {"error": {"message": "Invalid"}}
+                if status == 400
+                else {"result": {"sys_id": f"new{item['id']}", **data}}
+            )
+            serviced.append(
+                {
+                    "id": item["id"],
+                    "status_code": status,
+                    "body": base64.b64encode(json.dumps(body).encode()).decode(),
+                }
+            )
+        unserviced = [i["id"] for i in batch["rest_requests"]][len(serviced) :]
+        return _response(
+            200, {"serviced_requests": serviced, "unserviced_requests": unserviced}
+        )
+
+    api, _ = _api(handler)
+    ops = [{"op": "create", "data": {"n": i}} for i in range(4)]
+    ops[1]["data"]["bad"] = True
+
+    result = api.bulk_write("incident", ops, workers=1, batch_size=3, fields="sys_id")
+
+    assert [len(e) for e in envelopes] == [3, 1, 1]
+    assert envelopes[0][0]["url"] == "/api/now/table/incident?sysparm_fields=sys_id"
+    assert envelopes[0][0]["method"] == "POST"
+    assert [r.sys_id for r in result.results] == ["new0", None, "new2", "new3"]
+    assert result.results[1].error == "Invalid"
+    assert result.results[2].attempts == 2
+    assert result.throttled == 1
+
+
+def test_adaptive_concurrency_is_aimd():
+    limiter = AdaptiveConcurrency(8)
+    window = limiter.acquire()
+    stale = limiter.acquire()
+    limiter.throttle(window)
+    limiter.throttle(stale)
+    limiter.release(throttled=True)
+    limiter.release(throttled=True)
+
+    assert (limiter.limit, limiter.throttled) == (4, 2)
+    for _ in range(4):
+        limiter.acquire()
+        limiter.release()
+    assert limiter.limit == 5
@@ -0,0 +1,134 @@
+import json
+import threading
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from servicenow_api.api_client import Api
+from servicenow_api.choices import ChoiceCache, choice_display
+from servicenow_api.servicenow_models import ChangeRequest, Incident, Problem
+
+BASE = "https://dev12345.service-now.com"
+CHOICES = [
+    ("task", "state", "1", "Open"),
+    ("task", "state", "2", "Work in Progress"),
+    ("task", "impact", "2", "2 - Medium"),
+    ("incident", "state", "2", "In Progress"),
+    ("incident", "priority", "1", "1 - Critical"),
+    ("incident", "category", "network", "Network"),
+    ("change_request", "risk", "3", "Moderate"),
+    ("problem", "state", "101", "New"),
+]
+
+
+def _api(choices=CHOICES, fail=None):
+    calls = []
+    lock = threading.Lock()
+
+    def get(url, params, **_):
+        with lock:
+            calls.append(dict(params))
+        rows = [
+            {
+                "sys_id": f"{i:032x}",
+                "name": t,
+                "element": e,
+                "value": v,
+                "label": label,
+                "language": "en",
+            }
+            for i, (t, e, v, label) in enumerate(choices)
+        ]
+        query = params["sysparm_query"]
+        after = query.split("sys_id>")[1].split("^")[0] if "sys_id>" in query else ""
+        page = [r for r in rows if r["sys_id"] > after][: int(params["sysparm_limit"])]
+        response = requests.Response()
+        response.status_code = 403 if fail is not None and fail() else 200
+        response._content = json.dumps({"result": page}).encode()
+        return response
+
+    session = MagicMock()
+    session.get.side_effect = get
+    with patch("requests.Session", return_value=session):
+        api = Api(url=BASE, username="admin", password="pw")
+    return api, calls
+
+
+def test_labels_fall_back_to_the_parent_table():
+    api, calls = _api()
+    choices = ChoiceCache(api, tables=["task", "incident"])
+
+    assert choices.label("incident", "state", "2") == "In Progress"
+    assert choices.label("incident", "impact", 2) == "2 - Medium"
+    assert choices.label("incident", "state", "7") is None
+    assert choices.label("sys_user", "state", "2") is None
+    assert len(calls) == 1
+    assert "nameINtask,incident^language=en" in calls[0]["sysparm_query"]
+
+
+def test_choice_display_matches_display_value_pairs():
+    api, _ = _api()
+    choices = ChoiceCache(api)
+    pair = {"value": "2", "display_value": "In Progress"}
+
+    assert choice_display("2", choices, "incident", "state") == choice_display(pair)
+    assert choice_display({"value": "2"}, choices, "incident", "state") == "In Progress"
+    assert choice_display("2") == "2"
+    assert choice_display("x", choices, "incident", "state") == "x"
+    assert choice_display({"name": "n"}) == "n"
+
+
+def test_models_render_labels_from_raw_values():
+    api, _ = _api()
+    choices = ChoiceCache(api)
+
+    incident = Incident(state="2", priority={"value": "1"}, category="network")
+    assert incident.choice_label("state", choices) == "In Progress"
+    assert incident.choice_label("priority", choices) == "1 - Critical"
+    assert incident.choice_label("category", choices) == "Network"
+    assert incident.choice_label("state") == "2"
+    assert ChangeRequest(risk=3).choice_label("risk", choices) == "Moderate"
+    assert Problem(state="101").choice_label("state", choices) == "New"
+
+
+def test_cache_is_shared_per_instance_and_refreshed_by_the_calling_client():
+    api, calls = _api()
+    other, other_calls = _api()
+
+    first = api.get_choice_cache()
+    assert other.get_choice_cache() is first and first.loads == 1
+    # The shared cache does not pin the client that created it.
+    assert first.api is None
+
+    first.refresh_interval = 0.01
+    first._loaded_at -= 1
+    sent = len(calls)
+    assert other.get_choice_cache() is first
+    assert first.label("incident", "state", "2") == "In Progress"
+    first._refreshing.join(5)
+    assert first.loads == 2
+    assert len(calls) == sent and len(other_calls) == 1
+
+
+def test_failed_refresh_keeps_the_previous_lists():
+    failing = [False]
+    api, calls = _api(fail=lambda: failing[0])
+    choices = ChoiceCache(api, refresh_interval=0.01)
+    choices.load()
+
+    failing[0] = True
+    choices._loaded_at -= 1
+    choices.ensure_loaded()
+    choices._refreshing.join(5)
+
+    assert choices.loads == 1
+    assert choices.label("incident", "state", "2") == "In Progress"
+
+
+def test_large_choice_lists_are_read_in_keyset_pages():
+    many = [("task", "u_code", str(i), f"Code {i}") for i in range(2500)]
+    api, calls = _api(choices=many)
+    choices = ChoiceCache(api, tables=["task"])
+
+    assert choices.load() == 2500
+    assert len(calls) == 3 and choices.label("incident", "u_code", 2499) == "Code 2499"
@@ -0,0 +1,178 @@
+import gc
+import os
+import threading
+import time
+import weakref
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from servicenow_api.auth import get_client
+from servicenow_api.client_pool import ClientPool, get_client_pool, identity_digest
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_pool_reuses_client_for_same_key():
+    pool = ClientPool(max_size=4)
+    factory = MagicMock(side_effect=lambda: object())
+
+    first = pool.get(("inst", "id"), factory)
+    second = pool.get(("inst", "id"), factory)
+
+    assert first is second
+    assert factory.call_count == 1
+    assert pool.stats()["hits"] == 1
+    assert pool.stats()["misses"] == 1
+
+
+def test_pool_evicts_least_recently_used():
+    pool = ClientPool(max_size=2)
+    a = pool.get("a", object)
+    pool.get("b", object)
+    pool.get("a", object)  # touch a so b becomes LRU
+    pool.get("c", object)
+
+    assert pool.stats()["evictions"] == 1
+    assert pool.get("a", object) is a
+    assert len(pool) == 2
+
+
+def test_pool_drops_idle_clients():
+    clock = FakeClock()
+    pool = ClientPool(max_size=4, idle_ttl=10, clock=clock)
+    first = pool.get("k", object)
+    clock.now = 11
+    second = pool.get("k", object)
+
+    assert first is not second
+    assert pool.stats()["expirations"] == 1
+
+
+def test_pool_rebuilds_client_with_expiring_token():
+    pool = ClientPool(max_size=4, token_expiry_skew=60)
+    stale = MagicMock()
+    stale.token_expires_at = time.time() + 30
+    pool.get("k", lambda: stale)
+
+    fresh = pool.get("k", MagicMock)
+
+    assert fresh is not stale
+    # A caller of get() may still be using the stale client; it is not closed.
+    stale.close.assert_not_called()
+
+
+def test_pool_never_closes_dropped_clients():
+    pool = ClientPool(max_size=1)
+    evicted = pool.get("a", MagicMock)
+    invalidated = pool.get("b", MagicMock)  # evicts "a"
+    assert pool.invalidate("b")
+    cleared = pool.get("c", MagicMock)
+    pool.clear()
+
+    for client in (evicted, invalidated, cleared):
+        client.close.assert_not_called()
+
+
+def test_pool_releases_dropped_clients_to_the_garbage_collector():
+    class Client:
+        closed = False
+
+        def close(self):
+            self.closed = True
+
+    pool = ClientPool(max_size=1)
+    client = pool.get("a", Client)
+    ref = weakref.ref(client)
+    pool.get("b", Client)
+
+    assert not client.closed
+    del client
+    gc.collect()
+    assert ref() is None
+
+
+def test_pool_does_not_cache_factory_errors():
+    pool = ClientPool()
+    with pytest.raises(RuntimeError):
+        pool.get("k", MagicMock(side_effect=RuntimeError("boom")))
+    assert len(pool) == 0
+
+
+def test_pool_builds_cold_key_once_under_concurrency():
+    pool = ClientPool()
+    calls = []
+
+    def factory():
+        calls.append(1)
+        time.sleep(0.05)
+        return object()
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(pool.get("k", factory)))
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert len({id(r) for r in results}) == 1
+
+
+def test_identity_digest_hides_secrets():
+    digest = identity_digest("admin", "hunter2", None)
+    assert "hunter2" not in digest
+    assert digest == identity_digest("admin", "hunter2", None)
+    assert digest != identity_digest("admin", "other", None)
+
+
+def test_get_client_reuses_pooled_client():
+    with patch.dict(
+        os.environ, {"SERVICENOW_INSTANCE": "https://dev12345.service-now.com"}
+    ):
+        with patch(
+            "agent_utilities.mcp.delegated_auth.is_delegation_enabled",
+            return_value=False,
+        ):
+            with patch(
+                "servicenow_api.auth.Api", side_effect=lambda **kw: MagicMock()
+            ) as mock_api_cls:
+                first = get_client(username="admin", password="pw")
+                second = get_client(username="admin", password="pw")
+                other = get_client(username="admin", password="different")
+
+    assert first is second
+    assert other is not first
+    assert mock_api_cls.call_count == 2
+    assert get_client_pool().stats()["hits"] == 1
+
+
+def test_get_client_pool_can_be_disabled():
+    with patch.dict(
+        os.environ,
+        {
+            "SERVICENOW_INSTANCE": "https://dev12345.service-now.com",
+            "SERVICENOW_CLIENT_POOL": "false",
+        },
+    ):
+        with patch(
+            "agent_utilities.mcp.delegated_auth.is_delegation_enabled",
+            return_value=False,
+        ):
+            with patch(
+                "servicenow_api.auth.Api", side_effect=lambda **kw: MagicMock()
+            ) as mock_api_cls:
+                first = get_client(username="admin", password="pw")
+                second = get_client(username="admin", password="pw")
+
+    assert first is not second
+    assert mock_api_cls.call_count == 2
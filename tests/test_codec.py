@@ -0,0 +1,116 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+import requests
+from agent_utilities.core.exceptions import ParameterError
+
+from servicenow_api.api_client import Api
+from servicenow_api.async_client import AsyncApi
+from servicenow_api.codec import JsonCodec
+from servicenow_api.transport import ServiceNowSession
+
+BASE = "https://dev12345.service-now.com"
+BODY = {"result": [{"number": "INC0000001", "short_description": "Drucker kaputt ü"}]}
+
+
+def _response(content, status=200):
+    response = requests.Response()
+    response.status_code = status
+    response._content = content
+    return response
+
+
+def test_auto_prefers_an_installed_fast_backend():
+    codec = JsonCodec()
+    try:
+        import orjson  # noqa: F401
+    except ImportError:
+        assert codec.name in ("msgspec", "json")
+    else:
+        assert codec.name == "orjson"
+    assert codec.loads(codec.dumps(BODY)) == BODY
+
+
+def test_unknown_or_missing_codec_is_rejected():
+    with pytest.raises(ParameterError):
+        JsonCodec("ujson")
+    try:
+        import msgspec  # noqa: F401
+    except ImportError:
+        with pytest.raises(ImportError):
+            JsonCodec("msgspec")
+
+
+@pytest.mark.parametrize("name", ["auto", "json"])
+def test_non_utf8_bodies_and_unknown_types_fall_back_to_stdlib(name):
+    codec = JsonCodec(name)
+    raw = json.dumps(BODY)
+
+    assert codec.loads(raw.encode("utf-16")) == BODY
+    assert codec.loads(b"\xef\xbb\xbf" + raw.encode()) == BODY
+    with pytest.raises(json.JSONDecodeError):
+        codec.loads(b'{"result": [')
+
+
+def test_session_encodes_bodies_and_decodes_responses_with_codec():
+    inner = MagicMock()
+    inner.post.return_value = _response(json.dumps(BODY).encode(), 201)
+    codec = JsonCodec()
+    session = ServiceNowSession(inner, codec=codec)
+    headers = {"Authorization": "Basic abc"}
+
+    response = session.post(url=f"{BASE}/api", json={"a": "ü"}, headers=headers)
+
+    sent = inner.post.call_args.kwargs
+    assert "json" not in sent and json.loads(sent["data"]) == {"a": "ü"}
+    assert sent["headers"]["Content-Type"] == "application/json"
+    assert "Content-Type" not in headers
+    with patch.object(codec, "loads", wraps=codec.loads) as loads:
+        assert response.json() == BODY
+    loads.assert_called_once_with(response.content)
+
+
+def test_invalid_response_raises_requests_json_error():
+    inner = MagicMock()
+    inner.get.return_value = _response(b"<html>maintenance</html>")
+    session = ServiceNowSession(inner)
+
+    with pytest.raises(requests.JSONDecodeError):
+        session.get(url=f"{BASE}/api").json()
+
+
+def test_api_mixins_share_the_client_codec():
+    session = MagicMock()
+    session.get.return_value = _response(json.dumps(BODY).encode())
+    with patch("requests.Session", return_value=session):
+        api = Api(url=BASE, username="admin", password="pw", json_codec="json")
+
+    assert api.json_codec.name == "json" and api._session.codec is api.json_codec
+    assert api.get_incidents(sysparm_limit=1).result[0].number == "INC0000001"
+
+
+@pytest.mark.asyncio
+async def test_async_client_uses_codec_for_bodies():
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        record = {"sys_id": "abc", "short_description": "ü"}
+        return httpx.Response(201, content=json.dumps({"result": record}).encode())
+
+    api = AsyncApi(
+        url=BASE,
+        username="admin",
+        password="pw",
+        client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    async with api:
+        with patch.object(api.json_codec, "dumps", wraps=api.json_codec.dumps) as dumps:
+            resp = await api.create_incident(data={"short_description": "ü"})
+
+    dumps.assert_called_once_with({"short_description": "ü"})
+    assert json.loads(seen[0].content) == {"short_description": "ü"}
+    assert seen[0].headers["Content-Type"] == "application/json"
+    assert resp.result.short_description == "ü"
@@ -0,0 +1,158 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+from agent_utilities.core.exceptions import ParameterError
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from servicenow_api.api_client import Api  # noqa: E402
+from servicenow_api.columnar import ArrowBatchWriter, RecordBatchBuilder  # noqa: E402
+
+BASE = "https://dev12345.service-now.com"
+GROUPS = ["Service Desk", "Network", "Database"]
+
+
+def _record(i):
+    return {
+        "sys_id": f"{i:032x}",
+        "number": f"INC{i:07d}",
+        "state": str(i % 3 + 1),
+        "priority": str(i % 5 + 1),
+        "assignment_group": {
+            "link": f"{BASE}/api/now/table/sys_user_group/{i % 3}",
+            "value": GROUPS[i % 3],
+        },
+        "short_description": f"Printer {i} on fire" if i % 7 else "",
+        "reassignment_count": str(i % 4),
+        "opened_at": f"2026-03-{i % 28 + 1:02d} 08:00:00",
+    }
+
+
+RECORDS = [_record(i) for i in range(250)]
+
+
+def test_builder_dictionary_encodes_choice_columns_with_stable_codes():
+    builder = RecordBatchBuilder(batch_size=100)
+
+    batches = builder.add(RECORDS[:120]) + builder.add(RECORDS[120:])
+    batches.append(builder.flush())
+
+    schema = builder.schema
+    assert [b.num_rows for b in batches] == [100, 100, 50]
+    for name in ("state", "priority", "assignment_group"):
+        assert pa.types.is_dictionary(schema.field(name).type)
+    assert pa.types.is_string(schema.field("short_description").type)
+    table = pa.Table.from_batches(batches)
+    assert table.column("assignment_group").to_pylist() == [
+        GROUPS[i % 3] for i in range(250)
+    ]
+    # Codes never change meaning: later dictionaries extend earlier ones.
+    first, last = (b.column("state").dictionary.to_pylist() for b in batches[::2])
+    assert last[: len(first)] == first
+    assert table.column("short_description").null_count == len(range(0, 250, 7))
+
+
+def test_schema_overrides_cast_and_bad_values_raise():
+    builder = RecordBatchBuilder(
+        schema={"reassignment_count": "int64", "opened_at": "timestamp"},
+        fields=["number", "reassignment_count", "opened_at"],
+    )
+    builder.add(RECORDS[:10])
+    batch = builder.flush()
+
+    assert batch.schema.names == ["number", "reassignment_count", "opened_at"]
+    assert batch.column("reassignment_count").to_pylist()[:5] == [0, 1, 2, 3, 0]
+    assert pa.types.is_timestamp(batch.schema.field("opened_at").type)
+
+    broken = RecordBatchBuilder(schema={"number": "int64"})
+    broken.add(RECORDS[:1])
+    with pytest.raises(ParameterError, match="number"):
+        broken.flush()
+
+
+@pytest.mark.parametrize("fmt", ["parquet", "feather"])
+def test_writer_round_trips_with_row_groups(tmp_path, fmt):
+    path = tmp_path / f"incident.{fmt}"
+    with ArrowBatchWriter(path, format=fmt, row_group_size=64) as writer:
+        for start in range(0, len(RECORDS), 30):
+            writer.write(RECORDS[start : start + 30])
+
+    result = writer.result
+    assert (result.rows, result.row_groups) == (250, 4)
+    assert result.bytes == path.stat().st_size
+    assert "state" in result.dictionary_columns
+    if fmt == "parquet":
+        assert pq.ParquetFile(path).num_row_groups == 4
+        table = pq.read_table(path)
+    else:
+        table = pa.ipc.open_file(path).read_all()
+    assert table.column("number").to_pylist() == [r["number"] for r in RECORDS]
+
+
+def test_failed_export_leaves_no_file(tmp_path):
+    path = tmp_path / "incident.parquet"
+    with pytest.raises(RuntimeError):
+        with ArrowBatchWriter(path, row_group_size=10) as writer:
+            writer.write(RECORDS[:25])
+            raise RuntimeError("instance went away")
+
+    assert list(tmp_path.iterdir()) == []
+
+
+def _api(seen):
+    def get(url, params, **kwargs):
+        seen.append(params)
+        query = params.get("sysparm_query", "")
+        after = query.split("sys_id>")[1].split("^")[0] if "sys_id>" in query else ""
+        page = [r for r in RECORDS if r["sys_id"] > after][: params["sysparm_limit"]]
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps({"result": page}).encode()
+        return response
+
+    session = MagicMock()
+    session.get.side_effect = get
+    with patch("requests.Session", return_value=session):
+        return Api(url=BASE, username="admin", password="pw")
+
+
+def test_api_export_streams_keyset_pages_without_models(tmp_path):
+    seen = []
+    api = _api(seen)
+
+    with patch(
+        "servicenow_api.servicenow_models.Table.model_validate",
+        side_effect=AssertionError("no per-row models"),
+    ):
+        result = api.export_table_columnar(
+            table="incident",
+            path=str(tmp_path / "incident.parquet"),
+            fields=["number", "state", "assignment_group"],
+            page_size=100,
+            row_group_size=120,
+        )
+
+    assert (result.rows, result.row_groups) == (250, 3)
+    assert result.columns == ["number", "state", "assignment_group"]
+    assert all(p["sysparm_exclude_reference_link"] for p in seen)
+    assert all("sysparm_offset" not in p for p in seen)
+    table = pq.read_table(result.path)
+    assert table.column("assignment_group").to_pylist()[:3] == GROUPS
+
+
+def test_api_export_caps_rows_at_sysparm_limit(tmp_path):
+    seen = []
+    result = _api(seen).export_table_columnar(
+        table="incident",
+        path=str(tmp_path / "incident.parquet"),
+        fields=["number"],
+        page_size=100,
+        sysparm_limit=130,
+    )
+
+    assert result.rows == 130
+    assert [p["sysparm_limit"] for p in seen] == [100, 30]
+    assert pq.read_table(result.path).num_rows == 130
@@ -0,0 +1,313 @@
+import base64
+import gzip
+import json
+import threading
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from servicenow_api.api_client import (
+    Api,
+    decode_values,
+    find_connected_components,
+    find_subflow_sys_id,
+    graph_to_mermaid_multi,
+)
+from servicenow_api.flows import FlowCache, FlowCrawler, clear_shared_memos
+from servicenow_api.servicenow_models import FlowEdge, FlowGraph, FlowNode
+
+BASE = "https://dev12345.service-now.com"
+
+
+def _fid(n):
+    return f"{n:02d}" + "f" * 30
+
+
+def _values(sub_id=None):
+    params = [{"name": "subflow", "value": sub_id}] if sub_id else []
+    blob = gzip.compress(json.dumps(params).encode(), mtime=0)
+    return base64.b64encode(blob).decode()
+
+
+# root 1 -> 2 -> 3 -> 4, root 1 -> 5; root 6 -> 2 (shared) and -> 6 (self call);
+# root 7 has its actions in the legacy table; 9 does not exist.
+FLOWS = {
+    _fid(1): [("Step A", None), ("Call 2", _fid(2)), ("If ok", _fid(5))],
+    _fid(2): [("Call 3", _fid(3))],
+    _fid(3): [("Call 4", _fid(4))],
+    _fid(4): [("Log", None)],
+    _fid(5): [],
+    _fid(6): [("Call 2", _fid(2)), ("Again", _fid(6)), ("Missing", _fid(9))],
+    _fid(7): [("Legacy step", None)],
+}
+LEGACY = {_fid(7)}
+
+
+def _rows(flow, table):
+    if (flow in LEGACY) != (table == "sys_hub_action_instance"):
+        return []
+    return [
+        {
+            "sys_id": f"a{flow[:2]}{i:029x}",
+            "name": name,
+            "order": str(i * 100),
+            "values": _values(sub),
+            "action": {"display_value": name},
+            "action_type": {"display_value": "Subflow" if sub else "Log"},
+            "comment": "",
+            "display_text": "",
+            "flow.sys_id": flow,
+        }
+        for i, (name, sub) in enumerate(FLOWS[flow])
+    ]
+
+
+def _api(versions=None, username="admin"):
+    calls = []
+    lock = threading.Lock()
+
+    def get(url, params, **_):
+        table = url.rsplit("/", 1)[1]
+        query = params.get("sysparm_query", "")
+        with lock:
+            calls.append((table, query))
+        if table == "sys_hub_flow" and "sys_idIN" not in query:
+            after = (
+                query.split("sys_id>")[1].split("^")[0] if "sys_id>" in query else ""
+            )
+            rows = [
+                {"sys_id": i, "sys_updated_on": versions[i]}
+                for i in sorted(versions)
+                if i > after
+            ][: int(params["sysparm_limit"])]
+        elif table == "sys_hub_flow":
+            ids = query.split("sys_idIN")[1].split(",")
+            rows = [
+                {"sys_id": i, "name": f"Flow {int(i[:2])}", "active": "true"}
+                for i in ids
+                if i in FLOWS
+            ]
+        else:
+            flows = query.split("flowIN")[1].split("^")[0].split(",")
+            rows = [r for f in flows if f in FLOWS for r in _rows(f, table)]
+            rows = rows[int(params.get("sysparm_offset", 0)) :][
+                : params["sysparm_limit"]
+            ]
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps({"result": rows}).encode()
+        return response
+
+    session = MagicMock()
+    session.get.side_effect = get
+    with patch("requests.Session", return_value=session):
+        api = Api(url=BASE, username=username, password="pw")
+    return api, calls
+
+
+def test_levels_are_fetched_in_batches():
+    api, calls = _api()
+
+    graph, metadata = api.collect_graph_for_roots([_fid(1), _fid(6), _fid(7)])
+
+    # 4 levels: one metadata query and one v2 action query each, one legacy query
+    # for the flows without v2 actions, one metadata query for the last callees.
+    tables = [t for t, _ in calls]
+    assert tables.count("sys_hub_flow") == 4
+    assert tables.count("sys_hub_action_instance_v2") == 4
+    assert calls[1][1].startswith(f"flowIN{_fid(1)},{_fid(6)},{_fid(7)}^ORDERBYorder")
+    assert sorted(metadata) == sorted(_fid(n) for n in (1, 2, 3, 4, 5, 6, 7))
+    assert graph.summary == "3 root flows + subflows"
+
+
+def test_graph_matches_depth_first_construction():
+    api, _ = _api()
+
+    graph, _ = api.collect_graph_for_roots([_fid(1), _fid(6)], max_depth=2)
+
+    ids = [n.id for n in graph.nodes]
+    sub2, sub3 = f"sub_{_fid(2)[:8]}_", f"sub_{_fid(3)[:8]}_"
+    root1 = f"root_{_fid(1)[:8]}_"
+    # Callees are emitted before their callers; depth 3 (flow 4) is cut off.
+    assert ids[:4] == [
+        f"{sub3}trigger_{_fid(3)[:8]}",
+        f"{sub3}{_rows(_fid(3), 'v2')[0]['sys_id']}",
+        f"{sub2}trigger_{_fid(2)[:8]}",
+        f"{sub2}{_rows(_fid(2), 'v2')[0]['sys_id']}",
+    ]
+    assert ids[4] == f"sub_{_fid(5)[:8]}_trigger_{_fid(5)[:8]}"
+    assert ids[5] == f"{root1}trigger_{_fid(1)[:8]}"
+    labels = {n.id: n.label for n in graph.nodes}
+    assert labels[ids[1]].endswith("-> CALL SUBFLOW: Flow 4")
+    assert not any(e.to_id.endswith(f"trigger_{_fid(4)[:8]}") for e in graph.edges)
+    calls = [
+        (e.from_id, e.to_id) for e in graph.edges if e.label in ("calls", "condition")
+    ]
+    assert (ids[3], ids[0]) in calls
+    # Flow 6 calls the already visited flow 2 and itself.
+    root6 = f"root_{_fid(6)[:8]}_trigger_{_fid(6)[:8]}"
+    assert sum(1 for e in graph.edges if e.to_id == ids[2]) == 2
+    assert any(e.to_id == root6 and e.label == "calls" for e in graph.edges)
+
+
+def _crawler(api, **kwargs):
+    return FlowCrawler(api, decode_values, find_subflow_sys_id, **kwargs)
+
+
+def test_crawl_memoizes_metadata_actions_and_decoded_values():
+    api, calls = _api()
+    crawler = _crawler(api)
+    decodes = []
+    decode = crawler.decode
+    crawler.decode = lambda raw: decodes.append(raw) or decode(raw)
+
+    api.collect_graph_for_roots([_fid(1), _fid(6), _fid(7)], crawler=crawler)
+
+    stats = crawler.stats
+    assert stats["requests"] == len(calls)
+    assert len(decodes) == len(set(decodes)) == 7
+    # Flows 1-7 and the missing 9 are looked up once each; flow 6 calling itself
+    # is the only metadata reuse. No flow's actions are needed twice.
+    assert stats["metadata"] == {"hits": 1, "misses": 8}
+    assert stats["actions"] == {"hits": 0, "misses": 7}
+    # Flow 2 is called from flows 1 and 6 with the same values blob, and the
+    # empty blob of flows 1, 4 and 7 is decoded once.
+    assert stats["values"] == {"hits": 3, "misses": 7}
+    assert crawler.summary().startswith("memo hits: metadata 11% (1/9)")
+
+
+def test_memo_ttl_shares_loaded_flows_between_crawls():
+    clear_shared_memos()
+    api, calls = _api()
+    first, _ = api.collect_graph_for_roots(
+        [_fid(1), _fid(6)], crawler=_crawler(api, memo_ttl=60)
+    )
+    sent = len(calls)
+
+    crawler = _crawler(api, memo_ttl=60)
+    second, _ = api.collect_graph_for_roots([_fid(1), _fid(6)], crawler=crawler)
+
+    assert second == first
+    # Only the missing flow 9 is looked up again.
+    assert [t for t, _ in calls[sent:]] == ["sys_hub_flow"]
+    assert crawler.stats["actions"]["misses"] == 0
+
+    other, other_calls = _api(username="itil")
+    other.collect_graph_for_roots([_fid(1)], crawler=_crawler(other, memo_ttl=60))
+    assert any(t == "sys_hub_action_instance_v2" for t, _ in other_calls)
+    clear_shared_memos()
+
+
+def test_flow_cache_recrawls_only_updated_flows():
+    versions = {f: "2026-01-01 00:00:00" for f in FLOWS}
+    api, calls = _api(versions)
+    cache = FlowCache(":memory:")
+    roots = [_fid(1), _fid(6), _fid(7)]
+    first, meta = api.collect_graph_for_roots(roots, crawler=_crawler(api, cache=cache))
+
+    calls.clear()
+    crawler = _crawler(api, cache=cache)
+    second, _ = api.collect_graph_for_roots(roots, crawler=crawler)
+    assert second == first
+    # One version scan, plus the metadata lookup of the missing flow 9.
+    assert [t for t, _ in calls] == ["sys_hub_flow", "sys_hub_flow"]
+    assert crawler.reused == 7
+
+    versions[_fid(3)] = "2026-02-01 00:00:00"
+    calls.clear()
+    crawler = _crawler(api, cache=cache)
+    third, _ = api.collect_graph_for_roots(roots, crawler=crawler)
+    assert third == first
+    assert crawler.reused == 6
+    assert any(q.startswith(f"sys_idIN{_fid(3)}") for _, q in calls)
+    assert any(q.startswith(f"flowIN{_fid(3)}^") for _, q in calls)
+    assert cache.get(api.url, api.identity, {_fid(3): versions[_fid(3)]})
+
+
+def test_flow_cache_is_not_shared_between_identities():
+    versions = {f: "2026-01-01 00:00:00" for f in FLOWS}
+    cache = FlowCache(":memory:")
+    admin, _ = _api(versions)
+    admin.collect_graph_for_roots([_fid(1)], crawler=_crawler(admin, cache=cache))
+
+    user, calls = _api(versions, username="itil")
+    crawler = _crawler(user, cache=cache)
+    user.collect_graph_for_roots([_fid(1)], crawler=crawler)
+
+    assert user.identity != admin.identity
+    assert crawler.reused == 0
+    assert any(q.startswith(f"flowIN{_fid(1)}") for _, q in calls)
+
+
+def test_unwritable_flow_cache_falls_back_to_crawling(monkeypatch):
+    monkeypatch.setenv("SERVICENOW_FLOW_CACHE_DB", "/proc/nope/flows.sqlite3")
+    versions = {f: "2026-01-01 00:00:00" for f in FLOWS}
+    api, _ = _api(versions)
+    assert api._get_flow_cache() is None
+
+    report = api.workflow_to_mermaid(
+        flow_identifiers=[_fid(1)], save_to_file=False, use_cache=True
+    )
+    assert report.root_flow_sys_ids == [_fid(1)]
+    assert "flowchart" in report.markdown_content
+
+
+def test_mermaid_groups_nodes_under_their_root():
+    r1, r2 = _fid(1), _fid(2)
+    nodes = [
+        FlowNode(id=f"root_{r1[:8]}_trigger_{r1[:8]}", label="Flow 1", type="trigger"),
+        FlowNode(id="sub_x_a", label='say "hi"', type="subflow_call"),
+        FlowNode(id=f"root_{r1[:8]}_a", label="If", type="decision"),
+        FlowNode(id=f"root_{r2[:8]}_b", label="", type="loop"),
+        FlowNode(id="root_other_c", label="Step", type="action"),
+    ]
+    edges = [
+        FlowEdge(from_id=nodes[0].id, to_id=nodes[2].id),
+        FlowEdge(from_id=nodes[2].id, to_id=nodes[1].id, label="calls"),
+    ]
+    graph = FlowGraph(nodes=nodes, edges=edges, summary="")
+
+    out = graph_to_mermaid_multi(graph, [r1, r2, r1, _fid(3)], {r1: {"name": "One"}})
+
+    block1 = (
+        f'    subgraph "One ({r1})"\n'
+        f'        {nodes[0].id}(("Flow 1"))\n'
+        f'        {nodes[2].id}{{{{"If"}}}}\n'
+        "    end"
+    )
+    assert out == "\n".join(
+        [
+            "flowchart TD",
+            block1,
+            f'    subgraph "{r2} ({r2})"',
+            f"        {nodes[3].id}[//]",
+            "    end",
+            block1,
+            "    sub_x_a[[\"say 'hi'\"]]",
+            '    root_other_c["Step"]',
+            f"    {nodes[0].id} --> {nodes[2].id}",
+            f"    {nodes[2].id} --> |calls| sub_x_a",
+        ]
+    )
+
+
+def test_components_come_out_in_node_order():
+    nodes = [FlowNode(id=i, label=i, type="action") for i in "dabecf"]
+    edges = [
+        FlowEdge(from_id="e", to_id="a"),
+        FlowEdge(from_id="b", to_id="f"),
+        FlowEdge(from_id="a", to_id="d"),
+    ]
+    graph = FlowGraph(nodes=nodes, edges=edges, summary="")
+
+    components = find_connected_components(graph)
+
+    assert [[n.id for n in c.nodes] for c in components] == [
+        ["d", "a", "e"],
+        ["b", "f"],
+        ["c"],
+    ]
+    assert [e.from_id for e in components[0].edges] == ["e", "a"]
+    assert components[2].summary == "Component size: 1"
+    kept = find_connected_components(graph, drop_singletons=True)
+    assert [len(c.nodes) for c in kept] == [3, 2]
@@ -0,0 +1,118 @@
+import json
+import threading
+from unittest.mock import MagicMock, patch
+from urllib.parse import urlencode
+
+import pytest
+import requests
+from agent_utilities.core.exceptions import ParameterError
+
+from servicenow_api.api_client import Api
+from servicenow_api.lookup import chunk_in_query
+from servicenow_api.partitioning import and_condition
+from servicenow_api.servicenow_models import Table
+
+BASE = "https://dev12345.service-now.com"
+URL = f"{BASE}/api/now/table/cmdb_ci"
+ROWS = {f"{i:032x}": {"sys_id": f"{i:032x}", "name": f"ci-{i}"} for i in range(600)}
+
+
+def _api():
+    calls = []
+    lock = threading.Lock()
+
+    def get(url, params, **_):
+        with lock:
+            calls.append(dict(params))
+        ids = params["sysparm_query"].split("sys_idIN")[1].split("^")[0].split(",")
+        rows = [ROWS[i] for i in ids if i in ROWS][: params["sysparm_limit"]]
+        if params.get("sysparm_display_value") == "all":
+            rows = [{**r, "sys_id": {"value": r["sys_id"]}} for r in rows]
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps({"result": rows[::-1]}).encode()
+        return response
+
+    session = MagicMock()
+    session.get.side_effect = get
+    with patch("requests.Session", return_value=session):
+        api = Api(url=BASE, username="admin", password="pw")
+    return api, calls
+
+
+@pytest.mark.parametrize("query", [None, "active=true", "active=true^NQname=x"])
+def test_chunks_fit_the_url_limit_and_are_packed(query):
+    ids = list(ROWS)
+    params = {"sysparm_fields": "sys_id,name"}
+
+    def url_length(chunk):
+        condition = f"sys_idIN{','.join(chunk)}"
+        encoded = urlencode(
+            {
+                **params,
+                "sysparm_query": and_condition(query, condition),
+                "sysparm_limit": len(chunk),
+            }
+        )
+        return len(URL) + 1 + len(encoded)
+
+    chunks = chunk_in_query(ids, URL, params, query=query, max_url_length=2000)
+
+    assert [i for c in chunks for i in c] == ids
+    assert all(url_length(c) <= 2000 for c in chunks)
+    assert all(
+        url_length(c + n[:1]) > 2000 for c, n in zip(chunks, chunks[1:], strict=False)
+    )
+
+
+def test_values_that_can_never_fit_are_rejected():
+    with pytest.raises(ParameterError):
+        chunk_in_query(["x" * 500], URL, {}, max_url_length=400)
+
+
+def test_get_records_chunks_concurrently_and_reports_missing():
+    api, calls = _api()
+    wanted = list(ROWS)[::2] + ["f" * 32, "", list(ROWS)[0]]
+
+    result = api.get_records(
+        "cmdb_ci", wanted, fields=["name"], workers=4, max_url_length=2000
+    )
+
+    assert result.requests == len(calls) > 1
+    assert list(result.records) == list(ROWS)[::2]
+    assert all(isinstance(r, Table) for r in result.records.values())
+    assert result.records[f"{4:032x}"].name == "ci-4"
+    assert result.missing == ["f" * 32]
+    assert all(c["sysparm_fields"] == "sys_id,name" for c in calls)
+    assert all(len(c["sysparm_query"]) < 2000 for c in calls)
+
+
+def test_get_records_with_query_display_values_and_dicts():
+    api, calls = _api()
+    ids = list(ROWS)[:3]
+
+    result = api.get_records(
+        "cmdb_ci",
+        ids,
+        sysparm_query="operational_status=1",
+        sysparm_display_value="all",
+        result_mode="dicts",
+    )
+
+    assert list(result.records) == ids
+    assert result.records[ids[0]]["sys_id"] == {"value": ids[0]}
+    assert calls == [
+        {
+            "sysparm_display_value": "all",
+            "sysparm_query": f"operational_status=1^sys_idIN{','.join(ids)}",
+            "sysparm_limit": 3,
+        }
+    ]
+
+
+def test_get_records_without_ids_sends_nothing():
+    api, calls = _api()
+
+    result = api.get_records("cmdb_ci", [])
+
+    assert (result.records, result.missing, result.requests, calls) == ({}, [], 0, [])
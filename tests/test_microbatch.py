@@ -0,0 +1,230 @@
+import asyncio
+import base64
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+import requests
+
+from servicenow_api.api_client import Api
+from servicenow_api.async_client import AsyncApi
+from servicenow_api.microbatch import MicroBatchConfig, _relative_url
+
+BASE = "https://dev12345.service-now.com"
+
+
+def _record(url):
+    sys_id = url.split("?")[0].rsplit("/", 1)[1]
+    return {"result": {"sys_id": sys_id, "number": f"INC{sys_id}"}}
+
+
+def _entry(request, status=200, body=None):
+    body = _record(request["url"]) if body is None else body
+    return {
+        "id": request["id"],
+        "status_code": status,
+        "status_text": "OK" if status == 200 else "Not Found",
+        "headers": [{"name": "X-Total-Count", "value": "1"}],
+        "body": base64.b64encode(json.dumps(body).encode()).decode(),
+    }
+
+
+def _response(status, body):
+    response = requests.Response()
+    response.status_code = status
+    response._content = json.dumps(body).encode()
+    return response
+
+
+def _api(answer=None, **kwargs):
+    """Api whose batch endpoint answers each entry with ``answer(request)``."""
+    batches, gets = [], []
+    lock = threading.Lock()
+
+    def post(url, **kw):
+        assert url == f"{BASE}/api/now/v1/batch"
+        requests_ = json.loads(kw["data"])["rest_requests"]
+        with lock:
+            batches.append(requests_)
+        entries = [(answer or _entry)(r) for r in requests_]
+        return _response(
+            200,
+            {
+                "serviced_requests": [e for e in entries if e],
+                "unserviced_requests": [
+                    r["id"] for r, e in zip(requests_, entries, strict=True) if not e
+                ],
+            },
+        )
+
+    def get(url, params=None, **kw):
+        with lock:
+            gets.append(url)
+        return _response(200, _record(url))
+
+    session = MagicMock()
+    session.post.side_effect = post
+    session.get.side_effect = get
+    with patch("requests.Session", return_value=session):
+        api = Api(url=BASE, username="admin", password="pw", **kwargs)
+    return api, batches, gets
+
+
+def _read_concurrently(api, ids):
+    barrier = threading.Barrier(len(ids))
+
+    def read(sys_id):
+        barrier.wait()
+        return api.get_table_record(table="incident", table_record_sys_id=sys_id)
+
+    with ThreadPoolExecutor(len(ids)) as pool:
+        return list(pool.map(read, ids))
+
+
+def test_concurrent_gets_share_one_batch():
+    api, batches, gets = _api(micro_batch=0.2)
+    ids = [f"{i:04d}" for i in range(8)]
+
+    results = _read_concurrently(api, ids)
+
+    assert [r.result.sys_id for r in results] == ids
+    assert results[0].response.headers["X-Total-Count"] == "1"
+    assert len(batches) == 1 and not gets
+    entry = batches[0][0]
+    assert entry["method"] == "GET"
+    assert entry["url"].startswith("/api/now/table/incident/")
+    assert {h["name"] for h in entry["headers"]} == {"Accept"}
+    assert api._session.batcher.batched == 8
+
+
+def test_max_batch_splits_windows():
+    api, batches, _ = _api(micro_batch=MicroBatchConfig(window=0.2, max_batch=3))
+
+    _read_concurrently(api, [f"{i:04d}" for i in range(7)])
+
+    assert sorted(len(b) for b in batches) in ([1, 3, 3], [3, 3])
+
+
+def test_a_lone_get_is_sent_directly():
+    api, batches, gets = _api(micro_batch=0.01)
+
+    result = api.get_table_record(table="incident", table_record_sys_id="abc")
+
+    assert result.result.sys_id == "abc"
+    assert not batches and gets == [f"{BASE}/api/now/table/incident/abc"]
+
+
+def test_errors_unserviced_and_throttled_entries():
+    def answer(request):
+        if request["url"].endswith("/missing"):
+            return _entry(request, 404, {"error": {"message": "No Record found"}})
+        if request["url"].endswith(("/late", "/busy")):
+            return _entry(request, 429) if "busy" in request["url"] else None
+        return _entry(request)
+
+    api, _, gets = _api(answer, micro_batch=0.2)
+    barrier = threading.Barrier(4)
+
+    def read(sys_id):
+        barrier.wait()
+        try:
+            return api.get_table_record(table="incident", table_record_sys_id=sys_id)
+        except requests.HTTPError as e:
+            return e.response.status_code
+
+    with ThreadPoolExecutor(4) as pool:
+        results = list(pool.map(read, ["ok", "missing", "late", "busy"]))
+
+    assert results[0].result.sys_id == "ok"
+    assert results[1] == 404
+    assert [r.result.sys_id for r in results[2:]] == ["late", "busy"]
+    assert sorted(gets) == [
+        f"{BASE}/api/now/table/incident/busy",
+        f"{BASE}/api/now/table/incident/late",
+    ]
+
+
+def test_failed_batch_falls_back_to_individual_gets():
+    def answer(request):
+        raise RuntimeError("boom")
+
+    api, _, gets = _api(answer, micro_batch=0.2)
+
+    results = _read_concurrently(api, ["a", "b", "c"])
+
+    assert [r.result.sys_id for r in results] == ["a", "b", "c"]
+    assert len(gets) == 3
+
+
+def test_disabled_by_default_and_enabled_from_settings(monkeypatch):
+    api, _, _ = _api()
+    assert api._session.batcher is None and not api.micro_batch.enabled
+
+    monkeypatch.setenv("SERVICENOW_MICRO_BATCH_WINDOW", "0.004")
+    monkeypatch.setenv("SERVICENOW_MICRO_BATCH_SIZE", "20")
+    api, _, _ = _api()
+    assert api.micro_batch == MicroBatchConfig(window=0.004, max_batch=20)
+    assert api._session.batcher is not None
+
+
+def test_streamed_and_foreign_requests_bypass_the_batcher():
+    api, _, _ = _api(micro_batch=0.2)
+    batcher = api._session.batcher
+
+    assert batcher.accepts({"url": f"{BASE}/api/now/table/incident", "params": {}})
+    assert not batcher.accepts({"url": f"{BASE}/api/now/table/x", "stream": True})
+    assert not batcher.accepts({"url": f"{BASE}/api/now/v1/batch"})
+    assert not batcher.accepts({"url": "https://elsewhere.example/api/now/table/x"})
+    assert (
+        _relative_url("/api/x?a=1", {"b": ["1", "2"], "c": None})
+        == "/api/x?a=1&b=1&b=2"
+    )
+
+
+@pytest.mark.asyncio
+async def test_async_record_reads_are_batched():
+    seen = []
+
+    def handler(request):
+        seen.append(request)
+        if request.method == "POST":
+            body = json.loads(request.content)
+            return httpx.Response(
+                200,
+                json={
+                    "serviced_requests": [
+                        _entry(r, 404 if r["url"].endswith("/gone") else 200)
+                        for r in body["rest_requests"]
+                    ]
+                },
+            )
+        return httpx.Response(200, json=_record(str(request.url)))
+
+    api = AsyncApi(
+        url=BASE,
+        username="admin",
+        password="pw",
+        micro_batch=0.05,
+        client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    async with api:
+        results = await asyncio.gather(
+            *(
+                api.get_table_record(table="incident", table_record_sys_id=s)
+                for s in ("a", "b", "c")
+            ),
+            api.get_table_record(table="incident", table_record_sys_id="gone"),
+            return_exceptions=True,
+        )
+        lone = await api.get_table_record(table="incident", table_record_sys_id="d")
+
+    assert [r.result.sys_id for r in results[:3]] == ["a", "b", "c"]
+    assert isinstance(results[3], httpx.HTTPStatusError)
+    assert [(r.method, r.url.path) for r in seen] == [
+        ("POST", "/api/now/v1/batch"),
+        ("GET", "/api/now/table/incident/d"),
+    ]
+    assert lone.result.sys_id == "d"
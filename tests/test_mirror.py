@@ -0,0 +1,212 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+from conftest import serve_encoded_query
+
+from servicenow_api.api_client import Api
+from servicenow_api.mirror import MirrorMiss, TableMirror, compile_query
+
+BASE = "https://dev12345.service-now.com"
+CALLERS = {"u1": "Abel Tuter", "u2": "Beth Anglin"}
+
+
+class FakeInstance:
+    """Table API double for the sync scans the mirror issues."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.calls = []
+
+    def get(self, url, params, **kwargs):
+        self.calls.append(params)
+        hits, _ = serve_encoded_query(self.rows, params)
+        if params.get("sysparm_display_value") == "all":
+            hits = [
+                {
+                    k: {
+                        "value": v,
+                        "display_value": CALLERS.get(v, v) if k == "caller_id" else v,
+                    }
+                    for k, v in r.items()
+                }
+                for r in hits
+            ]
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps({"result": hits}).encode()
+        return response
+
+
+def _row(i, **extra):
+    return {
+        "sys_id": f"{i:032x}",
+        "number": f"INC{i:07d}",
+        "sys_updated_on": f"2026-03-01 10:{i:02d}:00",
+        "state": str(i % 3 + 1),
+        "priority": str(i % 5 + 1),
+        "short_description": f"Email outage {i}" if i % 2 else f"VPN down {i}",
+        "caller_id": "u1" if i % 4 else "u2",
+        **extra,
+    }
+
+
+@pytest.fixture
+def world():
+    instance = FakeInstance([_row(i) for i in range(20)])
+    session = MagicMock()
+    session.get.side_effect = instance.get
+    with patch("requests.Session", return_value=session):
+        api = Api(url=BASE, username="admin", password="pw")
+    api._mirror = TableMirror(api, path=":memory:", max_age_seconds=3600)
+    return instance, api
+
+
+def _rows(instance, predicate):
+    return sorted(r["sys_id"] for r in instance.rows if predicate(r))
+
+
+def test_query_mirror_materialises_once_then_answers_offline(world):
+    instance, api = world
+
+    first = api.query_mirror(table="incident", sysparm_query="state=2")
+    calls = len(instance.calls)
+    second = api.query_mirror(
+        table="incident",
+        sysparm_query="state=2^ORpriority>=4^NQnumber=INC0000000",
+        sysparm_fields="number,priority",
+    )
+
+    assert first.from_mirror and second.from_mirror
+    assert all(c["sysparm_display_value"] == "all" for c in instance.calls)
+    assert len(instance.calls) == calls
+    assert sorted(r.sys_id for r in first.result) == _rows(
+        instance, lambda r: r["state"] == "2"
+    )
+    expected = {
+        r["number"]
+        for r in instance.rows
+        if r["state"] == "2" or int(r["priority"]) >= 4 or r["number"] == "INC0000000"
+    }
+    assert {r.number for r in second.result} == expected
+    assert set(second.result[0].model_dump()) == {"base_type", "number", "priority"}
+
+
+def test_operators_ordering_paging_and_display_values(world):
+    instance, api = world
+
+    rows = api.query_mirror(
+        table="incident",
+        sysparm_query="short_descriptionLIKEoutage^stateIN1,3^ORDERBYDESCnumber",
+        sysparm_fields="number,caller_id",
+        sysparm_display_value="true",
+        sysparm_limit=3,
+        sysparm_offset=1,
+    ).result
+
+    matching = sorted(
+        (
+            r
+            for r in instance.rows
+            if "outage" in r["short_description"] and r["state"] in ("1", "3")
+        ),
+        key=lambda r: r["number"],
+        reverse=True,
+    )
+    assert [r.number for r in rows] == [r["number"] for r in matching[1:4]]
+    assert {r.caller_id for r in rows} <= set(CALLERS.values())
+
+    both = api.query_mirror(
+        table="incident",
+        sysparm_query="numberSTARTSWITHINC000001^caller_idISNOTEMPTY",
+        sysparm_fields="caller_id",
+        sysparm_display_value="all",
+    ).result
+    assert len(both) == 10
+    assert both[0].caller_id["display_value"] in CALLERS.values()
+
+
+def test_display_value_accepts_bools_and_any_case(world):
+    _, api = world
+    labels = api.query_mirror(
+        table="incident",
+        sysparm_query="number=INC0000001",
+        sysparm_fields="caller_id",
+        sysparm_display_value=True,
+    ).result
+    assert labels[0].caller_id == CALLERS["u1"]
+
+    mirror = api._mirror
+    for display_value, expected in [
+        ("True", CALLERS["u1"]),
+        ("All", {"value": "u1", "display_value": CALLERS["u1"]}),
+        (False, "u1"),
+    ]:
+        [record] = mirror.query(
+            "incident",
+            query="number=INC0000001",
+            fields="caller_id",
+            display_value=display_value,
+        )
+        assert record["caller_id"] == expected
+
+
+def test_unsupported_requests_fall_back_to_the_instance(world):
+    instance, api = world
+    api.mirror_table(table="incident", fields=["number", "state"])
+    instance.calls.clear()
+
+    dot_walk = api.query_mirror(table="incident", sysparm_query="caller_id.name=Abel")
+    unmirrored = api.query_mirror(
+        table="incident", sysparm_query="priority=1", sysparm_fields="number"
+    )
+    unlisted = api.query_mirror(table="sc_task", sysparm_query="state=1")
+
+    assert not any(r.from_mirror for r in (dot_walk, unmirrored, unlisted))
+    assert [c.get("sysparm_query") for c in instance.calls] == [
+        "caller_id.name=Abel",
+        "priority=1",
+        "state=1",
+    ]
+
+
+def test_stale_tables_refresh_changes_and_deletes(world):
+    instance, api = world
+    mirror = api._mirror
+    api.mirror_table(table="incident")
+    mirror.max_age = 0
+    mirror.syncer.reconcile_seconds = 0
+    instance.rows[0] = _row(0, state="3", sys_updated_on="2026-03-01 11:00:00")
+    instance.rows.pop()
+
+    result = api.query_mirror(table="incident", sysparm_query="state=3")
+
+    assert result.from_mirror
+    assert _rows(instance, lambda r: r["state"] == "3") == sorted(
+        r.sys_id for r in result.result
+    )
+    assert len(mirror.query("incident")) == len(instance.rows)
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "caller_id.name=Abel",
+        "opened_atONToday@javascript:gs.beginningOfToday()",
+        "assigned_to=javascript:gs.getUserID()",
+        "sys_class_nameINSTANCEOFcmdb_ci_server",
+        "ORstate=1",
+        "GROUPBYstate",
+    ],
+)
+def test_compile_query_rejects_what_it_cannot_answer(query):
+    with pytest.raises(MirrorMiss):
+        compile_query(query)
+
+
+def test_compile_query_uses_indexed_columns():
+    compiled = compile_query("number=INC0000001^ORDERBYsys_updated_on")
+    assert compiled.where == "(COALESCE(number, '') = ? COLLATE NOCASE)"
+    assert compiled.order_by == ["sys_updated_on"]
+    assert compiled.fields == {"number", "sys_updated_on"}
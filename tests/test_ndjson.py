@@ -0,0 +1,152 @@
+import gzip
+import io
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+from agent_utilities.core.exceptions import ParameterError
+
+from servicenow_api.api_client import Api
+from servicenow_api.ndjson import NdjsonCheckpoint, export_ndjson
+from servicenow_api.pagination import TablePage
+
+BASE = "https://dev12345.service-now.com"
+ROWS = [{"sys_id": f"{i:032x}", "number": f"INC{i:07d}"} for i in range(95)]
+
+
+class FakeTable:
+    def __init__(self, fail_on_call=None):
+        self.calls = []
+        self.fail_on_call = fail_on_call
+
+    def __call__(self, params):
+        self.calls.append(params)
+        if len(self.calls) == self.fail_on_call:
+            raise requests.ConnectionError("connection reset")
+        query = params.get("sysparm_query", "")
+        after = query.split("sys_id>")[1].split("^")[0] if "sys_id>" in query else ""
+        rows = [r for r in ROWS if r["sys_id"] > after]
+        offset = int(params.get("sysparm_offset") or 0)
+        return TablePage(rows[offset : offset + int(params["sysparm_limit"])], None)
+
+
+def _read(path, compression=None):
+    data = path.read_bytes()
+    if compression == "gzip":
+        data = gzip.decompress(data)
+    elif compression == "zstd":
+        zstandard = pytest.importorskip("zstandard")
+        reader = zstandard.ZstdDecompressor().stream_reader(
+            io.BytesIO(data), read_across_frames=True
+        )
+        data = reader.read()
+    return [json.loads(line) for line in data.decode().splitlines()]
+
+
+@pytest.mark.parametrize("compression", [None, "gzip", "zstd"])
+def test_export_writes_every_record_once(tmp_path, compression):
+    if compression == "zstd":
+        pytest.importorskip("zstandard")
+    path = tmp_path / "incident.ndjson"
+
+    result = export_ndjson(
+        FakeTable(), "incident", {}, path, compression=compression, page_size=20
+    )
+
+    assert _read(path, compression) == ROWS
+    # Five pages of records plus the empty page that ends an uncounted walk.
+    assert (result.records, result.pages, result.resumed) == (95, 6, False)
+    assert result.bytes == path.stat().st_size
+
+
+def test_interrupted_export_resumes_after_last_checkpoint(tmp_path):
+    path = tmp_path / "incident.ndjson.gz"
+    checkpoint = tmp_path / "incident.ckpt.json"
+    with pytest.raises(requests.ConnectionError):
+        export_ndjson(
+            FakeTable(fail_on_call=3),
+            "incident",
+            {},
+            path,
+            compression="gzip",
+            page_size=20,
+            checkpoint_path=checkpoint,
+        )
+    saved = NdjsonCheckpoint.load(checkpoint)
+    assert (saved.records, saved.cursor) == (40, ROWS[39]["sys_id"])
+    # A frame torn by the crash must not survive into the resumed file.
+    with open(path, "ab") as f:
+        f.write(b"\x1f\x8b torn frame")
+
+    fake = FakeTable()
+    result = export_ndjson(
+        fake,
+        "incident",
+        {},
+        path,
+        compression="gzip",
+        page_size=20,
+        checkpoint_path=checkpoint,
+    )
+
+    assert result.resumed and result.records == 95
+    assert _read(path, "gzip") == ROWS
+    assert f"sys_id>{ROWS[39]['sys_id']}" in fake.calls[0]["sysparm_query"]
+    assert not checkpoint.exists()
+
+
+def test_offset_walk_resumes_from_saved_offset(tmp_path):
+    path = tmp_path / "incident.ndjson"
+    checkpoint = tmp_path / "ckpt.json"
+    kwargs = dict(pagination="offset", page_size=30, checkpoint_path=checkpoint)
+    with pytest.raises(requests.ConnectionError):
+        export_ndjson(FakeTable(fail_on_call=2), "incident", {}, path, **kwargs)
+
+    fake = FakeTable()
+    export_ndjson(fake, "incident", {}, path, **kwargs)
+
+    assert fake.calls[0]["sysparm_offset"] == 30
+    assert _read(path) == ROWS
+
+
+def test_checkpoint_for_another_export_is_rejected(tmp_path):
+    path = tmp_path / "out.ndjson"
+    path.write_bytes(b"")
+    checkpoint = tmp_path / "ckpt.json"
+    NdjsonCheckpoint(table="incident", params={"sysparm_query": "active=true"}).save(
+        checkpoint
+    )
+
+    with pytest.raises(ParameterError):
+        export_ndjson(FakeTable(), "incident", {}, path, checkpoint_path=checkpoint)
+
+
+def test_api_export_table_ndjson_honours_limit_and_fields(tmp_path):
+    fake = FakeTable()
+
+    def get(url, params, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps({"result": fake(params).records}).encode()
+        return response
+
+    session = MagicMock()
+    session.get.side_effect = get
+    with patch("requests.Session", return_value=session):
+        api = Api(url=BASE, username="admin", password="pw")
+    path = tmp_path / "incident.ndjson.gz"
+
+    result = api.export_table_ndjson(
+        table="incident",
+        path=str(path),
+        fields=["number"],
+        compression="gzip",
+        page_size=25,
+        sysparm_limit=60,
+    )
+
+    assert result.records == 60
+    assert _read(path, "gzip") == ROWS[:60]
+    assert fake.calls[0]["sysparm_fields"] == "number,sys_id"
+    assert not (tmp_path / "incident.ndjson.gz.checkpoint.json").exists()
@@ -0,0 +1,423 @@
+import json
+import threading
+from unittest.mock import MagicMock, patch
+from urllib.parse import parse_qs
+
+import httpx
+import pytest
+import requests
+from agent_utilities.core.exceptions import ParameterError
+from conftest import serve_encoded_query
+
+from servicenow_api.api_client import Api
+from servicenow_api.async_client import AsyncApi
+from servicenow_api.pagination import (
+    OffsetPagination,
+    PaginationProgress,
+    TableIterator,
+    TablePage,
+)
+from servicenow_api.servicenow_models import Table
+
+BASE = "https://dev12345.service-now.com"
+ROWS = [{"sys_id": f"{i:032x}", "number": f"INC{i:07d}"} for i in range(25)]
+
+
+def _page(params, rows=ROWS):
+    offset = int(params.get("sysparm_offset", 0))
+    limit = int(params["sysparm_limit"])
+    counted = str(params.get("sysparm_no_count", "false")).lower() != "true"
+    return rows[offset : offset + limit], (len(rows) if counted else None)
+
+
+def _requests_response(records, total):
+    response = requests.Response()
+    response.status_code = 200
+    response._content = json.dumps({"result": records}).encode()
+    if total is not None:
+        response.headers["X-Total-Count"] = str(total)
+    return response
+
+
+def _api(session):
+    with patch("requests.Session", return_value=session):
+        return Api(url=BASE, username="admin", password="pw")
+
+
+def _table_session():
+    session = MagicMock()
+    session.get.side_effect = lambda url, params, **kw: _requests_response(
+        *_page(params)
+    )
+    return session
+
+
+def test_iter_table_walks_every_page_lazily():
+    session = _table_session()
+    api = _api(session)
+    progress = []
+
+    rows = api.iter_table(
+        table="incident",
+        query="active=true",
+        fields=["sys_id", "number"],
+        page_size=10,
+        on_progress=lambda p: progress.append((p.fetched, p.total)),
+    )
+    first = next(rows)
+
+    assert isinstance(first, Table)
+    assert first.number == "INC0000000"
+    # First page consumed, second page already prefetched; nothing further.
+    rows._pending.result()
+    assert session.get.call_count == 2
+
+    rest = list(rows)
+    assert [r.sys_id for r in [first, *rest]] == [r["sys_id"] for r in ROWS]
+    assert session.get.call_count == 3  # total known: no trailing empty request
+    assert progress == [(10, 25), (20, 25), (25, 25)]
+    assert rows.total == 25
+
+    calls = [c.kwargs["params"] for c in session.get.call_args_list]
+    assert [c["sysparm_offset"] for c in calls] == [0, 10, 20]
+    assert calls[0]["sysparm_query"] == "active=true"
+    assert calls[0]["sysparm_fields"] == "sys_id,number"
+    assert "sysparm_no_count" not in calls[0]
+    assert all(c["sysparm_no_count"] == "true" for c in calls[1:])
+
+
+def test_iter_table_offset_and_limit_bound_the_walk():
+    session = _table_session()
+    api = _api(session)
+
+    rows = list(
+        api.iter_table(table="incident", page_size=4, sysparm_offset=3, sysparm_limit=6)
+    )
+
+    assert [r.sys_id for r in rows] == [r["sys_id"] for r in ROWS[3:9]]
+    limits = [c.kwargs["params"]["sysparm_limit"] for c in session.get.call_args_list]
+    assert limits == [4, 2]
+
+
+def test_iter_table_from_an_offset_stops_at_the_total():
+    session = _table_session()
+    api = _api(session)
+
+    rows = list(api.iter_table(table="incident", page_size=10, sysparm_offset=5))
+
+    assert [r.sys_id for r in rows] == [r["sys_id"] for r in ROWS[5:]]
+    offsets = [c.kwargs["params"]["sysparm_offset"] for c in session.get.call_args_list]
+    assert offsets == [5, 15]
+
+
+def test_iter_table_without_count_stops_on_empty_page():
+    pages = [TablePage([{"a": 1}, {"a": 2}]), TablePage([{"a": 3}]), TablePage([])]
+    fetch = MagicMock(side_effect=pages)
+
+    assert list(TableIterator(fetch, {}, page_size=2, prefetch=False)) == [
+        {"a": 1},
+        {"a": 2},
+        {"a": 3},
+    ]
+    assert fetch.call_count == 3
+
+
+def test_prefetch_overlaps_consumption():
+    release = threading.Event()
+    started = threading.Event()
+
+    def fetch(params):
+        if params["sysparm_offset"]:
+            started.set()
+            release.wait(5)
+            return TablePage([])
+        return TablePage([{"a": 1}], total=None)
+
+    rows = TableIterator(fetch, {}, page_size=1)
+    assert next(rows) == {"a": 1}
+    assert started.wait(5)  # second request issued before the caller asked for it
+    release.set()
+    assert list(rows) == []
+
+
+def test_fetch_errors_surface_to_the_consumer():
+    def fetch(params):
+        if params["sysparm_offset"]:
+            raise requests.HTTPError("boom")
+        return TablePage([{"a": 1}], total=5)
+
+    rows = TableIterator(fetch, {}, page_size=1)
+    assert next(rows) == {"a": 1}
+    with pytest.raises(requests.HTTPError):
+        next(rows)
+
+
+def test_close_releases_prefetch_thread():
+    fetch = MagicMock(return_value=TablePage([{"a": 1}], total=100))
+    with TableIterator(fetch, {}, page_size=1) as rows:
+        next(rows)
+    assert rows._executor is None
+    with pytest.raises(StopIteration):
+        next(rows)
+
+
+def test_offset_strategy_and_progress_fraction():
+    # X-Total-Count counts every matching row, including those before ``start``.
+    progress = PaginationProgress(total=6, fetched=2)
+    strategy = OffsetPagination(start=2)
+    params = strategy.first({"sysparm_query": "x"}, 2)
+    assert params == {"sysparm_query": "x", "sysparm_limit": 2, "sysparm_offset": 2}
+    assert strategy.next(params, TablePage([{}, {}]), progress)["sysparm_offset"] == 4
+    assert (
+        strategy.next({**params, "sysparm_offset": 4}, TablePage([{}, {}]), progress)
+        is None
+    )
+    assert PaginationProgress(total=4, fetched=2).fraction == 0.5
+    assert PaginationProgress().fraction is None
+
+
+@pytest.mark.asyncio
+async def test_async_iter_table():
+    seen = []
+
+    def handler(request):
+        params = {k: v[0] for k, v in parse_qs(request.url.query.decode()).items()}
+        seen.append(params)
+        records, total = _page(params)
+        headers = {"X-Total-Count": str(total)} if total is not None else {}
+        return httpx.Response(200, json={"result": records}, headers=headers)
+
+    api = AsyncApi(
+        url=BASE,
+        username="admin",
+        password="pw",
+        client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    async with api:
+        rows = api.iter_table(table="incident", page_size=10)
+        got = [r.sys_id async for r in rows]
+
+    assert got == [r["sys_id"] for r in ROWS]
+    assert [p["sysparm_offset"] for p in seen] == ["0", "10", "20"]
+    assert rows.progress.fetched == 25
+
+
+# -- keyset pagination ------------------------------------------------------------
+
+
+KEYED = [
+    {
+        "sys_id": f"{(i * 7919) % 97:032x}",
+        "sys_updated_on": f"2026-01-01 00:00:{i // 3:02d}",
+        "active": "true" if i % 4 else "false",
+    }
+    for i in range(30)
+]
+
+
+def _keyset_session(rows):
+    session = MagicMock()
+    session.get.side_effect = lambda url, params, **kw: _requests_response(
+        *serve_encoded_query(rows, params)
+    )
+    return session
+
+
+def test_iter_table_keyset_orders_by_sys_id_without_offsets():
+    session = _keyset_session(KEYED)
+    api = _api(session)
+
+    got = [
+        r.sys_id
+        for r in api.iter_table(table="cmdb_ci", pagination="keyset", page_size=7)
+    ]
+
+    assert got == sorted(r["sys_id"] for r in KEYED)
+    queries = [c.kwargs["params"] for c in session.get.call_args_list]
+    assert all("sysparm_offset" not in q for q in queries)
+    assert queries[0]["sysparm_query"] == "ORDERBYsys_id"
+    assert queries[1]["sysparm_query"] == f"sys_id>{got[6]}^ORDERBYsys_id"
+
+
+def test_keyset_is_stable_when_rows_vanish_mid_walk():
+    rows = [dict(r) for r in KEYED]
+    for mode, expected_missing in (("offset", True), ("keyset", False)):
+        live = list(rows)
+        session = MagicMock()
+
+        def get(url, params, live=live, **kw):
+            records, total = serve_encoded_query(
+                live,
+                {
+                    **params,
+                    "sysparm_query": params.get("sysparm_query") or "ORDERBYsys_id",
+                },
+            )
+            return _requests_response(records, total)
+
+        session.get.side_effect = get
+        api = _api(session)
+        seen = []
+        for record in api.iter_table(
+            table="cmdb_ci", pagination=mode, page_size=5, prefetch=False
+        ):
+            seen.append(record.sys_id)
+            if len(seen) == 5:
+                live.remove(next(r for r in live if r["sys_id"] == seen[0]))
+        survivors = sorted(r["sys_id"] for r in live)
+        assert (set(survivors) - set(seen) != set()) is expected_missing
+
+
+def test_keyset_stops_when_instance_ignores_the_cursor():
+    session = MagicMock()
+    session.get.side_effect = lambda url, params, **kw: _requests_response(
+        ROWS[:5], None
+    )
+    api = _api(session)
+
+    with pytest.raises(ParameterError, match="did not advance"):
+        list(api.iter_table(table="cmdb_ci", pagination="keyset", page_size=5))
+    assert session.get.call_count == 2
+
+
+def test_iter_table_keyset_updated_breaks_timestamp_ties():
+    session = _keyset_session(KEYED)
+    api = _api(session)
+
+    rows = api.iter_table(
+        table="sys_audit",
+        query="active=true",
+        fields="sys_id",
+        pagination="keyset_updated",
+        page_size=4,
+    )
+    got = [(r.sys_updated_on, r.sys_id) for r in rows]
+
+    active = sorted(
+        (r["sys_updated_on"], r["sys_id"]) for r in KEYED if r["active"] == "true"
+    )
+    assert got == active
+    second = session.get.call_args_list[1].kwargs["params"]
+    ts, sid = got[3]
+    assert second["sysparm_query"] == (
+        f"active=true^sys_updated_on>{ts}^NQactive=true^sys_updated_on={ts}"
+        f"^sys_id>{sid}^ORDERBYsys_updated_on^ORDERBYsys_id"
+    )
+    assert second["sysparm_fields"] == "sys_id,sys_updated_on"
+    assert rows.cursor == f"{got[-1][0]},{got[-1][1]}"
+
+
+def test_iter_table_resumes_from_cursor():
+    session = _keyset_session(KEYED)
+    api = _api(session)
+    ordered = sorted(r["sys_id"] for r in KEYED)
+
+    first = api.iter_table(table="cmdb_ci", pagination="keyset", page_size=10)
+    head = [next(first).sys_id for _ in range(12)]
+    first.close()
+    rest = [
+        r.sys_id
+        for r in api.iter_table(
+            table="cmdb_ci", pagination="keyset", cursor=first.cursor, page_size=10
+        )
+    ]
+
+    assert head + rest == ordered
+
+
+def test_get_table_keyset_returns_next_cursor():
+    session = _keyset_session(KEYED)
+    api = _api(session)
+    ordered = sorted(r["sys_id"] for r in KEYED)
+
+    page = api.get_table(table="cmdb_ci", pagination="keyset", sysparm_limit=20)
+    assert [r.sys_id for r in page.result] == ordered[:20]
+    assert page.next_cursor == ordered[19]
+
+    last = api.get_table(
+        table="cmdb_ci", pagination="keyset", cursor=page.next_cursor, sysparm_limit=20
+    )
+    assert [r.sys_id for r in last.result] == ordered[20:]
+    assert last.next_cursor is None
+
+
+def test_get_incidents_keyset_replaces_next_offset():
+    session = _keyset_session(KEYED)
+    api = _api(session)
+
+    page = api.get_incidents(pagination="keyset", sysparm_limit=10)
+
+    assert page.truncated is True
+    assert page.next_offset is None
+    assert page.next_cursor == sorted(r["sys_id"] for r in KEYED)[9]
+
+
+def test_get_change_requests_keyset_loop():
+    session = _keyset_session(KEYED)
+    api = _api(session)
+
+    resp = api.get_change_requests(pagination="keyset", sysparm_limit=8)
+
+    assert [r.sys_id for r in resp.result] == sorted(r["sys_id"] for r in KEYED)
+    assert session.get.call_count == 4
+    assert all(
+        "sysparm_offset" not in c.kwargs["params"] for c in session.get.call_args_list
+    )
+    assert resp.next_cursor is None
+
+
+def test_get_change_requests_keyset_stops_when_cursor_does_not_advance():
+    session = MagicMock()
+    session.get.side_effect = lambda url, params, **kw: _requests_response(
+        ROWS[:5], None
+    )
+    api = _api(session)
+
+    with pytest.raises(ParameterError, match="did not advance"):
+        api.get_change_requests(pagination="keyset", sysparm_limit=5)
+    assert session.get.call_count == 2
+
+
+@pytest.mark.parametrize(
+    "kwargs",
+    [
+        {"pagination": "keyset", "sysparm_query": "active=true^ORDERBYnumber"},
+        {"pagination": "keyset", "sysparm_offset": 10},
+        {"pagination": "keyset_updated", "sysparm_display_value": "true"},
+        {"pagination": "seek"},
+        {"cursor": "abc"},
+    ],
+)
+def test_invalid_keyset_arguments_are_rejected(kwargs):
+    api = _api(_keyset_session(KEYED))
+    with pytest.raises(ParameterError):
+        api.get_table(table="cmdb_ci", **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_async_get_table_keyset():
+    def handler(request):
+        params = {k: v[0] for k, v in parse_qs(request.url.query.decode()).items()}
+        records, total = serve_encoded_query(KEYED, params)
+        return httpx.Response(
+            200, json={"result": records}, headers={"X-Total-Count": str(total)}
+        )
+
+    api = AsyncApi(
+        url=BASE,
+        username="admin",
+        password="pw",
+        client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    async with api:
+        page = await api.get_table(
+            table="cmdb_ci", pagination="keyset", sysparm_limit=25
+        )
+        rest = [
+            r.sys_id
+            async for r in api.iter_table(
+                table="cmdb_ci", pagination="keyset", cursor=page.next_cursor
+            )
+        ]
+
+    assert [r.sys_id for r in page.result] + rest == sorted(r["sys_id"] for r in KEYED)
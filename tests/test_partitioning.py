@@ -0,0 +1,197 @@
+import json
+import random
+import threading
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+from agent_utilities.core.exceptions import ParameterError
+from conftest import serve_encoded_query
+
+from servicenow_api.api_client import Api
+from servicenow_api.pagination import TablePage
+from servicenow_api.partitioning import (
+    ExportState,
+    PartitionedExport,
+    PartitionExportError,
+    and_condition,
+    plan_offset_partitions,
+    plan_sys_id_partitions,
+)
+from servicenow_api.transport import TransportConfig
+
+BASE = "https://dev12345.service-now.com"
+_rng = random.Random(7)
+ROWS = [
+    {"sys_id": f"{_rng.getrandbits(128):032x}", "active": str(i % 3 != 0).lower()}
+    for i in range(240)
+]
+
+
+class FakeTable:
+    """Thread-safe fake Table API evaluating the encoded queries the export emits."""
+
+    def __init__(self, rows, fail=None):
+        self.rows = rows
+        self.fail = fail
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def __call__(self, params):
+        with self.lock:
+            self.calls.append(params)
+        if self.fail is not None:
+            self.fail(params)
+        return TablePage(*serve_encoded_query(self.rows, params))
+
+
+def test_plans_cover_the_key_space():
+    parts = plan_sys_id_partitions(3)
+    assert [(p.low, p.high) for p in parts] == [
+        (None, "5555"),
+        ("5555", "aaaa"),
+        ("aaaa", None),
+    ]
+    windows = plan_offset_partitions(10, 4)
+    assert [(w.start, w.stop) for w in windows] == [(0, 2), (2, 5), (5, 7), (7, 10)]
+    assert len(plan_offset_partitions(2, 8)) == 2
+    assert and_condition("a=1^NQb=2", "sys_id<8") == "a=1^sys_id<8^NQb=2^sys_id<8"
+
+
+def test_sys_id_partitions_are_disjoint_and_complete():
+    fake = FakeTable(ROWS)
+    export = PartitionedExport(fake, "task", {}, workers=4, page_size=25)
+
+    got = [r["sys_id"] for r in export]
+
+    assert sorted(got) == sorted(r["sys_id"] for r in ROWS)
+    assert len(got) == len(set(got))
+    assert export.state.complete
+    assert export.progress.fetched == len(ROWS)
+    assert all("sysparm_offset" not in c for c in fake.calls)
+    assert all(c["sysparm_no_count"] == "true" for c in fake.calls)
+    assert any("sys_id>=4000^sys_id<8000" in c["sysparm_query"] for c in fake.calls)
+
+
+def test_ordered_merge_yields_sys_id_order_with_more_partitions_than_workers():
+    fake = FakeTable(ROWS)
+    export = PartitionedExport(
+        fake,
+        "task",
+        {"sysparm_query": "active=true"},
+        workers=2,
+        partitions=8,
+        ordered=True,
+        page_size=5,
+    )
+
+    got = [r["sys_id"] for r in export]
+
+    assert got == sorted(r["sys_id"] for r in ROWS if r["active"] == "true")
+
+
+def test_offset_windows_sized_from_total_count():
+    fake = FakeTable(ROWS)
+    export = PartitionedExport(
+        fake, "task", {}, workers=3, partitioning="offset", page_size=30
+    )
+
+    got = [r["sys_id"] for r in export]
+
+    assert sorted(got) == sorted(r["sys_id"] for r in ROWS)
+    assert len(got) == len(set(got))
+    assert export.state.total == len(ROWS)
+    probe, *pages = fake.calls
+    assert probe["sysparm_limit"] == 1 and "sysparm_no_count" not in probe
+    assert all(p["sysparm_query"] == "ORDERBYsys_id" for p in pages)
+    assert max(p["sysparm_offset"] + p["sysparm_limit"] for p in pages) == len(ROWS)
+
+
+def test_failed_partition_resumes_from_checkpoint(tmp_path):
+    state_path = tmp_path / "task.export.json"
+
+    def flaky(params):
+        # Partition 2 fails on its second page (once a cursor is in the query).
+        query = params.get("sysparm_query", "")
+        if "sys_id>=8000" in query and "sys_id>8" in query:
+            raise requests.ConnectionError("node restarted")
+
+    export = PartitionedExport(
+        FakeTable(ROWS, fail=flaky),
+        "task",
+        {},
+        workers=4,
+        page_size=10,
+        state_path=state_path,
+    )
+    first = []
+    with pytest.raises(PartitionExportError) as err:
+        for record in export:
+            first.append(record["sys_id"])
+
+    assert [p.index for p in err.value.failed] == [2]
+    saved = ExportState.load(state_path)
+    assert [p.done for p in saved.partitions] == [True, True, False, True]
+    assert saved.partitions[2].cursor is not None
+    assert saved.fetched == len(first)
+
+    fake = FakeTable(ROWS)
+    resumed = PartitionedExport(
+        fake, "task", {}, workers=4, page_size=10, state_path=state_path
+    )
+    second = [r["sys_id"] for r in resumed]
+
+    assert sorted(first + second) == sorted(r["sys_id"] for r in ROWS)
+    assert len(first) + len(second) == len(ROWS)
+    assert all("sys_id>=8000" in c["sysparm_query"] for c in fake.calls)
+    assert ExportState.load(state_path).complete
+
+
+def test_checkpoint_for_another_export_is_rejected(tmp_path):
+    state_path = tmp_path / "state.json"
+    ExportState(table="incident").save(state_path)
+    with pytest.raises(ParameterError):
+        PartitionedExport(FakeTable(ROWS), "task", {}, state_path=state_path)
+
+
+def test_closing_the_stream_stops_workers():
+    fake = FakeTable(ROWS)
+    export = PartitionedExport(fake, "task", {}, workers=4, page_size=5)
+    stream = iter(export)
+    next(stream)
+    stream.close()
+
+    assert export._stop.is_set()
+    assert len(fake.calls) < len(ROWS) // 5
+
+
+def test_api_export_table_uses_shared_session_and_caps_workers():
+    def get(url, params, **kwargs):
+        page = FakeTable(ROWS)(params)
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps({"result": page.records}).encode()
+        return response
+
+    session = MagicMock()
+    session.get.side_effect = get
+    with patch("requests.Session", return_value=session):
+        api = Api(
+            url=BASE,
+            username="admin",
+            password="pw",
+            transport=TransportConfig(pool_maxsize=2),
+        )
+
+    export = api.export_table(
+        table="task", fields=["number"], workers=16, ordered=True, page_size=50
+    )
+    got = [r.sys_id for r in export]
+
+    assert export.workers == 2
+    assert got == sorted(r["sys_id"] for r in ROWS)
+    urls = {c.kwargs["url"] for c in session.get.call_args_list}
+    assert urls == {f"{BASE}/api/now/table/task"}
+    assert session.get.call_args_list[0].kwargs["params"]["sysparm_fields"] == (
+        "number,sys_id"
+    )
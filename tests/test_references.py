@@ -0,0 +1,180 @@
+import json
+import threading
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from servicenow_api.api_client import Api
+from servicenow_api.references import LruTtlCache, ReferenceResolver, reference_target
+
+BASE = "https://dev12345.service-now.com"
+USERS = {f"u{i:031x}": f"User {i}" for i in range(20)}
+GROUPS = {f"g{i:031x}": f"Group {i}" for i in range(3)}
+TABLES = {"sys_user": USERS, "sys_user_group": GROUPS}
+
+
+def _ref(table, sys_id):
+    return {"link": f"{BASE}/api/now/table/{table}/{sys_id}", "value": sys_id}
+
+
+def _incidents(count):
+    users, groups = list(USERS), list(GROUPS)
+    return [
+        {
+            "sys_id": f"{i:032x}",
+            "number": f"INC{i:07d}",
+            "assigned_to": _ref("sys_user", users[i % len(users)]),
+            "assignment_group": _ref("sys_user_group", groups[i % len(groups)]),
+            "caller_id": "",
+        }
+        for i in range(count)
+    ]
+
+
+def _api(incidents=()):
+    calls = []
+    lock = threading.Lock()
+
+    def get(url, params, **_):
+        table = url.rsplit("/", 1)[1]
+        with lock:
+            calls.append((table, dict(params)))
+        if table == "incident":
+            rows = json.loads(json.dumps(list(incidents)))
+        elif table == "sys_dictionary":
+            rows = (
+                [{"element": "u_label"}]
+                if "name=u_widget" in params["sysparm_query"]
+                else []
+            )
+        elif table == "sys_db_object":
+            rows = [{"super_class.name": ""}]
+        else:
+            ids = params["sysparm_query"].split("sys_idIN")[1].split(",")
+            field = params["sysparm_fields"].split(",")[-1]
+            rows = [
+                {"sys_id": i, field: TABLES[table][i]}
+                for i in ids
+                if i in TABLES.get(table, {})
+            ]
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps({"result": rows}).encode()
+        return response
+
+    session = MagicMock()
+    session.get.side_effect = get
+    with patch("requests.Session", return_value=session):
+        api = Api(url=BASE, username="admin", password="pw")
+    return api, calls
+
+
+def test_lru_ttl_cache_evicts_and_expires():
+    now = [0.0]
+    cache = LruTtlCache(max_entries=2, ttl=10, clock=lambda: now[0])
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+    cache.set("c", 3)
+
+    assert (cache.get("b"), cache.get("a"), cache.get("c")) == (None, 1, 3)
+    now[0] = 11
+    assert cache.get("a", "gone") == "gone" and len(cache) == 1
+    assert (cache.hits, cache.misses) == (3, 2)
+
+
+def test_reference_target_parses_links():
+    assert reference_target(_ref("sys_user", "abc")) == ("sys_user", "abc")
+    assert reference_target({"value": "abc"}) is None
+    assert reference_target("abc") is None
+
+
+def test_page_references_are_resolved_with_one_query_per_table():
+    api, calls = _api()
+    rows = _incidents(50)
+
+    api.resolve_references(rows)
+
+    lookups = [(t, p) for t, p in calls if t != "incident"]
+    assert sorted(t for t, _ in lookups) == ["sys_user", "sys_user_group"]
+    assert all(p["sysparm_display_value"] == "true" for _, p in lookups)
+    assert rows[21]["assigned_to"]["display_value"] == "User 1"
+    assert rows[4]["assignment_group"]["display_value"] == "Group 1"
+    assert rows[0]["caller_id"] == ""
+
+
+def test_later_pages_are_answered_from_the_cache():
+    api, calls = _api(_incidents(40))
+
+    first = api.get_incidents(sysparm_limit=40, resolve_references=True)
+    second = api.get_incidents(
+        sysparm_limit=40, resolve_references=True, result_mode="dicts"
+    )
+
+    assert [t for t, _ in calls].count("sys_user") == 1
+    assert first.result[3].assigned_to.display_value == "User 3"
+    assert second.result[3]["assigned_to"]["display_value"] == "User 3"
+    assert "resolve_references" not in calls[0][1]
+    stats = api._get_reference_resolver().stats["sys_user"]
+    assert stats["misses"] == 20 and stats["hits"] == 20
+
+
+def test_only_requested_fields_are_resolved_and_missing_ids_are_cached():
+    api, calls = _api()
+    rows = _incidents(3)
+    rows[0]["assigned_to"] = _ref("sys_user", "deleted")
+
+    api.resolve_references(rows, fields="assigned_to")
+    api.resolve_references(rows, fields="assigned_to")
+
+    assert [t for t, _ in calls] == ["sys_user"]
+    assert "display_value" not in rows[0]["assigned_to"]
+    assert rows[1]["assigned_to"]["display_value"] == "User 1"
+    assert "display_value" not in rows[0]["assignment_group"]
+
+
+def test_existing_display_values_seed_the_cache():
+    api, calls = _api()
+    seen = {**_ref("sys_user", list(USERS)[5]), "display_value": "Known"}
+    rows = [{"assigned_to": seen}, {"assigned_to": _ref("sys_user", list(USERS)[5])}]
+
+    api.resolve_references(rows)
+
+    assert calls == [] and rows[1]["assigned_to"]["display_value"] == "Known"
+
+
+def test_display_field_comes_from_the_dictionary():
+    api, calls = _api()
+    resolver = ReferenceResolver(api, display_fields={"u_gadget": "u_code"})
+
+    assert resolver.display_field("u_widget") == "u_label"
+    assert resolver.display_field("u_widget") == "u_label"
+    assert resolver.display_field("u_other") == "name"
+    assert resolver.display_field("u_gadget") == "u_code"
+    assert [t for t, _ in calls].count("sys_dictionary") == 2
+
+
+def test_concurrent_callers_share_one_resolver():
+    api, _ = _api()
+    barrier = threading.Barrier(8)
+    built = []
+
+    class SlowResolver(ReferenceResolver):
+        def __init__(self, *args, **kwargs):
+            built.append(self)
+            threading.Event().wait(0.01)
+            super().__init__(*args, **kwargs)
+
+    def resolve():
+        barrier.wait()
+        return api._get_reference_resolver()
+
+    with patch("servicenow_api.api.api_client_system.ReferenceResolver", SlowResolver):
+        threads = [threading.Thread(target=resolve) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert len(built) == 1
+    assert api._get_reference_resolver() is built[0]
@@ -0,0 +1,149 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import httpx
+import pytest
+import requests
+from agent_utilities.core.exceptions import ParameterError
+
+from servicenow_api.api_client import Api
+from servicenow_api.async_client import AsyncApi
+from servicenow_api.results import LazyRecords
+from servicenow_api.servicenow_models import (
+    ChangeRequest,
+    Incident,
+    ReferenceField,
+    Response,
+    Table,
+)
+
+BASE = "https://dev12345.service-now.com"
+ROWS = [
+    {
+        "sys_id": f"{i:032x}",
+        "number": f"INC{i:07d}",
+        "caller_id": {"link": f"{BASE}/api/now/table/sys_user/{i}", "value": str(i)},
+    }
+    for i in range(6)
+]
+
+
+def _api(pages, **kwargs):
+    """Api whose session answers successive GETs with ``pages``."""
+    seen = []
+
+    def get(url, params, **_):
+        seen.append(params)
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps({"result": pages[len(seen) - 1]}).encode()
+        return response
+
+    session = MagicMock()
+    session.get.side_effect = get
+    with patch("requests.Session", return_value=session):
+        api = Api(url=BASE, username="admin", password="pw", **kwargs)
+    return api, seen
+
+
+def test_models_mode_is_the_default():
+    api, _ = _api([ROWS])
+
+    resp = api.get_incidents(sysparm_limit=6)
+
+    assert all(isinstance(r, Incident) for r in resp.result)
+    assert isinstance(resp.result[0].caller_id, ReferenceField)
+
+
+def test_dicts_mode_returns_rows_without_validating():
+    api, seen = _api([ROWS])
+
+    with patch.object(
+        Table, "model_validate", side_effect=AssertionError("no per-row models")
+    ):
+        resp = api.get_table(table="incident", sysparm_limit=6, result_mode="dicts")
+
+    assert resp.result == ROWS
+    assert "result_mode" not in seen[0]
+
+
+def test_lazy_mode_validates_rows_on_access_only():
+    api, _ = _api([ROWS], result_mode="lazy")
+
+    resp = api.get_incidents(sysparm_limit=6)
+
+    assert isinstance(resp.result, LazyRecords) and len(resp.result) == 6
+    assert resp.result.validated == 0
+    assert resp.result[1].number == "INC0000001"
+    assert [r.number for r in resp.result[:3]][2] == "INC0000002"
+    assert resp.result.validated == 3
+    assert resp.result[1] is resp.result[1]
+    # Untouched rows serialize as the JSON they arrived as.
+    dumped = resp.model_dump(mode="json")["result"]
+    assert dumped[5] == ROWS[5]
+    assert dumped[1]["caller_id"]["value"] == "1"
+
+
+def test_lazy_records_json_encode_through_the_response_unvalidated():
+    api, _ = _api([ROWS], result_mode="lazy")
+
+    resp = api.get_incidents(sysparm_limit=6)
+    encoded = json.loads(resp.model_dump_json())
+
+    assert encoded["result"] == ROWS
+    assert json.loads(json.dumps(resp.model_dump(mode="json")))["result"] == ROWS
+    assert resp.result.validated == 0
+
+
+def test_call_overrides_client_mode_across_change_request_pages():
+    pages = [ROWS[:3], ROWS[3:], []]
+    api, seen = _api(pages, result_mode="dicts")
+
+    resp = api.get_change_requests(
+        sysparm_limit=3, pagination="keyset", result_mode="lazy"
+    )
+
+    assert len(seen) == 3
+    assert isinstance(resp.result, LazyRecords) and len(resp.result) == 6
+    assert all(isinstance(r, ChangeRequest) for r in resp.result)
+
+
+def test_unknown_result_mode_is_rejected():
+    api, _ = _api([ROWS])
+
+    with pytest.raises(ParameterError):
+        api.get_problems(result_mode="raw")
+    with pytest.raises(ParameterError):
+        _api([ROWS], result_mode="raw")
+
+
+def test_client_default_comes_from_settings(monkeypatch):
+    monkeypatch.setenv("SERVICENOW_RESULT_MODE", "dicts")
+
+    api, _ = _api([ROWS])
+
+    assert api.result_mode == "dicts"
+    assert api.get_knowledge_articles().result == ROWS
+
+
+@pytest.mark.asyncio
+async def test_async_client_honours_result_mode():
+    def handler(request):
+        return httpx.Response(200, json={"result": ROWS})
+
+    api = AsyncApi(
+        url=BASE,
+        username="admin",
+        password="pw",
+        result_mode="dicts",
+        client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    async with api:
+        raw = await api.get_incidents(sysparm_limit=6)
+        lazy = await api.get_problems(result_mode="lazy")
+        models = await api.get_table(table="incident", result_mode="models")
+
+    assert raw.result == ROWS
+    assert isinstance(lazy.result, LazyRecords) and lazy.result.validated == 0
+    assert all(isinstance(r, Table) for r in models.result)
+    assert isinstance(Response(result=lazy.result).result, LazyRecords)
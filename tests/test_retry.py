@@ -0,0 +1,207 @@
+from unittest.mock import MagicMock
+
+import httpx
+import pytest
+import requests
+
+from servicenow_api.async_client import AsyncApi
+from servicenow_api.retry import (
+    IDEMPOTENCY_HEADER,
+    RateLimiter,
+    RetryBudget,
+    RetryPolicy,
+    parse_retry_after,
+)
+from servicenow_api.transport import ServiceNowSession, TransportConfig
+
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def _response(status, headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    response._content = b"{}"
+    response.raw = MagicMock()
+    return response
+
+
+def _session(responses, **kwargs):
+    inner = MagicMock()
+    inner.get.side_effect = list(responses)
+    inner.post.side_effect = list(responses)
+    session = ServiceNowSession(inner, TransportConfig(), **kwargs)
+    sleeps = []
+    session._sleep = sleeps.append
+    return session, inner, sleeps
+
+
+def test_parse_retry_after_forms():
+    assert parse_retry_after("7") == 7.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:10 GMT", now=1445412480) == 10.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+
+
+def test_backoff_is_capped_full_jitter():
+    policy = RetryPolicy(backoff_base=1, backoff_max=5)
+    assert policy.backoff(1, rng=lambda: 1.0) == 1
+    assert policy.backoff(3, rng=lambda: 1.0) == 4
+    assert policy.backoff(10, rng=lambda: 1.0) == 5
+    assert policy.backoff(3, rng=lambda: 0.25) == 1
+
+
+def test_get_retried_on_503_then_succeeds():
+    session, inner, sleeps = _session(
+        [_response(503), _response(503), _response(200)],
+        retry_policy=RetryPolicy(backoff_base=0.1),
+    )
+
+    response = session.get(url="https://x/api/now/table/incident")
+
+    assert response.status_code == 200
+    assert inner.get.call_count == 3
+    assert len(sleeps) == 2
+    assert all(0 <= s <= 0.2 for s in sleeps)
+
+
+def test_retry_after_is_honoured():
+    session, _, sleeps = _session(
+        [_response(429, {"Retry-After": "3"}), _response(200)],
+        retry_policy=RetryPolicy(),
+        rate_limiter=RateLimiter(),
+    )
+    session.rate_limiter.reserve = lambda: 0.0
+
+    assert session.get(url="https://x/api").status_code == 200
+    assert sleeps == [3.0]
+
+
+def test_retry_after_beyond_cap_fails_fast():
+    session, inner, sleeps = _session(
+        [_response(429, {"Retry-After": "600"}), _response(200)],
+        retry_policy=RetryPolicy(max_retry_after=60),
+    )
+    session.rate_limiter.reserve = lambda: 0.0
+
+    assert session.get(url="https://x/api").status_code == 429
+    assert inner.get.call_count == 1
+    assert sleeps == []
+
+
+def test_attempts_are_bounded():
+    session, inner, _ = _session(
+        [_response(503)] * 5, retry_policy=RetryPolicy(max_attempts=3)
+    )
+    assert session.get(url="https://x/api").status_code == 503
+    assert inner.get.call_count == 3
+
+
+def test_post_without_idempotency_key_is_not_retried():
+    session, inner, _ = _session([_response(503), _response(201)])
+    assert session.post(url="https://x/api", json={}).status_code == 503
+    assert inner.post.call_count == 1
+
+
+def test_post_with_idempotency_keys_retries_with_stable_key():
+    shared_headers = {"Authorization": "Basic abc"}
+    session, inner, _ = _session(
+        [_response(503), _response(201)],
+        retry_policy=RetryPolicy(idempotency_keys=True),
+    )
+
+    assert (
+        session.post(url="https://x/api", json={}, headers=shared_headers).status_code
+        == 201
+    )
+    keys = [c.kwargs["headers"][IDEMPOTENCY_HEADER] for c in inner.post.call_args_list]
+    assert len(keys) == 2 and keys[0] == keys[1]
+    assert IDEMPOTENCY_HEADER not in shared_headers
+
+
+def test_connection_errors_retried_for_get_only():
+    session, inner, _ = _session(
+        [requests.ConnectionError("reset"), _response(200)],
+    )
+    assert session.get(url="https://x/api").status_code == 200
+
+    session, inner, _ = _session([requests.ReadTimeout("slow"), _response(201)])
+    with pytest.raises(requests.ReadTimeout):
+        session.post(url="https://x/api", json={})
+
+
+def test_retry_budget_limits_retry_storms():
+    clock = FakeClock()
+    budget = RetryBudget(ratio=0.0, min_retries=2, window=10, clock=clock)
+    assert budget.try_acquire()
+    assert budget.try_acquire()
+    assert not budget.try_acquire()
+    clock.now += 11
+    assert budget.try_acquire()
+
+    session, inner, _ = _session(
+        [_response(503)] * 10,
+        retry_budget=RetryBudget(ratio=0.0, min_retries=1),
+    )
+    session.get(url="https://x/api")
+    assert inner.get.call_count == 2
+
+
+def test_rate_limiter_paces_to_observed_quota():
+    clock = FakeClock()
+    limiter = RateLimiter(burst=5, clock=clock)
+    assert limiter.reserve() == 0.0  # unlimited until headers are seen
+
+    limiter.observe(
+        200,
+        {"X-RateLimit-Remaining": "2", "X-RateLimit-Reset": str(clock.now + 20)},
+    )
+    assert limiter.rate == pytest.approx(0.1)
+    assert limiter.reserve() == 0.0
+    assert limiter.reserve() == 0.0
+    assert limiter.reserve() == pytest.approx(10.0)
+
+
+def test_rate_limiter_429_pauses_all_callers():
+    clock = FakeClock()
+    limiter = RateLimiter(clock=clock)
+    limiter.observe(429, {"Retry-After": "4"})
+    assert limiter.reserve() == pytest.approx(4.0)
+    clock.now += 4
+    assert limiter.reserve() == 0.0
+
+
+def test_rate_limiter_ignores_non_numeric_headers():
+    limiter = RateLimiter()
+    limiter.observe(200, MagicMock())
+    assert limiter.rate is None
+
+
+@pytest.mark.asyncio
+async def test_async_client_retries_429():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) == 1:
+            return httpx.Response(429, headers={"Retry-After": "0"})
+        return httpx.Response(200, json={"result": []})
+
+    api = AsyncApi(
+        url="https://dev12345.service-now.com",
+        username="admin",
+        password="pw",
+        rate_limiter=RateLimiter(),
+        client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    async with api:
+        resp = await api.get_table(table="incident")
+
+    assert resp.result == []
+    assert len(calls) == 2
@@ -0,0 +1,153 @@
+import io
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+
+from servicenow_api.api_client import Api
+from servicenow_api.pagination import KeysetPagination, TableIterator, TablePage
+from servicenow_api.streaming import StreamedRecords, iter_json_array
+
+BASE = "https://dev12345.service-now.com"
+ROWS = [
+    {"sys_id": f"{i:032x}", "number": f"INC{i:07d}", "short_description": "Drücker"}
+    for i in range(50)
+]
+
+
+def _chunks(data: bytes, size: int):
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+@pytest.mark.parametrize("size", [1, 3, 17, 4096])
+def test_elements_are_decoded_across_chunk_boundaries(size):
+    body = {
+        "meta": {"skip": [1, {"result": []}]},
+        "result": [*ROWS[:3], 1234567, -0.5, "ü]}", None, [1, [2]]],
+        "status": "ok",
+    }
+    data = json.dumps(body, ensure_ascii=False, indent=1).encode()
+
+    assert list(iter_json_array(_chunks(data, size))) == body["result"]
+
+
+def test_bare_arrays_and_empty_bodies():
+    assert list(iter_json_array([b" [1, ", b"2] "])) == [1, 2]
+    assert list(iter_json_array([b'{"result": []}'])) == []
+    assert list(iter_json_array([b'{"result": {"sys_id": "a"}}'])) == [{"sys_id": "a"}]
+    assert list(iter_json_array([b"{}"])) == []
+
+
+@pytest.mark.parametrize(
+    "data", [b'{"result": [{"a": 1}, {"b"', b'{"result": [1 2]}', b"<html>", b""]
+)
+def test_invalid_or_truncated_bodies_raise(data):
+    with pytest.raises(json.JSONDecodeError):
+        list(iter_json_array([data]))
+
+
+def test_records_are_yielded_before_the_body_finishes():
+    data = json.dumps({"result": ROWS}).encode()
+    read = []
+
+    def chunks():
+        for chunk in _chunks(data, 256):
+            read.append(len(chunk))
+            yield chunk
+
+    first = next(iter_json_array(chunks()))
+
+    assert first == ROWS[0]
+    assert sum(read) < len(data) / 4
+
+
+def test_streamed_records_report_length_only_once_consumed():
+    closed = []
+    records = StreamedRecords(iter(ROWS[:3]), close=lambda: closed.append(True))
+
+    with pytest.raises(TypeError):
+        len(records)
+    assert list(records) == ROWS[:3]
+    assert (len(records), records[-1], closed) == (3, ROWS[2], [True])
+    with pytest.raises(IndexError):
+        records[0]
+    records.close()
+    assert closed == [True]
+
+
+def test_table_iterator_walks_streamed_keyset_pages():
+    calls = []
+
+    def fetch(params):
+        calls.append(params)
+        query = params.get("sysparm_query", "")
+        after = query.split("sys_id>")[1].split("^")[0] if "sys_id>" in query else ""
+        page = [r for r in ROWS if r["sys_id"] > after][: params["sysparm_limit"]]
+        body = json.dumps({"result": page}).encode()
+        return TablePage(StreamedRecords(iter_json_array(_chunks(body, 64))), None)
+
+    rows = TableIterator(
+        fetch, {}, page_size=20, prefetch=True, strategy=KeysetPagination()
+    )
+
+    assert list(rows) == ROWS
+    assert len(calls) == 4 and rows.progress.pages == 4
+    assert rows.cursor == ROWS[-1]["sys_id"]
+
+
+def _streaming_api():
+    responses = []
+
+    def get(url, params, stream=False, **kwargs):
+        query = params.get("sysparm_query", "")
+        after = query.split("sys_id>")[1].split("^")[0] if "sys_id>" in query else ""
+        page = [r for r in ROWS if r["sys_id"] > after][: params["sysparm_limit"]]
+        response = requests.Response()
+        response.status_code = 200
+        response.raw = io.BytesIO(json.dumps({"result": page}).encode())
+        response.close = MagicMock()
+        response.streamed = stream
+        responses.append(response)
+        return response
+
+    session = MagicMock()
+    session.get.side_effect = get
+    with patch("requests.Session", return_value=session):
+        api = Api(url=BASE, username="admin", password="pw")
+    return api, responses
+
+
+def test_iter_table_stream_reads_bodies_incrementally():
+    api, responses = _streaming_api()
+
+    rows = api.iter_table(
+        table="incident", pagination="keyset", page_size=30, stream=True
+    )
+    numbers = [r.number for r in rows]
+
+    assert numbers == [r["number"] for r in ROWS]
+    assert all(r.streamed for r in responses)
+    assert all(r.close.called for r in responses)
+
+
+def test_closing_iterator_mid_page_releases_response():
+    api, responses = _streaming_api()
+
+    with api.iter_table(table="incident", page_size=30, stream=True) as rows:
+        next(rows)
+
+    assert len(responses) == 1 and responses[0].close.called
+
+
+def test_export_table_ndjson_streams(tmp_path):
+    api, responses = _streaming_api()
+    path = tmp_path / "incident.ndjson"
+
+    result = api.export_table_ndjson(
+        table="incident", path=str(path), page_size=20, stream=True
+    )
+
+    assert result.records == 50
+    assert [json.loads(line) for line in path.read_text().splitlines()] == ROWS
+    assert all(r.streamed for r in responses)
@@ -0,0 +1,147 @@
+import json
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+from conftest import serve_encoded_query
+
+from servicenow_api.api_client import Api
+from servicenow_api.sync import SyncStore, TableSync
+
+BASE = "https://dev12345.service-now.com"
+
+
+class FakeInstance:
+    """Table API double that evaluates the encoded queries sync emits."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.queries = []
+
+    def get(self, url, params, **kwargs):
+        self.queries.append(params.get("sysparm_query", ""))
+        hits, _ = serve_encoded_query(self.rows, params)
+        response = requests.Response()
+        response.status_code = 200
+        response._content = json.dumps({"result": hits}).encode()
+        return response
+
+
+def _row(i, updated, **extra):
+    return {"sys_id": f"{i:032x}", "sys_updated_on": updated, "state": "1", **extra}
+
+
+@pytest.fixture
+def world():
+    rows = [_row(i, f"2026-03-01 10:{i // 2:02d}:00") for i in range(12)]
+    instance = FakeInstance(rows)
+    session = MagicMock()
+    session.get.side_effect = instance.get
+    with patch("requests.Session", return_value=session):
+        api = Api(url=BASE, username="admin", password="pw")
+    store = SyncStore(":memory:")
+    return instance, TableSync(api, store=store, page_size=5), store
+
+
+def test_first_run_reads_everything_and_sets_watermark(world):
+    instance, sync, _ = world
+
+    result = sync.sync("incident", fields=["state"])
+
+    assert result.full is True
+    assert result.changed == 12
+    assert result.watermark == "2026-03-01 10:05:00"
+    assert instance.queries[0] == "ORDERBYsys_updated_on^ORDERBYsys_id"
+
+
+def test_next_run_only_reads_the_overlap_and_skips_unchanged(world):
+    instance, sync, _ = world
+    sync.sync("incident")
+    instance.queries.clear()
+
+    result = sync.sync("incident")
+
+    assert result.full is False
+    assert result.changed == 0
+    assert result.skipped == 6  # records from 10:03:00 onward fall in the 120s overlap
+    assert instance.queries[0].startswith("sys_updated_on>=2026-03-01 10:03:00^")
+
+
+def test_changes_and_equal_timestamp_inserts_are_delivered(world):
+    instance, sync, _ = world
+    sync.sync("incident")
+    instance.rows[0] = _row(0, "2026-03-01 11:00:00", state="2")
+    # A late commit carrying the old watermark's exact timestamp.
+    instance.rows.append(_row(99, "2026-03-01 10:05:00"))
+
+    batches = []
+    result = sync.sync("incident", on_records=batches.append)
+
+    delivered = [r["sys_id"] for batch in batches for r in batch]
+    assert sorted(delivered) == [f"{0:032x}", f"{99:032x}"]
+    assert result.records == []
+    assert result.watermark == "2026-03-01 11:00:00"
+
+
+def test_reconciliation_detects_deletes(world):
+    instance, sync, store = world
+    sync.sync("incident")
+    gone = instance.rows.pop(4)["sys_id"]
+
+    seen = []
+    result = sync.sync("incident", on_deletes=seen.extend, reconcile=True)
+
+    assert result.reconciled is True
+    assert result.deleted == seen == [gone]
+    key = sync._key("incident", None)
+    assert gone not in set(store.iter_known_ids(key))
+    assert sync.sync("incident", reconcile=True).deleted == []
+
+
+def test_reconciliation_runs_when_interval_elapsed(world):
+    instance, sync, _ = world
+    sync.sync("incident")
+    instance.rows.pop()
+
+    assert sync.sync("incident").reconciled is False  # default interval is a day
+    sync.reconcile_seconds = 0
+    assert len(sync.sync("incident").deleted) == 1
+
+
+def test_interrupted_run_resumes_from_last_delivered_batch(world):
+    instance, sync, _ = world
+    calls = []
+
+    def sink(batch):
+        calls.append([r["sys_id"] for r in batch])
+        if len(calls) == 2:
+            raise RuntimeError("sink down")
+
+    with pytest.raises(RuntimeError):
+        sync.sync("incident", on_records=sink)
+    resumed = sync.sync("incident")
+
+    first_batch = set(calls[0])
+    assert first_batch.isdisjoint(r["sys_id"] for r in resumed.records)
+    assert len(first_batch) + len(resumed.records) == 12
+
+
+def test_queries_have_independent_watermarks(world):
+    instance, sync, store = world
+    sync.sync("incident", query="state=1")
+    instance.queries.clear()
+
+    result = sync.sync("incident", query="active=true")
+
+    assert result.full is True
+    assert store.get_watermark(sync._key("incident", "state=1")) is not None
+
+
+def test_api_sync_table_uses_default_store(world, tmp_path):
+    _, sync, _ = world
+
+    first = sync.api.sync_table(table="incident")
+    second = sync.api.sync_table(table="incident")
+
+    assert (first.full, second.full) == (True, False)
+    assert (tmp_path / "sync.sqlite3").exists()
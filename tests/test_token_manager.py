@@ -0,0 +1,226 @@
+import gc
+import threading
+import time
+from unittest.mock import MagicMock, patch
+from urllib.parse import parse_qs
+
+import requests
+
+from servicenow_api.api_client import Api
+from servicenow_api.token_manager import OAuthTokenManager
+
+TOKEN_URL = "https://dev12345.service-now.com/oauth_token.do"
+AUTH_DATA = {
+    "grant_type": "password",
+    "client_id": "cid",
+    "client_secret": "csec",
+    "username": "admin",
+    "password": "pw",
+}
+
+
+def _token_response(access, refresh="r1", expires_in=1800):
+    resp = MagicMock(spec=requests.Response)
+    resp.status_code = 200
+    resp.json.return_value = {
+        "access_token": access,
+        "refresh_token": refresh,
+        "expires_in": expires_in,
+        "token_type": "Bearer",
+    }
+    return resp
+
+
+def _posted_form(session, call_index=-1):
+    return parse_qs(session.post.call_args_list[call_index].kwargs["data"])
+
+
+def test_fetch_records_expiry_and_refresh_token():
+    session = MagicMock()
+    session.post.return_value = _token_response("a1", expires_in=1800)
+    manager = OAuthTokenManager(session, TOKEN_URL, AUTH_DATA)
+
+    before = time.time()
+    manager.fetch()
+
+    assert manager.access_token == "a1"
+    assert manager.refresh_token == "r1"
+    assert before + 1800 <= manager.expires_at <= time.time() + 1800
+
+
+def test_refresh_sends_refresh_token_not_access_token():
+    session = MagicMock()
+    session.post.return_value = _token_response("a1", refresh="r1")
+    manager = OAuthTokenManager(session, TOKEN_URL, AUTH_DATA)
+    manager.fetch()
+
+    session.post.return_value = _token_response("a2", refresh="r2")
+    manager.refresh()
+
+    form = _posted_form(session)
+    assert form["grant_type"] == ["refresh_token"]
+    assert form["refresh_token"] == ["r1"]
+    assert manager.access_token == "a2"
+    assert manager.refresh_token == "r2"
+
+
+def test_rejected_refresh_token_falls_back_to_password_grant():
+    session = MagicMock()
+    session.post.return_value = _token_response("a1")
+    manager = OAuthTokenManager(session, TOKEN_URL, AUTH_DATA)
+    manager.fetch()
+
+    rejected = MagicMock(spec=requests.Response)
+    rejected.status_code = 401
+    rejected.raise_for_status.side_effect = requests.HTTPError(response=rejected)
+    session.post.side_effect = [rejected, _token_response("a3")]
+    manager.refresh()
+
+    assert _posted_form(session)["grant_type"] == ["password"]
+    assert manager.access_token == "a3"
+
+
+def test_needs_refresh_inside_margin():
+    manager = OAuthTokenManager(MagicMock(), TOKEN_URL, AUTH_DATA, refresh_margin=60)
+    manager.access_token = "a1"
+    manager.expires_in = 1800
+    manager.expires_at = time.time() + 30
+    assert manager.needs_refresh()
+    manager.expires_at = time.time() + 600
+    assert not manager.needs_refresh()
+
+
+def test_concurrent_unauthorized_triggers_single_refresh():
+    session = MagicMock()
+    session.post.return_value = _token_response("a1")
+    manager = OAuthTokenManager(session, TOKEN_URL, AUTH_DATA)
+    manager.fetch()
+
+    def slow_post(**kwargs):
+        time.sleep(0.05)
+        return _token_response("a2")
+
+    session.post.side_effect = slow_post
+    results = []
+    threads = [
+        threading.Thread(
+            target=lambda: results.append(manager.handle_unauthorized("a1"))
+        )
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert manager.refresh_count == 1
+    assert results == ["a2"] * 8
+
+
+def test_response_hook_retries_401_once_with_new_token():
+    session = MagicMock()
+    session.post.return_value = _token_response("a1")
+    manager = OAuthTokenManager(session, TOKEN_URL, AUTH_DATA)
+    manager.fetch()
+    session.post.return_value = _token_response("a2")
+
+    request = requests.Request(
+        "GET",
+        "https://dev12345.service-now.com/api/now/table/incident",
+        headers={"Authorization": "Bearer a1"},
+    ).prepare()
+    unauthorized = requests.Response()
+    unauthorized.status_code = 401
+    unauthorized.request = request
+    unauthorized._content = b""
+    unauthorized.connection = MagicMock()
+    ok = requests.Response()
+    ok.status_code = 200
+    unauthorized.connection.send.return_value = ok
+
+    result = manager.response_hook(unauthorized, timeout=5)
+
+    assert result is ok
+    sent = unauthorized.connection.send.call_args.args[0]
+    assert sent.headers["Authorization"] == "Bearer a2"
+    assert unauthorized.connection.send.call_args.kwargs == {"timeout": 5}
+    assert result.history == [unauthorized]
+
+
+def test_response_hook_ignores_token_endpoint():
+    manager = OAuthTokenManager(MagicMock(), TOKEN_URL, AUTH_DATA)
+    response = requests.Response()
+    response.status_code = 401
+    response.request = requests.Request("POST", TOKEN_URL).prepare()
+    assert manager.response_hook(response) is response
+
+
+def test_background_refresh_renews_before_expiry():
+    session = MagicMock()
+    session.post.return_value = _token_response("a1", expires_in=1)
+    manager = OAuthTokenManager(session, TOKEN_URL, AUTH_DATA)
+    manager.fetch()
+    session.post.return_value = _token_response("a2", expires_in=1800)
+
+    manager.start()
+    try:
+        deadline = time.time() + 3
+        while manager.access_token != "a2" and time.time() < deadline:
+            time.sleep(0.05)
+    finally:
+        manager.stop()
+
+    assert manager.access_token == "a2"
+
+
+def test_api_oauth_installs_token_manager_and_updates_headers():
+    mock_session = MagicMock()
+    mock_session.post.return_value = _token_response("a1", expires_in=None)
+    with patch("requests.Session", return_value=mock_session):
+        client = Api(
+            url="https://dev12345.service-now.com",
+            username="admin",
+            password="pw",
+            client_id="cid",
+            client_secret="csec",
+        )
+
+    assert client.token_manager is not None
+    assert client.headers["Authorization"] == "Bearer a1"
+    mock_session.post.return_value = _token_response("a2", expires_in=None)
+    client.refresh_auth_token()
+    assert client.headers["Authorization"] == "Bearer a2"
+    assert client.token == "a2"
+
+
+def _unclosed_oauth_client():
+    session = MagicMock()
+    session.post.return_value = _token_response("a1", expires_in=1800)
+    with patch("requests.Session", return_value=session):
+        client = Api(
+            url="https://dev12345.service-now.com",
+            username="admin",
+            password="pw",
+            client_id="cid",
+            client_secret="csec",
+        )
+    assert client.token_manager._thread.is_alive()
+
+
+def test_dropped_client_is_collected_and_its_refresher_exits():
+    def refreshers():
+        return [
+            t
+            for t in threading.enumerate()
+            if t.name == "servicenow-token-refresh" and t.is_alive()
+        ]
+
+    before = len(refreshers())
+    for _ in range(5):
+        _unclosed_oauth_client()
+
+    gc.collect()
+    deadline = time.time() + 3
+    while len(refreshers()) > before and time.time() < deadline:
+        time.sleep(0.05)
+    assert len(refreshers()) == before
@@ -0,0 +1,150 @@
+import os
+import socket
+import subprocess
+import sys
+import time
+from unittest.mock import MagicMock, patch
+
+import pytest
+import requests
+from requests.sessions import Session
+
+from servicenow_api.api_client import Api
+from servicenow_api.transport import (
+    ServiceNowAdapter,
+    ServiceNowSession,
+    TransportConfig,
+)
+
+
+def test_from_settings_reads_env():
+    env = {
+        "SERVICENOW_POOL_MAXSIZE": "200",
+        "SERVICENOW_CONNECT_TIMEOUT": "3.5",
+        "SERVICENOW_READ_TIMEOUT": "20",
+        "SERVICENOW_TCP_NODELAY": "false",
+        "SERVICENOW_REQUEST_DEADLINE": "45",
+    }
+    with patch.dict(os.environ, env):
+        config = TransportConfig.from_settings()
+
+    assert config.pool_maxsize == 200
+    assert config.requests_timeout() == (3.5, 20.0)
+    assert config.tcp_nodelay is False
+    assert config.deadline == 45.0
+
+
+def test_timeouts_are_clamped_to_deadline():
+    config = TransportConfig(connect_timeout=10, read_timeout=60, deadline=15)
+    assert config.requests_timeout() == (10, 15)
+    assert config.requests_timeout(elapsed=12) == pytest.approx((3, 3))
+
+
+def test_socket_options_include_nodelay_and_keepalive():
+    options = TransportConfig().socket_options()
+    assert (socket.IPPROTO_TCP, socket.TCP_NODELAY, 1) in options
+    assert (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1) in options
+
+    options = TransportConfig(tcp_nodelay=False, keep_alive=False).socket_options()
+    assert (socket.IPPROTO_TCP, socket.TCP_NODELAY, 0) in options
+    assert all(opt[1] != socket.SO_KEEPALIVE for opt in options)
+
+
+def test_session_mounts_sized_adapter():
+    inner = Session()
+    ServiceNowSession(inner, TransportConfig(pool_connections=4, pool_maxsize=64))
+
+    adapter = inner.get_adapter("https://dev12345.service-now.com/api")
+    assert isinstance(adapter, ServiceNowAdapter)
+    assert adapter._pool_maxsize == 64
+    assert adapter.poolmanager.connection_pool_kw["socket_options"][-1] == (
+        socket.SOL_SOCKET,
+        socket.SO_KEEPALIVE,
+        1,
+    )
+
+
+def test_default_timeout_injected_but_caller_timeout_wins():
+    inner = MagicMock()
+    session = ServiceNowSession(
+        inner, TransportConfig(connect_timeout=2, read_timeout=7)
+    )
+
+    session.get(url="https://x/api", params={"a": 1})
+    session.post(url="https://x/oauth_token.do", data="x", timeout=30)
+
+    assert inner.get.call_args.kwargs == {
+        "url": "https://x/api",
+        "params": {"a": 1},
+        "timeout": (2, 7),
+    }
+    assert inner.post.call_args.kwargs["timeout"] == 30
+
+
+def test_attributes_delegate_to_wrapped_session():
+    inner = Session()
+    session = ServiceNowSession(inner, TransportConfig())
+    assert session.hooks is inner.hooks
+    assert session.headers is inner.headers
+
+
+def test_deadline_aborts_slow_body():
+    def trickle(chunk_size):
+        for _ in range(5):
+            time.sleep(0.05)
+            yield b"x"
+
+    response = MagicMock()
+    response.iter_content.side_effect = trickle
+    inner = MagicMock()
+    inner.get.return_value = response
+    session = ServiceNowSession(inner, TransportConfig(deadline=0.1))
+
+    with pytest.raises(requests.Timeout):
+        session.get(url="https://x/api")
+    assert inner.get.call_args.kwargs["stream"] is True
+    response.close.assert_called_once()
+
+
+def test_deadline_buffers_body_within_budget():
+    response = requests.Response()
+    response.status_code = 200
+    response.raw = MagicMock()
+    response.iter_content = MagicMock(return_value=iter([b'{"result"', b": []}"]))
+    inner = MagicMock()
+    inner.get.return_value = response
+    session = ServiceNowSession(inner, TransportConfig(deadline=5))
+
+    assert session.get(url="https://x/api").json() == {"result": []}
+
+
+def test_api_applies_transport_to_every_mixin_call():
+    mock_session = MagicMock()
+    ok = MagicMock(spec=requests.Response)
+    ok.json.return_value = {"result": []}
+    mock_session.get.return_value = ok
+    with patch("requests.Session", return_value=mock_session):
+        api = Api(
+            url="https://dev12345.service-now.com",
+            username="admin",
+            password="pw",
+            transport=TransportConfig(connect_timeout=1, read_timeout=9),
+        )
+        api.get_table(table="incident")
+        api.get_problems()
+
+    assert api.transport.read_timeout == 9
+    for call in mock_session.get.call_args_list:
+        assert call.kwargs["timeout"] == (1, 9)
+    adapter = mock_session.mount.call_args_list[0].args[1]
+    assert isinstance(adapter, ServiceNowAdapter)
+
+
+def test_sync_client_imports_without_httpx():
+    # httpx is optional (http2/mcp extras); only AsyncApi may need it.
+    code = (
+        "import sys; sys.modules['httpx'] = None; "
+        "from servicenow_api.api_client import Api; "
+        "Api(url='https://dev12345.service-now.com', username='u', password='p')"
+    )
+    subprocess.run([sys.executable, "-c", code], check=True)